@@ -35,6 +35,11 @@ Checkpointable data structures:
 Checkpoint management:
 @@CheckpointManager
 
+Delta checkpoints of embeddings:
+@@DeltaCheckpointSaver
+@@mark_updated_rows
+@@track_sparse_updates
+
 Saving and restoring Python state:
 @@NumpyState
 @@PythonStateWrapper
@@ -51,6 +56,9 @@ from tensorflow.contrib.checkpoint.python.split_dependency import split_dependen
 from tensorflow.contrib.checkpoint.python.visualize import dot_graph_from_checkpoint
 from tensorflow.core.protobuf.checkpointable_object_graph_pb2 import CheckpointableObjectGraph
 from tensorflow.python.training.checkpoint_management import CheckpointManager
+from tensorflow.python.training.delta_checkpoint import DeltaCheckpointSaver
+from tensorflow.python.training.delta_checkpoint import mark_updated_rows
+from tensorflow.python.training.delta_checkpoint import track_sparse_updates
 from tensorflow.python.training.checkpointable.base import CheckpointableBase
 from tensorflow.python.training.checkpointable.data_structures import List
 from tensorflow.python.training.checkpointable.data_structures import Mapping
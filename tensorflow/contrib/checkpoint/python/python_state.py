@@ -88,6 +88,7 @@ class NumpyState(base.CheckpointableBase):
       new_reference = base.CheckpointableReference(name=name, ref=value)
       self._unconditional_checkpoint_dependencies.append(new_reference)
       self._unconditional_dependency_names[name] = value
+      base.mark_dependencies_changed()
       super(NumpyState, self).__setattr__(name, value)
     return value
 
@@ -25,6 +25,11 @@ To use, at program startup, call `tf.enable_eager_execution()`.
 
 @@py_func
 @@defun
+@@FunctionCachePolicy
+@@TraceEvent
+@@TraceCounters
+@@add_trace_listener
+@@remove_trace_listener
 @@function
 @@make_template
 @@implicit_gradients
@@ -141,6 +146,11 @@ from tensorflow.python.util.all_util import remove_undocumented
 
 py_func = script_ops.eager_py_func
 defun = _function_lib.defun
+FunctionCachePolicy = _function_lib.FunctionCachePolicy
+TraceEvent = _function_lib.TraceEvent
+TraceCounters = _function_lib.TraceCounters
+add_trace_listener = _function_lib.add_trace_listener
+remove_trace_listener = _function_lib.remove_trace_listener
 make_template = template.make_template_internal
 implicit_gradients = backprop.implicit_grad
 implicit_value_and_gradients = backprop.implicit_val_and_grad
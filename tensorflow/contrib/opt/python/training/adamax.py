@@ -37,6 +37,9 @@ class AdaMaxOptimizer(adam.AdamOptimizer):
   ([pdf](http://arxiv.org/pdf/1412.6980.pdf)).
   """
 
+  # Sparse updates only change the rows of the gradient.
+  _sparse_apply_updates_all_rows = False
+
   def __init__(self, learning_rate=0.001, beta1=0.9, beta2=0.999, epsilon=1e-8,
                use_locking=False, name="AdaMax"):
     """Construct a new AdaMax optimizer.
@@ -19,15 +19,27 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import threading
+import time
+
+import numpy as np
+
 from tensorflow.contrib.learn.python.learn.utils import saved_model_export_utils
 from tensorflow.contrib.predictor import predictor
+from tensorflow.core.protobuf import config_pb2
 from tensorflow.python.framework import ops
+from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.training import checkpoint_management
 from tensorflow.python.training import monitored_session
 
 
 class ContribEstimatorPredictor(predictor.Predictor):
-  """A `Predictor constructed from a `tf.contrib.learn.Estimator`."""
+  """A `Predictor constructed from a `tf.contrib.learn.Estimator`.
+
+  The graph and the session are created once. Calls feeding and fetching
+  dense tensors run a callable cached for the set of inputs they feed, instead
+  of going through `Session.run`.
+  """
 
   def __init__(self,
                estimator,
@@ -35,7 +47,8 @@ class ContribEstimatorPredictor(predictor.Predictor):
                input_alternative_key=None,
                output_alternative_key=None,
                graph=None,
-               config=None):
+               config=None,
+               reload_checkpoint_secs=None):
     """Initialize a `ContribEstimatorPredictor`.
 
     Args:
@@ -50,6 +63,11 @@ class ContribEstimatorPredictor(predictor.Predictor):
       graph: Optional. The Tensorflow `graph` in which prediction should be
         done.
       config: `ConfigProto` proto used to configure the session.
+      reload_checkpoint_secs: Optional. If set, calls check at most every
+        `reload_checkpoint_secs` seconds whether a newer checkpoint was
+        written to the `model_dir` of `estimator`, and restore it in the
+        existing session. Predictions running concurrently with a restore may
+        see a mix of old and new variable values.
     """
     self._graph = graph or ops.Graph()
     with self._graph.as_default():
@@ -57,12 +75,14 @@ class ContribEstimatorPredictor(predictor.Predictor):
       # pylint: disable=protected-access
       model_fn_ops = estimator._get_predict_ops(input_fn_ops.features)
       # pylint: enable=protected-access
-      checkpoint_path = checkpoint_management.latest_checkpoint(
-          estimator.model_dir)
-      self._session = monitored_session.MonitoredSession(
-          session_creator=monitored_session.ChiefSessionCreator(
-              config=config,
-              checkpoint_filename_with_path=checkpoint_path))
+      self._model_dir = estimator.model_dir
+      self._checkpoint_path = checkpoint_management.latest_checkpoint(
+          self._model_dir)
+      self._scaffold = model_fn_ops.scaffold or monitored_session.Scaffold()
+      self._session = monitored_session.ChiefSessionCreator(
+          scaffold=self._scaffold,
+          config=config,
+          checkpoint_filename_with_path=self._checkpoint_path).create_session()
 
     input_alternative_key = (
         input_alternative_key or
@@ -76,3 +96,67 @@ class ContribEstimatorPredictor(predictor.Predictor):
          model_fn_ops, output_alternative_key)
     _, fetch_tensors = output_alternatives[output_alternative_key]
     self._fetch_tensors = fetch_tensors
+
+    self._reload_checkpoint_secs = reload_checkpoint_secs
+    self._next_reload_check = time.time()
+    self._reload_lock = threading.Lock()
+    # Callables by the tuple of keys of the inputs they feed.
+    self._callables = {}
+    self._fetch_keys = sorted(self._fetch_tensors.keys())
+    self._callables_supported = all(
+        isinstance(tensor, ops.Tensor)
+        for tensor in list(self._feed_tensors.values()) +
+        list(self._fetch_tensors.values()))
+
+  @property
+  def checkpoint_path(self):
+    """The path of the checkpoint the variables were last restored from."""
+    return self._checkpoint_path
+
+  def _maybe_reload_checkpoint(self):
+    """Restores the latest checkpoint of the estimator if it is new."""
+    now = time.time()
+    if now < self._next_reload_check or not self._reload_lock.acquire(False):
+      return
+    try:
+      self._next_reload_check = now + self._reload_checkpoint_secs
+      checkpoint_path = checkpoint_management.latest_checkpoint(
+          self._model_dir)
+      if checkpoint_path and checkpoint_path != self._checkpoint_path:
+        logging.info('Restoring predictor variables from %s.',
+                     checkpoint_path)
+        self._scaffold.saver.restore(self._session, checkpoint_path)
+        self._checkpoint_path = checkpoint_path
+    finally:
+      self._reload_lock.release()
+
+  def _get_callable(self, feed_keys):
+    """Returns a callable feeding the inputs `feed_keys`."""
+    callable_fn = self._callables.get(feed_keys)
+    if callable_fn is None:
+      callable_opts = config_pb2.CallableOptions()
+      for key in feed_keys:
+        callable_opts.feed.append(self._feed_tensors[key].name)
+      for key in self._fetch_keys:
+        callable_opts.fetch.append(self._fetch_tensors[key].name)
+      # pylint: disable=protected-access
+      callable_fn = self._session._make_callable_from_options(callable_opts)
+      # pylint: enable=protected-access
+      self._callables[feed_keys] = callable_fn
+    return callable_fn
+
+  def __call__(self, input_dict):
+    if self._reload_checkpoint_secs is not None:
+      self._maybe_reload_checkpoint()
+    if (not self._callables_supported or
+        not set(input_dict.keys()).issubset(self._feed_tensors.keys())):
+      return super(ContribEstimatorPredictor, self).__call__(input_dict)
+    feed_keys = tuple(sorted(key for key, value in input_dict.items()
+                             if value is not None))
+    # Callables only accept values of the exact dtype of their feeds.
+    feed_values = [
+        np.asarray(input_dict[key],
+                   dtype=self._feed_tensors[key].dtype.as_numpy_dtype)
+        for key in feed_keys]
+    fetched = self._get_callable(feed_keys)(*feed_values)
+    return dict(zip(self._fetch_keys, fetched))
@@ -19,12 +19,23 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
 import tempfile
 import numpy as np
 
+from tensorflow.contrib.learn.python.learn.estimators import constants
+from tensorflow.contrib.learn.python.learn.estimators import estimator as contrib_estimator
+from tensorflow.contrib.learn.python.learn.estimators import model_fn as contrib_model_fn
 from tensorflow.contrib.predictor import contrib_estimator_predictor
 from tensorflow.contrib.predictor import testing_common
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import control_flow_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import state_ops
+from tensorflow.python.ops import variable_scope
 from tensorflow.python.platform import test
+from tensorflow.python.training import training_util
 
 
 KEYS_AND_OPS = (('sum', lambda x, y: x + y),
@@ -66,5 +77,63 @@ class ContribEstimatorPredictorTest(test.TestCase):
           'Got output {} for x = {} and y = {}'.format(
               key, output, x, y))
 
+  def testCallablesCachedByFedInputs(self):
+    predictor = contrib_estimator_predictor.ContribEstimatorPredictor(
+        estimator=self._estimator,
+        prediction_input_fn=self._prediction_input_fn,
+        output_alternative_key='sum')
+    self.assertAlmostEqual(3., predictor({'x': 1., 'y': 2})['sum'])
+    self.assertAlmostEqual(5., predictor({'x': 2., 'y': 3.})['sum'])
+    self.assertEqual(1, len(predictor._callables))
+    self.assertAlmostEqual(4., predictor({'x': 4., 'y': None})['sum'])
+    self.assertEqual(2, len(predictor._callables))
+    with self.assertRaisesRegexp(ValueError, 'unexpected keys'):
+      predictor({'z': 1.})
+
+  def testReloadCheckpoint(self):
+
+    def _model_fn(features, labels, mode):
+      _ = labels
+      bias = variable_scope.get_variable('bias', initializer=0.)
+      predictions = {'biased': math_ops.add(features['x'], bias)}
+      loss = None
+      train_op = None
+      if mode == contrib_model_fn.ModeKeys.TRAIN:
+        # Each training step increments the bias.
+        loss = array_ops.identity(bias)
+        train_op = control_flow_ops.group(
+            state_ops.assign_add(bias, 1.),
+            state_ops.assign_add(training_util.get_global_step(), 1))
+      return contrib_model_fn.ModelFnOps(
+          mode=mode,
+          predictions=predictions,
+          output_alternatives={
+              'biased': (constants.ProblemType.UNSPECIFIED, predictions)},
+          loss=loss,
+          train_op=train_op)
+
+    estimator = contrib_estimator.Estimator(
+        _model_fn, model_dir=tempfile.mkdtemp())
+    train_input_fn = testing_common.get_arithmetic_input_fn(
+        core=False, train=True)
+    estimator.fit(input_fn=train_input_fn, steps=1)
+
+    predictors = [
+        contrib_estimator_predictor.ContribEstimatorPredictor(
+            estimator=estimator,
+            prediction_input_fn=self._prediction_input_fn,
+            graph=ops.Graph(),
+            reload_checkpoint_secs=reload_checkpoint_secs)
+        for reload_checkpoint_secs in [None, 0]]
+    for predictor in predictors:
+      self.assertAlmostEqual(3., predictor({'x': 2.})['biased'])
+
+    estimator.fit(input_fn=train_input_fn, steps=1)
+    static_predictor, reloading_predictor = predictors
+    self.assertAlmostEqual(3., static_predictor({'x': 2.})['biased'])
+    self.assertAlmostEqual(4., reloading_predictor({'x': 2.})['biased'])
+    self.assertEqual(os.path.join(estimator.model_dir, 'model.ckpt-2'),
+                     reloading_predictor.checkpoint_path)
+
 if __name__ == '__main__':
   test.main()
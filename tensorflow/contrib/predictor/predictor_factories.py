@@ -31,9 +31,14 @@ def from_contrib_estimator(estimator,
                            input_alternative_key=None,
                            output_alternative_key=None,
                            graph=None,
-                           config=None):
+                           config=None,
+                           reload_checkpoint_secs=None):
   """Constructs a `Predictor` from a `tf.contrib.learn.Estimator`.
 
+  The `Predictor` builds the graph and restores the latest checkpoint once,
+  and can be called repeatedly without rebuilding them, unlike
+  `Estimator.predict`.
+
   Args:
     estimator: an instance of `tf.contrib.learn.Estimator`.
     prediction_input_fn: a function that takes no arguments and returns an
@@ -46,6 +51,9 @@ def from_contrib_estimator(estimator,
     graph: Optional. The Tensorflow `graph` in which prediction should be
       done.
     config: `ConfigProto` proto used to configure the session.
+    reload_checkpoint_secs: Optional. If set, the `Predictor` checks at most
+      every `reload_checkpoint_secs` seconds whether a newer checkpoint was
+      written to the `model_dir` of `estimator`, and restores it.
 
   Returns:
     An initialized `Predictor`.
@@ -65,7 +73,8 @@ def from_contrib_estimator(estimator,
       input_alternative_key=input_alternative_key,
       output_alternative_key=output_alternative_key,
       graph=graph,
-      config=config)
+      config=config,
+      reload_checkpoint_secs=reload_checkpoint_secs)
 
 
 def from_estimator(estimator,
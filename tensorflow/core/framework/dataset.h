@@ -603,7 +603,7 @@ class DatasetBaseIterator : public IteratorBase {
     tracing::ScopedActivity activity(params_.prefix);
     RecordStart(ctx, true /* stop_output */);
     Status s = GetNextInternal(ctx, out_tensors, end_of_sequence);
-    if (s.ok() && !*end_of_sequence) RecordElement(ctx);
+    if (s.ok() && !*end_of_sequence) RecordElement(ctx, *out_tensors);
     RecordStop(ctx, true /* start_output */);
     if (TF_PREDICT_FALSE(errors::IsOutOfRange(s) && !*end_of_sequence)) {
       s = errors::Internal(
@@ -657,9 +657,13 @@ class DatasetBaseIterator : public IteratorBase {
 
   // When performance modeling is enabled, this method records the fact that
   // this iterator has produced an element.
-  void RecordElement(IteratorContext* ctx) {
+  void RecordElement(IteratorContext* ctx, const std::vector<Tensor>& element) {
     if (ctx->model()) {
-      ctx->model()->RecordElement(prefix());
+      int64 num_bytes = 0;
+      for (const Tensor& t : element) {
+        num_bytes += t.TotalBytes();
+      }
+      ctx->model()->RecordElement(prefix(), num_bytes);
     }
   }
 
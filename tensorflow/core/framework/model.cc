@@ -24,7 +24,9 @@ namespace model {
 // TODO(jsimsa): Use `Node` subclassing instead of types and node statements.
 void Model::Node::CollectTunables(
     std::vector<std::shared_ptr<Node::Tunable>>* tunables) {
-  tf_shared_lock l(mu_);
+  // An exclusive lock is needed because the tunables' `bytes_per_unit` is
+  // updated below.
+  mutex_lock l(mu_);
   for (auto input : inputs_) {
     input->CollectTunables(tunables);
   }
@@ -34,6 +36,8 @@ void Model::Node::CollectTunables(
     case Type::PARALLEL_MAP: {
       if (auto* tunable_param =
               gtl::FindOrNull(tunable_params_, "parallelism")) {
+        // Each unit of parallelism buffers (at most) one output element.
+        (*tunable_param)->bytes_per_unit = BytesPerElementLocked();
         tunables->push_back(*tunable_param);
       }
       return;
@@ -43,6 +47,20 @@ void Model::Node::CollectTunables(
   }
 }
 
+void Model::Node::CollectBuffers(
+    std::vector<std::shared_ptr<Node::Tunable>>* buffers) {
+  mutex_lock l(mu_);
+  for (auto input : inputs_) {
+    input->CollectBuffers(buffers);
+  }
+  if (type_ == Type::PREFETCH) {
+    if (auto* tunable_param = gtl::FindOrNull(tunable_params_, "buffer_size")) {
+      (*tunable_param)->bytes_per_unit = BytesPerElementLocked();
+      buffers->push_back(*tunable_param);
+    }
+  }
+}
+
 int64 Model::Node::GetParameterValue(const string& name) {
   if (auto* tunable_param = gtl::FindOrNull(tunable_params_, name)) {
     return (*tunable_param)->value;
@@ -268,6 +286,7 @@ std::shared_ptr<Model::Node> Model::Node::Snapshot(
       std::make_shared<Node>(id_, name_, std::move(output));
   result->processing_time_ = processing_time_;
   result->num_elements_ = num_elements_;
+  result->bytes_produced_ = bytes_produced_;
   result->constant_params_ = constant_params_;
   result->tunable_params_ = tunable_params_;
   for (auto& input : inputs_) {
@@ -333,11 +352,17 @@ void Model::AddTunableParameter(const string& node_name,
 
 // The optimization algorithm starts by setting all tunable parallelism
 // parameters to 1. It then repeatedly identifies the parameter whose increase
-// in parallelism decreases the output time the most. This process is repeated
-// until all parameters reach their maximum values or the projected output time
-// is less than or equal to the processing time needed to produce an element
-// divided by CPU budget.
-void Model::Optimize(int64 cpu_budget) {
+// in parallelism decreases the output time the most, among the parameters
+// whose increase keeps the total parallelism within the CPU budget and the
+// estimated memory used by in-flight elements within the RAM budget. This
+// process is repeated until no parameter can be increased or the projected
+// output time is less than or equal to the processing time needed to produce an
+// element divided by CPU budget.
+//
+// Finally, the memory left over (if the RAM budget is set) is split evenly
+// between the tunable buffer sizes; without a RAM budget, buffer sizes are not
+// limited by the model.
+void Model::Optimize(int64 cpu_budget, int64 ram_budget) {
   std::shared_ptr<Model::Node> snapshot;
   {
     tf_shared_lock lock(mu_);
@@ -345,25 +370,26 @@ void Model::Optimize(int64 cpu_budget) {
   }
   const int64 processing_time = ProcessingTime(snapshot);
   auto tunables = CollectTunables(snapshot);
+  auto buffers = CollectBuffers(snapshot);
+  int64 total_parallelism = 0;
+  int64 ram_usage = 0;
   for (auto tunable : tunables) {
     tunable->value = 1;
+    total_parallelism += 1;
+    ram_usage += tunable->bytes_per_unit;
   }
   while (true) {
     const int64 output_time = OutputTime(snapshot);
-    bool all_tunables = true;
-    for (auto& tunable : tunables) {
-      if (tunable->value < tunable->max) {
-        all_tunables = false;
-        break;
-      }
-    }
-    if (output_time < processing_time / cpu_budget || all_tunables) {
+    if (output_time < processing_time / cpu_budget ||
+        total_parallelism >= cpu_budget) {
       break;
     }
     int64 best_delta = -1;
     Model::Node::Tunable* best_tunable = nullptr;
     for (auto& tunable : tunables) {
-      if (tunable->value == tunable->max) {
+      if (tunable->value == tunable->max ||
+          (ram_budget > 0 &&
+           ram_usage + tunable->bytes_per_unit > ram_budget)) {
         continue;
       }
       tunable->value++;
@@ -375,29 +401,41 @@ void Model::Optimize(int64 cpu_budget) {
       tunable->value--;
     }
     if (!best_tunable) {
-      // This should never happen because we are using a model snapshot and
-      // the output time is monotonically decreasing w.r.t. parallelism.
-      LOG(WARNING) << "Failed to find a tunable parameter that would "
-                      "decrease the output time, aborting the current "
-                      "optimization attempt.";
-      return;
+      // All parameters have reached their maximum values or the RAM budget.
+      break;
     }
     best_tunable->value++;
+    total_parallelism++;
+    ram_usage += best_tunable->bytes_per_unit;
+  }
+  for (auto& buffer : buffers) {
+    if (ram_budget > 0) {
+      const int64 share = std::max(0LL, ram_budget - ram_usage) /
+                          static_cast<int64>(buffers.size());
+      buffer->value =
+          std::max(buffer->min,
+                   std::min(buffer->max,
+                            share / std::max(1LL, buffer->bytes_per_unit)));
+    } else {
+      buffer->value = buffer->max;
+    }
   }
-  VLOG(2) << "Number of knobs: " << tunables.size();
-  for (auto& tunable : tunables) {
-    VLOG(2) << "Setting tunable parameter: " << tunable->value;
-    mutex_lock l(*tunable->state->mu);
-    tunable->state->value = tunable->value;
-    tunable->state->cond_var->notify_all();
+  VLOG(2) << "Number of knobs: " << tunables.size() + buffers.size();
+  for (auto* parameters : {&tunables, &buffers}) {
+    for (auto& tunable : *parameters) {
+      VLOG(2) << "Setting tunable parameter: " << tunable->value;
+      mutex_lock l(*tunable->state->mu);
+      tunable->state->value = tunable->value;
+      tunable->state->cond_var->notify_all();
+    }
   }
 }
 
-void Model::RecordElement(const string& name) {
+void Model::RecordElement(const string& name, int64 num_bytes) {
   tf_shared_lock l(mu_);
   auto node = gtl::FindOrNull(lookup_table_, name);
   if (node) {
-    (*node)->record_element();
+    (*node)->record_element(num_bytes);
   }
 }
 
@@ -439,6 +477,13 @@ std::vector<std::shared_ptr<Model::Node::Tunable>> Model::CollectTunables(
   return tunables;
 }
 
+std::vector<std::shared_ptr<Model::Node::Tunable>> Model::CollectBuffers(
+    std::shared_ptr<Model::Node> node) {
+  std::vector<std::shared_ptr<Model::Node::Tunable>> buffers;
+  node->CollectBuffers(&buffers);
+  return buffers;
+}
+
 int64 Model::OutputTime(std::shared_ptr<Model::Node> node) {
   std::vector<int64> input_times(1, 0);
   return node->OutputTime(&input_times);
@@ -78,11 +78,13 @@ class Model {
                            std::shared_ptr<SharedState> value, int64 min,
                            int64 max) LOCKS_EXCLUDED(mu_);
 
-  // Runs optimization.
-  void Optimize(int64 cpu_budget) LOCKS_EXCLUDED(mu_);
+  // Runs optimization. The total parallelism of the tunable transformations
+  // is limited to `cpu_budget` and, if `ram_budget` is positive, the estimated
+  // memory used by their buffers is limited to `ram_budget` bytes.
+  void Optimize(int64 cpu_budget, int64 ram_budget) LOCKS_EXCLUDED(mu_);
 
-  // Records that a node has produced an element.
-  void RecordElement(const string& name) LOCKS_EXCLUDED(mu_);
+  // Records that a node has produced an element of the given size in bytes.
+  void RecordElement(const string& name, int64 num_bytes) LOCKS_EXCLUDED(mu_);
 
   // Records that the given node has started work. If `stop_output` is set, it
   // also records that the output of the given node has stopped work.
@@ -135,6 +137,11 @@ class Model {
       // Identifies the maximum value of the parameter.
       int64 max;
 
+      // Identifies the estimated number of bytes buffered for each unit of the
+      // parameter value. This is set, under an exclusive lock of the owning
+      // node, when the parameter is collected for optimization.
+      int64 bytes_per_unit = 0;
+
       // Shared state of the parameter.
       std::shared_ptr<SharedState> state;
     };
@@ -197,10 +204,11 @@ class Model {
       return output_;
     }
 
-    // Records that the node produced an element.
-    void record_element() LOCKS_EXCLUDED(mu_) {
+    // Records that the node produced an element of the given size in bytes.
+    void record_element(int64 num_bytes) LOCKS_EXCLUDED(mu_) {
       mutex_lock l(mu_);
       num_elements_++;
+      bytes_produced_ += num_bytes;
     }
 
     // Records that a node thread has started executing.
@@ -238,6 +246,12 @@ class Model {
     void CollectTunables(std::vector<std::shared_ptr<Tunable>>* tunables)
         LOCKS_EXCLUDED(mu_);
 
+    // Collects tunable buffer sizes in the subtree rooted in this node. Buffer
+    // sizes do not affect the modeled output time, and are instead sized to
+    // fit the memory left over by the other tunable parameters.
+    void CollectBuffers(std::vector<std::shared_ptr<Tunable>>* buffers)
+        LOCKS_EXCLUDED(mu_);
+
     // Returns the per-element output time for this node.
     int64 OutputTime(std::vector<int64>* input_times) LOCKS_EXCLUDED(mu_) {
       tf_shared_lock l(mu_);
@@ -298,6 +312,14 @@ class Model {
       return (int64)((double)processing_time_ / (double)num_elements_);
     }
 
+    // Returns the average size in bytes of the elements produced by this node.
+    int64 BytesPerElementLocked() SHARED_LOCKS_REQUIRED(mu_) {
+      if (num_elements_ == 0) {
+        return 0;
+      }
+      return (int64)((double)bytes_produced_ / (double)num_elements_);
+    }
+
     int64 OutputTimeLocked(std::vector<int64>* input_times)
         SHARED_LOCKS_REQUIRED(mu_);
 
@@ -385,6 +407,7 @@ class Model {
     const Type type_;
     int64 processing_time_ GUARDED_BY(mu_) = 0;
     int64 num_elements_ GUARDED_BY(mu_) = 0;
+    int64 bytes_produced_ GUARDED_BY(mu_) = 0;
     std::map<std::thread::id, int64> work_start_ GUARDED_BY(mu_);
     std::map<string, int64> constant_params_ GUARDED_BY(mu_);
     // Tunables are shared with the model during optimization.
@@ -397,6 +420,10 @@ class Model {
   std::vector<std::shared_ptr<Node::Tunable>> CollectTunables(
       std::shared_ptr<Node> node);
 
+  // Collects tunable buffer sizes in the tree rooted in the given node.
+  std::vector<std::shared_ptr<Node::Tunable>> CollectBuffers(
+      std::shared_ptr<Node> node);
+
   // Collects the output time for the given node.
   int64 OutputTime(std::shared_ptr<Node> node);
 
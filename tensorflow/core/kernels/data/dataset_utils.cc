@@ -17,6 +17,7 @@ limitations under the License.
 #include "tensorflow/core/common_runtime/device.h"
 #include "tensorflow/core/common_runtime/function.h"
 #include "tensorflow/core/framework/op_kernel.h"
+#include "tensorflow/core/framework/stats_aggregator.h"
 #include "tensorflow/core/lib/gtl/cleanup.h"
 
 namespace tensorflow {
@@ -104,6 +105,17 @@ Status MakeIteratorFromInputElement(
       ctx, strings::StrCat(prefix, "[", thread_index, "]"), out_iterator);
 }
 
+void RecordParameterValue(IteratorContext* ctx, const string& prefix,
+                          const string& name, int64 value) {
+  auto stats_aggregator = ctx->stats_aggregator();
+  if (stats_aggregator) {
+    std::vector<string> components =
+        str_util::Split(prefix, "::", str_util::SkipEmpty());
+    stats_aggregator->AddScalar(strings::StrCat(components.back(), "::", name),
+                                static_cast<float>(value));
+  }
+}
+
 Status VerifyTypesMatch(const DataTypeVector& expected,
                         const DataTypeVector& received) {
   if (expected.size() != received.size()) {
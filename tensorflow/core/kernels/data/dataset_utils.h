@@ -47,6 +47,13 @@ Status MakeIteratorFromInputElement(
     int64 thread_index, CapturedFunction* captured_func, StringPiece prefix,
     std::unique_ptr<IteratorBase>* out_iterator);
 
+// If `ctx` has a stats aggregator, records the current value of the parameter
+// `name` of the iterator with the given prefix as a scalar named
+// "<last prefix component>::<name>". This makes it possible to inspect the
+// values chosen by performance modeling for tunable parameters.
+void RecordParameterValue(IteratorContext* ctx, const string& prefix,
+                          const string& name, int64 value);
+
 // Returns Status::OK() if `expected` and `received` types match,
 // errors::InvalidArgument otherwise.
 Status VerifyTypesMatch(const DataTypeVector& expected,
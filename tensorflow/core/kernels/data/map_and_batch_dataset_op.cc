@@ -276,6 +276,8 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
         {
           mutex_lock l(*mu_);
           EnsureRunnerThreadStarted(ctx);
+          RecordParameterValue(ctx, prefix(), "parallelism",
+                               num_parallel_calls_->value);
           while (batch_results_.empty() ||
                  batch_results_.front()->num_calls > 0) {
             RecordStop(ctx);
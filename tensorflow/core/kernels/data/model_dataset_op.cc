@@ -28,18 +28,29 @@ const int kOptimizationPeriodThresholdMs = 60 * EnvTime::kSecondsToMicros;
 class ModelDatasetOp : public UnaryDatasetOpKernel {
  public:
   explicit ModelDatasetOp(OpKernelConstruction* ctx)
-      : UnaryDatasetOpKernel(ctx) {}
+      : UnaryDatasetOpKernel(ctx) {
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("cpu_budget", &cpu_budget_));
+    OP_REQUIRES(ctx, cpu_budget_ >= 0,
+                errors::InvalidArgument("CPU budget must be non-negative."));
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("ram_budget", &ram_budget_));
+    OP_REQUIRES(ctx, ram_budget_ >= 0,
+                errors::InvalidArgument("RAM budget must be non-negative."));
+  }
 
   void MakeDataset(OpKernelContext* ctx, DatasetBase* input,
                    DatasetBase** output) override {
-    *output = new Dataset(ctx, input);
+    *output = new Dataset(ctx, input, cpu_budget_, ram_budget_);
   }
 
  private:
   class Dataset : public DatasetBase {
    public:
-    explicit Dataset(OpKernelContext* ctx, const DatasetBase* input)
-        : DatasetBase(DatasetContext(ctx)), input_(input) {
+    Dataset(OpKernelContext* ctx, const DatasetBase* input, int64 cpu_budget,
+            int64 ram_budget)
+        : DatasetBase(DatasetContext(ctx)),
+          input_(input),
+          cpu_budget_(cpu_budget),
+          ram_budget_(ram_budget) {
       input_->Ref();
     }
 
@@ -66,7 +77,14 @@ class ModelDatasetOp : public UnaryDatasetOpKernel {
                               Node** output) const override {
       Node* input_graph_node = nullptr;
       TF_RETURN_IF_ERROR(b->AddInputDataset(ctx, input_, &input_graph_node));
-      TF_RETURN_IF_ERROR(b->AddDataset(this, {input_graph_node}, output));
+      AttrValue cpu_budget_attr;
+      b->BuildAttrValue(cpu_budget_, &cpu_budget_attr);
+      AttrValue ram_budget_attr;
+      b->BuildAttrValue(ram_budget_, &ram_budget_attr);
+      TF_RETURN_IF_ERROR(b->AddDataset(this, {input_graph_node},
+                                       {{"cpu_budget", cpu_budget_attr},
+                                        {"ram_budget", ram_budget_attr}},
+                                       output));
       return Status::OK();
     }
 
@@ -149,7 +167,10 @@ class ModelDatasetOp : public UnaryDatasetOpKernel {
             }
             if (cancelled_) return;
           }
-          model_->Optimize(port::NumSchedulableCPUs());
+          const int64 cpu_budget = dataset()->cpu_budget_ > 0
+                                       ? dataset()->cpu_budget_
+                                       : port::NumSchedulableCPUs();
+          model_->Optimize(cpu_budget, dataset()->ram_budget_);
           // Exponentially increase the period of running the optimization
           // until a threshold is reached.
           if (optimization_period_ms < kOptimizationPeriodThresholdMs) {
@@ -173,7 +194,12 @@ class ModelDatasetOp : public UnaryDatasetOpKernel {
     };
 
     const DatasetBase* input_;
+    const int64 cpu_budget_;
+    const int64 ram_budget_;
   };
+
+  int64 cpu_budget_;
+  int64 ram_budget_;
 };
 
 REGISTER_KERNEL_BUILDER(Name("ModelDataset").Device(DEVICE_CPU),
@@ -19,6 +19,7 @@ limitations under the License.
 #include "tensorflow/core/common_runtime/function.h"
 #include "tensorflow/core/framework/dataset.h"
 #include "tensorflow/core/framework/partial_tensor_shape.h"
+#include "tensorflow/core/framework/stats_aggregator.h"
 #include "tensorflow/core/framework/tensor.h"
 #include "tensorflow/core/kernels/data/captured_function.h"
 #include "tensorflow/core/kernels/data/dataset_utils.h"
@@ -26,6 +27,7 @@ limitations under the License.
 #include "tensorflow/core/lib/core/threadpool.h"
 #include "tensorflow/core/lib/gtl/cleanup.h"
 #include "tensorflow/core/lib/random/random.h"
+#include "tensorflow/core/lib/strings/str_util.h"
 #include "tensorflow/core/util/ptr_util.h"
 
 namespace tensorflow {
@@ -35,6 +37,16 @@ namespace {
 // See documentation in ../../ops/dataset_ops.cc for a high-level
 // description of the following op.
 
+// Returns a short description of the input element `input`, for logging.
+string DescribeInput(const std::vector<Tensor>& input) {
+  std::vector<string> values;
+  values.reserve(input.size());
+  for (const Tensor& t : input) {
+    values.push_back(t.SummarizeValue(3));
+  }
+  return strings::StrCat("[", str_util::Join(values, ", "), "]");
+}
+
 class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
  public:
   explicit ParallelInterleaveDatasetOp(OpKernelConstruction* ctx)
@@ -42,6 +54,11 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
     OP_REQUIRES_OK(ctx, ctx->GetAttr("f", &interleave_func_));
     OP_REQUIRES_OK(ctx, ctx->GetAttr("output_types", &output_types_));
     OP_REQUIRES_OK(ctx, ctx->GetAttr("output_shapes", &output_shapes_));
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("input_latency_budget_ms",
+                                     &input_latency_budget_ms_));
+    OP_REQUIRES(
+        ctx, input_latency_budget_ms_ >= 0,
+        errors::InvalidArgument("`input_latency_budget_ms` must be >= 0"));
   }
 
   void MakeDataset(OpKernelContext* ctx, DatasetBase* input,
@@ -83,7 +100,8 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
     *output =
         new Dataset(ctx, input, interleave_func_, std::move(captured_func),
                     cycle_length, block_length, sloppy, buffer_output_elements,
-                    prefetch_input_elements, output_types_, output_shapes_);
+                    prefetch_input_elements, input_latency_budget_ms_,
+                    output_types_, output_shapes_);
   }
 
  private:
@@ -93,7 +111,8 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
             const NameAttrList& func,
             std::unique_ptr<CapturedFunction> captured_func, int64 cycle_length,
             int64 block_length, bool sloppy, int64 buffer_output_elements,
-            int64 prefetch_input_elements, const DataTypeVector& output_types,
+            int64 prefetch_input_elements, int64 input_latency_budget_ms,
+            const DataTypeVector& output_types,
             const std::vector<PartialTensorShape>& output_shapes)
         : DatasetBase(DatasetContext(ctx)),
           input_(input),
@@ -104,6 +123,7 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
           sloppy_(sloppy),
           buffer_output_elements_(buffer_output_elements),
           prefetch_input_elements_(prefetch_input_elements),
+          input_latency_budget_ms_(input_latency_budget_ms),
           output_types_(output_types),
           output_shapes_(output_shapes) {
       input_->Ref();
@@ -162,6 +182,9 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
       b->BuildAttrValue(interleave_func_, &f);
       AttrValue other_arguments_types_attr;
       b->BuildAttrValue(other_arguments_types, &other_arguments_types_attr);
+      AttrValue input_latency_budget_ms_attr;
+      b->BuildAttrValue(input_latency_budget_ms_,
+                        &input_latency_budget_ms_attr);
 
       TF_RETURN_IF_ERROR(b->AddDataset(
           this,
@@ -172,7 +195,10 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
            {5, buffer_output_elements_node},
            {6, prefetch_input_elements_node}},
           {{1, other_arguments}},
-          {{"f", f}, {"Targuments", other_arguments_types_attr}}, output));
+          {{"f", f},
+           {"Targuments", other_arguments_types_attr},
+           {"input_latency_budget_ms", input_latency_budget_ms_attr}},
+          output));
       return Status::OK();
     }
 
@@ -211,6 +237,16 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
     //     `workers_` that we will move to `interleave_indices_` when an
     //     iterator in `interleave_indices_` is exhausted.
     //
+    // If `input_latency_budget_ms_` is positive and the client has waited
+    // longer than the budget for the next element (in the deterministic order)
+    // of an iterator, that iterator is skipped: its WorkerState is marked as
+    // `skipped`, its index moves from `interleave_indices_` to
+    // `skipped_indices_`, and the next iterator from `staging_indices_` takes
+    // its place. The worker thread discards the pending element when it
+    // eventually arrives, after which the WorkerState can be given new input
+    // and moved to `staging_indices_`. Apart from the skipped inputs, the
+    // output order remains deterministic.
+    //
     // The client calls `GetNext[Internal]()` to retrieve an output element. The
     // internal implementation updates the state of `interleave_indices_` and
     // `staging_indices_` as output iterators (run by the worker threads) are
@@ -224,17 +260,24 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
     //
     // A few invariants are maintained:
     //  1. No element in interleave_indices_ should be a -1 unless
-    //     `staging_indices_` is empty and `input_impl_` is empty.
+    //     `staging_indices_` is empty and either `input_impl_` is empty or
+    //     `skipped_indices_` is not empty.
     //  2. Every `worker_` element is pointed to by at most one element of the
-    //     union of `interleave_indices_` and `staging_indices_`.
+    //     union of `interleave_indices_`, `staging_indices_` and
+    //     `skipped_indices_`.
     //  3. Unless `input_impl_` is empty, every `worker_` must be pointed to by
-    //     an element in `interleave_indices_` or `staging_indices_`.
+    //     an element in `interleave_indices_`, `staging_indices_` or
+    //     `skipped_indices_`.
     class Iterator : public DatasetIterator<Dataset> {
      public:
       explicit Iterator(const Params& params)
           : DatasetIterator<Dataset>(params),
             workers_(dataset()->num_threads()),
-            worker_thread_states_(dataset()->num_threads()) {}
+            worker_thread_states_(dataset()->num_threads()) {
+        std::vector<string> components =
+            str_util::Split(params.prefix, "::", str_util::SkipEmpty());
+        prefix_end_ = components.back();
+      }
 
       ~Iterator() override {
         mutex_lock l(mu_);
@@ -260,7 +303,14 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
                              bool* end_of_sequence) override {
         mutex_lock l(mu_);
         TF_RETURN_IF_ERROR(EnsureWorkerThreadsStarted(ctx));
+        const int64 latency_budget_micros =
+            dataset()->sloppy_ ? 0 : dataset()->input_latency_budget_ms_ * 1000;
+        // The worker that we are waiting on for the next element in the
+        // deterministic order, and the time at which we started waiting.
+        int64 waiting_worker_index = -1;
+        uint64 wait_start_micros = 0;
         while (!cancelled_) {
+          ReclaimSkippedWorkersLocked(ctx);
           // Wait for an item to become available, blocking if necessary. If we
           // are allowed to be sloppy, we can skip over input datasets that do
           // not have an item readily available.
@@ -305,6 +355,21 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
                 next_index_ = index;
                 block_count_ = 0;
               }
+              if (latency_budget_micros > 0) {
+                const uint64 now_micros = ctx->env()->NowMicros();
+                if (waiting_worker_index != current_worker_index) {
+                  waiting_worker_index = current_worker_index;
+                  wait_start_micros = now_micros;
+                } else if (static_cast<int64>(now_micros - wait_start_micros) >=
+                           latency_budget_micros) {
+                  // The iterator has exceeded its latency budget, so we skip
+                  // it and restart the inner [for] loop.
+                  SkipWorkerLocked(ctx, index, now_micros - wait_start_micros);
+                  waiting_worker_index = -1;
+                  can_produce_elements = true;
+                  must_wait_for_input = false;
+                }
+              }
               break;
             } else if (!current_worker->is_producing) {
               // This iterator has reached end of input.
@@ -349,6 +414,18 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
             RecordStop(ctx);
             if (dataset()->sloppy_) {
               sloppy_cond_var_.wait(l);
+            } else if (interleave_indices_[next_index_] < 0) {
+              // The remaining input elements must wait for a skipped worker to
+              // discard its pending element.
+              DCHECK(!skipped_indices_.empty());
+              workers_[skipped_indices_.front()].cond_var.wait(l);
+            } else if (latency_budget_micros > 0) {
+              // Wait no longer than the rest of the latency budget.
+              const int64 elapsed_micros =
+                  ctx->env()->NowMicros() - wait_start_micros;
+              workers_[interleave_indices_[next_index_]].cond_var.wait_for(
+                  l, std::chrono::microseconds(std::max<int64>(
+                         latency_budget_micros - elapsed_micros, 0)));
             } else {
               workers_[interleave_indices_[next_index_]].cond_var.wait(l);
             }
@@ -396,6 +473,13 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
               full_name(strings::StrCat("staging_indices_", i)),
               staging_indices_[i]));
         }
+        TF_RETURN_IF_ERROR(writer->WriteScalar(full_name("skipped_size"),
+                                               skipped_indices_.size()));
+        for (int i = 0; i < skipped_indices_.size(); ++i) {
+          TF_RETURN_IF_ERROR(writer->WriteScalar(
+              full_name(strings::StrCat("skipped_indices_", i)),
+              skipped_indices_[i]));
+        }
         if (!worker_threads_.empty()) {
           TF_RETURN_IF_ERROR(
               writer->WriteScalar(full_name("worker_threads_running"), ""));
@@ -477,6 +561,26 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
           }
         }
 
+        // Restore `skipped_indices_`.
+        if (reader->Contains(full_name("skipped_size"))) {
+          int64 skipped_size;
+          TF_RETURN_IF_ERROR(
+              reader->ReadScalar(full_name("skipped_size"), &skipped_size));
+          for (int i = 0; i < skipped_size; ++i) {
+            int64 temp;
+            TF_RETURN_IF_ERROR(reader->ReadScalar(
+                full_name(strings::StrCat("skipped_indices_", i)), &temp));
+            if (all_indices.find(temp) != all_indices.end()) {
+              return errors::Internal(
+                  "Duplicate entry for ", temp,
+                  " found when reading interleave, staging and skipped "
+                  "indices.");
+            }
+            all_indices.insert(temp);
+            skipped_indices_.emplace_back(temp);
+          }
+        }
+
         // Start Worker threads.
         if (reader->Contains(full_name("worker_threads_running"))) {
           worker_threads_.reserve(dataset()->num_threads());
@@ -516,6 +620,12 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
         // Concretely, all output elements will have been consumed only when:
         // is_producing == false && outputs.empty();
         bool is_producing = false;
+        // Set to true iff the client has skipped the input of this worker for
+        // exceeding the latency budget, and the worker thread has not yet
+        // discarded its pending element.
+        bool skipped = false;
+        // A human-readable description of the current input, for logging.
+        string description;
         // Condition variable used to coordinate between threads. The worker
         // thread waits on this condition variable when it is either (1) waiting
         // for the main thread to add arguments to `input`, or (2) waiting for
@@ -534,6 +644,7 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
             DCHECK(!MayHaveElements())
                 << "Tried to start inputs, despite already producing!";
             input = std::move(input_arguments);
+            description = DescribeInput(input);
             is_producing = true;
             cond_var.notify_one();
           } else {
@@ -626,6 +737,10 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
           workers_[thread_index].cond_var.notify_all();
           RecordStop(ctx.get());
         });
+        // The number of elements produced from the current input, and the time
+        // at which its iterator was built, for reporting its throughput.
+        int64 num_input_elements = 0;
+        uint64 input_start_micros = 0;
         bool make_new_iterator;
         {
           tf_shared_lock l(ckpt_mu_);
@@ -707,6 +822,8 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
             // Mark that we have used up the restored iterator.
             make_new_iterator = true;
           }
+          num_input_elements = 0;
+          input_start_micros = ctx->env()->NowMicros();
           // 2. Start producing elements or send error state to client if
           //    iterator creation failed.
           if (!iterator_creation_status.ok()) {
@@ -720,6 +837,10 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
             }
             if (cancelled_) return;
             tf_shared_lock ckpt_l(ckpt_mu_);
+            if (workers_[thread_index].skipped) {
+              DiscardSkippedInputLocked(thread_index);
+              continue;
+            }
             workers_[thread_index].outputs.emplace_back(
                 iterator_creation_status);
             workers_[thread_index].is_producing = false;
@@ -772,6 +893,12 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
                 if (cancelled_) return;
 
                 tf_shared_lock ckpt_l(ckpt_mu_);
+                if (workers_[thread_index].skipped) {
+                  // The client has moved on from this input, so we drop the
+                  // pending element and stop reading the input.
+                  DiscardSkippedInputLocked(thread_index);
+                  break;
+                }
                 workers_[thread_index].is_producing = !end_of_sequence;
 
                 // Output the element.
@@ -782,7 +909,11 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
                   worker_thread_states_[thread_index].iterator.reset();
                   worker_thread_states_[thread_index].input.clear();
                   worker_thread_states_[thread_index].end_of_sequence = false;
+                  RecordInputThroughputLocked(ctx.get(), thread_index,
+                                              num_input_elements,
+                                              input_start_micros);
                 } else {
+                  ++num_input_elements;
                   workers_[thread_index].outputs.emplace_back(
                       worker_thread_states_[thread_index].output_elem.status);
                   workers_[thread_index].outputs.back().output.swap(
@@ -804,6 +935,114 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
         }
       }
 
+      // Skips the iterator at `interleave_indices_[index]`, replacing it with
+      // the next iterator from `staging_indices_` (if any).
+      void SkipWorkerLocked(IteratorContext* ctx, int64 index,
+                            uint64 waited_micros)
+          EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        const int64 worker_index = interleave_indices_[index];
+        WorkerState* worker = &workers_[worker_index];
+        LOG(WARNING) << "Skipping input " << worker->description << " of "
+                     << prefix() << " after waiting " << waited_micros / 1000
+                     << " ms for its next element, which exceeds the latency "
+                        "budget of "
+                     << dataset()->input_latency_budget_ms_ << " ms.";
+        worker->skipped = true;
+        skipped_indices_.push_back(worker_index);
+        num_skipped_inputs_++;
+        auto stats_aggregator = ctx->stats_aggregator();
+        if (stats_aggregator) {
+          stats_aggregator->AddScalar(
+              strings::StrCat(prefix_end_, "::skipped_inputs"),
+              static_cast<float>(num_skipped_inputs_));
+          stats_aggregator->IncrementCounter(prefix_end_, "skipped_inputs", 1);
+        }
+
+        interleave_indices_[index] = -1;
+        if (!staging_indices_.empty()) {
+          interleave_indices_[index] = staging_indices_.front();
+          staging_indices_.pop_front();
+        }
+        next_index_ = (index + 1) % interleave_indices_.size();
+        block_count_ = 0;
+      }
+
+      // Gives new input to the skipped workers that have discarded their
+      // pending element, and fills any slots in `interleave_indices_` that
+      // were left empty by skipped workers.
+      void ReclaimSkippedWorkersLocked(IteratorContext* ctx)
+          EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        if (skipped_indices_.empty()) {
+          return;
+        }
+        for (auto it = skipped_indices_.begin();
+             it != skipped_indices_.end();) {
+          WorkerState* worker = &workers_[*it];
+          if (worker->skipped) {
+            ++it;
+            continue;
+          }
+          if (input_impl_) {
+            std::vector<Tensor> args;
+            bool end_of_input = false;
+            Status s = input_impl_->GetNext(ctx, &args, &end_of_input);
+            if (end_of_input) {
+              input_impl_.reset();
+            } else {
+              worker->SetInputs(s, std::move(args));
+              staging_indices_.push_back(*it);
+            }
+          }
+          it = skipped_indices_.erase(it);
+        }
+        for (int64 i = 0;
+             i < interleave_indices_.size() && !staging_indices_.empty();
+             ++i) {
+          if (interleave_indices_[i] < 0) {
+            interleave_indices_[i] = staging_indices_.front();
+            staging_indices_.pop_front();
+          }
+        }
+      }
+
+      // Called by the worker thread of a skipped worker to drop its pending
+      // element and make the worker available for new input.
+      void DiscardSkippedInputLocked(int64 thread_index)
+          EXCLUSIVE_LOCKS_REQUIRED(mu_) SHARED_LOCKS_REQUIRED(ckpt_mu_) {
+        WorkerThreadState* state = &worker_thread_states_[thread_index];
+        state->iterator.reset();
+        state->input.clear();
+        state->iterator_creation_status = Status::OK();
+        state->output_elem.status = Status::OK();
+        state->output_elem.output.clear();
+        state->end_of_sequence = false;
+        workers_[thread_index].outputs.clear();
+        workers_[thread_index].is_producing = false;
+        workers_[thread_index].skipped = false;
+        workers_[thread_index].cond_var.notify_all();
+      }
+
+      // Logs the throughput of an input that has been read to the end, and
+      // adds it to the `input_throughput` histogram of the stats aggregator.
+      void RecordInputThroughputLocked(IteratorContext* ctx,
+                                       int64 thread_index, int64 num_elements,
+                                       uint64 start_micros)
+          EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        const uint64 elapsed_micros = ctx->env()->NowMicros() - start_micros;
+        const double throughput =
+            elapsed_micros > 0 ? num_elements * 1e6 / elapsed_micros : 0.0;
+        VLOG(1) << "Input " << workers_[thread_index].description << " of "
+                << prefix() << " produced " << num_elements << " elements in "
+                << elapsed_micros / 1000 << " ms (" << throughput
+                << " elements/s).";
+        auto stats_aggregator = ctx->stats_aggregator();
+        if (stats_aggregator) {
+          stats_aggregator->AddToHistogram(
+              strings::StrCat(prefix_end_, "::input_throughput"),
+              {throughput});
+        }
+      }
+
       Status WriteWorkerStateLocked(IteratorStateWriter* writer, int index)
           EXCLUSIVE_LOCKS_REQUIRED(mu_, ckpt_mu_) {
         string prefix = strings::StrCat("worker_", index);
@@ -827,6 +1066,10 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
           TF_RETURN_IF_ERROR(writer->WriteScalar(
               full_name(strings::StrCat(prefix, "_is_producing")), ""));
         }
+        if (workers_[index].skipped) {
+          TF_RETURN_IF_ERROR(writer->WriteScalar(
+              full_name(strings::StrCat(prefix, "_skipped")), ""));
+        }
         return Status::OK();
       }
 
@@ -862,6 +1105,9 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
         } else {
           workers_[index].is_producing = false;
         }
+        workers_[index].skipped = reader->Contains(
+            full_name(strings::StrCat(worker_prefix, "_skipped")));
+        workers_[index].description = DescribeInput(workers_[index].input);
         return Status::OK();
       }
 
@@ -913,6 +1159,10 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
               full_name(strings::StrCat(worker_prefix, "_input_", i)),
               &worker_thread_states_[index].input.back()));
         }
+        if (input_size > 0) {
+          workers_[index].description =
+              DescribeInput(worker_thread_states_[index].input);
+        }
         // Restore iterator.
         if (reader->Contains(full_name(
                 strings::StrCat(worker_prefix, "_iterator_exhausted")))) {
@@ -1038,6 +1288,13 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
       std::vector<int64> interleave_indices_ GUARDED_BY(mu_);
       // Indices in `workers_` of prefetched iterators.
       std::deque<int64> staging_indices_ GUARDED_BY(mu_);
+      // Indices in `workers_` of iterators that were skipped for exceeding the
+      // latency budget, and that cannot take new input yet.
+      std::deque<int64> skipped_indices_ GUARDED_BY(mu_);
+      // The number of inputs skipped so far, for reporting.
+      int64 num_skipped_inputs_ GUARDED_BY(mu_) = 0;
+      // The last component of the iterator prefix, used to name statistics.
+      string prefix_end_;
 
       // The index into output_elements_ for next element to produce.
       size_t next_index_ GUARDED_BY(mu_) = 0;
@@ -1059,6 +1316,7 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
     const bool sloppy_;
     const int64 buffer_output_elements_;
     const int64 prefetch_input_elements_;
+    const int64 input_latency_budget_ms_;
     const DataTypeVector output_types_;
     const std::vector<PartialTensorShape> output_shapes_;
   };
@@ -1066,6 +1324,7 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
   DataTypeVector output_types_;
   std::vector<PartialTensorShape> output_shapes_;
   NameAttrList interleave_func_;
+  int64 input_latency_budget_ms_;
 };
 
 REGISTER_KERNEL_BUILDER(Name("ParallelInterleaveDataset").Device(DEVICE_CPU),
@@ -1276,6 +1535,8 @@ class ParallelInterleaveDatasetV2Op : public UnaryDatasetOpKernel {
           {
             mutex_lock l(*mu_);
             EnsureRunnerThreadStarted(ctx);
+            RecordParameterValue(ctx, prefix(), "parallelism",
+                                 num_parallel_calls_->value);
             while (ShouldWait(&result)) {
               RecordStop(ctx);
               cond_var_->wait(l);
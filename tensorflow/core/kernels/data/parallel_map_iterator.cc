@@ -21,6 +21,7 @@ limitations under the License.
 #include <utility>
 #include <vector>
 
+#include "tensorflow/core/kernels/data/dataset_utils.h"
 #include "tensorflow/core/lib/gtl/cleanup.h"
 #include "tensorflow/core/platform/cpu_info.h"
 #include "tensorflow/core/util/ptr_util.h"
@@ -81,6 +82,8 @@ class ParallelMapIteratorBase : public DatasetBaseIterator {
     {
       mutex_lock l(*mu_);
       EnsureRunnerThreadStarted(ctx);
+      RecordParameterValue(ctx, prefix(), "parallelism",
+                           num_parallel_calls_->value);
       while (ShouldWait(&result)) {
         RecordStop(ctx);
         cond_var_->wait(l);
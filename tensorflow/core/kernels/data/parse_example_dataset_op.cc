@@ -141,11 +141,14 @@ class ParseExampleDatasetOp : public UnaryDatasetOpKernel {
          it++) {
       it->second = i++;
     }
+    std::unique_ptr<example::FastExampleBatchParser> parser;
+    OP_REQUIRES_OK(ctx,
+                   example::FastExampleBatchParser::Create(config, &parser));
 
     *output = new Dataset(
         ctx, input, std::move(dense_defaults), std::move(sparse_keys_),
         std::move(dense_keys_), std::move(key_to_output_index),
-        std::move(config), num_parallel_calls, sparse_types_, dense_types_,
+        std::move(parser), num_parallel_calls, sparse_types_, dense_types_,
         dense_shapes_, output_types_, output_shapes_, sloppy_);
   }
 
@@ -156,7 +159,8 @@ class ParseExampleDatasetOp : public UnaryDatasetOpKernel {
             std::vector<Tensor> dense_defaults, std::vector<string> sparse_keys,
             std::vector<string> dense_keys,
             std::map<string, int> key_to_output_index,
-            example::FastParseExampleConfig config, int32 num_parallel_calls,
+            std::unique_ptr<example::FastExampleBatchParser> parser,
+            int32 num_parallel_calls,
             const DataTypeVector& sparse_types,
             const DataTypeVector& dense_types,
             const std::vector<PartialTensorShape>& dense_shapes,
@@ -168,7 +172,7 @@ class ParseExampleDatasetOp : public UnaryDatasetOpKernel {
           sparse_keys_(std::move(sparse_keys)),
           dense_keys_(std::move(dense_keys)),
           key_to_output_index_(std::move(key_to_output_index)),
-          config_(std::move(config)),
+          parser_(std::move(parser)),
           num_parallel_calls_(num_parallel_calls),
           sparse_types_(sparse_types),
           dense_types_(dense_types),
@@ -189,23 +193,27 @@ class ParseExampleDatasetOp : public UnaryDatasetOpKernel {
         (*ctx->runner())([this, ctx, input_element, result, done]() {
           thread::ThreadPool* device_threadpool =
               ctx->lib()->device()->tensorflow_cpu_worker_threads()->workers;
+          // The serialized examples are parsed in place, unless the input
+          // element has several components that must be concatenated.
           std::vector<string> slice_vec;
-          for (const Tensor& t : input_element) {
-            auto serialized_t = t.flat<string>();
-            gtl::ArraySlice<string> slice(serialized_t.data(),
-                                          serialized_t.size());
-            for (auto it = slice.begin(); it != slice.end(); it++)
-              slice_vec.push_back(*it);
+          gtl::ArraySlice<string> serialized;
+          if (input_element.size() == 1) {
+            auto serialized_t = input_element[0].flat<string>();
+            serialized = gtl::ArraySlice<string>(serialized_t.data(),
+                                                 serialized_t.size());
+          } else {
+            for (const Tensor& t : input_element) {
+              auto serialized_t = t.flat<string>();
+              slice_vec.insert(slice_vec.end(), serialized_t.data(),
+                               serialized_t.data() + serialized_t.size());
+            }
+            serialized = slice_vec;
           }
-          example::FastParseExampleConfig config = config_;
-          // local copy of config_ for modification.
           auto stats_aggregator = ctx->stats_aggregator();
-          if (stats_aggregator) {
-            config.collect_feature_stats = true;
-          }
           example::Result example_result;
-          Status s = FastParseExample(config, slice_vec, {}, device_threadpool,
-                                      &example_result);
+          Status s = parser_->Parse(serialized, {}, device_threadpool,
+                                    stats_aggregator != nullptr,
+                                    &example_result);
           if (s.ok()) {
             (*result).resize(key_to_output_index_.size());
             for (int d = 0; d < dense_keys_.size(); ++d) {
@@ -346,7 +354,7 @@ class ParseExampleDatasetOp : public UnaryDatasetOpKernel {
     const std::vector<string> sparse_keys_;
     const std::vector<string> dense_keys_;
     const std::map<string, int> key_to_output_index_;
-    const example::FastParseExampleConfig config_;
+    const std::unique_ptr<example::FastExampleBatchParser> parser_;
     const int64 num_parallel_calls_;
     const DataTypeVector sparse_types_;
     const DataTypeVector dense_types_;
@@ -74,6 +74,10 @@ class PrefetchDatasetOp::Dataset : public DatasetBase {
    public:
     explicit Iterator(const Params& params)
         : DatasetIterator<Dataset>(params),
+          mu_(std::make_shared<mutex>()),
+          cond_var_(std::make_shared<condition_variable>()),
+          buffer_size_(std::make_shared<model::SharedState>(
+              kint64max, mu_, cond_var_)),
           auto_tuner_(params.dataset->buffer_size_) {
       std::vector<string> components =
           str_util::Split(params.prefix, "::", str_util::SkipEmpty());
@@ -90,13 +94,16 @@ class PrefetchDatasetOp::Dataset : public DatasetBase {
       // through the IteratorContext to upstream,
       // potentially-blocking iterators, when we add these.
       {
-        mutex_lock l(mu_);
+        mutex_lock l(*mu_);
         cancelled_ = true;
-        cond_var_.notify_all();
+        cond_var_->notify_all();
       }
     }
 
     Status Initialize(IteratorContext* ctx) override {
+      if (dataset()->buffer_size_ == PrefetchAutotuner::kAutoTune) {
+        AddTunableParameter(ctx, "buffer_size", buffer_size_, 1, kint64max);
+      }
       return dataset()->input_->MakeIterator(ctx, prefix(), &input_impl_);
     }
 
@@ -105,15 +112,15 @@ class PrefetchDatasetOp::Dataset : public DatasetBase {
                            bool* end_of_sequence) override {
       auto stats_aggregator = ctx->stats_aggregator();
       {
-        mutex_lock l(mu_);
+        mutex_lock l(*mu_);
         TF_RETURN_IF_ERROR(EnsurePrefetchThreadStarted(ctx));
         // Wait until the next element in the buffer has been
         // produced, or we are shutting down.
         while (!cancelled_ && buffer_.empty() && !prefetch_thread_finished_ &&
-               auto_tuner_.buffer_limit() != 0) {
+               BufferLimit() != 0) {
           auto_tuner_.RecordEmpty();
           RecordStop(ctx);
-          cond_var_.wait(l);
+          cond_var_->wait(l);
           RecordStart(ctx);
         }
 
@@ -131,18 +138,18 @@ class PrefetchDatasetOp::Dataset : public DatasetBase {
           return Status::OK();
         }
 
-        DCHECK_EQ(auto_tuner_.buffer_limit(), 0);
+        DCHECK_EQ(BufferLimit(), 0);
       }
 
       mutex_lock parent_l(parent_mu_);
-      mutex_lock l(mu_);
+      mutex_lock l(*mu_);
       if (stats_aggregator) {
         stats_aggregator->AddScalar(
             strings::StrCat(prefix_end_, "::buffer_size"),
             static_cast<float>(buffer_.size()));
         stats_aggregator->AddScalar(
             strings::StrCat(prefix_end_, "::buffer_capacity"),
-            static_cast<float>(auto_tuner_.buffer_limit()));
+            static_cast<float>(BufferLimit()));
       }
       return input_impl_->GetNext(ctx, out_tensors, end_of_sequence);
     }
@@ -152,7 +159,7 @@ class PrefetchDatasetOp::Dataset : public DatasetBase {
       // Acquire both locks to ensure that the prefetch thread and
       // all GetNext threads are blocked.
       mutex_lock parent_l(parent_mu_);
-      mutex_lock l(mu_);
+      mutex_lock l(*mu_);
       TF_RETURN_IF_ERROR(SaveInput(writer, input_impl_));
       TF_RETURN_IF_ERROR(
           writer->WriteScalar(full_name("buffer_size"), buffer_.size()));
@@ -176,7 +183,7 @@ class PrefetchDatasetOp::Dataset : public DatasetBase {
     Status RestoreInternal(IteratorContext* ctx,
                            IteratorStateReader* reader) override {
       mutex_lock parent_l(parent_mu_);
-      mutex_lock l(mu_);
+      mutex_lock l(*mu_);
       buffer_.clear();
       TF_RETURN_IF_ERROR(RestoreInput(ctx, reader, input_impl_));
       size_t buffer_size;
@@ -221,18 +228,18 @@ class PrefetchDatasetOp::Dataset : public DatasetBase {
 
     Status Consume(std::vector<Tensor>* out_tensors, bool* end_of_sequence,
                    const std::shared_ptr<StatsAggregator>& stats_aggregator)
-        EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        EXCLUSIVE_LOCKS_REQUIRED(*mu_) {
       if (stats_aggregator) {
         stats_aggregator->AddToHistogram(
             strings::StrCat(prefix_end_, "::buffer_utilization"),
             {static_cast<float>(buffer_.size()) /
-             static_cast<float>(auto_tuner_.buffer_limit())});
+             static_cast<float>(BufferLimit())});
         stats_aggregator->AddScalar(
             strings::StrCat(prefix_end_, "::buffer_size"),
             static_cast<float>(buffer_.size()));
         stats_aggregator->AddScalar(
             strings::StrCat(prefix_end_, "::buffer_capacity"),
-            static_cast<float>(auto_tuner_.buffer_limit()));
+            static_cast<float>(BufferLimit()));
       }
       // A new element is available. Forward the status from computing it, and
       // (if we successfully got an element) the output values.
@@ -249,12 +256,20 @@ class PrefetchDatasetOp::Dataset : public DatasetBase {
       //
       // TODO(mrry): Consider using different condition variables for
       // GetNext and Prefetch.
-      cond_var_.notify_all();
+      cond_var_->notify_all();
       return s;
     }
 
+    // Returns the maximum number of buffered elements, which is the smaller of
+    // the limit chosen by `auto_tuner_` and the limit chosen by the performance
+    // model (which is only set when the buffer size is autotuned and the
+    // model has a RAM budget).
+    int64 BufferLimit() EXCLUSIVE_LOCKS_REQUIRED(*mu_) {
+      return std::min(auto_tuner_.buffer_limit(), buffer_size_->value);
+    }
+
     Status EnsurePrefetchThreadStarted(IteratorContext* ctx)
-        EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        EXCLUSIVE_LOCKS_REQUIRED(*mu_) {
       if (!prefetch_thread_) {
         std::shared_ptr<IteratorContext> new_ctx(new IteratorContext(*ctx));
         prefetch_thread_.reset(ctx->env()->StartThread(
@@ -276,10 +291,10 @@ class PrefetchDatasetOp::Dataset : public DatasetBase {
 
         // 1. Wait for a slot in the buffer.
         {
-          mutex_lock l(mu_);
-          while (!cancelled_ && buffer_.size() >= auto_tuner_.buffer_limit()) {
+          mutex_lock l(*mu_);
+          while (!cancelled_ && buffer_.size() >= BufferLimit()) {
             RecordStop(ctx.get());
-            cond_var_.wait(l);
+            cond_var_->wait(l);
             RecordStart(ctx.get());
           }
 
@@ -300,23 +315,23 @@ class PrefetchDatasetOp::Dataset : public DatasetBase {
         buffer_element.status = input_impl_->GetNext(
             ctx.get(), &buffer_element.value, &end_of_sequence);
         if (buffer_element.status.ok() && end_of_sequence) {
-          mutex_lock l(mu_);
+          mutex_lock l(*mu_);
           prefetch_thread_finished_ = true;
-          cond_var_.notify_all();
+          cond_var_->notify_all();
           return;
         }
 
         // 3. Signal that the element has been produced.
         {
-          mutex_lock l(mu_);
+          mutex_lock l(*mu_);
           buffer_.push_back(std::move(buffer_element));
-          cond_var_.notify_all();
+          cond_var_->notify_all();
         }
       }
     }
 
     Status WriteStatus(IteratorStateWriter* writer, size_t index,
-                       const Status& status) EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+                       const Status& status) EXCLUSIVE_LOCKS_REQUIRED(*mu_) {
       TF_RETURN_IF_ERROR(writer->WriteScalar(
           CodeKey(index), static_cast<int64>(status.code())));
       if (!status.ok()) {
@@ -327,7 +342,7 @@ class PrefetchDatasetOp::Dataset : public DatasetBase {
     }
 
     Status ReadStatus(IteratorStateReader* reader, size_t index, Status* status)
-        EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        EXCLUSIVE_LOCKS_REQUIRED(*mu_) {
       int64 code_int;
       TF_RETURN_IF_ERROR(reader->ReadScalar(CodeKey(index), &code_int));
       error::Code code = static_cast<error::Code>(code_int);
@@ -353,19 +368,22 @@ class PrefetchDatasetOp::Dataset : public DatasetBase {
 
     // This mutex is used to ensure exclusivity between multiple threads
     // reading/writing this iterator's local state.
-    mutex mu_;
+    const std::shared_ptr<mutex> mu_;
     // This mutex is used to ensure exclusivity between multiple threads
     // accessing the parent iterator. We keep this separate from `mu_` to
     // allow prefetching to run in parallel with GetNext calls.
-    mutex parent_mu_ ACQUIRED_BEFORE(mu_);
+    mutex parent_mu_ ACQUIRED_BEFORE(*mu_);
     std::unique_ptr<IteratorBase> input_impl_ GUARDED_BY(parent_mu_);
-    condition_variable cond_var_;
+    const std::shared_ptr<condition_variable> cond_var_;
+    // Identifies the maximum buffer size chosen by the performance model, if
+    // the buffer size is autotuned.
+    const std::shared_ptr<model::SharedState> buffer_size_;
     string prefix_end_;
-    PrefetchAutotuner auto_tuner_ GUARDED_BY(mu_);
-    std::deque<BufferElement> buffer_ GUARDED_BY(mu_);
-    std::unique_ptr<Thread> prefetch_thread_ GUARDED_BY(mu_);
-    bool cancelled_ GUARDED_BY(mu_) = false;
-    bool prefetch_thread_finished_ GUARDED_BY(mu_) = false;
+    PrefetchAutotuner auto_tuner_ GUARDED_BY(*mu_);
+    std::deque<BufferElement> buffer_ GUARDED_BY(*mu_);
+    std::unique_ptr<Thread> prefetch_thread_ GUARDED_BY(*mu_);
+    bool cancelled_ GUARDED_BY(*mu_) = false;
+    bool prefetch_thread_finished_ GUARDED_BY(*mu_) = false;
   };
   const DatasetBase* const input_;
   const int64 buffer_size_;
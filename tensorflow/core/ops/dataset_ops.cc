@@ -329,6 +329,7 @@ REGISTER_OP("ParallelInterleaveDataset")
     .Attr("Targuments: list(type) >= 0")
     .Attr("output_types: list(type) >= 1")
     .Attr("output_shapes: list(shape) >= 1")
+    .Attr("input_latency_budget_ms: int = 0")
     .SetShapeFn(shape_inference::ScalarShape);
 
 REGISTER_OP("ParallelInterleaveDatasetV2")
@@ -914,6 +915,8 @@ REGISTER_OP("ModelDataset")
     .Output("handle: variant")
     .Attr("output_types: list(type) >= 1")
     .Attr("output_shapes: list(shape) >= 1")
+    .Attr("cpu_budget: int = 0")
+    .Attr("ram_budget: int = 0")
     .SetShapeFn(shape_inference::ScalarShape);
 
 REGISTER_OP("MapDefun")
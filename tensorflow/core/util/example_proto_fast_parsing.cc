@@ -28,6 +28,7 @@ limitations under the License.
 #include "tensorflow/core/lib/gtl/inlined_vector.h"
 #include "tensorflow/core/lib/monitoring/counter.h"
 #include "tensorflow/core/platform/logging.h"
+#include "tensorflow/core/platform/mutex.h"
 #include "tensorflow/core/platform/protobuf.h"
 #include "tensorflow/core/util/presized_cuckoo_map.h"
 #include "tensorflow/core/util/sparse/sparse_tensor.h"
@@ -912,49 +913,73 @@ void FillAndCopyVarLen(
   }
 }
 
-}  // namespace
-
-Status FastParseExample(const Config& config,
-                        gtl::ArraySlice<string> serialized,
-                        gtl::ArraySlice<string> example_names,
-                        thread::ThreadPool* thread_pool, Result* result) {
-  DCHECK(result != nullptr);
-  // Check config so we can safely CHECK(false) in switches on config.*.dtype
+// Checks config so we can safely CHECK(false) in switches on config.*.dtype.
+Status CheckConfig(const Config& config) {
   for (auto& c : config.sparse) {
     TF_RETURN_IF_ERROR(CheckConfigDataType(c.dtype));
   }
   for (auto& c : config.dense) {
     TF_RETURN_IF_ERROR(CheckConfigDataType(c.dtype));
   }
+  return Status::OK();
+}
 
-  if (config.collect_feature_stats) {
-    result->feature_stats.resize(serialized.size());
-  }
-
+// Builds the index from hashed feature names to config entries, changing the
+// seed of `hasher` until there are no collisions.
+Status BuildConfigIndex(
+    const Config& config, SeededHasher* hasher,
+    PresizedCuckooMap<std::pair<size_t, Type>>* config_index) {
   size_t config_size = config.dense.size() + config.sparse.size();
-  SeededHasher hasher;
-  // Build config index.
-  PresizedCuckooMap<std::pair<size_t, Type>> config_index(config_size);
   bool ok = true;
   for (size_t i = 0; i < 1000; ++i) {
     for (size_t d = 0; d < config.dense.size(); ++d) {
-      ok &= config_index.InsertUnique(hasher(config.dense[d].feature_name),
-                                      {d, Type::Dense});
+      ok &= config_index->InsertUnique((*hasher)(config.dense[d].feature_name),
+                                       {d, Type::Dense});
     }
     for (size_t d = 0; d < config.sparse.size(); ++d) {
-      ok &= config_index.InsertUnique(hasher(config.sparse[d].feature_name),
-                                      {d, Type::Sparse});
+      ok &= config_index->InsertUnique((*hasher)(config.sparse[d].feature_name),
+                                       {d, Type::Sparse});
     }
     if (ok) break;
     LOG(WARNING) << "Collision found. This should happen only if you have "
                     "around 2^32 entries in your config.";
-    hasher.seed++;
-    config_index.Clear(config_size);
+    hasher->seed++;
+    config_index->Clear(config_size);
   }
   if (!ok) {
     return errors::Internal(
         "Could not avoid collision. This should not happen.");
   }
+  return Status::OK();
+}
+
+// Clears `buffer` while keeping the storage it has allocated, so that it can
+// be refilled without allocating. (Unlike `clear()`, `resize(0)` does not
+// release the heap storage of an `InlinedVector`.)
+void ResetSparseBuffer(SparseBuffer* buffer) {
+  buffer->bytes_list.resize(0);
+  buffer->float_list.resize(0);
+  buffer->int64_list.resize(0);
+  buffer->example_end_indices.clear();
+}
+
+// Buffers for the variable-length dense and sparse features of each
+// minibatch.
+struct MinibatchBuffers {
+  std::vector<std::vector<SparseBuffer>> sparse;
+  std::vector<std::vector<SparseBuffer>> varlen_dense;
+};
+
+Status FastParseExampleWithIndex(
+    const Config& config,
+    const PresizedCuckooMap<std::pair<size_t, Type>>& config_index,
+    SeededHasher hasher, gtl::ArraySlice<string> serialized,
+    gtl::ArraySlice<string> example_names, thread::ThreadPool* thread_pool,
+    bool collect_feature_stats, MinibatchBuffers* buffers, Result* result) {
+  DCHECK(result != nullptr);
+  if (collect_feature_stats) {
+    result->feature_stats.resize(serialized.size());
+  }
 
   // Allocate dense output for fixed length dense values
   // (variable-length dense and sparse have to be buffered).
@@ -1007,17 +1032,26 @@ Status FastParseExample(const Config& config,
   //   Maybe accept outside parameter #num_minibatches?
 
   // Do minibatches in parallel.
-  std::vector<std::vector<SparseBuffer>> sparse_buffers(num_minibatches);
-  std::vector<std::vector<SparseBuffer>> varlen_dense_buffers(num_minibatches);
+  std::vector<std::vector<SparseBuffer>>& sparse_buffers = buffers->sparse;
+  std::vector<std::vector<SparseBuffer>>& varlen_dense_buffers =
+      buffers->varlen_dense;
+  sparse_buffers.resize(num_minibatches);
+  varlen_dense_buffers.resize(num_minibatches);
   std::vector<Status> status_of_minibatch(num_minibatches);
   auto ProcessMiniBatch = [&](size_t minibatch) {
     sparse_buffers[minibatch].resize(config.sparse.size());
+    for (SparseBuffer& buffer : sparse_buffers[minibatch]) {
+      ResetSparseBuffer(&buffer);
+    }
     varlen_dense_buffers[minibatch].resize(config.dense.size());
+    for (SparseBuffer& buffer : varlen_dense_buffers[minibatch]) {
+      ResetSparseBuffer(&buffer);
+    }
     size_t start = first_example_of_minibatch(minibatch);
     size_t end = first_example_of_minibatch(minibatch + 1);
     for (size_t e = start; e < end; ++e) {
       PerExampleFeatureStats* stats = nullptr;
-      if (config.collect_feature_stats) {
+      if (collect_feature_stats) {
         stats = &result->feature_stats[e];
       }
       status_of_minibatch[minibatch] = FastParseSerializedExample(
@@ -1185,6 +1219,81 @@ Status FastParseExample(const Config& config,
   return Status::OK();
 }
 
+}  // namespace
+
+Status FastParseExample(const Config& config,
+                        gtl::ArraySlice<string> serialized,
+                        gtl::ArraySlice<string> example_names,
+                        thread::ThreadPool* thread_pool, Result* result) {
+  TF_RETURN_IF_ERROR(CheckConfig(config));
+  SeededHasher hasher;
+  PresizedCuckooMap<std::pair<size_t, Type>> config_index(
+      config.dense.size() + config.sparse.size());
+  TF_RETURN_IF_ERROR(BuildConfigIndex(config, &hasher, &config_index));
+  MinibatchBuffers buffers;
+  return FastParseExampleWithIndex(
+      config, config_index, hasher, serialized, example_names, thread_pool,
+      config.collect_feature_stats, &buffers, result);
+}
+
+struct FastExampleBatchParser::Impl {
+  explicit Impl(const Config& config)
+      : config(config),
+        config_index(config.dense.size() + config.sparse.size()) {}
+
+  const Config config;
+  SeededHasher hasher;
+  PresizedCuckooMap<std::pair<size_t, Type>> config_index;
+
+  mutex mu;
+  // Buffers that are not used by an in-progress call to `Parse()`.
+  std::vector<std::unique_ptr<MinibatchBuffers>> free_buffers GUARDED_BY(mu);
+};
+
+FastExampleBatchParser::FastExampleBatchParser(std::unique_ptr<Impl> impl)
+    : impl_(std::move(impl)) {}
+
+FastExampleBatchParser::~FastExampleBatchParser() {}
+
+Status FastExampleBatchParser::Create(
+    const FastParseExampleConfig& config,
+    std::unique_ptr<FastExampleBatchParser>* parser) {
+  TF_RETURN_IF_ERROR(CheckConfig(config));
+  std::unique_ptr<Impl> impl(new Impl(config));
+  TF_RETURN_IF_ERROR(
+      BuildConfigIndex(impl->config, &impl->hasher, &impl->config_index));
+  parser->reset(new FastExampleBatchParser(std::move(impl)));
+  return Status::OK();
+}
+
+const FastParseExampleConfig& FastExampleBatchParser::config() const {
+  return impl_->config;
+}
+
+Status FastExampleBatchParser::Parse(gtl::ArraySlice<string> serialized,
+                                     gtl::ArraySlice<string> example_names,
+                                     thread::ThreadPool* thread_pool,
+                                     bool collect_feature_stats,
+                                     Result* result) {
+  std::unique_ptr<MinibatchBuffers> buffers;
+  {
+    mutex_lock l(impl_->mu);
+    if (!impl_->free_buffers.empty()) {
+      buffers = std::move(impl_->free_buffers.back());
+      impl_->free_buffers.pop_back();
+    }
+  }
+  if (!buffers) {
+    buffers.reset(new MinibatchBuffers);
+  }
+  Status s = FastParseExampleWithIndex(
+      impl_->config, impl_->config_index, impl_->hasher, serialized,
+      example_names, thread_pool, collect_feature_stats, buffers.get(), result);
+  mutex_lock l(impl_->mu);
+  impl_->free_buffers.push_back(std::move(buffers));
+  return s;
+}
+
 Status FastParseSingleExample(const Config& config, const string& serialized,
                               Result* result) {
   DCHECK(result != nullptr);
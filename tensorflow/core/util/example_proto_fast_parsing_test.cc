@@ -19,6 +19,7 @@ limitations under the License.
 
 #include "tensorflow/core/example/example.pb.h"
 #include "tensorflow/core/example/feature.pb.h"
+#include "tensorflow/core/framework/tensor_testutil.h"
 #include "tensorflow/core/lib/random/philox_random.h"
 #include "tensorflow/core/lib/random/simple_philox.h"
 #include "tensorflow/core/platform/protobuf.h"
@@ -321,6 +322,56 @@ TEST(FastParse, StatsCollection) {
   }
 }
 
+void ExpectResultsEqual(const Result& expected, const Result& actual) {
+  ASSERT_EQ(expected.sparse_indices.size(), actual.sparse_indices.size());
+  for (size_t i = 0; i < expected.sparse_indices.size(); ++i) {
+    test::ExpectTensorEqual<int64>(expected.sparse_indices[i],
+                                   actual.sparse_indices[i]);
+    test::ExpectTensorEqual<int64>(expected.sparse_shapes[i],
+                                   actual.sparse_shapes[i]);
+    EXPECT_EQ(expected.sparse_values[i].DebugString(100),
+              actual.sparse_values[i].DebugString(100));
+  }
+  ASSERT_EQ(expected.dense_values.size(), actual.dense_values.size());
+  for (size_t i = 0; i < expected.dense_values.size(); ++i) {
+    EXPECT_EQ(expected.dense_values[i].DebugString(100),
+              actual.dense_values[i].DebugString(100));
+  }
+}
+
+TEST(FastExampleBatchParser, MatchesFastParseExample) {
+  FastParseExampleConfig config;
+  AddDenseFeature("bytes_list", DT_STRING, {2}, false, 2, &config);
+  AddDenseFeature("float_list", DT_FLOAT, {-1}, true, 1, &config);
+  AddSparseFeature("int64_list", DT_INT64, &config);
+
+  std::unique_ptr<FastExampleBatchParser> parser;
+  TF_ASSERT_OK(FastExampleBatchParser::Create(config, &parser));
+
+  // Batches of decreasing size reuse the buffers of larger batches, which
+  // must not leak values into the results.
+  for (size_t num_examples : {13, 5, 1}) {
+    std::vector<string> serialized(num_examples, ExampleWithSomeFeatures());
+    Result expected;
+    TF_ASSERT_OK(FastParseExample(config, serialized, {}, nullptr, &expected));
+    for (bool collect_feature_stats : {false, true}) {
+      Result actual;
+      TF_ASSERT_OK(parser->Parse(serialized, {}, nullptr, collect_feature_stats,
+                                 &actual));
+      ExpectResultsEqual(expected, actual);
+      EXPECT_EQ(collect_feature_stats ? num_examples : 0,
+                actual.feature_stats.size());
+    }
+  }
+}
+
+TEST(FastExampleBatchParser, InvalidConfig) {
+  FastParseExampleConfig config;
+  AddSparseFeature("int64_list", DT_INT32, &config);
+  std::unique_ptr<FastExampleBatchParser> parser;
+  EXPECT_FALSE(FastExampleBatchParser::Create(config, &parser).ok());
+}
+
 string RandStr(random::SimplePhilox* rng) {
   static const char key_char_lookup[] =
       "0123456789{}~`!@#$%^&*()"
@@ -23,14 +23,18 @@ removing existing functionality.
 See [Importing Data](https://tensorflow.org/guide/datasets) for an overview.
 
 @@Counter
+@@ArrowFileDataset
 @@CheckpointInputPipelineHook
 @@CsvDataset
+@@IndexedTFRecordDataset
 @@Optional
+@@ParquetDataset
 @@RandomDataset
 @@Reducer
 @@SqlDataset
 @@TFRecordWriter
 
+@@balanced_sample_from_datasets
 @@bucket_by_sequence_length
 @@choose_from_datasets
 @@copy_to_device
@@ -46,14 +50,17 @@ See [Importing Data](https://tensorflow.org/guide/datasets) for an overview.
 @@make_csv_dataset
 @@make_saveable_from_iterator
 @@map_and_batch
+@@parallel_from_generator
 @@parallel_interleave
 @@parse_example_dataset
 @@prefetch_to_device
+@@profile_dataset
 @@rejection_resample
 @@sample_from_datasets
 @@scan
 @@set_stats_aggregator
 @@shuffle_and_repeat
+@@snapshot
 @@StatsAggregator
 @@unbatch
 @@unique
@@ -73,11 +80,13 @@ from tensorflow.python.data.experimental.ops.batching import unbatch
 from tensorflow.python.data.experimental.ops.counter import Counter
 from tensorflow.python.data.experimental.ops.enumerate_ops import enumerate_dataset
 from tensorflow.python.data.experimental.ops.error_ops import ignore_errors
+from tensorflow.python.data.experimental.ops.generator_ops import parallel_from_generator
 from tensorflow.python.data.experimental.ops.get_single_element import get_single_element
 from tensorflow.python.data.experimental.ops.grouping import bucket_by_sequence_length
 from tensorflow.python.data.experimental.ops.grouping import group_by_reducer
 from tensorflow.python.data.experimental.ops.grouping import group_by_window
 from tensorflow.python.data.experimental.ops.grouping import Reducer
+from tensorflow.python.data.experimental.ops.interleave_ops import balanced_sample_from_datasets
 from tensorflow.python.data.experimental.ops.interleave_ops import choose_from_datasets
 from tensorflow.python.data.experimental.ops.interleave_ops import parallel_interleave
 from tensorflow.python.data.experimental.ops.interleave_ops import sample_from_datasets
@@ -90,14 +99,19 @@ from tensorflow.python.data.experimental.ops.optimization import AUTOTUNE
 from tensorflow.python.data.experimental.ops.parsing_ops import parse_example_dataset
 from tensorflow.python.data.experimental.ops.prefetching_ops import copy_to_device
 from tensorflow.python.data.experimental.ops.prefetching_ops import prefetch_to_device
+from tensorflow.python.data.experimental.ops.profiling import profile_dataset
 from tensorflow.python.data.experimental.ops.random_ops import RandomDataset
+from tensorflow.python.data.experimental.ops.readers import ArrowFileDataset
 from tensorflow.python.data.experimental.ops.readers import CsvDataset
+from tensorflow.python.data.experimental.ops.readers import IndexedTFRecordDataset
 from tensorflow.python.data.experimental.ops.readers import make_batched_features_dataset
 from tensorflow.python.data.experimental.ops.readers import make_csv_dataset
+from tensorflow.python.data.experimental.ops.readers import ParquetDataset
 from tensorflow.python.data.experimental.ops.readers import SqlDataset
 from tensorflow.python.data.experimental.ops.resampling import rejection_resample
 from tensorflow.python.data.experimental.ops.scan_ops import scan
 from tensorflow.python.data.experimental.ops.shuffle_ops import shuffle_and_repeat
+from tensorflow.python.data.experimental.ops.snapshot import snapshot
 from tensorflow.python.data.experimental.ops.stats_ops import latency_stats
 from tensorflow.python.data.experimental.ops.stats_ops import set_stats_aggregator
 from tensorflow.python.data.experimental.ops.stats_ops import StatsAggregator
@@ -0,0 +1,111 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks for `tf.data.experimental.parse_example_dataset()`."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+import numpy as np
+
+from tensorflow.core.example import example_pb2
+from tensorflow.core.example import feature_pb2
+from tensorflow.python.client import session
+from tensorflow.python.data.experimental.ops import parsing_ops as contrib_parsing_ops
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import parsing_ops
+from tensorflow.python.platform import test
+
+_NUMPY_RANDOM_SEED = 42
+
+
+def _make_serialized_example(num_features):
+  """Returns an `Example` with `num_features` features of each kind."""
+  features = {}
+  for i in range(num_features):
+    features["int64_%d" % i] = feature_pb2.Feature(
+        int64_list=feature_pb2.Int64List(value=np.random.randint(100, size=4)))
+    features["float_%d" % i] = feature_pb2.Feature(
+        float_list=feature_pb2.FloatList(value=np.random.rand(4)))
+    features["bytes_%d" % i] = feature_pb2.Feature(
+        bytes_list=feature_pb2.BytesList(value=[b"abc", b"defgh"]))
+  example = example_pb2.Example(
+      features=feature_pb2.Features(feature=features))
+  return example.SerializeToString()
+
+
+def _make_features(num_features):
+  """Returns a feature spec that covers dense, sparse and varlen features."""
+  features = {}
+  for i in range(num_features):
+    features["int64_%d" % i] = parsing_ops.FixedLenFeature([4], dtypes.int64)
+    features["float_%d" % i] = parsing_ops.FixedLenSequenceFeature(
+        [], dtypes.float32, allow_missing=True)
+    features["bytes_%d" % i] = parsing_ops.VarLenFeature(dtypes.string)
+  return features
+
+
+class ParseExampleDatasetBenchmark(test.Benchmark):
+  """Compares `parse_example_dataset()` with mapping `tf.parse_example()`."""
+
+  def benchmarkParseExample(self):
+    np.random.seed(_NUMPY_RANDOM_SEED)
+    for num_features in [100, 1000, 10000]:
+      serialized = _make_serialized_example(num_features)
+      features = _make_features(num_features)
+      for batch_size in [1, 32]:
+        self._benchmark(
+            serialized, batch_size, "map", num_features,
+            lambda d: d.map(lambda x: parsing_ops.parse_example(x, features)))
+        self._benchmark(
+            serialized, batch_size, "fused", num_features,
+            lambda d: d.apply(contrib_parsing_ops.parse_example_dataset(
+                features)))
+
+  def _benchmark(self, serialized, batch_size, label, num_features,
+                 parse_fn):
+    with ops.Graph().as_default():
+      dataset = dataset_ops.Dataset.from_tensors(serialized).repeat(None)
+      dataset = parse_fn(dataset.batch(batch_size))
+      next_element = dataset.make_one_shot_iterator().get_next()
+
+      # Fewer iterations for larger examples keep the running time bounded.
+      num_iters = max(10, 100000 // (num_features * batch_size))
+      with session.Session() as sess:
+        for _ in range(5):
+          sess.run(next_element)
+        deltas = []
+        for _ in range(num_iters):
+          start = time.time()
+          sess.run(next_element)
+          deltas.append(time.time() - start)
+
+      median_wall_time = np.median(deltas)
+      print("Parse example (%s) features: %d batch size: %d median wall time: "
+            "%f (%f examples/s)" % (label, num_features, batch_size,
+                                    median_wall_time,
+                                    batch_size / median_wall_time))
+      self.report_benchmark(
+          iters=num_iters,
+          wall_time=median_wall_time,
+          name="benchmark_parse_example_dataset_%s_features_%d_batch_size_%d" %
+          (label, num_features, batch_size))
+
+
+if __name__ == "__main__":
+  test.main()
@@ -0,0 +1,182 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for `tf.data.experimental.{Parquet,ArrowFile}Dataset`."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import unittest
+
+from absl.testing import parameterized
+import numpy as np
+
+from tensorflow.python.data.experimental.ops import readers
+from tensorflow.python.data.kernel_tests import test_base
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
+from tensorflow.python.framework import sparse_tensor
+from tensorflow.python.platform import test
+
+# pylint: disable=g-import-not-at-top
+try:
+  import pyarrow
+  import pyarrow.parquet
+except ImportError:
+  pyarrow = None
+# pylint: enable=g-import-not-at-top
+
+_NUM_ROWS = 10
+_LISTS = [[1, 2], [], None, [3], [4, 5, 6], [7], [], [8], [9, 9], [1]]
+
+
+def _make_table():
+  return pyarrow.Table.from_arrays([
+      pyarrow.array(np.arange(_NUM_ROWS, dtype=np.int32)),
+      pyarrow.array(np.arange(_NUM_ROWS, dtype=np.float64) / 2),
+      pyarrow.array([b"row %d" % i for i in range(_NUM_ROWS)]),
+      pyarrow.array(_LISTS, type=pyarrow.list_(pyarrow.int64())),
+  ], names=["id", "value", "name", "tokens"])
+
+
+def _write_parquet(filename, table, rows_per_group):
+  pyarrow.parquet.write_table(table, filename, row_group_size=rows_per_group)
+
+
+def _write_arrow(filename, table, rows_per_group):
+  with pyarrow.OSFile(filename, "wb") as sink:
+    writer = pyarrow.ipc.new_file(sink, table.schema)
+    for batch in table.to_batches(max_chunksize=rows_per_group):
+      writer.write_batch(batch)
+    writer.close()
+
+
+_FORMATS = (
+    ("Parquet", _write_parquet, readers.ParquetDataset),
+    ("Arrow", _write_arrow, readers.ArrowFileDataset),
+)
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed.")
+class ColumnarDatasetTest(test_base.DatasetTestBase, parameterized.TestCase):
+
+  def _writeFiles(self, write_fn, num_files=2, rows_per_group=4):
+    filenames = []
+    for i in range(num_files):
+      filename = os.path.join(self.get_temp_dir(), "file_%d" % i)
+      write_fn(filename, _make_table(), rows_per_group)
+      filenames.append(filename)
+    return filenames
+
+  def _getElements(self, dataset):
+    get_next = dataset.make_one_shot_iterator().get_next()
+    elements = []
+    with self.cached_session() as sess:
+      while True:
+        try:
+          elements.append(sess.run(get_next))
+        except errors.OutOfRangeError:
+          return elements
+
+  @parameterized.named_parameters(*_FORMATS)
+  def testReadAllColumns(self, write_fn, dataset_class):
+    filenames = self._writeFiles(write_fn)
+    dataset = dataset_class(filenames, batch_size=3)
+    self.assertEqual({
+        "id": dtypes.int32,
+        "value": dtypes.float64,
+        "name": dtypes.string,
+        "tokens": dtypes.int64
+    }, dataset.output_types)
+    self.assertIs(sparse_tensor.SparseTensor,
+                  dataset.output_classes["tokens"])
+    self.assertEqual([None], dataset.output_shapes["id"].as_list())
+
+    elements = self._getElements(dataset)
+    # Row groups of 4, 4 and 2 rows are split into batches of at most 3 rows.
+    self.assertEqual([3, 1, 3, 1, 2] * 2, [len(e["id"]) for e in elements])
+    ids = np.concatenate([e["id"] for e in elements])
+    self.assertAllEqual(list(range(_NUM_ROWS)) * 2, ids)
+    self.assertAllEqual(ids / 2,
+                        np.concatenate([e["value"] for e in elements]))
+    self.assertEqual([b"row %d" % i for i in ids],
+                     list(np.concatenate([e["name"] for e in elements])))
+
+    # The null list in row 2 is read as an empty list.
+    first = elements[0]["tokens"]
+    self.assertAllEqual([[0, 0], [0, 1]], first.indices)
+    self.assertAllEqual([1, 2], first.values)
+    self.assertAllEqual([3, 2], first.dense_shape)
+    third = elements[2]["tokens"]
+    self.assertAllEqual([[0, 0], [0, 1], [0, 2], [1, 0]], third.indices)
+    self.assertAllEqual([4, 5, 6, 7], third.values)
+    self.assertAllEqual([3, 3], third.dense_shape)
+
+  @parameterized.named_parameters(*_FORMATS)
+  def testProjection(self, write_fn, dataset_class):
+    filenames = self._writeFiles(write_fn)
+    dataset = dataset_class(filenames, columns=["value", "id"])
+    self.assertEqual({"value": dtypes.float64, "id": dtypes.int32},
+                     dataset.output_types)
+    elements = self._getElements(dataset)
+    self.assertEqual(6, len(elements))
+    self.assertAllEqual([4, 5, 6, 7], elements[1]["id"])
+
+    with self.assertRaisesRegexp(ValueError, "not in the schema"):
+      dataset_class(filenames, columns=["missing"])
+
+  @parameterized.named_parameters(*_FORMATS)
+  def testShards(self, write_fn, dataset_class):
+    filenames = self._writeFiles(write_fn, num_files=3)
+    shards = []
+    for shard_index in range(2):
+      dataset = dataset_class(filenames, columns=["id"], num_shards=2,
+                              shard_index=shard_index)
+      shards.append([e["id"].tolist() for e in self._getElements(dataset)])
+    # Row group `r` of file `i` belongs to shard `(i + r) % 2`.
+    self.assertEqual(
+        [[0, 1, 2, 3], [8, 9], [4, 5, 6, 7], [0, 1, 2, 3], [8, 9]], shards[0])
+    self.assertEqual([[4, 5, 6, 7], [0, 1, 2, 3], [8, 9], [4, 5, 6, 7]],
+                     shards[1])
+
+  @parameterized.named_parameters(*_FORMATS)
+  def testParallelReadsPreserveOrder(self, write_fn, dataset_class):
+    filenames = self._writeFiles(write_fn, num_files=3)
+    dataset = dataset_class(filenames, columns=["id", "tokens"], batch_size=2,
+                            num_parallel_reads=4)
+    ids = np.concatenate([e["id"] for e in self._getElements(dataset)])
+    self.assertAllEqual(list(range(_NUM_ROWS)) * 3, ids)
+
+  def testNullValues(self):
+    filename = os.path.join(self.get_temp_dir(), "nulls")
+    _write_parquet(filename,
+                   pyarrow.Table.from_arrays([pyarrow.array([1, None])],
+                                             names=["x"]), 2)
+    dataset = readers.ParquetDataset(filename)
+    with self.assertRaisesOpError("null values"):
+      self._getElements(dataset)
+
+  def testInvalidArguments(self):
+    filenames = self._writeFiles(_write_parquet, num_files=1)
+    with self.assertRaises(ValueError):
+      readers.ParquetDataset(filenames, batch_size=0)
+    with self.assertRaises(ValueError):
+      readers.ParquetDataset(filenames, num_shards=2, shard_index=2)
+    with self.assertRaises(ValueError):
+      readers.ParquetDataset([])
+
+
+if __name__ == "__main__":
+  test.main()
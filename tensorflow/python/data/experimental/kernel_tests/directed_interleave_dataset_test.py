@@ -24,6 +24,7 @@ from tensorflow.python.data.kernel_tests import test_base
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.framework import errors
 from tensorflow.python.framework import random_seed
+from tensorflow.python.ops import resource_variable_ops
 from tensorflow.python.platform import test
 
 
@@ -96,6 +97,95 @@ class DirectedInterleaveDatasetTest(test_base.DatasetTestBase):
       freqs = self._testSampleFromDatasetsHelper(probs_ds, classes, num_samples)
       self.assertLess(self._chi2(probs, freqs / num_samples), 1e-2)
 
+  def _getChoices(self, dataset, num_elements):
+    next_element = dataset.make_one_shot_iterator().get_next()
+    with self.cached_session() as sess:
+      return [sess.run(next_element) for _ in range(num_elements)]
+
+  def testBalancedSampleFromDatasets(self):
+    weights = np.asarray([0.5, 0.3, 0.15, 0.05])
+    datasets = [
+        dataset_ops.Dataset.from_tensors(i).repeat(None)
+        for i in range(len(weights))
+    ]
+    dataset = interleave_ops.balanced_sample_from_datasets(
+        datasets, weights, block_length=7)
+    choices = self._getChoices(dataset, 70)
+
+    # At the end of each block, every input is within one element of its share.
+    for n in range(7, 71, 7):
+      counts = np.bincount(choices[:n], minlength=len(weights))
+      self.assertAllLess(np.abs(counts - weights * n), 1.0)
+
+    # The mixture is deterministic.
+    self.assertEqual(choices, self._getChoices(dataset, 70))
+
+  def testBalancedSampleFromDatasetsSpreadsBlock(self):
+    words = [b"foo", b"bar"]
+    datasets = [dataset_ops.Dataset.from_tensors(w).repeat() for w in words]
+    dataset = interleave_ops.balanced_sample_from_datasets(
+        datasets, weights=[0.75, 0.25], block_length=4)
+    self.assertEqual([b"foo", b"foo", b"bar", b"foo"] * 2,
+                     self._getChoices(dataset, 8))
+
+  def testBalancedSampleFromDatasetsExhaustedInput(self):
+    datasets = [
+        dataset_ops.Dataset.from_tensors(0).repeat(3),
+        dataset_ops.Dataset.from_tensors(1).repeat(10)
+    ]
+    dataset = interleave_ops.balanced_sample_from_datasets(
+        datasets, block_length=4)
+    next_element = dataset.make_one_shot_iterator().get_next()
+    with self.cached_session() as sess:
+      choices = [sess.run(next_element) for _ in range(13)]
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(next_element)
+    self.assertEqual([0, 1, 0, 1, 0, 1], choices[:6])
+    self.assertEqual([1] * 7, choices[6:])
+
+  def testBalancedSampleFromDatasetsWeightsVariable(self):
+    weights = resource_variable_ops.ResourceVariable([1.0, 0.0])
+    datasets = [
+        dataset_ops.Dataset.from_tensors(i).repeat(None) for i in range(2)
+    ]
+    dataset = interleave_ops.balanced_sample_from_datasets(
+        datasets, weights, block_length=10)
+    iterator = dataset.make_initializable_iterator()
+    next_element = iterator.get_next()
+    with self.cached_session() as sess:
+      sess.run(weights.initializer)
+      sess.run(iterator.initializer)
+      self.assertEqual([0] * 10, [sess.run(next_element) for _ in range(10)])
+      sess.run(weights.assign([0.5, 0.5]))
+      # Input 1 catches up with its new share of all 20 elements in the next
+      # block, after which the inputs alternate.
+      self.assertEqual([1] * 10, [sess.run(next_element) for _ in range(10)])
+      self.assertEqual([0, 1] * 5, [sess.run(next_element) for _ in range(10)])
+
+  def testBalancedSampleFromDatasetsWeightsDataset(self):
+    weights = dataset_ops.Dataset.from_tensor_slices(
+        np.asarray([[1.0, 0.0], [0.0, 1.0]])).repeat()
+    datasets = [
+        dataset_ops.Dataset.from_tensors(i).repeat(None) for i in range(2)
+    ]
+    dataset = interleave_ops.balanced_sample_from_datasets(
+        datasets, weights, block_length=3)
+    self.assertEqual([0, 0, 0, 1, 1, 1, 0, 0, 0],
+                     self._getChoices(dataset, 9))
+
+  def testBalancedSampleFromDatasetsErrors(self):
+    datasets = [dataset_ops.Dataset.range(10), dataset_ops.Dataset.range(20)]
+    with self.assertRaisesRegexp(ValueError,
+                                 r"vector of length `len\(datasets\)`"):
+      interleave_ops.balanced_sample_from_datasets(
+          datasets, weights=[0.25, 0.25, 0.25, 0.25])
+
+    with self.assertRaisesRegexp(TypeError, "`tf.float32` or `tf.float64`"):
+      interleave_ops.balanced_sample_from_datasets(datasets, weights=[1, 1])
+
+    with self.assertRaisesRegexp(ValueError, "must be positive"):
+      interleave_ops.balanced_sample_from_datasets(datasets, block_length=0)
+
   def testSelectFromDatasets(self):
     words = [b"foo", b"bar", b"baz"]
     datasets = [dataset_ops.Dataset.from_tensors(w).repeat() for w in words]
@@ -0,0 +1,108 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for `tf.data.experimental.parallel_from_generator()`."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+from tensorflow.python.data.experimental.ops import generator_ops
+from tensorflow.python.data.kernel_tests import test_base
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
+from tensorflow.python.framework import tensor_shape
+from tensorflow.python.platform import test
+
+
+def _range_generator(n, worker_index, num_workers):
+  for i in range(worker_index, n, num_workers):
+    yield i, np.full([i % 5], i, dtype=np.int64)
+
+
+def _failing_generator(worker_index, unused_num_workers):
+  yield worker_index
+  raise ValueError("Worker failure.")
+
+
+class ParallelFromGeneratorTest(test_base.DatasetTestBase):
+
+  def _getElements(self, dataset):
+    get_next = dataset.make_one_shot_iterator().get_next()
+    elements = []
+    with self.cached_session() as sess:
+      while True:
+        try:
+          elements.append(sess.run(get_next))
+        except errors.OutOfRangeError:
+          return elements
+
+  def testDeterministicOrder(self):
+    dataset = generator_ops.parallel_from_generator(
+        _range_generator, (dtypes.int64, dtypes.int64),
+        (tensor_shape.scalar(), tensor_shape.TensorShape([None])),
+        args=(23,), num_workers=3, num_slots=2)
+    self.assertEqual([None], dataset.output_shapes[1].as_list())
+
+    elements = self._getElements(dataset)
+    self.assertEqual(list(range(23)), [i for i, _ in elements])
+    for i, array in elements:
+      self.assertAllEqual(np.full([i % 5], i), array)
+
+  def testSloppyOrder(self):
+    dataset = generator_ops.parallel_from_generator(
+        _range_generator, (dtypes.int64, dtypes.int64), args=(23,),
+        num_workers=4, sloppy=True)
+    elements = self._getElements(dataset)
+    self.assertEqual(list(range(23)), sorted(i for i, _ in elements))
+
+  def testElementsLargerThanSlot(self):
+    dataset = generator_ops.parallel_from_generator(
+        _range_generator, (dtypes.int64, dtypes.int64), args=(10,),
+        num_workers=2, slot_bytes=16)
+    elements = self._getElements(dataset)
+    self.assertEqual(list(range(10)), [i for i, _ in elements])
+    for i, array in elements:
+      self.assertAllEqual(np.full([i % 5], i), array)
+
+  def testRepeat(self):
+    dataset = generator_ops.parallel_from_generator(
+        _range_generator, (dtypes.int64, dtypes.int64), args=(5,),
+        num_workers=2).repeat(2)
+    elements = self._getElements(dataset)
+    self.assertEqual(list(range(5)) * 2, [i for i, _ in elements])
+
+  def testWorkerError(self):
+    dataset = generator_ops.parallel_from_generator(
+        _failing_generator, dtypes.int64, num_workers=1)
+    get_next = dataset.make_one_shot_iterator().get_next()
+    with self.cached_session() as sess:
+      self.assertEqual(0, sess.run(get_next))
+      with self.assertRaisesOpError("Worker failure"):
+        sess.run(get_next)
+
+  def testInvalidArguments(self):
+    with self.assertRaises(TypeError):
+      generator_ops.parallel_from_generator(None, dtypes.int64)
+    with self.assertRaises(ValueError):
+      generator_ops.parallel_from_generator(
+          _range_generator, dtypes.int64, num_workers=0)
+    with self.assertRaises(ValueError):
+      generator_ops.parallel_from_generator(
+          _range_generator, dtypes.int64, num_slots=0)
+
+
+if __name__ == "__main__":
+  test.main()
@@ -0,0 +1,127 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for `tf.data.experimental.IndexedTFRecordDataset`."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+
+from tensorflow.python.data.experimental.ops import readers
+from tensorflow.python.data.kernel_tests import test_base
+from tensorflow.python.framework import errors
+from tensorflow.python.lib.io import tf_record
+from tensorflow.python.platform import test
+from tensorflow.python.util import compat
+
+
+class IndexedTFRecordDatasetTest(test_base.DatasetTestBase):
+
+  def setUp(self):
+    super(IndexedTFRecordDatasetTest, self).setUp()
+    self._num_files = 3
+    self._num_records = [4, 0, 7]
+    self._filenames = []
+    self._records = []
+    for i in range(self._num_files):
+      filename = os.path.join(self.get_temp_dir(), "tf_record.%d.txt" % i)
+      self._filenames.append(filename)
+      with tf_record.TFRecordWriter(filename, index_path=True) as writer:
+        for j in range(self._num_records[i]):
+          record = compat.as_bytes(
+              "Record %d of file %d" % (j, i) * (i + j + 1))
+          writer.write(record)
+          self._records.append(record)
+
+  def _getRecords(self, dataset):
+    get_next = dataset.make_one_shot_iterator().get_next()
+    records = []
+    with self.cached_session() as sess:
+      while True:
+        try:
+          records.append(sess.run(get_next))
+        except errors.OutOfRangeError:
+          return records
+
+  def testReadInOrder(self):
+    dataset = readers.IndexedTFRecordDataset(self._filenames)
+    self.assertEqual(self._records, self._getRecords(dataset))
+
+  def testParallelReadsPreserveOrder(self):
+    dataset = readers.IndexedTFRecordDataset(
+        self._filenames, num_parallel_reads=4)
+    self.assertEqual(self._records, self._getRecords(dataset))
+
+  def testShuffle(self):
+    dataset = readers.IndexedTFRecordDataset(
+        self._filenames, shuffle=True, seed=42)
+    records = self._getRecords(dataset)
+    self.assertNotEqual(self._records, records)
+    self.assertEqual(sorted(self._records), sorted(records))
+    self.assertEqual(records, self._getRecords(
+        readers.IndexedTFRecordDataset(self._filenames, shuffle=True,
+                                       seed=42)))
+
+  def testSkipAndShardShuffled(self):
+    dataset = readers.IndexedTFRecordDataset(
+        self._filenames, shuffle=True, seed=7)
+    records = self._getRecords(dataset)
+    self.assertEqual(records[5:], self._getRecords(dataset.skip(5)))
+    shards = [self._getRecords(dataset.shard(2, i)) for i in range(2)]
+    self.assertEqual(records[0::2], shards[0])
+    self.assertEqual(records[1::2], shards[1])
+
+    unseeded = readers.IndexedTFRecordDataset(self._filenames, shuffle=True)
+    self.assertEqual(sorted(self._records),
+                     sorted(self._getRecords(unseeded)))
+    with self.assertRaisesRegexp(ValueError, "requires a `seed`"):
+      unseeded.skip(5)
+    with self.assertRaisesRegexp(ValueError, "requires a `seed`"):
+      unseeded.shard(2, 0)
+
+  def testSkipAndShard(self):
+    dataset = readers.IndexedTFRecordDataset(self._filenames)
+    self.assertIsInstance(dataset.skip(5), readers.IndexedTFRecordDataset)
+    self.assertEqual(self._records[5:], self._getRecords(dataset.skip(5)))
+    self.assertEqual(self._records[1::3],
+                     self._getRecords(dataset.shard(3, 1)))
+    self.assertEqual(self._records[3::2],
+                     self._getRecords(dataset.skip(1).shard(2, 0).skip(1)))
+
+  def testStandaloneIndex(self):
+    filename = os.path.join(self.get_temp_dir(), "unindexed.txt")
+    with tf_record.TFRecordWriter(filename) as writer:
+      for record in self._records:
+        writer.write(record)
+    self.assertEqual(len(self._records),
+                     tf_record.build_tf_record_index(filename))
+    dataset = readers.IndexedTFRecordDataset(filename)
+    self.assertEqual(self._records, self._getRecords(dataset))
+
+  def testMismatchedIndex(self):
+    index_filenames = [tf_record.tf_record_index_path(f)
+                       for f in self._filenames]
+    with self.assertRaises(ValueError):
+      readers.IndexedTFRecordDataset(self._filenames, index_filenames[1:])
+    dataset = readers.IndexedTFRecordDataset(
+        self._filenames[2:], index_filenames[:1])
+    get_next = dataset.make_one_shot_iterator().get_next()
+    with self.cached_session() as sess:
+      with self.assertRaisesOpError("does not match the index"):
+        sess.run(get_next)
+
+
+if __name__ == "__main__":
+  test.main()
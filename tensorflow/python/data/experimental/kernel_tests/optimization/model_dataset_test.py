@@ -22,11 +22,15 @@ import time
 from absl.testing import parameterized
 import numpy as np
 
+from tensorflow.core.framework import summary_pb2
 from tensorflow.python.data.experimental.ops import batching
 from tensorflow.python.data.experimental.ops import optimization
+from tensorflow.python.data.experimental.ops import sleep
+from tensorflow.python.data.experimental.ops import stats_ops
 from tensorflow.python.data.kernel_tests import test_base
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.framework import errors
+from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.platform import test
 
@@ -208,6 +212,51 @@ class ModelDatasetTest(test_base.DatasetTestBase, parameterized.TestCase):
       with self.assertRaises(errors.OutOfRangeError):
         sess.run(get_next)
 
+  def testAutotuneBudgets(self):
+    stats_aggregator = stats_ops.StatsAggregator()
+    dataset = dataset_ops.Dataset.range(300).apply(sleep.sleep(1000))
+    # Each element is 4KB.
+    dataset = dataset.map(
+        lambda x: array_ops.fill([1024], math_ops.to_float(x)),
+        num_parallel_calls=optimization.AUTOTUNE)
+    dataset = dataset.prefetch(optimization.AUTOTUNE)
+    dataset = dataset.apply(stats_ops.set_stats_aggregator(stats_aggregator))
+    options = dataset_ops.Options()
+    options.experimental_autotune = True
+    options.experimental_autotune_cpu_budget = 2
+    options.experimental_autotune_ram_budget = 4 * 4096
+    dataset = dataset.with_options(options)
+
+    iterator = dataset.make_initializable_iterator()
+    get_next = iterator.get_next()
+    summary_t = stats_aggregator.get_summary()
+    with self.cached_session() as sess:
+      sess.run(iterator.initializer)
+      for _ in range(300):
+        sess.run(get_next)
+      summary = summary_pb2.Summary()
+      summary.ParseFromString(sess.run(summary_t))
+
+    values = {value.tag: value.simple_value for value in summary.value}
+    # The parallelism chosen by the model is within the CPU budget, and the
+    # memory left over by the in-flight map elements bounds the prefetch
+    # buffer.
+    self.assertLessEqual(1, values["ParallelMap::parallelism"])
+    self.assertGreaterEqual(2, values["ParallelMap::parallelism"])
+    self.assertGreaterEqual(
+        4 - values["ParallelMap::parallelism"],
+        values["Prefetch::buffer_capacity"])
+
+  def testAutotuneBudgetOptions(self):
+    options = dataset_ops.Options()
+    with self.assertRaises(TypeError):
+      options.experimental_autotune_cpu_budget = 1.5
+    options.experimental_autotune_cpu_budget = 4
+    other = dataset_ops.Options()
+    other.experimental_autotune_cpu_budget = 8
+    with self.assertRaises(ValueError):
+      options.merge(other)
+
 
 if __name__ == "__main__":
   test.main()
@@ -24,7 +24,10 @@ import time
 
 from six.moves import zip_longest
 
+from tensorflow.python.data.experimental.kernel_tests import stats_dataset_test_base
 from tensorflow.python.data.experimental.ops import interleave_ops
+from tensorflow.python.data.experimental.ops import sleep
+from tensorflow.python.data.experimental.ops import stats_ops
 from tensorflow.python.data.kernel_tests import test_base
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.framework import dtypes
@@ -807,5 +810,75 @@ class ParallelInterleaveTest(test_base.DatasetTestBase):
     self.assertAllEqual(results[0], results[1])
 
 
+class ParallelInterleaveLatencyBudgetTest(
+    stats_dataset_test_base.StatsDatasetTestBase):
+
+  def _interleave(self, map_fn, num_inputs, input_latency_budget_ms=None):
+    stats_aggregator = stats_ops.StatsAggregator()
+    dataset = dataset_ops.Dataset.range(num_inputs).apply(
+        interleave_ops.parallel_interleave(
+            map_fn,
+            cycle_length=2,
+            input_latency_budget_ms=input_latency_budget_ms)).apply(
+                stats_ops.set_stats_aggregator(stats_aggregator))
+    iterator = dataset.make_initializable_iterator()
+    next_element = iterator.get_next()
+    summary_t = stats_aggregator.get_summary()
+
+    with self.cached_session() as sess:
+      sess.run(iterator.initializer)
+      elements = []
+      try:
+        while True:
+          elements.append(sess.run(next_element))
+      except errors.OutOfRangeError:
+        pass
+      return elements, sess.run(summary_t)
+
+  def testSkipSlowInput(self):
+    # Input 1 takes a second to produce each of its elements.
+    def slow_map_fn(x):
+      sleep_microseconds = math_ops.cast(math_ops.equal(x, 1),
+                                         dtypes.int64) * 1000000
+      return dataset_ops.Dataset.range(10 * x, 10 * x + 3).apply(
+          sleep.sleep(sleep_microseconds))
+
+    def empty_map_fn(x):
+      return dataset_ops.Dataset.range(10 * x, 10 * x + 3).filter(
+          lambda _: math_ops.not_equal(x, 1))
+
+    elements, summary_str = self._interleave(
+        slow_map_fn, 4, input_latency_budget_ms=50)
+    expected, _ = self._interleave(empty_map_fn, 4)
+    self.assertEqual(expected, elements)
+    self.assertNotIn(10, elements)
+    self._assertSummaryHasScalarValue(summary_str,
+                                      "ParallelInterleave::skipped_inputs", 1)
+    # Only the inputs that were read to the end report their throughput.
+    self._assertSummaryHasCount(summary_str,
+                                "ParallelInterleave::input_throughput", 3)
+
+  def testFastInputsAreNotSkipped(self):
+    map_fn = lambda x: dataset_ops.Dataset.range(10 * x, 10 * x + 3)
+    elements, summary_str = self._interleave(
+        map_fn, 5, input_latency_budget_ms=10000)
+    expected, _ = self._interleave(map_fn, 5)
+    self.assertEqual(expected, elements)
+    self.assertEqual(15, len(elements))
+    self._assertSummaryHasCount(summary_str,
+                                "ParallelInterleave::input_throughput", 5)
+
+  def testInvalidLatencyBudget(self):
+    dataset = dataset_ops.Dataset.range(4).apply(
+        interleave_ops.parallel_interleave(
+            dataset_ops.Dataset.from_tensors,
+            cycle_length=2,
+            input_latency_budget_ms=-1))
+    iterator = dataset.make_initializable_iterator()
+    with self.cached_session() as sess:
+      with self.assertRaisesOpError("must be >= 0"):
+        sess.run(iterator.initializer)
+
+
 if __name__ == "__main__":
   test.main()
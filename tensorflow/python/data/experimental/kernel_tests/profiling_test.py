@@ -0,0 +1,105 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for `tf.data.experimental.profile_dataset()`."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import os
+
+from tensorflow.python.data.experimental.ops import profiling
+from tensorflow.python.data.experimental.ops import sleep
+from tensorflow.python.data.kernel_tests import test_base
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.platform import test
+
+
+class ProfileDatasetTest(test_base.DatasetTestBase):
+
+  def _makeDataset(self):
+    return (dataset_ops.Dataset.range(40)
+            .map(lambda x: x * 2)
+            .apply(sleep.sleep(2000))
+            .batch(4)
+            .prefetch(2))
+
+  def testStages(self):
+    with self.cached_session():
+      profile = profiling.profile_dataset(
+          self._makeDataset(), snapshot_interval=3)
+
+    self.assertEqual(10, profile.num_elements)
+    self.assertEqual([
+        "0:RangeDataset", "1:MapDataset", "2:SleepDataset", "3:BatchDataset",
+        "4:PrefetchDataset"
+    ], [stage.name for stage in profile.stages])
+    self.assertEqual([40, 40, 40, 10, 10],
+                     [stage.num_elements for stage in profile.stages])
+    for stage in profile.stages:
+      self.assertGreaterEqual(stage.self_time_us, 0)
+      self.assertGreater(stage.throughput, 0)
+
+    # Each element of the sleep stage takes at least 2ms.
+    self.assertEqual("2:SleepDataset", profile.bottleneck.name)
+    self.assertGreaterEqual(profile.stages[2].latency_us, 40 * 2000)
+    self.assertEqual(profile.stages[1].latency_us,
+                     profile.stages[2].input_latency_us)
+    self.assertIsNotNone(profile.stages[4].buffer_utilization)
+    self.assertIsNone(profile.stages[3].buffer_utilization)
+
+  def testNumElements(self):
+    with self.cached_session():
+      profile = profiling.profile_dataset(self._makeDataset(), num_elements=3)
+    self.assertEqual(3, profile.num_elements)
+    self.assertEqual(3, profile.stages[-1].num_elements)
+
+  def testReport(self):
+    with self.cached_session():
+      profile = profiling.profile_dataset(self._makeDataset())
+    report = profile.report().splitlines()
+    self.assertIn("Consumed 10 elements", report[0])
+    self.assertIn("2:SleepDataset", report[2])
+    self.assertEqual(3 + len(profile.stages), len(report))
+    self.assertIn("prefetch() stages", report[-1])
+
+  def testChromeTrace(self):
+    with self.cached_session():
+      profile = profiling.profile_dataset(
+          self._makeDataset(), snapshot_interval=4)
+    filename = os.path.join(self.get_temp_dir(), "trace.json")
+    profile.write_chrome_trace(filename)
+    with open(filename) as f:
+      events = json.load(f)["traceEvents"]
+
+    regions = [e for e in events if e["ph"] == "X"]
+    self.assertEqual(10, len(regions))
+    counters = [e for e in events if e["ph"] == "C"]
+    # Snapshots after elements 4 and 8, and at the end.
+    self.assertEqual(3 * len(profile.stages), len(counters))
+    self.assertEqual(set(stage.name for stage in profile.stages),
+                     set(e["name"] for e in counters))
+
+  def testPassthroughDatasetsAreNotStages(self):
+    dataset = dataset_ops.Dataset.range(5).map(lambda x: x + 1)
+    dataset = dataset.with_options(dataset_ops.Options())
+    with self.cached_session():
+      profile = profiling.profile_dataset(dataset)
+    self.assertEqual(["0:RangeDataset", "1:MapDataset"],
+                     [stage.name for stage in profile.stages])
+
+
+if __name__ == "__main__":
+  test.main()
@@ -42,5 +42,24 @@ class SampleFromDatasetsSerializationTest(
         lambda: self._build_dataset([0.25, 0.25, 0.25, 0.25], 1000), 100)
 
 
+class BalancedSampleFromDatasetsSerializationTest(
+    dataset_serialization_test_base.DatasetSerializationTestBase):
+
+  def _build_dataset(self, weights, num_samples):
+    dataset = interleave_ops.balanced_sample_from_datasets(
+        [
+            dataset_ops.Dataset.range(i * 1000, (i + 1) * 1000)
+            for i in range(len(weights))
+        ],
+        weights,
+        block_length=7)
+    return dataset.take(num_samples)
+
+  def testSerializationCore(self):
+    self.run_core_tests(
+        lambda: self._build_dataset([0.5, 0.3, 0.2], 100),
+        lambda: self._build_dataset([0.25, 0.25, 0.25, 0.25], 50), 100)
+
+
 if __name__ == "__main__":
   test.main()
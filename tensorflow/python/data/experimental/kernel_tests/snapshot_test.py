@@ -0,0 +1,197 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for `tf.data.experimental.snapshot()`."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import os
+import time
+
+from absl.testing import parameterized
+
+from tensorflow.python.data.experimental.ops import snapshot
+from tensorflow.python.data.kernel_tests import test_base
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
+from tensorflow.python.framework import ops
+from tensorflow.python.framework import sparse_tensor
+from tensorflow.python.lib.io import tf_record
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import script_ops
+from tensorflow.python.platform import test
+
+
+def _make_dataset():
+  return dataset_ops.Dataset.range(23).map(lambda x: (x, [x, x * 2]))
+
+
+class SnapshotTest(test_base.DatasetTestBase, parameterized.TestCase):
+
+  def _readMetadata(self, path):
+    [directory] = os.listdir(path)
+    with open(os.path.join(path, directory, "snapshot.json")) as f:
+      return json.load(f)
+
+  def _getElements(self, dataset, num_elements=None):
+    get_next = dataset.make_one_shot_iterator().get_next()
+    elements = []
+    with self.session() as sess:
+      while num_elements is None or len(elements) < num_elements:
+        try:
+          elements.append(sess.run(get_next))
+        except errors.OutOfRangeError:
+          break
+    return [(x, list(y)) for x, y in elements]
+
+  def _expectedElements(self):
+    return [(x, [x, x * 2]) for x in range(23)]
+
+  @parameterized.named_parameters(
+      ("Uncompressed", ""),
+      ("Zlib", "ZLIB"),
+      ("Gzip", "GZIP"),
+  )
+  def testWriteThenRead(self, compression):
+    path = self.get_temp_dir()
+    dataset = _make_dataset().apply(
+        snapshot.snapshot(path, compression=compression, num_shards=3,
+                          elements_per_file=2))
+    self.assertEqual(self._expectedElements(), self._getElements(dataset))
+
+    metadata = self._readMetadata(path)
+    self.assertTrue(metadata["complete"])
+    self.assertEqual(23, metadata["num_elements"])
+    self.assertEqual(12, len(metadata["files"]))
+
+    with ops.Graph().as_default():
+      dataset = _make_dataset().apply(
+          snapshot.snapshot(path, compression=compression, num_shards=3,
+                            elements_per_file=2, num_parallel_reads=2))
+      self.assertEqual(self._expectedElements(), self._getElements(dataset))
+
+  def testReadDoesNotRecompute(self):
+    path = self.get_temp_dir()
+    dataset = _make_dataset().apply(
+        snapshot.snapshot(path, num_shards=1, elements_per_file=100))
+    self._getElements(dataset)
+
+    # Overwrite the snapshot with different (but compatible) elements, and
+    # check that they are produced instead of the elements of the input.
+    [directory] = os.listdir(path)
+    [filename] = self._readMetadata(path)["files"]
+    records = dataset_ops.Dataset.range(3).map(
+        lambda x: snapshot._serialize_element(  # pylint: disable=protected-access
+            [x * 10, array_ops.stack([x, x])]))
+    get_next = records.make_one_shot_iterator().get_next()
+    with self.session() as sess, tf_record.TFRecordWriter(
+        os.path.join(path, directory, filename),
+        tf_record.TFRecordOptions("GZIP")) as writer:
+      for _ in range(3):
+        writer.write(sess.run(get_next))
+
+    with ops.Graph().as_default():
+      dataset = _make_dataset().apply(
+          snapshot.snapshot(path, num_shards=1, elements_per_file=100))
+      self.assertEqual([(0, [0, 0]), (10, [1, 1]), (20, [2, 2])],
+                       self._getElements(dataset))
+
+  def testResumePartialWrite(self):
+    path = self.get_temp_dir()
+    dataset = _make_dataset().apply(
+        snapshot.snapshot(path, num_shards=2, elements_per_file=2))
+    self.assertEqual(self._expectedElements()[:11],
+                     self._getElements(dataset, num_elements=11))
+
+    # Elements [0, 8) form two complete rounds, which are committed
+    # asynchronously by the writer threads.
+    for _ in range(100):
+      metadata = self._readMetadata(path)
+      if metadata["num_rounds"] == 2:
+        break
+      time.sleep(0.1)
+    self.assertFalse(metadata["complete"])
+    self.assertEqual(2, metadata["num_rounds"])
+    self.assertEqual(8, metadata["num_elements"])
+
+    with ops.Graph().as_default():
+      dataset = _make_dataset().apply(
+          snapshot.snapshot(path, num_shards=2, elements_per_file=2))
+      self.assertEqual(self._expectedElements(), self._getElements(dataset))
+    metadata = self._readMetadata(path)
+    self.assertTrue(metadata["complete"])
+    self.assertEqual(23, metadata["num_elements"])
+
+  def testRepeatAfterSnapshot(self):
+    path = self.get_temp_dir()
+    dataset = _make_dataset().apply(
+        snapshot.snapshot(path, num_shards=2, elements_per_file=3)).repeat(2)
+    self.assertEqual(self._expectedElements() * 2, self._getElements(dataset))
+    self.assertEqual(23, self._readMetadata(path)["num_elements"])
+
+  def testRepeatReadsSnapshotAfterFirstEpoch(self):
+    num_calls = [0]
+
+    def count(x):
+      num_calls[0] += 1
+      return x
+
+    path = self.get_temp_dir()
+    dataset = dataset_ops.Dataset.range(23).map(
+        lambda x: script_ops.py_func(count, [x], dtypes.int64, stateful=True))
+    dataset = dataset.apply(
+        snapshot.snapshot(path, num_shards=2, elements_per_file=3)).repeat(2)
+    get_next = dataset.make_one_shot_iterator().get_next()
+    with self.session() as sess:
+      for _ in range(2):
+        for i in range(23):
+          self.assertEqual(i, sess.run(get_next))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_next)
+    # The second epoch reads the snapshot instead of recomputing the input.
+    self.assertEqual(23, num_calls[0])
+
+  def testDifferentPipelinesUseDifferentSnapshots(self):
+    path = self.get_temp_dir()
+    self._getElements(dataset_ops.Dataset.range(5).apply(
+        snapshot.snapshot(path)))
+    self._getElements(dataset_ops.Dataset.range(6).apply(
+        snapshot.snapshot(path)))
+    self.assertEqual(2, len(os.listdir(path)))
+
+  def testFingerprintDependsOnFunctionBodies(self):
+
+    def fingerprint(map_fn):
+      with ops.Graph().as_default():
+        # Defines an unrelated function first, to shift function name suffixes.
+        dataset_ops.Dataset.range(1).map(lambda x: x - 1)
+        return snapshot._fingerprint_dataset(
+            dataset_ops.Dataset.range(5).map(map_fn).map(lambda x: x + 1))
+
+    self.assertEqual(fingerprint(lambda x: x * 2), fingerprint(lambda x: x * 2))
+    self.assertNotEqual(fingerprint(lambda x: x * 2),
+                        fingerprint(lambda x: x * 3))
+
+  def testSparseTensorsNotSupported(self):
+    dataset = dataset_ops.Dataset.from_tensors(
+        sparse_tensor.SparseTensor([[0]], [1], [1]))
+    with self.assertRaises(TypeError):
+      dataset.apply(snapshot.snapshot(self.get_temp_dir()))
+
+
+if __name__ == "__main__":
+  test.main()
@@ -0,0 +1,332 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Multi-process Python generator datasets."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import ctypes
+import multiprocessing
+import traceback
+
+import numpy as np
+from six.moves import queue
+
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.data.util import nest
+from tensorflow.python.framework import dtypes
+from tensorflow.python.util.tf_export import tf_export
+
+
+# Offsets of the arrays written into a shared-memory slot are rounded up to a
+# multiple of this value, so that the NumPy views over them are aligned.
+_SLOT_ALIGNMENT = 64
+
+# Message kinds sent from the worker processes to the consumer.
+_ELEMENT = 0
+_INLINE_ELEMENT = 1
+_DONE = 2
+_ERROR = 3
+
+
+def _align(offset):
+  return (offset + _SLOT_ALIGNMENT - 1) // _SLOT_ALIGNMENT * _SLOT_ALIGNMENT
+
+
+class _SharedMemoryRing(object):
+  """A fixed number of fixed-size slots in memory shared with a worker.
+
+  Ownership of the slots is passed back and forth through `free_slots`: the
+  worker takes a slot index before producing an element, and the consumer
+  returns it once the element has been copied out. Because every element
+  (including those that are too large for a slot) consumes a slot token, the
+  number of slots also bounds the number of in-flight elements per worker.
+  """
+
+  def __init__(self, num_slots, slot_bytes):
+    self.num_slots = num_slots
+    self.slot_bytes = slot_bytes
+    self.buffer = multiprocessing.RawArray(ctypes.c_char,
+                                           num_slots * slot_bytes)
+    self.free_slots = multiprocessing.Queue()
+    for slot in range(num_slots):
+      self.free_slots.put(slot)
+
+  def view(self, slot, offset, dtype, shape):
+    """Returns a NumPy view over the given region of `slot`."""
+    dtype = np.dtype(dtype)
+    count = int(np.prod(shape)) if shape else 1
+    start = slot * self.slot_bytes + offset
+    return np.frombuffer(
+        self.buffer, dtype=dtype, count=count, offset=start).reshape(shape)
+
+  def write(self, slot, arrays):
+    """Copies `arrays` into `slot` and returns their layout.
+
+    Args:
+      slot: The index of the slot to write to.
+      arrays: A list of NumPy arrays.
+
+    Returns:
+      A list of `(offset, dtype, shape)` tuples describing where each array
+      was written, or `None` if the arrays do not fit in a single slot.
+    """
+    layout = []
+    offset = 0
+    for array in arrays:
+      if array.dtype.hasobject:
+        return None
+      layout.append((offset, array.dtype.str, array.shape))
+      offset = _align(offset + array.nbytes)
+    if offset > self.slot_bytes:
+      return None
+    for array, (offset, dtype, shape) in zip(arrays, layout):
+      self.view(slot, offset, dtype, shape)[...] = array
+    return layout
+
+  def read(self, slot, layout):
+    """Returns copies of the arrays described by `layout` in `slot`."""
+    return [np.array(self.view(slot, offset, dtype, shape))
+            for offset, dtype, shape in layout]
+
+
+def _worker_loop(worker_index, num_workers, generator, args, output_types,
+                 flattened_types, ring, results):
+  """The body of a generator worker process."""
+  try:
+    for value in generator(*(args + (worker_index, num_workers))):
+      try:
+        flattened_values = nest.flatten_up_to(output_types, value)
+      except (TypeError, ValueError):
+        raise TypeError(
+            "`generator` yielded an element that did not match the expected "
+            "structure. The expected structure was %s, but the yielded "
+            "element was %s." % (output_types, value))
+      arrays = [np.asarray(v, dtype=dtype.as_numpy_dtype)
+                for v, dtype in zip(flattened_values, flattened_types)]
+      slot = ring.free_slots.get()
+      layout = ring.write(slot, arrays)
+      if layout is None:
+        results.put((_INLINE_ELEMENT, worker_index, slot, arrays))
+      else:
+        results.put((_ELEMENT, worker_index, slot, layout))
+    results.put((_DONE, worker_index, None, None))
+  except Exception:  # pylint: disable=broad-except
+    results.put((_ERROR, worker_index, None, traceback.format_exc()))
+
+
+class _GeneratorWorkerPool(object):
+  """Runs a sharded generator in a pool of processes and collects elements."""
+
+  def __init__(self, generator, args, output_types, num_workers, sloppy,
+               num_slots, slot_bytes):
+    self._output_types = output_types
+    self._num_workers = num_workers
+    self._sloppy = sloppy
+    flattened_types = [dtypes.as_dtype(dt) for dt in nest.flatten(output_types)]
+    self._rings = [_SharedMemoryRing(num_slots, slot_bytes)
+                   for _ in range(num_workers)]
+    self._results = multiprocessing.Queue()
+    self._processes = []
+    for worker_index in range(num_workers):
+      process = multiprocessing.Process(
+          target=_worker_loop,
+          args=(worker_index, num_workers, generator, args, output_types,
+                flattened_types, self._rings[worker_index], self._results))
+      process.daemon = True
+      self._processes.append(process)
+    # Messages that arrived from a worker other than the one whose turn it is
+    # when producing elements in deterministic order.
+    self._pending = [collections.deque() for _ in range(num_workers)]
+    self._finished = [False] * num_workers
+    self._next_worker = 0
+
+  def start(self):
+    for process in self._processes:
+      process.start()
+
+  def close(self):
+    for process in self._processes:
+      if process.is_alive():
+        process.terminate()
+      process.join()
+    self._processes = []
+
+  def _receive(self):
+    """Returns the next message from any worker, checking for crashes."""
+    while True:
+      try:
+        return self._results.get(timeout=1.0)
+      except queue.Empty:
+        for worker_index, process in enumerate(self._processes):
+          # A worker that exits cleanly has already flushed its final message
+          # to `self._results`, so only abnormal exits indicate a crash.
+          if (not self._finished[worker_index] and
+              process.exitcode not in (None, 0)):
+            raise RuntimeError(
+                "Generator worker %d exited unexpectedly with code %s." %
+                (worker_index, process.exitcode))
+
+  def _unpack(self, message):
+    """Converts an element message into a structure of arrays."""
+    kind, worker_index, slot, payload = message
+    ring = self._rings[worker_index]
+    if kind == _ELEMENT:
+      arrays = ring.read(slot, payload)
+    else:
+      arrays = payload
+    ring.free_slots.put(slot)
+    return nest.pack_sequence_as(self._output_types, arrays)
+
+  def _next_message(self):
+    """Returns the next element message, or `None` when all workers are done."""
+    while not all(self._finished):
+      if self._sloppy:
+        message = self._receive()
+      else:
+        worker_index = self._next_worker
+        if self._finished[worker_index]:
+          self._next_worker = (worker_index + 1) % self._num_workers
+          continue
+        if self._pending[worker_index]:
+          message = self._pending[worker_index].popleft()
+        else:
+          message = self._receive()
+          if message[1] != worker_index:
+            self._pending[message[1]].append(message)
+            continue
+      kind, worker_index, _, payload = message
+      if kind == _ERROR:
+        raise RuntimeError(
+            "Generator worker %d raised an exception:\n%s" %
+            (worker_index, payload))
+      if kind == _DONE:
+        self._finished[worker_index] = True
+        continue
+      if not self._sloppy:
+        self._next_worker = (worker_index + 1) % self._num_workers
+      return message
+    return None
+
+  def __iter__(self):
+    while True:
+      message = self._next_message()
+      if message is None:
+        return
+      yield self._unpack(message)
+
+
+@tf_export("data.experimental.parallel_from_generator")
+def parallel_from_generator(generator,
+                            output_types,
+                            output_shapes=None,
+                            args=None,
+                            num_workers=None,
+                            sloppy=False,
+                            num_slots=4,
+                            slot_bytes=16 << 20):
+  """Creates a `Dataset` whose elements are generated by a pool of processes.
+
+  Unlike `tf.data.Dataset.from_generator`, which runs `generator` in the
+  Python interpreter of the calling process (and therefore serializes all
+  Python work behind the global interpreter lock), this function shards
+  `generator` across `num_workers` worker processes. Each worker writes the
+  NumPy arrays for an element into a ring of `num_slots` shared-memory slots,
+  and only a small descriptor of the element is sent back to the calling
+  process.
+
+  Each worker invokes `generator(*args, worker_index, num_workers)`, and is
+  responsible for yielding the elements of shard `worker_index`. For example:
+
+  ```python
+  def gen(filenames, worker_index, num_workers):
+    for filename in filenames[worker_index::num_workers]:
+      yield expensive_python_decode(filename)
+
+  ds = tf.data.experimental.parallel_from_generator(
+      gen, tf.float32, tf.TensorShape([224, 224, 3]), args=(filenames,),
+      num_workers=8)
+  ```
+
+  If `sloppy` is false, elements are produced in round-robin order across the
+  workers (the first element of worker 0, then the first element of worker 1,
+  and so on), skipping workers that have exhausted their shard. If `sloppy` is
+  true, elements are produced in the order in which the workers finish them.
+
+  Elements that do not fit into a single slot of `slot_bytes` bytes are sent
+  through a pipe instead, which is slower but still correct.
+
+  NOTE: The worker processes are created using `multiprocessing`, and
+  `generator` and `args` must therefore be usable in a child process (e.g.
+  picklable, when the "spawn" start method is used). The workers must not use
+  TensorFlow operations. The body of `generator` will not be serialized in a
+  `GraphDef`.
+
+  WARNING: If `sloppy` is `True`, the order of produced elements is not
+  deterministic.
+
+  Args:
+    generator: A callable object that takes the values in `args` followed by
+      `worker_index` and `num_workers`, and returns an object that supports the
+      `iter()` protocol.
+    output_types: A nested structure of `tf.DType` objects corresponding to
+      each component of an element yielded by `generator`.
+    output_shapes: (Optional.) A nested structure of `tf.TensorShape`
+      objects corresponding to each component of an element yielded by
+      `generator`.
+    args: (Optional.) A tuple of Python values that will be passed to
+      `generator` in each worker.
+    num_workers: (Optional.) The number of worker processes. Defaults to the
+      number of CPUs on the host.
+    sloppy: (Optional.) If false, elements are produced in deterministic order.
+      Otherwise, elements are produced as soon as any worker has produced them.
+    num_slots: (Optional.) The number of shared-memory slots for each worker,
+      which bounds the number of elements that a worker can produce ahead of
+      the consumer.
+    slot_bytes: (Optional.) The size of each shared-memory slot in bytes.
+
+  Returns:
+    Dataset: A `Dataset`.
+
+  Raises:
+    TypeError: If `generator` is not callable.
+    ValueError: If `num_workers`, `num_slots` or `slot_bytes` is not positive.
+  """
+  if not callable(generator):
+    raise TypeError("`generator` must be callable.")
+  if num_workers is None:
+    num_workers = multiprocessing.cpu_count()
+  if num_workers < 1:
+    raise ValueError("`num_workers` must be positive, but was %d." %
+                     num_workers)
+  if num_slots < 1:
+    raise ValueError("`num_slots` must be positive, but was %d." % num_slots)
+  if slot_bytes < 1:
+    raise ValueError("`slot_bytes` must be positive, but was %d." % slot_bytes)
+  args = () if args is None else tuple(args)
+
+  def gen():
+    """Starts a fresh worker pool for each pass over the dataset."""
+    pool = _GeneratorWorkerPool(generator, args, output_types, num_workers,
+                                sloppy, num_slots, slot_bytes)
+    pool.start()
+    try:
+      for element in pool:
+        yield element
+    finally:
+      pool.close()
+
+  return dataset_ops.Dataset.from_generator(gen, output_types, output_shapes)
@@ -17,7 +17,9 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from tensorflow.python.data.experimental.ops import batching
 from tensorflow.python.data.experimental.ops import random_ops
+from tensorflow.python.data.experimental.ops import scan_ops
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.data.ops import readers
 from tensorflow.python.data.util import nest
@@ -28,6 +30,8 @@ from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import gen_experimental_dataset_ops
 from tensorflow.python.ops import gen_stateless_random_ops
 from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import nn_ops
+from tensorflow.python.ops import resource_variable_ops
 from tensorflow.python.util.tf_export import tf_export
 
 
@@ -37,7 +41,8 @@ def parallel_interleave(map_func,
                         block_length=1,
                         sloppy=False,
                         buffer_output_elements=None,
-                        prefetch_input_elements=None):
+                        prefetch_input_elements=None,
+                        input_latency_budget_ms=None):
   """A parallel version of the `Dataset.interleave()` transformation.
 
   `parallel_interleave()` maps `map_func` across its input to produce nested
@@ -63,6 +68,19 @@ def parallel_interleave(map_func,
   WARNING: If `sloppy` is `True`, the order of produced elements is not
   deterministic.
 
+  In deterministic mode, a single slow input `Dataset` (e.g. a file on a
+  straggling remote server) stalls the whole pipeline. If
+  `input_latency_budget_ms` is set, an input `Dataset` whose next element
+  takes longer than the budget to arrive is skipped with a warning, and the
+  remaining elements are produced in the same order as if that input had
+  ended at the point where it was skipped.
+
+  If a `tf.data.experimental.StatsAggregator` is attached to the pipeline, the
+  throughput (in elements per second) of each input `Dataset` that is read to
+  the end is added to the `"ParallelInterleave::input_throughput"` histogram,
+  and the number of skipped inputs is reported as the
+  `"ParallelInterleave::skipped_inputs"` scalar.
+
   Args:
     map_func: A function mapping a nested structure of tensors to a `Dataset`.
     cycle_length: The number of input `Dataset`s to interleave from in parallel.
@@ -76,6 +94,10 @@ def parallel_interleave(map_func,
       each interleaved iterator).
     prefetch_input_elements: The number of input elements to transform to
       iterators before they are needed for interleaving.
+    input_latency_budget_ms: (Optional.) If positive, the maximum number of
+      milliseconds to wait for the next element of an input `Dataset` before
+      skipping that input. Only applies when `sloppy` is `False`. Defaults to
+      waiting indefinitely.
 
   Returns:
     A `Dataset` transformation function, which can be passed to
@@ -84,7 +106,8 @@ def parallel_interleave(map_func,
   def _apply_fn(dataset):
     return readers.ParallelInterleaveDataset(
         dataset, map_func, cycle_length, block_length, sloppy,
-        buffer_output_elements, prefetch_input_elements)
+        buffer_output_elements, prefetch_input_elements,
+        input_latency_budget_ms)
 
   return _apply_fn
 
@@ -217,6 +240,159 @@ def sample_from_datasets(datasets, weights=None, seed=None):
   return _DirectedInterleaveDataset(selector_input, datasets)
 
 
+def _balanced_block(emitted, total, weights, block_length):
+  """Chooses the inputs for the next block of a balanced mixture.
+
+  Args:
+    emitted: A `tf.int64` vector with the number of elements chosen from each
+      input so far.
+    total: A `tf.int64` scalar with the number of elements chosen so far.
+    weights: A `tf.float64` vector of non-negative input weights.
+    block_length: A Python integer, the number of elements in a block.
+
+  Returns:
+    A tuple of the updated `emitted` and `total`, and a `tf.int64` vector of
+    `block_length` input indices.
+  """
+  num_inputs = array_ops.size(weights)
+  weights /= math_ops.reduce_sum(weights)
+  new_total = total + block_length
+
+  # Allot the elements of the block in proportion to how far behind its target
+  # share of `new_total` each input is. Inputs that are ahead of their share
+  # (e.g. after their weight decreased) get no elements.
+  deficits = math_ops.maximum(
+      weights * math_ops.cast(new_total, dtypes.float64) -
+      math_ops.cast(emitted, dtypes.float64), 0.0)
+  quotas = deficits * (block_length / math_ops.reduce_sum(deficits))
+  floors = math_ops.floor(quotas)
+  counts = math_ops.cast(floors, dtypes.int64)
+  # Give the elements lost to rounding to the largest remainders.
+  num_remaining = block_length - math_ops.reduce_sum(counts)
+  _, remaining = nn_ops.top_k(
+      quotas - floors, k=math_ops.cast(num_remaining, dtypes.int32))
+  counts += math_ops.reduce_sum(
+      array_ops.one_hot(remaining, num_inputs, dtype=dtypes.int64), axis=0)
+
+  # Spread the elements of each input evenly over the block: the `k`th of
+  # `counts[i]` elements from input `i` is placed at `(k + 0.5) / counts[i]`.
+  # `top_k()` orders equal positions by input index, which makes the order
+  # deterministic.
+  positions = math_ops.range(block_length, dtype=dtypes.int64)
+  inputs = array_ops.searchsorted(
+      math_ops.cumsum(counts), positions, side="right", out_type=dtypes.int64)
+  ranks = positions - array_ops.gather(
+      math_ops.cumsum(counts, exclusive=True), inputs)
+  offsets = ((math_ops.cast(ranks, dtypes.float64) + 0.5) / math_ops.cast(
+      array_ops.gather(counts, inputs), dtypes.float64))
+  _, order = nn_ops.top_k(-offsets, k=block_length)
+  return emitted + counts, new_total, array_ops.gather(inputs, order)
+
+
+@tf_export("data.experimental.balanced_sample_from_datasets")
+def balanced_sample_from_datasets(datasets, weights=None, block_length=1024):
+  """Deterministically mixes the elements of `datasets` in given proportions.
+
+  Unlike `tf.data.experimental.sample_from_datasets()`, which draws the input
+  of each element at random, this transformation chooses the inputs of a block
+  of `block_length` elements at a time, so that at the end of each block the
+  number of elements produced from each input is within one element of its
+  share of all the elements produced so far. Within a block, the elements of
+  each input are spread evenly. For example:
+
+  ```python
+  datasets = [tf.data.Dataset.from_tensors("foo").repeat(),
+              tf.data.Dataset.from_tensors("bar").repeat()]
+  result = tf.data.experimental.balanced_sample_from_datasets(
+      datasets, weights=[0.75, 0.25], block_length=4)
+  ```
+
+  The elements of `result` will be:
+
+  ```
+  "foo", "foo", "bar", "foo", "foo", "foo", "bar", "foo", ...
+  ```
+
+  Since the inputs are chosen a block at a time, the per-element overhead is
+  small and independent of the number of inputs, which makes this
+  transformation suitable for mixing hundreds of datasets. Its state is saved
+  with the state of the iterator.
+
+  The weights can be changed while iterating by passing a resource
+  `tf.Variable` (e.g. one created with `use_resource=True`), which is read at
+  the start of each block, or a `tf.data.Dataset` whose elements are the
+  weights to use for consecutive blocks. After a change, the mixture converges
+  to the new proportions over the following blocks. Since a dataset that
+  captures a variable is stateful, it must be iterated with an initializable
+  iterator (e.g. `Dataset.make_initializable_iterator()`) rather than a
+  one-shot iterator.
+
+  If an input is exhausted, its share of the elements is produced by the other
+  inputs.
+
+  Args:
+    datasets: A list of `tf.data.Dataset` objects with compatible structure.
+    weights: (Optional.) A list of `len(datasets)` non-negative floating-point
+      values where `weights[i]` is proportional to the fraction of elements
+      that should be produced from `datasets[i]`, a resource `tf.Variable`
+      containing such a vector, or a `tf.data.Dataset` object where each
+      element is such a list. Defaults to equal weights.
+    block_length: (Optional.) The number of elements for which the inputs are
+      chosen at a time. Larger blocks reduce the overhead of choosing inputs,
+      and smaller blocks let the mixture react sooner to changes in `weights`.
+
+  Returns:
+    A dataset that interleaves elements from `datasets` in proportion to
+    `weights`.
+
+  Raises:
+    TypeError: If the `datasets` or `weights` arguments have the wrong type.
+    ValueError: If the `weights` argument is specified and does not match the
+      length of the `datasets` element, or if `block_length` is not positive.
+  """
+  num_datasets = len(datasets)
+  if block_length < 1:
+    raise ValueError("`block_length` must be positive, got: %d" % block_length)
+
+  if isinstance(weights, dataset_ops.Dataset):
+    weights_ds = weights.map(lambda *w: array_ops.reshape(  # pylint: disable=g-long-lambda
+        math_ops.cast(w, dtypes.float64), [num_datasets]))
+    read_weights = lambda w: w
+  else:
+    if weights is None:
+      weights = [1.0] * num_datasets
+    if not resource_variable_ops.is_resource_variable(weights):
+      weights = ops.convert_to_tensor(weights, name="weights")
+    if weights.dtype.base_dtype not in (dtypes.float32, dtypes.float64):
+      raise TypeError("`weights` must be convertible to a tensor of "
+                      "`tf.float32` or `tf.float64` elements.")
+    if not weights.shape.is_compatible_with([num_datasets]):
+      raise ValueError(
+          "`weights` must be a vector of length `len(datasets)`.")
+
+    # NOTE(mrry): We only specialize when `weights` is not a `Dataset`. When it
+    # is a `Dataset`, it is possible that evaluating it has a side effect the
+    # user depends on.
+    if num_datasets == 1:
+      return datasets[0]
+
+    weights_ds = dataset_ops.Dataset.from_tensors(0).repeat()
+    # A variable is read in each block, so that updates take effect.
+    read_weights = lambda _: math_ops.cast(weights, dtypes.float64)
+
+  def choose_block(state, w):
+    emitted, total = state
+    emitted, total, block = _balanced_block(emitted, total, read_weights(w),
+                                            block_length)
+    return (emitted, total), block
+
+  initial_state = (array_ops.zeros([num_datasets], dtype=dtypes.int64),
+                   ops.convert_to_tensor(0, dtype=dtypes.int64))
+  selector_input = weights_ds.apply(
+      scan_ops.scan(initial_state, choose_block)).apply(batching.unbatch())
+  return _DirectedInterleaveDataset(selector_input, datasets)
+
+
 @tf_export("data.experimental.choose_from_datasets")
 def choose_from_datasets(datasets, choice_dataset):
   """Creates a dataset that deterministically chooses elements from `datasets`.
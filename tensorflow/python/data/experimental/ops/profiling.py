@@ -0,0 +1,346 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Per-transformation profiling of `tf.data` pipelines."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import copy
+import time
+
+from tensorflow.core.framework import summary_pb2
+from tensorflow.python.client import session as session_lib
+from tensorflow.python.client import timeline
+from tensorflow.python.data.experimental.ops import optimization
+from tensorflow.python.data.experimental.ops import stats_ops
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.eager import context
+from tensorflow.python.framework import errors
+from tensorflow.python.framework import ops
+from tensorflow.python.lib.io import file_io
+from tensorflow.python.util.tf_export import tf_export
+
+
+# Identity transformations that are not reported as stages of their own.
+_PASSTHROUGH_DATASETS = (
+    dataset_ops._OptionsDataset,  # pylint: disable=protected-access
+    dataset_ops._ModelDataset,  # pylint: disable=protected-access
+    dataset_ops._OptimizeDataset,  # pylint: disable=protected-access
+    optimization._AssertNextDataset,  # pylint: disable=protected-access
+    stats_ops._SetStatsAggregatorDataset,  # pylint: disable=protected-access
+    stats_ops._StatsDataset,  # pylint: disable=protected-access
+)
+
+_BUFFER_UTILIZATION_SUFFIX = "::buffer_utilization"
+
+# The kernel name prefix under which each kind of buffered transformation
+# records its buffer utilization. Only the prefetch kernel records buffer
+# statistics; other asynchronous transformations (e.g. parallel `map()`) have
+# internal buffers, but do not report their occupancy.
+_BUFFER_PREFIXES = {
+    dataset_ops.PrefetchDataset: "Prefetch",
+}
+
+
+class DatasetStageStats(
+    collections.namedtuple("DatasetStageStats", [
+        "name", "num_elements", "latency_us", "input_latency_us",
+        "self_time_us", "throughput", "buffer_utilization"
+    ])):
+  """Statistics for one transformation of a profiled `tf.data` pipeline.
+
+  Fields:
+    name: A string identifying the transformation, made of its position in the
+      pipeline (counting from the source) and the name of its class.
+    num_elements: The number of elements that the transformation produced.
+    latency_us: The total time in microseconds that the consumer of this
+      transformation waited for its elements.
+    input_latency_us: The total time in microseconds that this transformation
+      waited for the elements of its input, or 0 for a source.
+    self_time_us: An estimate of the time in microseconds that the consumer
+      waited because of this transformation, excluding time spent waiting for
+      its input. Transformations that run asynchronously (e.g. `prefetch()`
+      and parallel `map()`) hide the latency of their inputs, and have a
+      self time of zero when they do so completely.
+    throughput: The number of elements produced per second of profiling.
+    buffer_utilization: For a `prefetch()` stage, the mean fraction of its
+      buffer that was full when an element was consumed. `None` for all other
+      stages, which do not record buffer statistics (including those with
+      internal buffers, such as parallel `map()`), and for a `prefetch()` stage
+      whose statistics are ambiguous because the pipeline has several of them.
+  """
+  pass
+
+
+class DatasetProfile(object):
+  """The result of profiling a `tf.data` pipeline with `profile_dataset()`."""
+
+  def __init__(self, stages, num_elements, wall_time_us, get_next_events,
+               snapshots):
+    self._stages = stages
+    self._num_elements = num_elements
+    self._wall_time_us = wall_time_us
+    self._get_next_events = get_next_events
+    self._snapshots = snapshots
+
+  @property
+  def stages(self):
+    """A list of `DatasetStageStats`, in pipeline order from the source."""
+    return self._stages
+
+  @property
+  def num_elements(self):
+    """The number of elements consumed while profiling."""
+    return self._num_elements
+
+  @property
+  def wall_time_us(self):
+    """The wall time in microseconds spent consuming elements."""
+    return self._wall_time_us
+
+  @property
+  def bottleneck(self):
+    """The `DatasetStageStats` of the stage with the largest self time."""
+    if not self._stages:
+      return None
+    return self.ranked_stages()[0]
+
+  def ranked_stages(self):
+    """Returns the stages, sorted by decreasing self time."""
+    return sorted(self._stages, key=lambda s: s.self_time_us, reverse=True)
+
+  def report(self):
+    """Returns a human-readable report of the stages, ranked by self time."""
+    lines = [
+        "Consumed %d elements in %.3f ms (%.1f elements/s)." %
+        (self._num_elements, self._wall_time_us / 1e3,
+         _per_second(self._num_elements, self._wall_time_us)),
+        "%4s  %-40s %10s %12s %14s %12s %8s" %
+        ("Rank", "Stage", "Elements", "Self (ms)", "Latency (ms)",
+         "Elements/s", "Buffer*"),
+    ]
+    for rank, stage in enumerate(self.ranked_stages()):
+      buffer_utilization = ("-" if stage.buffer_utilization is None else
+                            "%.0f%%" % (100 * stage.buffer_utilization))
+      lines.append("%4d  %-40s %10d %12.3f %14.3f %12.1f %8s" %
+                   (rank + 1, stage.name, stage.num_elements,
+                    stage.self_time_us / 1e3, stage.latency_us / 1e3,
+                    stage.throughput, buffer_utilization))
+    lines.append("* Buffer utilization is only recorded for prefetch() stages.")
+    return "\n".join(lines)
+
+  def chrome_trace(self, pretty=False):
+    """Returns a timeline of the profiled iteration in Chrome trace format.
+
+    The timeline contains a region for each element requested by the consumer
+    (spanning the time that the consumer waited for it), and a counter track
+    for each stage with its mean latency and throughput between consecutive
+    statistics snapshots.
+
+    Args:
+      pretty: (Optional.) If True, produce human-readable JSON output.
+
+    Returns:
+      A JSON-formatted string, which can be loaded in `chrome://tracing`.
+    """
+    formatter = timeline._ChromeTraceFormatter()  # pylint: disable=protected-access
+    formatter.emit_pid("tf.data consumer", 0)
+    formatter.emit_tid("GetNext", 0, 0)
+    formatter.emit_pid("tf.data stages", 1)
+    for index, (start_us, duration_us) in enumerate(self._get_next_events):
+      formatter.emit_region(start_us, duration_us, 0, 0, "GetNext",
+                            "GetNext", {"element": index})
+    previous_time_us, previous_histograms = 0, {}
+    for time_us, histograms in self._snapshots:
+      elapsed_us = time_us - previous_time_us
+      for stage in self._stages:
+        count, total = histograms.get(stage.name, (0, 0.0))
+        previous_count, previous_total = previous_histograms.get(
+            stage.name, (0, 0.0))
+        count -= previous_count
+        total -= previous_total
+        formatter.emit_counters(
+            "Stage", stage.name, 1, time_us, {
+                "mean_latency_us": total / count if count else 0.0,
+                "elements_per_second": _per_second(count, elapsed_us),
+            })
+      previous_time_us, previous_histograms = time_us, histograms
+    return formatter.format_to_string(pretty=pretty)
+
+  def write_chrome_trace(self, filename, pretty=False):
+    """Writes the output of `chrome_trace()` to `filename`."""
+    file_io.write_string_to_file(filename, self.chrome_trace(pretty=pretty))
+
+
+def _per_second(count, duration_us):
+  return count * 1e6 / duration_us if duration_us else 0.0
+
+
+def _instrument(dataset, stages):
+  """Returns a copy of `dataset` with latency statistics for each stage.
+
+  The chain of `UnaryDataset` transformations that produces `dataset` is
+  copied, and a `latency_stats()` transformation is inserted after each of
+  them. Any other dataset (e.g. a source, or a `zip()` of several datasets) is
+  instrumented as a single stage.
+
+  Args:
+    dataset: A `tf.data.Dataset`.
+    stages: A list to which `(name, dataset)` pairs are appended for each
+      instrumented stage, in pipeline order from the source.
+
+  Returns:
+    A `tf.data.Dataset`.
+  """
+  if isinstance(dataset, dataset_ops.UnaryDataset):
+    instrumented = copy.copy(dataset)
+    instrumented._input_dataset = _instrument(dataset._input_dataset, stages)  # pylint: disable=protected-access
+    if isinstance(dataset, _PASSTHROUGH_DATASETS):
+      return instrumented
+  else:
+    instrumented = dataset
+  name = "%d:%s" % (len(stages), type(dataset).__name__.lstrip("_"))
+  stages.append((name, dataset))
+  return instrumented.apply(stats_ops.latency_stats(name))
+
+
+def _parse_summary(serialized_summary):
+  """Returns the histograms and scalars in a serialized `Summary`."""
+  summary = summary_pb2.Summary.FromString(serialized_summary)
+  histograms = {}
+  for value in summary.value:
+    if value.HasField("histo"):
+      histograms[value.tag] = (int(value.histo.num), value.histo.sum)
+  return histograms
+
+
+def _buffer_utilizations(stages, histograms):
+  """Maps stage names to their mean buffer utilization, where unambiguous."""
+  utilizations = {}
+  for dataset_type, prefix in _BUFFER_PREFIXES.items():
+    matching = [name for name, dataset in stages
+                if type(dataset) is dataset_type]  # pylint: disable=unidiomatic-typecheck
+    count, total = histograms.get(prefix + _BUFFER_UTILIZATION_SUFFIX, (0, 0))
+    if len(matching) == 1 and count:
+      utilizations[matching[0]] = total / count
+  return utilizations
+
+
+@tf_export("data.experimental.profile_dataset")
+def profile_dataset(dataset,
+                    num_elements=None,
+                    session=None,
+                    snapshot_interval=100):
+  """Iterates over `dataset` and profiles each of its transformations.
+
+  This function rebuilds the pipeline that produces `dataset` with a
+  `tf.data.experimental.latency_stats()` transformation after each stage,
+  consumes up to `num_elements` elements from it (or all of them), and returns
+  a `DatasetProfile` with per-stage element counts, latencies, throughput and
+  (for `prefetch()` stages) buffer utilization, along with a timeline of the
+  iteration. For example:
+
+  ```python
+  dataset = tf.data.TFRecordDataset(filenames)
+  dataset = dataset.map(parse_fn, num_parallel_calls=8)
+  dataset = dataset.batch(32).prefetch(1)
+
+  profile = tf.data.experimental.profile_dataset(dataset, num_elements=1000)
+  print(profile.report())
+  profile.write_chrome_trace("/tmp/input_pipeline.json")
+  ```
+
+  The stages are ranked by "self time": the time that the consumer of a stage
+  waited for its elements, minus the time that the stage itself waited for
+  the elements of its input. The first stage in the ranking is the most
+  likely bottleneck of the pipeline.
+
+  Only the chain of single-input transformations that produces `dataset` is
+  broken down into stages. Datasets with several inputs (e.g. the result of
+  `zip()`), and datasets created inside functions (e.g. in `interleave()`), are
+  profiled as part of the stage that contains them.
+
+  Args:
+    dataset: A `tf.data.Dataset` to profile.
+    num_elements: (Optional.) The maximum number of elements to consume.
+      Defaults to consuming the entire dataset.
+    session: (Optional.) In graph mode, the `tf.Session` used to iterate over
+      the dataset. Defaults to the default session, or a new session on the
+      default graph if there is none.
+    snapshot_interval: (Optional.) The number of elements between consecutive
+      snapshots of the statistics that form the counter tracks of the
+      timeline.
+
+  Returns:
+    A `DatasetProfile`.
+  """
+  stages = []
+  aggregator = stats_ops.StatsAggregator()
+  instrumented = _instrument(dataset, stages).apply(
+      stats_ops.set_stats_aggregator(aggregator))
+
+  if context.executing_eagerly():
+    iterator = iter(instrumented)
+    get_next = lambda: next(iterator)
+    get_summary = lambda: aggregator.get_summary().numpy()
+  else:
+    # A one-shot iterator cannot capture the `StatsAggregator` resource.
+    iterator = instrumented.make_initializable_iterator()
+    get_next_t = iterator.get_next()
+    summary_t = aggregator.get_summary()
+    if session is None:
+      session = ops.get_default_session() or session_lib.Session()
+    session.run(iterator.initializer)
+    get_next = lambda: session.run(get_next_t)
+    get_summary = lambda: session.run(summary_t)
+
+  get_next_events = []
+  snapshots = []
+  start = time.time()
+  consumed = 0
+  while num_elements is None or consumed < num_elements:
+    before = time.time()
+    try:
+      get_next()
+    except (StopIteration, errors.OutOfRangeError):
+      break
+    after = time.time()
+    get_next_events.append(((before - start) * 1e6, (after - before) * 1e6))
+    consumed += 1
+    if consumed % snapshot_interval == 0:
+      snapshots.append(((after - start) * 1e6,
+                        _parse_summary(get_summary())))
+  wall_time_us = (time.time() - start) * 1e6
+  histograms = _parse_summary(get_summary())
+  snapshots.append((wall_time_us, histograms))
+
+  utilizations = _buffer_utilizations(stages, histograms)
+  stage_stats = []
+  input_latency_us = 0.0
+  for name, _ in stages:
+    count, latency_us = histograms.get(name, (0, 0.0))
+    stage_stats.append(
+        DatasetStageStats(
+            name=name,
+            num_elements=count,
+            latency_us=latency_us,
+            input_latency_us=input_latency_us,
+            self_time_us=max(latency_us - input_latency_us, 0.0),
+            throughput=_per_second(count, wall_time_us),
+            buffer_utilization=utilizations.get(name)))
+    input_latency_us = latency_us
+  return DatasetProfile(stage_stats, consumed, wall_time_us, get_next_events,
+                        snapshots)
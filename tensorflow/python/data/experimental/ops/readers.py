@@ -19,6 +19,7 @@ from __future__ import print_function
 
 import collections
 import csv
+import threading
 
 import numpy as np
 
@@ -34,13 +35,25 @@ from tensorflow.python.data.util import nest
 from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
+from tensorflow.python.framework import sparse_tensor
 from tensorflow.python.framework import tensor_shape
 from tensorflow.python.lib.io import file_io
+from tensorflow.python.lib.io import tf_record
 from tensorflow.python.ops import gen_dataset_ops
 from tensorflow.python.ops import gen_experimental_dataset_ops
+from tensorflow.python.ops import script_ops
 from tensorflow.python.platform import gfile
+from tensorflow.python.util import compat
 from tensorflow.python.util.tf_export import tf_export
 
+# pylint: disable=g-import-not-at-top
+try:
+  import pyarrow
+  import pyarrow.parquet
+except ImportError:
+  pyarrow = None
+# pylint: enable=g-import-not-at-top
+
 _ACCEPTABLE_CSV_TYPES = (dtypes.float32, dtypes.float64, dtypes.int32,
                          dtypes.int64, dtypes.string)
 
@@ -842,6 +855,609 @@ def _get_file_names(file_pattern, shuffle):
   return file_names
 
 
+class _RecordPermutation(object):
+  """A seeded pseudo-random bijection of `[0, n)`, computed per element.
+
+  A balanced Feistel network permutes the integers of the smallest power of
+  four that is at least `n`; values outside `[0, n)` are permuted again until
+  they fall inside it ("cycle walking"), which takes fewer than four rounds of
+  the network on average. No state is kept between elements, so the position
+  of any element of the permutation is computed directly.
+  """
+
+  _NUM_ROUNDS = 6
+
+  def __init__(self, n, seed):
+    self._n = n
+    self._half_bits = max(1, ((max(n, 2) - 1).bit_length() + 1) // 2)
+    self._half_mask = (1 << self._half_bits) - 1
+    self._keys = [int(key) for key in np.random.RandomState(seed).randint(
+        0, 2**31 - 1, size=self._NUM_ROUNDS)]
+
+  def _round_function(self, value, key):
+    value = ((value ^ key) * 0x45D9F3B) & 0xFFFFFFFF
+    value = ((value ^ (value >> 16)) * 0x45D9F3B) & 0xFFFFFFFF
+    return (value ^ (value >> 16)) & self._half_mask
+
+  def __call__(self, position):
+    value = position
+    while True:
+      left, right = value >> self._half_bits, value & self._half_mask
+      for key in self._keys:
+        left, right = right, left ^ self._round_function(right, key)
+      value = (left << self._half_bits) | right
+      if value < self._n:
+        return value
+
+
+class _IndexedTFRecordReader(object):
+  """Reads records by global ID from a list of indexed TFRecord files.
+
+  If `seed` is not None, the records are read in the order of a seeded
+  permutation of their IDs.
+  """
+
+  def __init__(self, filenames, offsets, seed=None):
+    self._filenames = filenames
+    self._offsets = offsets
+    self._starts = np.cumsum([0] + [len(o) - 1 for o in offsets])
+    self._permutation = (None if seed is None else
+                         _RecordPermutation(self.num_records, seed))
+
+  @property
+  def num_records(self):
+    return int(self._starts[-1])
+
+  def read(self, position):
+    record_id = int(position)
+    if self._permutation is not None:
+      record_id = self._permutation(record_id)
+    file_index = int(np.searchsorted(self._starts, record_id, side="right")) - 1
+    return tf_record.read_tf_record(self._filenames[file_index],
+                                    self._offsets[file_index],
+                                    record_id - self._starts[file_index])
+
+
+@tf_export("data.experimental.IndexedTFRecordDataset")
+class IndexedTFRecordDataset(dataset_ops.Dataset):
+  """A `Dataset` of records from indexed TFRecord files, in any order.
+
+  Unlike `tf.data.TFRecordDataset`, which reads each file sequentially, this
+  dataset uses the index written alongside each file (see
+  `tf.python_io.TFRecordWriter` and `tf.io.build_tf_record_index()`) to seek
+  directly to each record. This makes it possible to shuffle over all records
+  of all files without a shuffle buffer, and to `skip()` or `shard()` the
+  records without reading the skipped ones.
+
+  The shuffled order is a permutation of the records computed from `seed`, one
+  record at a time, so the first record is produced immediately and resuming
+  with `skip()` costs nothing. With the same `seed`, every run (and every
+  worker) sees the same order, so `skip()` and `shard()` of a shuffled dataset
+  require a `seed`. For example, to resume after a restart:
+
+  ```python
+  with tf.python_io.TFRecordWriter(filename, index_path=True) as writer:
+    ...
+  dataset = tf.data.experimental.IndexedTFRecordDataset(
+      [filename], shuffle=True, seed=epoch, num_parallel_reads=8)
+  dataset = dataset.skip(records_already_processed)
+  ```
+
+  NOTE: Indexed files must be uncompressed.
+  """
+
+  def __init__(self, filenames, index_filenames=None, shuffle=False,
+               seed=None, num_parallel_reads=None):
+    """Creates an `IndexedTFRecordDataset`.
+
+    Args:
+      filenames: A Python string or list of strings containing the names of
+        one or more uncompressed TFRecord files. The indexes of these files are
+        read when the dataset is created.
+      index_filenames: (Optional.) A Python list of index file names, one for
+        each file in `filenames`. Defaults to
+        `tf_record.tf_record_index_path()` of each file.
+      shuffle: (Optional.) A Python boolean. If `True`, the records of all
+        files are produced in a pseudo-random order determined by `seed`. The
+        order is the same each time the dataset is iterated over; use a
+        different `seed` (e.g. the epoch number) to reshuffle.
+      seed: (Optional.) A Python integer, representing the seed of the order
+        of the records when `shuffle` is `True`. Defaults to a random seed,
+        chosen when the dataset is created. Required to `skip()` or `shard()`
+        a shuffled dataset.
+      num_parallel_reads: (Optional.) A `tf.int32` scalar `tf.Tensor`,
+        representing the number of records to read in parallel. Defaults to
+        reading records sequentially. The order of the records does not depend
+        on this argument.
+
+    Raises:
+      ValueError: If `index_filenames` and `filenames` have different lengths.
+      tf.errors.DataLossError: If an index file is invalid.
+    """
+    super(IndexedTFRecordDataset, self).__init__()
+    if isinstance(filenames, compat.bytes_or_text_types):
+      filenames = [filenames]
+    filenames = [compat.as_str_any(f) for f in filenames]
+    if index_filenames is None:
+      index_filenames = [tf_record.tf_record_index_path(f) for f in filenames]
+    if len(index_filenames) != len(filenames):
+      raise ValueError(
+          "`index_filenames` must contain one index file for each file in "
+          "`filenames`.")
+    offsets = [np.array(tf_record.read_tf_record_index(f), dtype=np.int64)
+               for f in index_filenames]
+    # Only an explicit seed gives the same order across runs and workers.
+    self._unseeded_shuffle = shuffle and seed is None
+    if shuffle and seed is None:
+      seed = np.random.randint(2**31 - 1)
+    self._reader = _IndexedTFRecordReader(
+        filenames, offsets, seed=seed if shuffle else None)
+    self._init(dataset_ops.Dataset.range(self._reader.num_records),
+               num_parallel_reads)
+
+  def _init(self, record_ids, num_parallel_reads):
+    # `record_ids` are positions in the (possibly permuted) order of the
+    # records, which the reader maps to the records to read.
+    self._record_ids = record_ids
+    self._num_parallel_reads = num_parallel_reads
+
+    def read_record(record_id):
+      record = script_ops.py_func(
+          self._reader.read, [record_id], dtypes.string, stateful=False)
+      record.set_shape(tensor_shape.scalar())
+      return record
+
+    self._impl = record_ids.map(read_record,
+                                num_parallel_calls=num_parallel_reads)
+
+  def _clone(self, record_ids):
+    dataset = IndexedTFRecordDataset.__new__(IndexedTFRecordDataset)
+    super(IndexedTFRecordDataset, dataset).__init__()
+    # pylint: disable=protected-access
+    dataset._reader = self._reader
+    dataset._unseeded_shuffle = self._unseeded_shuffle
+    dataset._init(record_ids, self._num_parallel_reads)
+    # pylint: enable=protected-access
+    return dataset
+
+  def _check_seeded(self, transformation):
+    if self._unseeded_shuffle:
+      raise ValueError(
+          "`%s()` of a shuffled IndexedTFRecordDataset requires a `seed`, so "
+          "that the order of the records is the same in every run and on "
+          "every worker." % transformation)
+
+  def skip(self, count):
+    """Creates a `Dataset` that skips `count` records without reading them.
+
+    Args:
+      count: A `tf.int64` scalar `tf.Tensor`, representing the number of
+        records of this dataset that should be skipped to form the new
+        dataset. If `count` is greater than the size of this dataset, the new
+        dataset will contain no elements. If `count` is -1, skips the entire
+        dataset.
+
+    Returns:
+      Dataset: An `IndexedTFRecordDataset`.
+
+    Raises:
+      ValueError: If the records are shuffled without a `seed`.
+    """
+    self._check_seeded("skip")
+    return self._clone(self._record_ids.skip(count))
+
+  def shard(self, num_shards, index):
+    """Creates a `Dataset` with every `num_shards`-th record of this dataset.
+
+    Only the records of the shard are read.
+
+    Args:
+      num_shards: A `tf.int64` scalar `tf.Tensor`, representing the number of
+        shards operating in parallel.
+      index: A `tf.int64` scalar `tf.Tensor`, representing the worker index.
+
+    Returns:
+      Dataset: An `IndexedTFRecordDataset`.
+
+    Raises:
+      ValueError: If the records are shuffled without a `seed`.
+    """
+    self._check_seeded("shard")
+    return self._clone(self._record_ids.shard(num_shards, index))
+
+  def _as_variant_tensor(self):
+    return self._impl._as_variant_tensor()  # pylint: disable=protected-access
+
+  def _inputs(self):
+    return self._impl._inputs()  # pylint: disable=protected-access
+
+  @property
+  def output_classes(self):
+    return self._impl.output_classes
+
+  @property
+  def output_shapes(self):
+    return self._impl.output_shapes
+
+  @property
+  def output_types(self):
+    return self._impl.output_types
+
+
+def _arrow_column_spec(name, arrow_type):
+  """Returns the `tf.DType` of a column and whether it holds lists."""
+  is_list = pyarrow.types.is_list(arrow_type)
+  if is_list:
+    arrow_type = arrow_type.value_type
+  if (pyarrow.types.is_string(arrow_type) or
+      pyarrow.types.is_binary(arrow_type)):
+    return dtypes.string, is_list
+  if (pyarrow.types.is_boolean(arrow_type) or
+      pyarrow.types.is_integer(arrow_type) or
+      pyarrow.types.is_floating(arrow_type)):
+    return dtypes.as_dtype(np.dtype(arrow_type.to_pandas_dtype())), is_list
+  raise TypeError("Column %r has type %s, which is not supported. Supported "
+                  "types are booleans, integers, floating-point numbers, "
+                  "strings, binary, and lists of these." % (name, arrow_type))
+
+
+def _arrow_to_numpy(name, array, dtype):
+  """Converts an Arrow array without nulls to a NumPy array."""
+  if array.null_count:
+    raise ValueError("Column %r contains null values, which are not "
+                     "supported." % name)
+  if dtype == dtypes.string:
+    # Binary values are converted to `bytes` without decoding them.
+    array = array.cast(pyarrow.binary())
+  return array.to_numpy(zero_copy_only=False)
+
+
+def _arrow_list_to_sparse(name, array, dtype):
+  """Converts an Arrow list array to the components of a `SparseTensor`.
+
+  Null lists are treated as empty lists.
+  """
+  offsets = array.offsets.to_numpy().astype(np.int64)
+  values = _arrow_to_numpy(name, array.flatten(), dtype)
+  lengths = np.diff(offsets)
+  rows = np.repeat(np.arange(len(array), dtype=np.int64), lengths)
+  columns = (np.arange(len(values), dtype=np.int64) -
+             np.repeat(offsets[:-1] - offsets[0], lengths))
+  indices = np.stack([rows, columns], axis=1)
+  dense_shape = np.array(
+      [len(array), lengths.max() if len(lengths) else 0], dtype=np.int64)
+  return indices, values, dense_shape
+
+
+class _ColumnarReader(object):
+  """Reads batches of rows from the row groups of columnar files.
+
+  A row group is the unit of sharding: each row group belongs to exactly one
+  of `num_shards` shards, and is read in slices of up to `batch_size` rows.
+  Subclasses define how files are opened and how row groups are read.
+  """
+
+  def __init__(self, filenames, columns, batch_size, num_shards, shard_index):
+    self._filenames = filenames
+    self._batch_size = batch_size
+    self._num_shards = num_shards
+    self._shard_index = shard_index
+    # File handles are not thread-safe, so each thread that reads a batch uses
+    # its own handles, and caches the last row group that it read.
+    self._local = threading.local()
+
+    schema = self._schema(self._open(filenames[0]))
+    if columns is None:
+      columns = schema.names
+    self._columns = []
+    for name in columns:
+      index = schema.get_field_index(name)
+      if index < 0:
+        raise ValueError("Column %r is not in the schema of %s: %s" %
+                         (name, filenames[0], schema.names))
+      dtype, is_list = _arrow_column_spec(name, schema.types[index])
+      self._columns.append((name, dtype, is_list))
+
+  @property
+  def columns(self):
+    """A list of `(name, dtype, is_list)` tuples for the selected columns."""
+    return self._columns
+
+  @property
+  def num_files(self):
+    return len(self._filenames)
+
+  def _open(self, filename):
+    """Returns a handle to `filename`, to be passed to the other methods."""
+    raise NotImplementedError("_ColumnarReader._open")
+
+  def _schema(self, f):
+    """Returns the `pyarrow.Schema` of an open file."""
+    raise NotImplementedError("_ColumnarReader._schema")
+
+  def _row_group_sizes(self, f):
+    """Returns the number of rows in each row group of an open file."""
+    raise NotImplementedError("_ColumnarReader._row_group_sizes")
+
+  def _read_row_group(self, f, row_group, column_names):
+    """Returns the given columns of a row group as a `pyarrow.Table`."""
+    raise NotImplementedError("_ColumnarReader._read_row_group")
+
+  def _get_file(self, file_index):
+    files = getattr(self._local, "files", None)
+    if files is None:
+      files = self._local.files = {}
+    f = files.get(file_index)
+    if f is None:
+      f = files[file_index] = self._open(self._filenames[file_index])
+    return f
+
+  def batches(self, file_index):
+    """Returns the `(file_index, row_group, start_row)` batches of a file.
+
+    Only the row groups that belong to this reader's shard are included.
+    """
+    file_index = int(file_index)
+    f = self._get_file(file_index)
+    batches = []
+    for row_group, num_rows in enumerate(self._row_group_sizes(f)):
+      if (file_index + row_group) % self._num_shards == self._shard_index:
+        for start in range(0, num_rows, self._batch_size):
+          batches.append((file_index, row_group, start))
+    return np.array(batches, dtype=np.int64).reshape([-1, 3])
+
+  def read(self, file_index, row_group, start):
+    """Returns the flattened components of the columns of a batch."""
+    file_index, row_group, start = int(file_index), int(row_group), int(start)
+    key = (file_index, row_group)
+    if getattr(self._local, "key", None) != key:
+      self._local.key = None
+      self._local.table = self._read_row_group(
+          self._get_file(file_index), row_group,
+          [name for name, _, _ in self._columns])
+      self._local.key = key
+    table = self._local.table.slice(start, self._batch_size)
+    components = []
+    for name, dtype, is_list in self._columns:
+      chunks = table.column(name).chunks
+      array = (chunks[0] if len(chunks) == 1 else
+               pyarrow.concat_arrays(chunks))
+      if is_list:
+        components.extend(_arrow_list_to_sparse(name, array, dtype))
+      else:
+        components.append(_arrow_to_numpy(name, array, dtype))
+    return components
+
+
+def _open_arrow_file(filename):
+  """Opens `filename`, memory-mapping it if it is a local file."""
+  if "://" in filename:
+    return file_io.FileIO(filename, "rb")
+  return pyarrow.memory_map(filename, "r")
+
+
+class _ParquetReader(_ColumnarReader):
+  """Reads the row groups of Parquet files."""
+
+  def _open(self, filename):
+    return pyarrow.parquet.ParquetFile(_open_arrow_file(filename))
+
+  def _schema(self, f):
+    return f.schema_arrow
+
+  def _row_group_sizes(self, f):
+    return [f.metadata.row_group(i).num_rows for i in range(f.num_row_groups)]
+
+  def _read_row_group(self, f, row_group, column_names):
+    return f.read_row_group(row_group, columns=column_names)
+
+
+class _ArrowFileReader(_ColumnarReader):
+  """Reads the record batches of Arrow IPC files as row groups."""
+
+  def _open(self, filename):
+    return pyarrow.ipc.open_file(_open_arrow_file(filename))
+
+  def _schema(self, f):
+    return f.schema
+
+  def _row_group_sizes(self, f):
+    return [f.get_batch(i).num_rows for i in range(f.num_record_batches)]
+
+  def _read_row_group(self, f, row_group, column_names):
+    batch = f.get_batch(row_group)
+    return pyarrow.Table.from_arrays(
+        [batch.column(batch.schema.get_field_index(name))
+         for name in column_names],
+        names=column_names)
+
+
+class _ColumnarDataset(dataset_ops.Dataset):
+  """A `Dataset` of batches of rows read from columnar files."""
+
+  def __init__(self, reader_class, filenames, columns, batch_size, num_shards,
+               shard_index, num_parallel_reads):
+    super(_ColumnarDataset, self).__init__()
+    if pyarrow is None:
+      raise ImportError("`%s` requires pyarrow." % type(self).__name__)
+    if isinstance(filenames, compat.bytes_or_text_types):
+      filenames = [filenames]
+    filenames = [compat.as_str_any(f) for f in filenames]
+    if not filenames:
+      raise ValueError("`filenames` must not be empty.")
+    if batch_size < 1:
+      raise ValueError("`batch_size` must be positive, got: %d" % batch_size)
+    if not 0 <= shard_index < num_shards:
+      raise ValueError("`shard_index` must be in the range [0, %d), got: %d" %
+                       (num_shards, shard_index))
+    reader = reader_class(filenames, columns, batch_size, num_shards,
+                          shard_index)
+
+    def list_batches(file_index):
+      batches = script_ops.py_func(
+          reader.batches, [file_index], dtypes.int64, stateful=False)
+      batches.set_shape([None, 3])
+      return dataset_ops.Dataset.from_tensor_slices(batches)
+
+    output_types = []
+    for _, dtype, is_list in reader.columns:
+      output_types.extend([dtypes.int64, dtype, dtypes.int64]
+                          if is_list else [dtype])
+
+    def read_batch(batch):
+      components = script_ops.py_func(
+          reader.read, [batch[0], batch[1], batch[2]], output_types,
+          stateful=False)
+      features = {}
+      components = iter(components)
+      for name, _, is_list in reader.columns:
+        if is_list:
+          indices, values, dense_shape = [next(components) for _ in range(3)]
+          indices.set_shape([None, 2])
+          values.set_shape([None])
+          dense_shape.set_shape([2])
+          features[name] = sparse_tensor.SparseTensor(indices, values,
+                                                      dense_shape)
+        else:
+          values = next(components)
+          values.set_shape([None])
+          features[name] = values
+      return features
+
+    self._impl = dataset_ops.Dataset.range(reader.num_files).flat_map(
+        list_batches).map(read_batch, num_parallel_calls=num_parallel_reads)
+
+  def _as_variant_tensor(self):
+    return self._impl._as_variant_tensor()  # pylint: disable=protected-access
+
+  def _inputs(self):
+    return self._impl._inputs()  # pylint: disable=protected-access
+
+  @property
+  def output_classes(self):
+    return self._impl.output_classes
+
+  @property
+  def output_shapes(self):
+    return self._impl.output_shapes
+
+  @property
+  def output_types(self):
+    return self._impl.output_types
+
+
+@tf_export("data.experimental.ParquetDataset")
+class ParquetDataset(_ColumnarDataset):
+  """A `Dataset` of batches of rows from Parquet files.
+
+  Each element is a dictionary mapping the names of the selected columns to
+  the values of a batch of rows from one row group: a vector for a column of
+  scalars, or a 2-D `tf.SparseTensor` for a column of lists. The columns are
+  converted to tensors a whole batch at a time, and the columns that are not
+  selected are not read. For example:
+
+  ```python
+  dataset = tf.data.experimental.ParquetDataset(
+      filenames, columns=["label", "age", "query_tokens"], batch_size=256,
+      num_shards=num_workers, shard_index=worker_index)
+  # `dataset` has elements like:
+  # {"label": <int64 Tensor [256]>,
+  #  "age": <float32 Tensor [256]>,
+  #  "query_tokens": <string SparseTensor [256, ?]>}
+  ```
+
+  Local files are memory-mapped. Columns must not contain null values,
+  except that null lists are read as empty lists.
+
+  NOTE: This dataset requires pyarrow.
+  """
+
+  def __init__(self, filenames, columns=None, batch_size=1024, num_shards=1,
+               shard_index=0, num_parallel_reads=None):
+    """Creates a `ParquetDataset`.
+
+    Args:
+      filenames: A Python string or list of strings containing the names of
+        the files to read. The schema of the first file is read when the
+        dataset is created, and all files must contain the selected columns
+        with the same types.
+      columns: (Optional.) A list of the names of the columns to read. Only
+        these columns are read from the files. Defaults to all the columns of
+        the first file.
+      batch_size: (Optional.) The maximum number of rows in each element.
+        Elements do not span row groups, so the last element of each row group
+        may have fewer rows.
+      num_shards: (Optional.) The number of shards that the row groups are
+        divided into, e.g. the number of workers reading the files.
+      shard_index: (Optional.) The index of the shard to read, in the range
+        `[0, num_shards)`. Row group `r` of `filenames[i]` belongs to shard
+        `(i + r) % num_shards`, so each row group is read by exactly one
+        shard, and only the row groups of this shard are read.
+      num_parallel_reads: (Optional.) A `tf.int32` scalar `tf.Tensor`,
+        representing the number of batches to read in parallel. Defaults to
+        reading batches sequentially. The order of the elements does not depend
+        on this argument.
+
+    Raises:
+      ImportError: If pyarrow is not installed.
+      TypeError: If a selected column has an unsupported type.
+      ValueError: If a selected column does not exist, or if `batch_size`,
+        `num_shards` or `shard_index` is invalid.
+    """
+    super(ParquetDataset, self).__init__(_ParquetReader, filenames, columns,
+                                         batch_size, num_shards, shard_index,
+                                         num_parallel_reads)
+
+
+@tf_export("data.experimental.ArrowFileDataset")
+class ArrowFileDataset(_ColumnarDataset):
+  """A `Dataset` of batches of rows from Arrow IPC files.
+
+  This dataset reads files in the Arrow IPC file format (also known as Feather
+  version 2), and treats each record batch of a file as a row group. Its
+  elements have the same structure as those of
+  `tf.data.experimental.ParquetDataset`.
+
+  NOTE: This dataset requires pyarrow.
+  """
+
+  def __init__(self, filenames, columns=None, batch_size=1024, num_shards=1,
+               shard_index=0, num_parallel_reads=None):
+    """Creates an `ArrowFileDataset`.
+
+    Args:
+      filenames: A Python string or list of strings containing the names of
+        the files to read. The schema of the first file is read when the
+        dataset is created, and all files must contain the selected columns
+        with the same types.
+      columns: (Optional.) A list of the names of the columns to read. Only
+        these columns are read from the files. Defaults to all the columns of
+        the first file.
+      batch_size: (Optional.) The maximum number of rows in each element.
+        Elements do not span row groups, so the last element of each row group
+        may have fewer rows.
+      num_shards: (Optional.) The number of shards that the row groups are
+        divided into, e.g. the number of workers reading the files.
+      shard_index: (Optional.) The index of the shard to read, in the range
+        `[0, num_shards)`. Row group `r` of `filenames[i]` belongs to shard
+        `(i + r) % num_shards`, so each row group is read by exactly one
+        shard, and only the row groups of this shard are read.
+      num_parallel_reads: (Optional.) A `tf.int32` scalar `tf.Tensor`,
+        representing the number of batches to read in parallel. Defaults to
+        reading batches sequentially. The order of the elements does not depend
+        on this argument.
+
+    Raises:
+      ImportError: If pyarrow is not installed.
+      TypeError: If a selected column has an unsupported type.
+      ValueError: If a selected column does not exist, or if `batch_size`,
+        `num_shards` or `shard_index` is invalid.
+    """
+    super(ArrowFileDataset, self).__init__(_ArrowFileReader, filenames,
+                                           columns, batch_size, num_shards,
+                                           shard_index, num_parallel_reads)
+
+
 @tf_export("data.experimental.SqlDataset")
 class SqlDataset(dataset_ops.DatasetSource):
   """A `Dataset` consisting of the results from a SQL query."""
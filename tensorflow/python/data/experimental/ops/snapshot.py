@@ -0,0 +1,604 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Persistent, sharded snapshots of `Dataset` elements."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+from six.moves import queue
+
+from tensorflow.core.framework import graph_pb2
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.data.ops import readers
+from tensorflow.python.data.util import nest
+from tensorflow.python.eager import context
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import ops
+from tensorflow.python.lib.io import file_io
+from tensorflow.python.lib.io import tf_record
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import gen_parsing_ops
+from tensorflow.python.ops import script_ops
+from tensorflow.python.util import compat
+from tensorflow.python.util.tf_export import tf_export
+
+
+_METADATA_FILENAME = "snapshot.json"
+_METADATA_VERSION = 1
+
+# The number of records that may be queued for each shard writer thread
+# before the pipeline blocks.
+_WRITER_QUEUE_SIZE = 64
+
+
+def _function_fingerprinter(library):
+  """Returns a function fingerprinting the functions of `library` by name.
+
+  The fingerprint of a function is computed from its `FunctionDef` without
+  its name, with the names of the functions it references replaced by their
+  own fingerprints. Function names carry a suffix that is unique within a
+  process, so they cannot be used to identify the same function across
+  programs.
+
+  Args:
+    library: A `FunctionDefLibrary`.
+
+  Returns:
+    A function from a function name to a string.
+  """
+  functions = {function.signature.name: function
+               for function in library.function}
+  memo = {}
+
+  def function_fingerprint(name):
+    if name not in memo:
+      function = functions.get(name)
+      if function is None:
+        # Not defined in the library, e.g. a kernel-backed function name.
+        memo[name] = compat.as_str(name)
+      else:
+        # Guards against (invalid) recursive references.
+        memo[name] = compat.as_str(name)
+        normalized = type(function)()
+        normalized.CopyFrom(function)
+        normalized.signature.name = ""
+        for node in normalized.node_def:
+          for key in node.attr:
+            normalize_attr(node.attr[key])
+        for key in normalized.attr:
+          normalize_attr(normalized.attr[key])
+        memo[name] = hashlib.sha256(
+            normalized.SerializeToString(deterministic=True)).hexdigest()
+    return memo[name]
+
+  def normalize_attr(attr):
+    """Replaces the function names in `attr` by their fingerprints."""
+    if attr.HasField("func"):
+      attr.func.name = function_fingerprint(attr.func.name)
+      for key in attr.func.attr:
+        normalize_attr(attr.func.attr[key])
+    elif attr.HasField("list"):
+      for func in attr.list.func:
+        func.name = function_fingerprint(func.name)
+        for key in func.attr:
+          normalize_attr(func.attr[key])
+
+  return function_fingerprint, normalize_attr
+
+
+def _node_fingerprint(node_def, input_fingerprints, normalize_attr):
+  """Returns a fingerprint of a node from its type, attrs and inputs."""
+  hasher = hashlib.sha256()
+  hasher.update(compat.as_bytes(node_def.op))
+  for name in sorted(node_def.attr):
+    if name.startswith("_"):
+      continue
+    attr = type(node_def.attr[name])()
+    attr.CopyFrom(node_def.attr[name])
+    normalize_attr(attr)
+    hasher.update(compat.as_bytes(name))
+    hasher.update(attr.SerializeToString(deterministic=True))
+  for input_fingerprint in input_fingerprints:
+    hasher.update(compat.as_bytes(input_fingerprint))
+  return hasher.hexdigest()
+
+
+def _fingerprint_dataset(dataset):
+  """Returns a hex fingerprint of the graph that produces `dataset`.
+
+  The fingerprint is computed from the types, attributes and inputs of the
+  ops that produce the dataset variant, but not from their names, so that the
+  same pipeline built in different programs (or in a different order within
+  one program) has the same fingerprint. Functions referenced by the ops are
+  identified by a fingerprint of their body, computed in the same way.
+
+  Args:
+    dataset: A `tf.data.Dataset`.
+
+  Returns:
+    A string.
+  """
+  if context.executing_eagerly():
+    graph_def = graph_pb2.GraphDef()
+    graph_def.ParseFromString(dataset._as_serialized_graph().numpy())  # pylint: disable=protected-access
+    _, normalize_attr = _function_fingerprinter(graph_def.library)
+    nodes = {node.name: node for node in graph_def.node}
+    memo = {}
+
+    def node_fingerprint(name):
+      if name not in memo:
+        node = nodes[name]
+        input_fingerprints = []
+        for input_name in node.input:
+          control = input_name.startswith("^")
+          input_name = input_name.lstrip("^")
+          input_op, _, output_index = input_name.partition(":")
+          input_fingerprints.append(
+              ("^" if control else "") + node_fingerprint(input_op) +
+              (output_index or "0"))
+        memo[name] = _node_fingerprint(node, input_fingerprints,
+                                       normalize_attr)
+      return memo[name]
+
+    # The output of the serialized graph is the node that no other consumes.
+    consumed = set(input_name.lstrip("^").partition(":")[0]
+                   for node in graph_def.node for input_name in node.input)
+    hasher = hashlib.sha256()
+    for fingerprint in sorted(node_fingerprint(name) for name in nodes
+                              if name not in consumed):
+      hasher.update(compat.as_bytes(fingerprint))
+    return hasher.hexdigest()
+
+  variant_op = dataset._as_variant_tensor().op  # pylint: disable=protected-access
+  _, normalize_attr = _function_fingerprinter(
+      variant_op.graph.as_graph_def().library)
+  memo = {}
+
+  def op_fingerprint(op):
+    if op not in memo:
+      input_fingerprints = [
+          op_fingerprint(tensor.op) + str(tensor.value_index)
+          for tensor in op.inputs]
+      input_fingerprints.extend(
+          "^" + op_fingerprint(control_input)
+          for control_input in op.control_inputs)
+      memo[op] = _node_fingerprint(op.node_def, input_fingerprints,
+                                   normalize_attr)
+    return memo[op]
+
+  return op_fingerprint(variant_op)
+
+
+def _read_metadata(directory):
+  filename = os.path.join(directory, _METADATA_FILENAME)
+  if not file_io.file_exists(filename):
+    return None
+  return json.loads(file_io.read_file_to_string(filename))
+
+
+def _write_metadata(directory, metadata):
+  file_io.atomic_write_string_to_file(
+      os.path.join(directory, _METADATA_FILENAME),
+      json.dumps(metadata, sort_keys=True))
+
+
+class _ShardWriter(object):
+  """Writes the records of one shard on a background thread.
+
+  The records of a shard are split into one file per round. A file is closed
+  when the first record of the next round arrives (or when the snapshot is
+  finalized), and `on_close(round_index)` is then invoked on the writer
+  thread.
+  """
+
+  def __init__(self, options, on_close):
+    self._options = options
+    self._on_close = on_close
+    self._queue = queue.Queue(maxsize=_WRITER_QUEUE_SIZE)
+    self._error = None
+    self._thread = threading.Thread(target=self._run)
+    self._thread.daemon = True
+    self._thread.start()
+
+  def _run(self):
+    writer = None
+    round_index = None
+    while True:
+      message = self._queue.get()
+      try:
+        if message is None:
+          return
+        kind, value = message
+        if kind == "open":
+          round_index, filename = value
+          writer = tf_record.TFRecordWriter(filename, self._options)
+        elif kind == "write":
+          writer.write(value)
+        elif kind == "close" and writer is not None:
+          writer.close()
+          writer = None
+          self._on_close(round_index)
+      except Exception as e:  # pylint: disable=broad-except
+        self._error = e
+      finally:
+        self._queue.task_done()
+
+  def check_error(self):
+    if self._error is not None:
+      raise self._error
+
+  def put(self, kind, value=None):
+    self.check_error()
+    self._queue.put((kind, value))
+
+  def join(self):
+    self._queue.join()
+    self.check_error()
+
+  def stop(self):
+    self._queue.put(None)
+    self._thread.join()
+
+
+class _SnapshotWriter(object):
+  """Host-side state for writing a snapshot from a running pipeline.
+
+  Element `i` of the input is written to shard `i % num_shards`. Each shard
+  rolls over to a new file after `elements_per_file` elements, and the
+  `num_shards` files that cover the same range of elements form a "round".
+  The metadata file records the rounds whose files have all been closed, so
+  that an interrupted write can be resumed after the last committed round.
+  """
+
+  def __init__(self, directory, metadata):
+    self._directory = directory
+    self._metadata = metadata
+    self._num_shards = metadata["num_shards"]
+    self._elements_per_round = self._num_shards * metadata["elements_per_file"]
+    self._options = tf_record.TFRecordOptions(metadata["compression"])
+    self._resume_rounds = metadata["num_rounds"]
+    self._resume_files = list(metadata["files"])
+    self._lock = threading.Lock()
+    self._writers = []
+    self._round_files = {}
+    self._closed_counts = {}
+    self._num_written = 0
+    self._finalized = False
+
+  @property
+  def num_resumed_elements(self):
+    return self._resume_rounds * self._elements_per_round
+
+  @property
+  def resumed_files(self):
+    return self._resume_files
+
+  def _on_shard_closed(self, round_index):
+    """Commits the rounds whose files have all been closed, in order."""
+    with self._lock:
+      self._closed_counts[round_index] = (
+          self._closed_counts.get(round_index, 0) + 1)
+      self._commit_closed_rounds()
+
+  def _commit_closed_rounds(self):
+    committed = False
+    while True:
+      round_index = self._metadata["num_rounds"]
+      files = self._round_files.get(round_index)
+      if not files or self._closed_counts.get(round_index, 0) < len(files):
+        break
+      self._metadata["files"].extend(files)
+      self._metadata["num_rounds"] += 1
+      del self._round_files[round_index]
+      committed = True
+    if committed:
+      self._metadata["num_elements"] = min(
+          self._num_written,
+          self._metadata["num_rounds"] * self._elements_per_round)
+      _write_metadata(self._directory, self._metadata)
+
+  def start(self):
+    """Discards all state beyond the rounds committed at construction time.
+
+    This is invoked at the start of each pass over the input. Once a pass has
+    completed the snapshot, later passes leave it unchanged and read it.
+
+    Returns:
+      1 if the snapshot is complete, and 0 otherwise.
+    """
+    if self._finalized and self._metadata["complete"]:
+      return np.array(1, dtype=np.int64)
+    for writer in self._writers:
+      writer.stop()
+    for filename in file_io.get_matching_files(
+        os.path.join(self._directory, "*.tfrecord")):
+      if os.path.basename(filename) not in self._resume_files:
+        file_io.delete_file(filename)
+    with self._lock:
+      self._metadata["num_rounds"] = self._resume_rounds
+      self._metadata["files"] = list(self._resume_files)
+      self._metadata["num_elements"] = self.num_resumed_elements
+      self._metadata["complete"] = False
+      _write_metadata(self._directory, self._metadata)
+      self._num_written = self.num_resumed_elements
+      self._round_files = {}
+      self._closed_counts = {}
+      self._finalized = False
+      self._writers = [_ShardWriter(self._options, self._on_shard_closed)
+                       for _ in range(self._num_shards)]
+    return np.array(0, dtype=np.int64)
+
+  def committed_filenames(self):
+    """Returns the paths of the committed files, in order."""
+    with self._lock:
+      return np.array([compat.as_bytes(os.path.join(self._directory, f))
+                       for f in self._metadata["files"]], dtype=object)
+
+  def write(self, record):
+    """Writes a single serialized element."""
+    messages = []
+    with self._lock:
+      if self._finalized:
+        return np.array(0, dtype=np.int64)
+      round_index, offset = divmod(self._num_written, self._elements_per_round)
+      writer = self._writers[offset % self._num_shards]
+      if offset < self._num_shards:
+        # This is the first element of the round for this shard.
+        filename = "%08d-%05d.tfrecord" % (round_index, offset)
+        self._round_files.setdefault(round_index, []).append(filename)
+        messages.append(("close", None))
+        messages.append(
+            ("open", (round_index, os.path.join(self._directory, filename))))
+      messages.append(("write", record))
+      self._num_written += 1
+    # The writer threads acquire `self._lock` when they close a file, so we
+    # must not block on their queues while holding it.
+    for kind, value in messages:
+      writer.put(kind, value)
+    return np.array(0, dtype=np.int64)
+
+  def finalize(self):
+    """Flushes all files and marks the snapshot as complete."""
+    with self._lock:
+      if self._finalized:
+        return np.array(0, dtype=np.int64)
+      self._finalized = True
+    for writer in self._writers:
+      writer.put("close")
+    for writer in self._writers:
+      writer.join()
+    with self._lock:
+      self._commit_closed_rounds()
+      self._metadata["num_elements"] = self._num_written
+      self._metadata["complete"] = True
+      _write_metadata(self._directory, self._metadata)
+    return np.array(0, dtype=np.int64)
+
+
+def _serialize_element(flat_components):
+  """Serializes a flat list of tensors into a single scalar string."""
+  serialized = [gen_parsing_ops.serialize_tensor(c) for c in flat_components]
+  return gen_parsing_ops.serialize_tensor(array_ops.stack(serialized))
+
+
+def _reader_dataset(filenames, num_shards, compression, output_types,
+                    output_shapes, num_parallel_reads):
+  """Returns a `Dataset` that reads the given snapshot files in order.
+
+  Args:
+    filenames: A list of paths, or a 1-D `tf.string` tensor of paths.
+    num_shards: The number of shards of the snapshot.
+    compression: The compression type of the files.
+    output_types: The types of the elements.
+    output_shapes: The shapes of the elements.
+    num_parallel_reads: The number of files to read, and elements to parse, in
+      parallel.
+
+  Returns:
+    A `Dataset`.
+  """
+  flat_types = nest.flatten(output_types)
+  flat_shapes = nest.flatten(output_shapes)
+
+  def parse_fn(record):
+    serialized = gen_parsing_ops.parse_tensor(record, dtypes.string)
+    components = []
+    for i, (dtype, shape) in enumerate(zip(flat_types, flat_shapes)):
+      component = gen_parsing_ops.parse_tensor(serialized[i], dtype)
+      component.set_shape(shape)
+      components.append(component)
+    return nest.pack_sequence_as(output_types, components)
+
+  # Files are listed round by round, and the files of one round hold
+  # interleaved elements of the input, so a deterministic interleave over
+  # `num_shards` files at a time restores the original element order.
+  dataset = dataset_ops.Dataset.from_tensor_slices(
+      ops.convert_to_tensor(filenames, dtype=dtypes.string))
+  dataset = dataset.interleave(
+      lambda f: readers.TFRecordDataset(f, compression_type=compression),
+      cycle_length=num_shards,
+      block_length=1,
+      num_parallel_calls=num_parallel_reads)
+  return dataset.map(parse_fn, num_parallel_calls=num_parallel_reads)
+
+
+def _writer_dataset(input_dataset, directory, metadata, output_types,
+                    output_shapes, num_parallel_reads):
+  """Returns a `Dataset` that produces `input_dataset` and writes a snapshot."""
+  writer = _SnapshotWriter(directory, metadata)
+
+  def write_fn(*args):
+    flat_components = nest.flatten(args)
+    write_op = script_ops.py_func(
+        writer.write, [_serialize_element(flat_components)], dtypes.int64,
+        stateful=True)
+    with ops.control_dependencies([write_op]):
+      flat_components = [array_ops.identity(c) for c in flat_components]
+    return nest.pack_sequence_as(output_types, flat_components)
+
+  def finalize_fn(_):
+    return script_ops.py_func(writer.finalize, [], dtypes.int64, stateful=True)
+
+  def start_fn(_):
+    complete = script_ops.py_func(writer.start, [], dtypes.int64,
+                                  stateful=True)
+    complete.set_shape([])
+    return complete
+
+  def filenames_fn():
+    filenames = script_ops.py_func(writer.committed_filenames, [],
+                                   dtypes.string, stateful=True)
+    filenames.set_shape([None])
+    return filenames
+
+  def pipeline_fn(complete):
+    resumed = writer.num_resumed_elements
+    dataset = input_dataset.skip(resumed).map(write_fn)
+    # A dataset that produces no elements, but finalizes the snapshot when
+    # the iterator reaches it after exhausting the input.
+    finalize = dataset_ops.Dataset.from_tensors(0).map(finalize_fn).flat_map(
+        lambda _: input_dataset.take(0))
+    dataset = dataset.concatenate(finalize)
+    if resumed:
+      dataset = _reader_dataset(
+          [os.path.join(directory, f) for f in writer.resumed_files],
+          metadata["num_shards"], metadata["compression"], output_types,
+          output_shapes, num_parallel_reads).concatenate(dataset)
+    # Once a pass has completed the snapshot, later passes (e.g. the epochs of
+    # a `repeat()` after this transformation) read the committed files instead
+    # of recomputing the input. `take(0)` does not create an iterator over its
+    # input, so only one of the two branches below is ever evaluated:
+    # `complete` is 1 when the snapshot is complete, and 0 otherwise, and a
+    # count of -1 takes all elements.
+    committed = _reader_dataset(
+        filenames_fn(), metadata["num_shards"], metadata["compression"],
+        output_types, output_shapes, num_parallel_reads)
+    return committed.take(-complete).concatenate(dataset.take(complete - 1))
+
+  return dataset_ops.Dataset.from_tensors(0).map(start_fn).flat_map(
+      pipeline_fn)
+
+
+@tf_export("data.experimental.snapshot")
+def snapshot(path,
+             compression="GZIP",
+             num_shards=8,
+             elements_per_file=10000,
+             num_parallel_reads=None):
+  """Persists the elements of a dataset to disk, and reuses them later.
+
+  The first time a pipeline with a `snapshot()` transformation is iterated
+  over, the elements of the input are produced as usual, and are also written
+  to `num_shards` compressed TFRecord files in parallel, each on its own
+  background thread. When the input has been exhausted, the snapshot is marked
+  as complete. Any later pipeline (in the same program, in a different job, or
+  on another worker) that applies `snapshot()` to the same input pipeline with
+  the same `path` will read the elements from the snapshot files instead of
+  recomputing them. Later passes over the same pipeline (e.g. the epochs of a
+  `repeat()` after this transformation) also read the snapshot once it is
+  complete. For example:
+
+  ```python
+  dataset = tf.data.TFRecordDataset(filenames)
+  dataset = dataset.map(expensive_decode_and_augment, num_parallel_calls=32)
+  dataset = dataset.apply(tf.data.experimental.snapshot("/path/to/snapshots"))
+  dataset = dataset.shuffle(10000).repeat()
+  ```
+
+  Snapshots are stored in a subdirectory of `path` named after a fingerprint
+  of the graph that produces the input dataset, so that changing the input
+  pipeline creates a new snapshot instead of reading a stale one. Values that
+  are fed at runtime (e.g. through a `tf.placeholder`) and Python functions
+  invoked through `tf.py_func` do not contribute to the fingerprint.
+
+  If writing is interrupted, the files that were completely written are kept,
+  and a later pipeline resumes writing after them; the input elements that
+  were already written are skipped (but still computed) by the input pipeline.
+  Whether the snapshot is read or written is decided when this transformation
+  is applied. Only one pipeline should write a given snapshot at a time.
+
+  Args:
+    path: A string, the directory in which snapshots are stored.
+    compression: (Optional.) One of `""`, `"ZLIB"` or `"GZIP"`.
+    num_shards: (Optional.) The number of files that are written (and read)
+      in parallel.
+    elements_per_file: (Optional.) The number of elements in each file. A
+      partially written snapshot is resumed at a multiple of
+      `num_shards * elements_per_file` elements.
+    num_parallel_reads: (Optional.) The number of files to read, and elements
+      to parse, in parallel when reading a snapshot. Defaults to reading and
+      parsing sequentially.
+
+  Returns:
+    A `Dataset` transformation function, which can be passed to
+    `tf.data.Dataset.apply`.
+  """
+
+  def _apply_fn(dataset):
+    """Function from `Dataset` to `Dataset` that applies the transformation."""
+    for output_class in nest.flatten(dataset.output_classes):
+      if output_class is not ops.Tensor:
+        raise TypeError(
+            "`snapshot()` only supports datasets of dense tensors, but the "
+            "input dataset has classes %s." % (dataset.output_classes,))
+    if num_shards < 1:
+      raise ValueError("`num_shards` must be positive, but was %d." %
+                       num_shards)
+    if elements_per_file < 1:
+      raise ValueError("`elements_per_file` must be positive, but was %d." %
+                       elements_per_file)
+
+    compression_type = tf_record.TFRecordOptions.get_compression_type_string(
+        compression)
+    fingerprint = _fingerprint_dataset(dataset)
+    directory = os.path.join(path, fingerprint)
+    file_io.recursive_create_dir(directory)
+    metadata = _read_metadata(directory)
+    if metadata is not None and metadata.get("complete"):
+      return _reader_dataset([os.path.join(directory, f)
+                              for f in metadata["files"]],
+                             metadata["num_shards"], metadata["compression"],
+                             dataset.output_types, dataset.output_shapes,
+                             num_parallel_reads)
+
+    new_metadata = {
+        "version": _METADATA_VERSION,
+        "fingerprint": fingerprint,
+        "output_types": [dt.name for dt in nest.flatten(dataset.output_types)],
+        "compression": compression_type,
+        "num_shards": num_shards,
+        "elements_per_file": elements_per_file,
+        "num_rounds": 0,
+        "num_elements": 0,
+        "files": [],
+        "complete": False,
+    }
+    if metadata is not None and all(
+        metadata.get(key) == new_metadata[key]
+        for key in ("version", "compression", "num_shards",
+                    "elements_per_file")):
+      new_metadata["num_rounds"] = metadata["num_rounds"]
+      new_metadata["files"] = metadata["files"]
+    return _writer_dataset(dataset, directory, new_metadata,
+                           dataset.output_types, dataset.output_shapes,
+                           num_parallel_reads)
+
+  return _apply_fn
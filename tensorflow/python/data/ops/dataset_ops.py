@@ -109,7 +109,9 @@ class Dataset(object):
     if static_optimizations:
       dataset = _OptimizeDataset(dataset, static_optimizations)
     if options.experimental_autotune:
-      dataset = _ModelDataset(dataset)
+      dataset = _ModelDataset(dataset,
+                              options.experimental_autotune_cpu_budget,
+                              options.experimental_autotune_ram_budget)
     return dataset
 
   def make_initializable_iterator(self, shared_name=None):
@@ -1403,7 +1405,17 @@ class Options(object):
   for _name, _ty, _docstring in [
       ("experimental_autotune", bool,
        "Whether to dynamically adjust the values of tunable parameters (e.g. "
-       "degrees of parallelism)."),
+       "degrees of parallelism). When a `tf.data.experimental.StatsAggregator` "
+       "is attached, the chosen values are reported as scalars such as "
+       "`ParallelMap::parallelism` and `Prefetch::buffer_capacity`."),
+      ("experimental_autotune_cpu_budget", int,
+       "When autotuning, the maximum total degree of parallelism of the "
+       "transformations whose parallelism is `tf.data.experimental.AUTOTUNE`. "
+       "Defaults to the number of schedulable CPU cores."),
+      ("experimental_autotune_ram_budget", int,
+       "When autotuning, the maximum number of bytes that the transformations "
+       "whose parallelism or buffer size is `tf.data.experimental.AUTOTUNE` "
+       "may use to buffer elements. Defaults to no limit."),
       ("experimental_deterministic", bool,
        "Whether the outputs need to be produced in deterministic order."),
       ("experimental_filter_fusion", bool,
@@ -1503,6 +1515,8 @@ class Options(object):
     for other in [self, options]:
       for name in [
           "experimental_autotune",
+          "experimental_autotune_cpu_budget",
+          "experimental_autotune_ram_budget",
           "experimental_deterministic",
           "experimental_filter_fusion",
           "experimental_hoist_random_uniform",
@@ -3012,15 +3026,24 @@ class _OptionsDataset(UnaryDataset):
 class _ModelDataset(UnaryDataset):
   """A `Dataset` that acts as an identity, and models performance."""
 
-  def __init__(self, input_dataset):
-    """See `optimize()` for details."""
+  def __init__(self, input_dataset, cpu_budget=None, ram_budget=None):
+    """See `Options.experimental_autotune` for details."""
     super(_ModelDataset, self).__init__(input_dataset)
     self._input_dataset = input_dataset
+    self._cpu_budget = cpu_budget
+    self._ram_budget = ram_budget
 
   def _as_variant_tensor(self):
+    kwargs = flat_structure(self)
+    # The budgets are only set when they are specified, so that the default
+    # `ModelDataset` node remains compatible with older binaries.
+    if self._cpu_budget:
+      kwargs["cpu_budget"] = self._cpu_budget
+    if self._ram_budget:
+      kwargs["ram_budget"] = self._ram_budget
     return gen_dataset_ops.model_dataset(
         self._input_dataset._as_variant_tensor(),  # pylint: disable=protected-access
-        **flat_structure(self))
+        **kwargs)
 
   @property
   def output_classes(self):
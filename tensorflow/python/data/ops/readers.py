@@ -128,7 +128,8 @@ class ParallelInterleaveDataset(dataset_ops.InterleaveDataset):
   """A `Dataset` that maps a function over its input and flattens the result."""
 
   def __init__(self, input_dataset, map_func, cycle_length, block_length,
-               sloppy, buffer_output_elements, prefetch_input_elements):
+               sloppy, buffer_output_elements, prefetch_input_elements,
+               input_latency_budget_ms=None):
     """See `tf.data.experimental.parallel_interleave()` for details."""
     super(ParallelInterleaveDataset, self).__init__(input_dataset, map_func,
                                                     cycle_length, block_length)
@@ -142,6 +143,7 @@ class ParallelInterleaveDataset(dataset_ops.InterleaveDataset):
         "prefetch_input_elements",
         prefetch_input_elements,
         argument_default=2 * cycle_length)
+    self._input_latency_budget_ms = input_latency_budget_ms or 0
 
   def _as_variant_tensor(self):
     # pylint: disable=protected-access
@@ -154,6 +156,7 @@ class ParallelInterleaveDataset(dataset_ops.InterleaveDataset):
         self._buffer_output_elements,
         self._prefetch_input_elements,
         f=self._map_func,
+        input_latency_budget_ms=self._input_latency_budget_ms,
         **dataset_ops.flat_structure(self))
     # pylint: enable=protected-access
 
@@ -19,17 +19,23 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import base64
 import collections
 import functools
+import hashlib
+import json
+import os
 import re
 import sys
 import threading
+import time
 import types as types_lib
 import weakref
 
 import numpy as np
 import six
 
+from google.protobuf import message
 from tensorflow.core.framework import attr_value_pb2
 from tensorflow.core.framework import function_pb2
 from tensorflow.python import pywrap_tensorflow
@@ -41,13 +47,19 @@ from tensorflow.python.framework import c_api_util
 from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import device as pydev
 from tensorflow.python.framework import dtypes as dtypes_module
+from tensorflow.python.framework import errors
 from tensorflow.python.framework import func_graph as func_graph_module
+from tensorflow.python.framework import function_def_to_graph
 from tensorflow.python.framework import ops
+from tensorflow.python.framework import tensor_shape
 from tensorflow.python.framework import tensor_spec
+from tensorflow.python.framework import versions
+from tensorflow.python.lib.io import file_io
 from tensorflow.python.ops import custom_gradient
 from tensorflow.python.ops import functional_ops
 from tensorflow.python.ops import gradients_impl
 from tensorflow.python.ops import resource_variable_ops
+from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.util import compat
 from tensorflow.python.util import nest
 from tensorflow.python.util import tf_decorator
@@ -699,6 +711,243 @@ def _deterministic_dict_values(dictionary):
   return tuple(dictionary[key] for key in sorted(dictionary))
 
 
+class FunctionCachePolicy(
+    collections.namedtuple("FunctionCachePolicy",
+                           ["max_size", "relax_shapes_after", "max_traces",
+                            "persistent_cache_dir"])):
+  """Controls how a `defun` caches the graph functions that it traces.
+
+  By default, `defun` traces a new graph function for every distinct input
+  signature (including the shape of each Tensor argument) and keeps all of
+  them. Functions that are called with Tensors of many different shapes, such
+  as sequence models fed with variable-length batches, then retrace on every
+  new shape and hold on to an unbounded number of graphs.
+
+  Fields:
+    max_size: (Optional.) The maximum number of entries in the cache. When the
+      cache is full, the least recently used entry is evicted. Defaults to an
+      unbounded cache.
+    relax_shapes_after: (Optional.) If set, once a dimension of a Tensor
+      argument has been traced with more than this many different sizes (with
+      all other arguments alike), the function is traced once more with that
+      dimension set to `None`, and that trace is reused for all later sizes.
+    max_traces: (Optional.) If set, once the Python function has been traced
+      this many times, every dimension of the Tensor arguments of later traces
+      is set to `None`, so that a single trace serves all shapes of a given
+      rank.
+    persistent_cache_dir: (Optional.) A directory in which traced functions
+      are stored across processes. Before tracing, the `FunctionDef` of a
+      previous trace is loaded from this directory if one was stored for the
+      same Python source code, function name and attributes, input signature
+      and TensorFlow version, which saves the cost of running the Python
+      function again.
+
+  Shape relaxation does not apply when the `defun` has an `input_signature`,
+  which already determines the shapes of its trace.
+
+  Only functions traced while executing eagerly, outside of any device,
+  colocation or distribution strategy scope, are stored on disk. Their inputs
+  must be Tensors and Python scalars or strings, their outputs must be Tensors
+  or `None`, and they must not capture Tensors or variables or call other
+  graph functions. Since only the source code of the Python function is
+  fingerprinted, the persistent cache must not be used with functions whose
+  behavior depends on closures, globals or the code of the functions they
+  call, when those may change from one process to another.
+  """
+
+  def __new__(cls, max_size=None, relax_shapes_after=None, max_traces=None,
+              persistent_cache_dir=None):
+    for name, value in (("max_size", max_size),
+                        ("relax_shapes_after", relax_shapes_after),
+                        ("max_traces", max_traces)):
+      if value is not None and value < 1:
+        raise ValueError("%s must be at least 1, got %d." % (name, value))
+    return super(FunctionCachePolicy, cls).__new__(
+        cls, max_size, relax_shapes_after, max_traces, persistent_cache_dir)
+
+  @property
+  def relaxes_shapes(self):
+    return self.relax_shapes_after is not None or self.max_traces is not None
+
+
+class _NotPersistableError(Exception):
+  """Raised when a trace cannot be stored in the persistent cache."""
+
+
+def _encode_structure(structure, encode_leaf):
+  """Encodes a nested structure as a JSON-compatible value.
+
+  Args:
+    structure: A nested structure of lists, tuples and dicts with string keys.
+    encode_leaf: A function that encodes each leaf of `structure`.
+
+  Returns:
+    A JSON-compatible value from which `_decode_structure` rebuilds
+    `structure`.
+
+  Raises:
+    _NotPersistableError: If `structure` contains other kinds of containers.
+  """
+  if isinstance(structure, dict):
+    if not all(isinstance(key, six.string_types) for key in structure):
+      raise _NotPersistableError("Only dicts with string keys are supported.")
+    return {"dict": [[key, _encode_structure(structure[key], encode_leaf)]
+                     for key in sorted(structure)]}
+  if type(structure) in (list, tuple):  # pylint: disable=unidiomatic-typecheck
+    return {type(structure).__name__:
+                [_encode_structure(x, encode_leaf) for x in structure]}
+  if nest.is_sequence(structure):
+    raise _NotPersistableError(
+        "Unsupported container of type %s." % type(structure))
+  return {"leaf": encode_leaf(structure)}
+
+
+def _decode_structure(encoded, leaves):
+  """Rebuilds a structure encoded by `_encode_structure`.
+
+  Args:
+    encoded: The result of `_encode_structure`.
+    leaves: A function that is called with each encoded leaf and returns the
+      corresponding leaf of the rebuilt structure.
+
+  Returns:
+    The rebuilt structure.
+  """
+  if "dict" in encoded:
+    return {key: _decode_structure(value, leaves)
+            for key, value in encoded["dict"]}
+  if "list" in encoded:
+    return [_decode_structure(x, leaves) for x in encoded["list"]]
+  if "tuple" in encoded:
+    return tuple(_decode_structure(x, leaves) for x in encoded["tuple"])
+  return leaves(encoded["leaf"])
+
+
+def _encode_input(value):
+  """Encodes an input of a trace for the key of the persistent cache."""
+  if isinstance(value, (ops.Tensor, tensor_spec.TensorSpec)):
+    return [value.dtype.name, value.shape.as_list()
+            if value.shape.ndims is not None else None]
+  if value is None or isinstance(
+      value, (bool, float) + six.integer_types + six.string_types +
+      (six.binary_type,)):
+    return repr(value)
+  raise _NotPersistableError(
+      "Unsupported input of type %s." % type(value))
+
+
+def _encode_output(value):
+  """Encodes an output of a trace for the persistent cache."""
+  if value is None:
+    return None
+  if type(value) is not ops.Tensor:  # pylint: disable=unidiomatic-typecheck
+    raise _NotPersistableError(
+        "Unsupported output of type %s." % type(value))
+  return True
+
+
+def _arg_name(arg):
+  """Returns the user-specified name of an input of a trace, or its op name."""
+  try:
+    return compat.as_text(arg.op.get_attr("_user_specified_name"))
+  except ValueError:
+    # Inputs created by other means than the argument placeholders of a
+    # `defun` have no user-specified name.
+    return arg.op.name
+
+
+# The names of the components of the key under which `PolymorphicFunction`
+# caches its graph functions, in the order returned by `_cache_key`.
+_CACHE_KEY_COMPONENTS = ("inputs", "execution_context", "device_functions",
+                         "colocation_stack", "xla")
+
+# The number of recent `TraceEvent`s kept by each `PolymorphicFunction`.
+_MAX_TRACE_EVENTS = 100
+
+_trace_listeners = []
+
+
+class TraceEvent(
+    collections.namedtuple("TraceEvent", [
+        "function_name", "num_traces", "changed_components", "input_signature",
+        "wall_time_secs", "num_nodes", "from_persistent_cache"
+    ])):
+  """Describes a graph function created by a `defun`.
+
+  Fields:
+    function_name: The name of the `defun`.
+    num_traces: The number of times the Python function of the `defun` has
+      been traced, including this trace.
+    changed_components: A tuple with the names of the components of the cache
+      key that differ from the previous graph function of the `defun`: any of
+      "inputs", "execution_context" (the graph, or eager execution),
+      "device_functions", "colocation_stack" and "xla". It is empty for the
+      first graph function, and when the same inputs are traced again after
+      their graph function was evicted from a bounded cache.
+    input_signature: The structure of the inputs, with Tensors and variables
+      replaced by `TensorSpec`s, and objects other than Python scalars and
+      strings by their types.
+    wall_time_secs: The time spent tracing the Python function, or loading it
+      from the persistent cache, and building the graph function.
+    num_nodes: The number of operations in the graph of the function.
+    from_persistent_cache: Whether the graph function was loaded from the
+      persistent cache instead of being traced.
+  """
+
+
+class TraceCounters(
+    collections.namedtuple("TraceCounters", [
+        "num_calls", "num_traces", "num_persistent_cache_loads",
+        "trace_wall_time_secs", "changed_components"
+    ])):
+  """Counts the graph functions created by a `defun`.
+
+  Fields:
+    num_calls: The number of times a graph function was looked up, by calling
+      the `defun` or getting one of its concrete functions.
+    num_traces: The number of times the Python function was traced.
+    num_persistent_cache_loads: The number of graph functions loaded from the
+      persistent cache.
+    trace_wall_time_secs: The total `wall_time_secs` of all `TraceEvent`s.
+    changed_components: A dict that maps the name of each component of the
+      cache key to the number of graph functions created because it changed.
+      See `TraceEvent.changed_components`.
+  """
+
+
+def add_trace_listener(listener):
+  """Registers a function to call with each `TraceEvent` of every `defun`.
+
+  The listener is called while the `defun` holds its lock, so it must not call
+  the `defun` that produced the event.
+
+  Args:
+    listener: A function that takes a `TraceEvent`.
+  """
+  _trace_listeners.append(listener)
+
+
+def remove_trace_listener(listener):
+  """Unregisters a listener added with `add_trace_listener`."""
+  _trace_listeners.remove(listener)
+
+
+def _trace_input_signature(inputs):
+  """Describes the inputs of a trace for a `TraceEvent`."""
+
+  def describe(value):
+    if isinstance(value, (ops.Tensor, tensor_spec.TensorSpec,
+                          resource_variable_ops.ResourceVariable)):
+      return tensor_spec.TensorSpec(value.shape, value.dtype)
+    if value is None or isinstance(
+        value, (bool, float, complex) + six.integer_types + six.string_types +
+        (six.binary_type,)):
+      return value
+    return type(value)
+
+  return nest.map_structure(describe, inputs)
+
+
 class PolymorphicFunction(object):
   """Wrapper class for the graph functions defined for a Python function.
 
@@ -716,7 +965,8 @@ class PolymorphicFunction(object):
                name,
                input_signature=None,
                attributes=None,
-               experimental_autograph=False):
+               experimental_autograph=False,
+               cache_policy=None):
     """Initializes a polymorphic function.
 
     Args:
@@ -730,6 +980,9 @@ class PolymorphicFunction(object):
       experimental_autograph: whether to use autograph to compile
         `python_function`. See https://www.tensorflow.org/guide/autograph for
         more information.
+      cache_policy: a `FunctionCachePolicy` that bounds the cache of traced
+        functions and controls shape relaxation. Defaults to an unbounded
+        cache without shape relaxation.
 
     Raises:
       ValueError: if `input_signature` is not None and the `python_function`'s
@@ -748,6 +1001,19 @@ class PolymorphicFunction(object):
     self._experimental_autograph = experimental_autograph
     self._function_cache = collections.OrderedDict()
     self._function_attributes = attributes or {}
+    self._cache_policy = cache_policy or FunctionCachePolicy()
+    # The number of times `python_function` has been traced.
+    self._num_traces = 0
+    # Maps the shape-agnostic cache key of a set of inputs to the sizes seen
+    # for each dimension of each Tensor input, for shape relaxation.
+    self._observed_sizes = collections.OrderedDict()
+    # Diagnostics about the graph functions created for this function.
+    self._num_calls = 0
+    self._num_persistent_cache_loads = 0
+    self._trace_wall_time_secs = 0.
+    self._changed_components = {name: 0 for name in _CACHE_KEY_COMPONENTS}
+    self._trace_events = collections.deque(maxlen=_MAX_TRACE_EVENTS)
+    self._last_trace_key = None
 
     self._lock = threading.Lock()
     # _descriptor_cache is a of instance of a class to an instance-specific
@@ -800,6 +1066,23 @@ class PolymorphicFunction(object):
     """Returns the wrapped Python function."""
     return self._python_function
 
+  @property
+  def trace_events(self):
+    """Returns a list with the most recent `TraceEvent`s of this function."""
+    with self._lock:
+      return list(self._trace_events)
+
+  @property
+  def trace_counters(self):
+    """Returns the `TraceCounters` of this function."""
+    with self._lock:
+      return TraceCounters(
+          num_calls=self._num_calls,
+          num_traces=self._num_traces,
+          num_persistent_cache_loads=self._num_persistent_cache_loads,
+          trace_wall_time_secs=self._trace_wall_time_secs,
+          changed_components=dict(self._changed_components))
+
   def _get_concrete_function_internal(self, *args, **kwargs):
     """Bypasses error checking when getting a graph function."""
     if self._input_signature:
@@ -1068,33 +1351,303 @@ class PolymorphicFunction(object):
       args, kwargs = self._canonicalize_function_inputs(*args, **kwargs)
     cache_key = self._cache_key(args, kwargs)
     with self._lock:
+      self._num_calls += 1
       try:
         graph_function = self._function_cache.get(cache_key, None)
       except TypeError:
         raise TypeError("Arguments supplied to `defun`-generated functions "
                         "must be hashable.")
 
+      if graph_function is not None:
+        if self._cache_policy.max_size is not None:
+          # Mark the entry as the most recently used one.
+          self._function_cache[cache_key] = self._function_cache.pop(cache_key)
+        return graph_function, args, kwargs
+
+      relaxed_key, trace_args, trace_kwargs = self._relax_shapes(
+          args, kwargs, cache_key)
+      if relaxed_key is not None:
+        graph_function = self._function_cache.get(relaxed_key, None)
       if graph_function is None:
-        if self._input_signature is None:
-          arglen = len(args)
-        else:
-          arglen = len(self._input_signature)
-        arg_names = (
-            self._arg_names[:arglen]
-            + [self._vararg_name] * (arglen - len(self._arg_names)))
-        graph_function = Function(
-            func_graph_module.func_graph_from_py_func(
-                self._name,
-                self._python_function,
-                args,
-                kwargs,
-                self._input_signature,
-                experimental_autograph=self._experimental_autograph,
-                arg_names=arg_names),
-            self._function_attributes)
-        self._function_cache[cache_key] = graph_function
+        start_time = time.time()
+        persistent_path = self._persistent_cache_path(
+            trace_args, trace_kwargs, cache_key)
+        if persistent_path is not None:
+          graph_function = self._load_persistent_trace(persistent_path)
+        from_persistent_cache = graph_function is not None
+        if not from_persistent_cache:
+          if self._input_signature is None:
+            arglen = len(args)
+          else:
+            arglen = len(self._input_signature)
+          arg_names = (
+              self._arg_names[:arglen]
+              + [self._vararg_name] * (arglen - len(self._arg_names)))
+          graph_function = Function(
+              func_graph_module.func_graph_from_py_func(
+                  self._name,
+                  self._python_function,
+                  trace_args,
+                  trace_kwargs,
+                  self._input_signature,
+                  experimental_autograph=self._experimental_autograph,
+                  arg_names=arg_names),
+              self._function_attributes)
+          self._num_traces += 1
+          if persistent_path is not None:
+            self._save_persistent_trace(persistent_path, graph_function)
+        self._record_trace(
+            cache_key, trace_args, trace_kwargs, graph_function,
+            time.time() - start_time, from_persistent_cache)
+      if relaxed_key is not None:
+        self._add_to_cache(relaxed_key, graph_function)
+      # A relaxed trace is also cached under the exact key of these inputs, so
+      # that calling with the same shapes again does not need to relax them.
+      self._add_to_cache(cache_key, graph_function)
       return graph_function, args, kwargs
 
+  def _record_trace(self, cache_key, args, kwargs, graph_function,
+                    wall_time_secs, from_persistent_cache):
+    """Records the `TraceEvent` of a new graph function and notifies listeners.
+
+    Args:
+      cache_key: The cache key of the inputs of the function.
+      args: The positional arguments with which the function was traced.
+      kwargs: The keyword arguments with which the function was traced.
+      graph_function: The new `Function`.
+      wall_time_secs: The time spent creating `graph_function`.
+      from_persistent_cache: Whether `graph_function` was loaded from the
+        persistent cache.
+    """
+    if self._last_trace_key is None:
+      changed_components = ()
+    else:
+      changed_components = tuple(
+          name for name, previous, current in zip(
+              _CACHE_KEY_COMPONENTS, self._last_trace_key, cache_key)
+          if previous != current)
+    self._last_trace_key = cache_key
+    for name in changed_components:
+      self._changed_components[name] += 1
+    if from_persistent_cache:
+      self._num_persistent_cache_loads += 1
+    self._trace_wall_time_secs += wall_time_secs
+
+    if self._input_signature is None:
+      inputs = (args, kwargs) if kwargs else args
+    else:
+      inputs = self._input_signature
+    event = TraceEvent(
+        function_name=self._name,
+        num_traces=self._num_traces,
+        changed_components=changed_components,
+        input_signature=_trace_input_signature(inputs),
+        wall_time_secs=wall_time_secs,
+        num_nodes=len(graph_function.graph.get_operations()),
+        from_persistent_cache=from_persistent_cache)
+    self._trace_events.append(event)
+    logging.vlog(1, "Created a graph function for %s in %.3f seconds with %d "
+                 "nodes; changed cache key components: %s.", self._name,
+                 wall_time_secs, event.num_nodes,
+                 ", ".join(changed_components) or "none")
+    for listener in _trace_listeners:
+      listener(event)
+
+  def _add_to_cache(self, key, graph_function):
+    """Adds `graph_function` to the cache, evicting the oldest entries."""
+    self._function_cache[key] = graph_function
+    max_size = self._cache_policy.max_size
+    if max_size is not None:
+      while len(self._function_cache) > max_size:
+        self._function_cache.popitem(last=False)
+
+  def _persistent_cache_path(self, args, kwargs, cache_key):
+    """Returns the file that stores a trace in the persistent cache.
+
+    Args:
+      args: The positional arguments with which the function is traced.
+      kwargs: The keyword arguments with which the function is traced.
+      cache_key: The cache key of the inputs of the function.
+
+    Returns:
+      The path of the file, or `None` if the policy has no persistent cache or
+      if the trace cannot be stored in it.
+    """
+    cache_dir = self._cache_policy.persistent_cache_dir
+    if cache_dir is None:
+      return None
+    _, execution_context, device_functions, colocation_stack, uses_xla = (
+        cache_key)
+    if (execution_context is not True or device_functions or colocation_stack
+        or uses_xla):
+      return None
+    if self._input_signature is None:
+      inputs = (args, kwargs)
+    else:
+      inputs = self._input_signature
+    try:
+      fingerprint = json.dumps([
+          tf_inspect.getsource(self._python_function),
+          self._name,
+          sorted((key, repr(value))
+                 for key, value in self._function_attributes.items()),
+          self._experimental_autograph,
+          _encode_structure(inputs, _encode_input),
+          versions.__version__,
+          versions.__git_version__,
+      ])
+    except (IOError, TypeError, _NotPersistableError) as e:
+      logging.vlog(1, "Not using the persistent cache for %s: %s", self._name,
+                   e)
+      return None
+    return os.path.join(
+        cache_dir,
+        hashlib.sha256(compat.as_bytes(fingerprint)).hexdigest() + ".json")
+
+  def _load_persistent_trace(self, path):
+    """Loads a trace from the persistent cache.
+
+    Args:
+      path: The file returned by `_persistent_cache_path`.
+
+    Returns:
+      A `Function`, or `None` if `path` does not hold a valid trace.
+    """
+    try:
+      if not file_io.file_exists(path):
+        return None
+      entry = json.loads(file_io.read_file_to_string(path))
+      function_def = function_pb2.FunctionDef.FromString(
+          base64.b64decode(entry["function_def"]))
+      input_shapes = [tensor_shape.TensorShape(shape)
+                      for shape in entry["input_shapes"]]
+      func_graph = function_def_to_graph.function_def_to_graph(
+          function_def, input_shapes)
+      for arg, arg_name in zip(func_graph.inputs, entry["arg_names"]):
+        arg.op._set_attr(  # pylint: disable=protected-access
+            "_user_specified_name",
+            attr_value_pb2.AttrValue(s=compat.as_bytes(arg_name)))
+      outputs = iter(func_graph.outputs)
+      func_graph.structured_outputs = _decode_structure(
+          entry["outputs"],
+          lambda is_tensor: next(outputs) if is_tensor else None)
+    except (errors.OpError, message.DecodeError, KeyError, TypeError,
+            ValueError) as e:
+      logging.warning("Ignoring invalid entry %s of the persistent function "
+                      "cache: %s", path, e)
+      return None
+    func_graph.name = self._name
+    logging.vlog(1, "Loaded %s from the persistent cache at %s.", self._name,
+                 path)
+    return Function(func_graph, self._function_attributes)
+
+  def _save_persistent_trace(self, path, graph_function):
+    """Stores a trace in the persistent cache, if it is self-contained.
+
+    Args:
+      path: The file returned by `_persistent_cache_path`.
+      graph_function: The `Function` traced for the inputs of `path`.
+    """
+    func_graph = graph_function.graph
+    # pylint: disable=protected-access
+    if (func_graph.captures or func_graph._weak_variables or
+        func_graph._functions):
+      return
+    # pylint: enable=protected-access
+    try:
+      outputs = _encode_structure(func_graph.structured_outputs,
+                                  _encode_output)
+    except _NotPersistableError as e:
+      logging.vlog(1, "Not storing %s in the persistent cache: %s",
+                   self._name, e)
+      return
+    entry = {
+        "function_def": compat.as_text(base64.b64encode(
+            graph_function.function_def.SerializeToString())),
+        "input_shapes": [arg.shape.as_list() if arg.shape.ndims is not None
+                         else None for arg in func_graph.inputs],
+        "arg_names": [_arg_name(arg) for arg in func_graph.inputs],
+        "outputs": outputs,
+    }
+    try:
+      file_io.recursive_create_dir(os.path.dirname(path))
+      file_io.atomic_write_string_to_file(path, json.dumps(entry))
+    except errors.OpError as e:
+      logging.warning("Failed to write %s to the persistent function cache: "
+                      "%s", path, e)
+
+  def _relax_shapes(self, args, kwargs, cache_key):
+    """Computes the inputs with which to trace the function, per the policy.
+
+    Records the size of each dimension of the Tensors in `args` and `kwargs`,
+    and replaces each Tensor with a `TensorSpec` in which the dimensions that
+    have seen too many sizes are `None`.
+
+    Args:
+      args: The canonicalized positional arguments of the Python function.
+      kwargs: The canonicalized keyword arguments of the Python function.
+      cache_key: The cache key of `args` and `kwargs`.
+
+    Returns:
+      A tuple `(relaxed_key, trace_args, trace_kwargs)`. If no dimension is
+      relaxed, `relaxed_key` is `None` and `args` and `kwargs` are returned
+      unchanged. Otherwise `relaxed_key` is the cache key of the relaxed trace.
+    """
+    if (self._input_signature is not None or
+        not self._cache_policy.relaxes_shapes):
+      return None, args, kwargs
+    inputs = (args, kwargs) if kwargs else args
+    flat_inputs = nest.flatten(inputs)
+    tensor_indices = [i for i, x in enumerate(flat_inputs)
+                      if isinstance(x, ops.Tensor)]
+    shapes = [flat_inputs[i].shape for i in tensor_indices]
+    if not tensor_indices or any(shape.ndims is None for shape in shapes):
+      return None, args, kwargs
+
+    # Inputs that differ only in the sizes of the dimensions of their Tensors
+    # share a shape-agnostic key.
+    flat_skeleton = list(flat_inputs)
+    for i, shape in zip(tensor_indices, shapes):
+      flat_skeleton[i] = (flat_inputs[i].dtype.as_datatype_enum, shape.ndims)
+    skeleton = nest.pack_sequence_as(inputs, flat_skeleton)
+    agnostic_key = ((pywrap_tensorflow.TFE_Py_EncodeArg(skeleton),) +
+                    cache_key[1:])
+
+    observed_sizes = self._observed_sizes.pop(agnostic_key, None)
+    if observed_sizes is None:
+      observed_sizes = [[set() for _ in range(shape.ndims)] for shape in shapes]
+    self._observed_sizes[agnostic_key] = observed_sizes
+    max_size = self._cache_policy.max_size
+    if max_size is not None and len(self._observed_sizes) > max_size:
+      self._observed_sizes.popitem(last=False)
+
+    relax_all = (self._cache_policy.max_traces is not None and
+                 self._num_traces >= self._cache_policy.max_traces)
+    relax_after = self._cache_policy.relax_shapes_after
+    relaxed = False
+    relaxed_shapes = []
+    for shape, sizes in zip(shapes, observed_sizes):
+      dims = []
+      for size, seen in zip(shape.as_list(), sizes):
+        seen.add(size)
+        if relax_all or (relax_after is not None and len(seen) > relax_after):
+          relaxed = relaxed or size is not None
+          dims.append(None)
+        else:
+          dims.append(size)
+      relaxed_shapes.append(tuple(dims))
+    if not relaxed:
+      return None, args, kwargs
+
+    for i, shape in zip(tensor_indices, relaxed_shapes):
+      flat_inputs[i] = tensor_spec.TensorSpec(shape, flat_inputs[i].dtype)
+    relaxed_inputs = nest.pack_sequence_as(inputs, flat_inputs)
+    if kwargs:
+      trace_args, trace_kwargs = relaxed_inputs
+    else:
+      trace_args, trace_kwargs = relaxed_inputs, kwargs
+    return (agnostic_key, tuple(relaxed_shapes)), trace_args, trace_kwargs
+
 
 def register(func, *args, **kwargs):
   """Register a specialization of a PolymorphicFunction into the graph.
@@ -1129,7 +1682,10 @@ def validate_signature(signature):
                     "a possibly nested sequence of TensorSpec objects.")
 
 
-def defun(func=None, input_signature=None, experimental_autograph=False):
+def defun(func=None,
+          input_signature=None,
+          experimental_autograph=False,
+          experimental_cache_policy=None):
   """Compiles a Python function into a callable TensorFlow graph.
 
   `defun` (short for "define function") trace-compiles a Python function
@@ -1292,6 +1848,14 @@ def defun(func=None, input_signature=None, experimental_autograph=False):
   Python functions that are compiled with an `input_signature` must only accept
   Tensors as arguments and must not take unnamed keyword arguments (**kwargs).
 
+  When no single signature fits, the `experimental_cache_policy` argument can
+  bound the number of cached graphs and relax shapes automatically. For
+  example, with
+  `tf.contrib.eager.FunctionCachePolicy(max_size=32, relax_shapes_after=3)`
+  at most 32 graphs are kept, and once a dimension of an argument has been
+  seen with more than 3 sizes, `F` is traced once more with that dimension
+  left unspecified, and that graph is reused for all later sizes.
+
   _Tracing_
   Be aware that because `F` only logs TensorFlow operations, all the other
   Python code that `f` executes will only shape the _construction_ of the graphs
@@ -1317,6 +1881,14 @@ def defun(func=None, input_signature=None, experimental_autograph=False):
   will be inserted into the graph as a TensorFlow constant. The solution is to
   replace the call to `np.random.randn` with `tf.random_normal((5, 5))`.
 
+  To find out why `F` was traced again, inspect `F.trace_events`, a list of
+  `tf.contrib.eager.TraceEvent`s that name the components of the cache key
+  (such as the inputs or the device functions) that changed since the previous
+  trace, and report the time spent tracing and the size of each graph.
+  `F.trace_counters` aggregates them, and
+  `tf.contrib.eager.add_trace_listener` reports the events of all defuns as
+  they happen.
+
   _Python Side-Effects_
   A corollary of the previous discussion on tracing is the following: If a
   Python function `f` has Python side-effects, then executing `f` multiple times
@@ -1441,7 +2013,11 @@ def defun(func=None, input_signature=None, experimental_autograph=False):
     experimental_autograph: Whether `func` should be compiled before
       constructing the graph. See https://www.tensorflow.org/guide/autograph
       for more information.
-
+    experimental_cache_policy: (Optional.) A
+      `tf.contrib.eager.FunctionCachePolicy` that bounds the number of cached
+      graphs, controls automatic shape relaxation and can store traces on
+      disk for later processes. Defaults to caching every trace in memory
+      without relaxing shapes.
 
   Returns:
      If `func` is not None, returns a callable that will execute the compiled
@@ -1456,13 +2032,15 @@ def defun(func=None, input_signature=None, experimental_autograph=False):
   return defun_with_attributes(
       func=func,
       input_signature=input_signature,
-      experimental_autograph=experimental_autograph)
+      experimental_autograph=experimental_autograph,
+      experimental_cache_policy=experimental_cache_policy)
 
 
 def defun_with_attributes(func=None,
                           input_signature=None,
                           attributes=None,
-                          experimental_autograph=False):
+                          experimental_autograph=False,
+                          experimental_cache_policy=None):
   """Compiles a Python function into a callable TensorFlow graph.
 
   This function supports adding extra function attributes. See detailed
@@ -1480,6 +2058,7 @@ def defun_with_attributes(func=None,
       the whitelisted argument which is a python string, and sets the name for
       this `Function` in the graph.
     experimental_autograph: same as defun()'s experimental_autograph.
+    experimental_cache_policy: same as defun()'s experimental_cache_policy.
 
   Returns:
     Same as the return value of defun, with attributes added to the function in
@@ -1504,7 +2083,8 @@ def defun_with_attributes(func=None,
             name,
             input_signature=input_signature,
             attributes=attributes,
-            experimental_autograph=experimental_autograph))
+            experimental_autograph=experimental_autograph,
+            cache_policy=experimental_cache_policy))
 
   # This code path is for the `foo = tfe.defun(foo, ...)` use case
   if func is not None:
@@ -1536,7 +2116,8 @@ def class_method_to_instance_method(original_function, instance):
           make_partial_py_func(original_function.python_function,
                                weak_instance)),
       name=original_function._name,
-      input_signature=original_function._input_signature)
+      input_signature=original_function._input_signature,
+      cache_policy=original_function._cache_policy)
   # pylint: enable=protected-access
 
   # And we wrap the function with tf_decorator so inspection works correctly
@@ -1756,6 +1756,168 @@ class FunctionTest(test.TestCase, parameterized.TestCase):
       defined(t)
       self.assertEqual(len(defined._function_cache), 4)
 
+  def testCachePolicyMaxSize(self):
+    traced_shapes = []
+
+    def func(t):
+      traced_shapes.append(t.shape.as_list())
+      return t + t
+
+    defined = function.defun(
+        func, experimental_cache_policy=function.FunctionCachePolicy(
+            max_size=2))
+    defined(array_ops.zeros([1]))
+    defined(array_ops.zeros([2]))
+    # Using [1] makes [2] the least recently used entry.
+    defined(array_ops.zeros([1]))
+    defined(array_ops.zeros([3]))
+    self.assertEqual(len(defined._function_cache), 2)
+    self.assertEqual([[1], [2], [3]], traced_shapes)
+
+    defined(array_ops.zeros([1]))
+    self.assertEqual([[1], [2], [3]], traced_shapes)
+    self.assertAllEqual([2., 2.], defined(array_ops.ones([2])))
+    self.assertEqual([[1], [2], [3], [2]], traced_shapes)
+
+  def testCachePolicyRelaxShapes(self):
+    traced_shapes = []
+
+    def func(t, scale):
+      traced_shapes.append(t.shape.as_list())
+      return t * scale
+
+    defined = function.defun(
+        func, experimental_cache_policy=function.FunctionCachePolicy(
+            relax_shapes_after=2))
+    for length in range(1, 6):
+      self.assertAllEqual([2.] * length,
+                          defined(array_ops.ones([3, length]), 2.)[0])
+    # The third length relaxes the second dimension, and later lengths reuse
+    # the relaxed trace.
+    self.assertEqual([[3, 1], [3, 2], [3, None]], traced_shapes)
+
+    # Shapes that were traced exactly are still served by those traces.
+    defined(array_ops.ones([3, 1]), 2.)
+    self.assertEqual(3, len(traced_shapes))
+
+    # Other Python values are relaxed separately.
+    defined(array_ops.ones([3, 7]), 3.)
+    self.assertEqual([3, 7], traced_shapes[-1])
+
+    # The first dimension has only been seen with a single size.
+    defined(array_ops.ones([4, 8]), 2.)
+    self.assertEqual([4, None], traced_shapes[-1])
+
+  def testCachePolicyMaxTraces(self):
+    traced_shapes = []
+
+    def func(t):
+      traced_shapes.append(t.shape.as_list())
+      return array_ops.shape(t)
+
+    defined = function.defun(
+        func, experimental_cache_policy=function.FunctionCachePolicy(
+            max_traces=2))
+    defined(array_ops.zeros([1, 1]))
+    defined(array_ops.zeros([2, 2]))
+    self.assertAllEqual([3, 4], defined(array_ops.zeros([3, 4])))
+    self.assertAllEqual([5, 6], defined(array_ops.zeros([5, 6])))
+    self.assertEqual([[1, 1], [2, 2], [None, None]], traced_shapes)
+
+  def testCachePolicyInvalidArguments(self):
+    with self.assertRaisesRegexp(ValueError, 'max_size'):
+      function.FunctionCachePolicy(max_size=0)
+    with self.assertRaisesRegexp(ValueError, 'relax_shapes_after'):
+      function.FunctionCachePolicy(relax_shapes_after=-1)
+
+  def testCachePolicyPersistentCache(self):
+    num_traces = []
+
+    def func(x, y, scale=2.):
+      num_traces.append(None)
+      return {'sum': (x + y) * scale, 'none': None}
+
+    policy = function.FunctionCachePolicy(
+        persistent_cache_dir=self.get_temp_dir())
+    x = constant_op.constant([1., 2.])
+    y = constant_op.constant([3., 4.])
+    first = function.defun(func, experimental_cache_policy=policy)
+    self.assertAllEqual([8., 12.], first(x, y)['sum'])
+    self.assertEqual(1, len(num_traces))
+
+    # A new defun of the same function, as created in another process, loads
+    # the trace from disk.
+    second = function.defun(func, experimental_cache_policy=policy)
+    result = second(x, y)
+    self.assertAllEqual([8., 12.], result['sum'])
+    self.assertIsNone(result['none'])
+    self.assertEqual(1, len(num_traces))
+    with backprop.GradientTape() as tape:
+      tape.watch(x)
+      total = second(x, y)['sum']
+    self.assertAllEqual([2., 2.], tape.gradient(total, x))
+
+    # Other Python values and shapes are traced.
+    self.assertAllEqual([12., 18.], second(x, y, scale=3.)['sum'])
+    self.assertEqual(2, len(num_traces))
+    second(array_ops.ones([3]), array_ops.ones([3]))
+    self.assertEqual(3, len(num_traces))
+
+  def testTraceEvents(self):
+
+    def func(x, scale):
+      return x * scale
+
+    events = []
+    function.add_trace_listener(events.append)
+    self.addCleanup(function.remove_trace_listener, events.append)
+    defined = function.defun(func)
+    defined(array_ops.ones([2]), 2.)
+    defined(array_ops.ones([2]), 2.)
+    defined(array_ops.ones([3]), 2.)
+    with ops.device('cpu:0'):
+      defined(array_ops.ones([3]), 2.)
+    with ops.Graph().as_default():
+      defined(array_ops.ones([3]), 3.)
+
+    self.assertEqual(defined.trace_events, events)
+    self.assertEqual([1, 2, 3], [event.num_traces for event in events])
+    self.assertEqual([(), ('inputs',), ('inputs', 'execution_context')],
+                     [event.changed_components for event in events])
+    self.assertEqual((tensor_spec.TensorSpec([3], dtypes.float32), 3.),
+                     events[2].input_signature)
+    for event in events:
+      self.assertEqual('func', event.function_name)
+      self.assertGreater(event.wall_time_secs, 0)
+      self.assertGreater(event.num_nodes, 0)
+      self.assertFalse(event.from_persistent_cache)
+
+    counters = defined.trace_counters
+    self.assertEqual(5, counters.num_calls)
+    self.assertEqual(3, counters.num_traces)
+    self.assertEqual(0, counters.num_persistent_cache_loads)
+    self.assertAllClose(sum(event.wall_time_secs for event in events),
+                        counters.trace_wall_time_secs)
+    self.assertEqual(2, counters.changed_components['inputs'])
+    self.assertEqual(1, counters.changed_components['execution_context'])
+    self.assertEqual(0, counters.changed_components['device_functions'])
+
+  def testCachePolicyPersistentCacheSkipsCaptures(self):
+    num_traces = []
+    v = resource_variable_ops.ResourceVariable(1.)
+
+    def func(x):
+      num_traces.append(None)
+      return x * v
+
+    policy = function.FunctionCachePolicy(
+        persistent_cache_dir=self.get_temp_dir())
+    function.defun(func, experimental_cache_policy=policy)(
+        constant_op.constant(2.))
+    function.defun(func, experimental_cache_policy=policy)(
+        constant_op.constant(2.))
+    self.assertEqual(2, len(num_traces))
+
   def testPythonFunctionWithDefaultArgs(self):
 
     def func(foo, bar=1, baz=2):
@@ -218,8 +218,11 @@ def new_tf_operations(graph):
     wrapped TF_Operation
   """
   # TODO(b/69679162): do this more efficiently
+  # pylint: disable=protected-access
   for c_op in tf_operations(graph):
-    try:
-      graph._get_operation_by_tf_operation(c_op)  # pylint: disable=protected-access
-    except KeyError:
+    name = c_api.TF_OperationName(c_op)
+    # Lazily imported TF_Operations get their Operation on first use.
+    if (name not in graph._nodes_by_name and
+        name not in graph._lazy_tf_operations):
       yield c_op
+  # pylint: enable=protected-access
@@ -272,6 +272,63 @@ def _ProcessNewOps(graph):
       op._set_device(coloc_device)  # pylint: disable=protected-access
 
 
+def _ProcessDevicesForLazyImport(graph_def):
+  """Applies the device processing of `_ProcessNewOps` to `graph_def`.
+
+  When operations are imported lazily, their devices are set before import so
+  that creating their `Operation`s later does not mutate them. Like
+  `_ProcessNewOps` with no device functions in effect, this canonicalizes the
+  device of each node, and sets the device of each node that is colocated with
+  other nodes to the device of the first of them that has one.
+
+  Args:
+    graph_def: A `GraphDef` proto.
+
+  Returns:
+    `graph_def`, or a copy of it with updated devices.
+
+  Raises:
+    ValueError: If a node is colocated with a node that is not in `graph_def`.
+  """
+  canonical_devices = {}
+  devices = {}
+  colocation_pairs = {}
+  for node in graph_def.node:
+    device = canonical_devices.get(node.device)
+    if device is None:
+      device = pydev.canonical_name(node.device)
+      canonical_devices[node.device] = device
+    colocation_names = []
+    if '_class' in node.attr:
+      for val in node.attr['_class'].list.s:
+        val = compat.as_str(val)
+        if val.startswith('loc:@') and val[len('loc:@'):] != node.name:
+          colocation_names.append(val[len('loc:@'):])
+    if colocation_names:
+      colocation_pairs[node.name] = colocation_names
+      # As in `_ProcessNewOps`, colocation overrides the original device.
+      device = ''
+    devices[node.name] = device
+
+  for name, colocation_names in colocation_pairs.items():
+    for colocation_name in colocation_names:
+      if colocation_name not in devices:
+        raise ValueError('Specified colocation to an op that '
+                         'does not exist during import: %s in %s' %
+                         (colocation_name, name))
+      if devices[colocation_name]:
+        devices[name] = devices[colocation_name]
+        break
+
+  if all(node.device == devices[node.name] for node in graph_def.node):
+    return graph_def
+  processed_graph_def = graph_pb2.GraphDef()
+  processed_graph_def.CopyFrom(graph_def)
+  for node in processed_graph_def.node:
+    node.device = devices[node.name]
+  return processed_graph_def
+
+
 def _GetColocationNames(op):
   """Returns names of the ops that `op` should be colocated with."""
   colocation_names = []
@@ -338,7 +395,8 @@ def import_graph_def(graph_def,
                      return_elements=None,
                      name=None,
                      op_dict=None,
-                     producer_op_list=None):
+                     producer_op_list=None,
+                     experimental_lazy_operations=False):
   """Imports the graph from `graph_def` into the current default `Graph`.
 
   This function provides a way to import a serialized TensorFlow
@@ -367,6 +425,15 @@ def import_graph_def(graph_def,
       unrecognized attrs for ops in `graph_def` that have their default value
       according to `producer_op_list` will be removed. This will allow some more
       `GraphDef`s produced by later binaries to be accepted by earlier binaries.
+    experimental_lazy_operations: (Optional.) If `True`, the Python
+      `Operation` and `Tensor` objects for the imported nodes are only created
+      when they are first used, e.g. by `Graph.get_operation_by_name()`, by a
+      tensor lookup or by `Graph.get_operations()`, which makes importing large
+      graphs take time proportional to the part of them that is used. Nodes
+      are still added to the graph immediately and can be run by a `Session`.
+      This has no effect when device, colocation, control dependencies,
+      container or other scopes are active, or when importing into a function,
+      since these must apply to the new `Operation`s.
 
   Returns:
     A list of `Operation` and/or `Tensor` objects from the imported graph,
@@ -392,6 +459,11 @@ def import_graph_def(graph_def,
     _RemoveDefaultAttrs(op_dict, producer_op_list, graph_def)
 
   graph = ops.get_default_graph()
+  lazy_operations = (experimental_lazy_operations and
+                     graph._can_add_lazy_tf_operations())  # pylint: disable=protected-access
+  if lazy_operations:
+    graph_def = _ProcessDevicesForLazyImport(graph_def)
+
   with ops.name_scope(name, 'import', input_map.values()) as scope:
     # Save unique prefix generated by name_scope
     if scope:
@@ -421,6 +493,8 @@ def import_graph_def(graph_def,
       except errors.InvalidArgumentError as e:
         # Convert to ValueError for backwards compatibility.
         raise ValueError(str(e))
+    # The import may have updated the versions of the graph.
+    graph._invalidate_graph_def_cache()  # pylint: disable=protected-access
 
     # Create _DefinedFunctions for any imported functions.
     #
@@ -440,7 +514,10 @@ def import_graph_def(graph_def,
         f.add_to_graph(graph)
       # pylint: enable=protected-access
 
-    _ProcessNewOps(graph)
+    if lazy_operations:
+      graph._add_lazy_tf_operations()  # pylint: disable=protected-access
+    else:
+      _ProcessNewOps(graph)
 
   # Treat input mappings that don't appear in the graph as an error, because
   # they are likely to be due to a typo.
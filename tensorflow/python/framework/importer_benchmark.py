@@ -0,0 +1,79 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks for `tf.import_graph_def()`."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+from tensorflow.core.framework import attr_value_pb2
+from tensorflow.core.framework import graph_pb2
+from tensorflow.core.framework import types_pb2
+from tensorflow.python.framework import importer
+from tensorflow.python.framework import ops
+from tensorflow.python.framework import tensor_util
+from tensorflow.python.framework import versions
+from tensorflow.python.platform import test
+
+
+def _make_graph_def(num_nodes):
+  """Returns a `GraphDef` with a constant followed by a chain of identities."""
+  graph_def = graph_pb2.GraphDef()
+  graph_def.versions.producer = versions.GRAPH_DEF_VERSION
+  dtype = attr_value_pb2.AttrValue(type=types_pb2.DT_FLOAT)
+  node = graph_def.node.add(name="n0", op="Const")
+  node.attr["dtype"].CopyFrom(dtype)
+  node.attr["value"].tensor.CopyFrom(tensor_util.make_tensor_proto(1.0))
+  for i in range(1, num_nodes):
+    node = graph_def.node.add(name="n%d" % i, op="Identity",
+                              input=["n%d" % (i - 1)])
+    node.attr["T"].CopyFrom(dtype)
+  return graph_def
+
+
+class ImportGraphDefBenchmark(test.Benchmark):
+  """Compares importing `GraphDef`s with and without lazy `Operation`s."""
+
+  def benchmarkImportGraphDef(self):
+    for num_nodes in [1000, 10000, 100000, 1000000]:
+      graph_def = _make_graph_def(num_nodes)
+      for lazy in [False, True]:
+        self._benchmark(graph_def, num_nodes, lazy)
+
+  def _benchmark(self, graph_def, num_nodes, lazy):
+    with ops.Graph().as_default() as g:
+      start = time.time()
+      importer.import_graph_def(graph_def, name="",
+                                experimental_lazy_operations=lazy)
+      import_time = time.time() - start
+      # Looking up the last node is what a typical inference program does.
+      start = time.time()
+      g.get_tensor_by_name("n%d:0" % (num_nodes - 1))
+      lookup_time = time.time() - start
+
+    label = "lazy" if lazy else "eager"
+    print("Import graph def (%s) nodes: %d import time: %f lookup time: %f" %
+          (label, num_nodes, import_time, lookup_time))
+    self.report_benchmark(
+        iters=1,
+        wall_time=import_time + lookup_time,
+        extras={"import_time": import_time, "lookup_time": lookup_time},
+        name="benchmark_import_graph_def_%s_nodes_%d" % (label, num_nodes))
+
+
+if __name__ == "__main__":
+  test.main()
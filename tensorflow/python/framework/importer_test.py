@@ -1288,6 +1288,72 @@ class ImportGraphDefTest(test.TestCase):
       z1_val, z2_val = sess.run((z1, z2))
       self.assertAllEqual(z1_val, z2_val)
 
+  def _MakeGraphDefForLazyImport(self):
+    with ops.Graph().as_default() as g:
+      a = constant_op.constant(3.0, name="a")
+      with ops.device("/cpu:0"):
+        b = constant_op.constant(4.0, name="b")
+      with ops.colocate_with(b):
+        c = math_ops.add(a, b, name="c")
+      math_ops.multiply(c, 2.0, name="d")
+    return g.as_graph_def()
+
+  def testLazyOperations(self):
+    gdef = self._MakeGraphDefForLazyImport()
+    with ops.Graph().as_default() as g:
+      importer.import_graph_def(gdef, name="eager")
+      eager_ops = g.get_operations()
+
+    with ops.Graph().as_default() as g:
+      c, = importer.import_graph_def(
+          gdef, return_elements=["c"], name="lazy",
+          experimental_lazy_operations=True)
+      # pylint: disable=protected-access
+      self.assertEqual(["lazy/c"], [op.name for op in g._nodes_by_id.values()])
+      self.assertEqual("/device:CPU:0", c.device)  # colocated with b.
+      self.assertEqual(["lazy/a", "lazy/b"], [x.op.name for x in c.inputs])
+      self.assertEqual(3, len(g._nodes_by_id))
+      d = g.get_tensor_by_name("lazy/d:0")
+      self.assertEqual(4, len(g._nodes_by_id))
+      # pylint: enable=protected-access
+
+      # Names of operations that were not used yet are taken.
+      self.assertEqual("lazy/d/y_1", g.unique_name("lazy/d/y"))
+
+      with self.cached_session() as sess:
+        self.assertEqual(14.0, sess.run(d))
+
+      # All operations have the ids and devices of an eager import.
+      lazy_ops = g.get_operations()
+      self.assertEqual([op.name.replace("eager/", "lazy/") for op in eager_ops],
+                       [op.name for op in lazy_ops])
+      self.assertEqual([op._id for op in eager_ops],  # pylint: disable=protected-access
+                       [op._id for op in lazy_ops])  # pylint: disable=protected-access
+      self.assertEqual([op.device for op in eager_ops],
+                       [op.device for op in lazy_ops])
+
+  def testLazyOperationsWithScopes(self):
+    gdef = self._MakeGraphDefForLazyImport()
+    with ops.Graph().as_default() as g:
+      # Scopes that apply to the new operations disable lazy creation.
+      with ops.device("/job:ps"):
+        importer.import_graph_def(gdef, experimental_lazy_operations=True)
+      self.assertEqual(5, len(g._nodes_by_id))  # pylint: disable=protected-access
+      self.assertEqual("/job:ps/device:CPU:0",
+                       g.get_operation_by_name("import/b").device)
+
+    with ops.Graph().as_default() as g:
+      importer.import_graph_def(gdef, experimental_lazy_operations=True)
+      # Scopes that are active when operations are first used do not apply.
+      with ops.device("/job:ps"), ops.control_dependencies(
+          [constant_op.constant(1.0)]):
+        a = g.get_operation_by_name("import/a")
+      self.assertEqual("", a.device)
+      self.assertEqual([], a.control_inputs)
+
+      g.finalize()
+      self.assertEqual(6, len(g._nodes_by_id))  # pylint: disable=protected-access
+
 
 if __name__ == "__main__":
   test.main()
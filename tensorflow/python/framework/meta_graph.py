@@ -654,7 +654,8 @@ def import_scoped_meta_graph(meta_graph_or_file,
                              import_scope=None,
                              input_map=None,
                              unbound_inputs_col_name="unbound_inputs",
-                             restore_collections_predicate=(lambda key: True)):
+                             restore_collections_predicate=(lambda key: True),
+                             experimental_lazy_operations=False):
   """Recreates a `Graph` saved in a `MetaGraphDef` proto.
 
   This function takes a `MetaGraphDef` protocol buffer as input. If
@@ -689,6 +690,9 @@ def import_scoped_meta_graph(meta_graph_or_file,
       named c (i.e whose key is c) will be restored iff
       1) `restore_collections_predicate(c)` is True, and
       2) `c != unbound_inputs_col_name`.
+    experimental_lazy_operations: If `True`, the Python `Operation`s of the
+      imported nodes are only created when they are first used. See
+      `tf.import_graph_def`.
 
   Returns:
     A dictionary of all the `Variables` imported into the name scope.
@@ -698,7 +702,8 @@ def import_scoped_meta_graph(meta_graph_or_file,
   """
   return import_scoped_meta_graph_with_return_elements(
       meta_graph_or_file, clear_devices, graph, import_scope, input_map,
-      unbound_inputs_col_name, restore_collections_predicate)[0]
+      unbound_inputs_col_name, restore_collections_predicate,
+      experimental_lazy_operations=experimental_lazy_operations)[0]
 
 
 def import_scoped_meta_graph_with_return_elements(
@@ -709,7 +714,8 @@ def import_scoped_meta_graph_with_return_elements(
     input_map=None,
     unbound_inputs_col_name="unbound_inputs",
     restore_collections_predicate=(lambda key: True),
-    return_elements=None):
+    return_elements=None,
+    experimental_lazy_operations=False):
   """Imports graph from `MetaGraphDef` and returns vars and return elements.
 
   This function takes a `MetaGraphDef` protocol buffer as input. If
@@ -747,6 +753,9 @@ def import_scoped_meta_graph_with_return_elements(
     return_elements:  A list of strings containing operation names in the
       `MetaGraphDef` that will be returned as `Operation` objects; and/or
       tensor names in `MetaGraphDef` that will be returned as `Tensor` objects.
+    experimental_lazy_operations: If `True`, the Python `Operation`s of the
+      imported nodes are only created when they are first used. See
+      `tf.import_graph_def`.
 
   Returns:
     A tuple of (
@@ -803,7 +812,8 @@ def import_scoped_meta_graph_with_return_elements(
         name=(import_scope or scope_to_prepend_to_names),
         input_map=input_map,
         producer_op_list=producer_op_list,
-        return_elements=return_elements)
+        return_elements=return_elements,
+        experimental_lazy_operations=experimental_lazy_operations)
 
     # Restores all the other collections.
     variable_objects = {}
@@ -954,6 +964,7 @@ def export_scoped_meta_graph(filename=None,
         exclude_nodes = _find_extraneous_saver_nodes(graph.as_graph_def(),
                                                      saver_def)
 
+      graph._materialize_lazy_operations()
       for key in sorted(graph._nodes_by_id):
         if _should_include_node(graph._nodes_by_id[key].name,
                                 export_scope,
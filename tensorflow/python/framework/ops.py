@@ -562,6 +562,7 @@ class Tensor(_TensorLike):
     except errors.InvalidArgumentError as e:
       # Convert to ValueError for backwards compatibility.
       raise ValueError(str(e))
+    self._op._graph._invalidate_graph_def_cache(self._op)  # pylint: disable=protected-access
 
   @property
   def value_index(self):
@@ -2039,6 +2040,7 @@ class Operation(object):
         self._graph._c_graph,  # pylint: disable=protected-access
         self._c_op,  # pylint: disable=protected-access
         compat.as_str(_device_string(device)))
+    self._graph._invalidate_graph_def_cache(self)  # pylint: disable=protected-access
 
   def _update_input(self, index, tensor):
     """Update the input to this operation at the given index.
@@ -2070,6 +2072,7 @@ class Operation(object):
         self._graph._c_graph,  # pylint: disable=protected-access
         tensor._as_tf_output(),  # pylint: disable=protected-access
         self._tf_input(index))
+    self._graph._invalidate_graph_def_cache(self)  # pylint: disable=protected-access
 
   def _add_control_inputs(self, ops):
     """Add a list of new control inputs to this operation.
@@ -2085,6 +2088,8 @@ class Operation(object):
       if not isinstance(op, Operation):
         raise TypeError("op must be an Operation: %s" % op)
       c_api.AddControlInput(self._graph._c_graph, self._c_op, op._c_op)  # pylint: disable=protected-access
+    if ops:
+      self._graph._invalidate_graph_def_cache(self)  # pylint: disable=protected-access
 
   def _add_control_input(self, op):
     """Add a new control input to this operation.
@@ -2099,10 +2104,12 @@ class Operation(object):
     if not isinstance(op, Operation):
       raise TypeError("op must be an Operation: %s" % op)
     c_api.AddControlInput(self._graph._c_graph, self._c_op, op._c_op)  # pylint: disable=protected-access
+    self._graph._invalidate_graph_def_cache(self)  # pylint: disable=protected-access
 
   def _remove_all_control_inputs(self):
     """Removes any control inputs to this operation."""
     c_api.RemoveAllControlInputs(self._graph._c_graph, self._c_op)  # pylint: disable=protected-access
+    self._graph._invalidate_graph_def_cache(self)  # pylint: disable=protected-access
 
   def __str__(self):
     return str(self.node_def)
@@ -2312,6 +2319,7 @@ class Operation(object):
     try:
       # pylint: disable=protected-access
       c_api.SetAttr(self._graph._c_graph, self._c_op, attr_name, buf)
+      self._graph._invalidate_graph_def_cache(self)
       # pylint: enable=protected-access
     finally:
       c_api.TF_DeleteBuffer(buf)
@@ -2755,6 +2763,12 @@ def _name_from_scope_name(name):
 _MUTATION_LOCK_GROUP = 0
 _SESSION_RUN_LOCK_GROUP = 1
 
+# `Graph._as_graph_def()` appends the NodeDefs of ops added since its cached
+# `GraphDef` was built if there are at most this many of them, or a tenth of
+# the number of nodes in the cached `GraphDef`, and otherwise rebuilds it.
+_GRAPH_DEF_MIN_DELTA = 100
+
+
 @tf_export("Graph")
 class Graph(object):
   """A TensorFlow computation, represented as a dataflow graph.
@@ -2822,7 +2836,19 @@ class Graph(object):
     self._nodes_by_id = dict()  # GUARDED_BY(self._lock)
     self._next_id_counter = 0  # GUARDED_BY(self._lock)
     self._nodes_by_name = dict()  # GUARDED_BY(self._lock)
+    # Maps the names of TF_Operations imported by `import_graph_def` with
+    # `experimental_lazy_operations=True` that do not have an `Operation` yet
+    # to the TF_Operation and the id reserved for its `Operation`.
+    self._lazy_tf_operations = dict()  # GUARDED_BY(self._lock)
     self._version = 0  # GUARDED_BY(self._lock)
+    # Maps `add_shapes` to the last `GraphDef` built by `_as_graph_def()` and
+    # the `(version, mutation count)` it corresponds to. Ops added after the
+    # cached `GraphDef` are appended to it, while any other change to the graph
+    # (see `_invalidate_graph_def_cache()`) bumps the mutation count.
+    self._graph_def_cache = {}  # GUARDED_BY(self._lock)
+    # The largest version covered by an entry of `_graph_def_cache`.
+    self._graph_def_cache_version = 0
+    self._graph_def_mutation_count = 0
     # Maps a name used in the graph to the next id to use for that name.
     self._names_in_use = {}
     self._stack_state_is_thread_local = False
@@ -3018,6 +3044,7 @@ class Graph(object):
     to a graph when it is shared between multiple threads, for example
     when using a `tf.train.QueueRunner`.
     """
+    self._materialize_lazy_operations()
     self._finalized = True
 
   def _unsafe_unfinalize(self):
@@ -3068,7 +3095,9 @@ class Graph(object):
     (using `tf.import_graph_def`) or used with the
     [C++ Session API](../../../../api_docs/cc/index.md).
 
-    This method is thread-safe.
+    This method is thread-safe. The last `GraphDef` built is cached, and the
+    NodeDefs of ops added since then are appended to it, so that repeated
+    calls on a large graph only serialize what changed.
 
     Args:
       from_version: Optional.  If this is set, returns a `GraphDef`
@@ -3089,23 +3118,105 @@ class Graph(object):
     """
     # pylint: enable=line-too-long
     with self._lock:
-      with c_api_util.tf_buffer() as buf:
-        c_api.TF_GraphToGraphDef(self._c_graph, buf)
-        data = c_api.TF_GetBuffer(buf)
+      if from_version is not None:
+        return self._graph_def_since_version(from_version, add_shapes)
+
+      # Any change made to the ops covered by the cache while (or after) the
+      # `GraphDef` is built bumps the mutation count read here.
+      self._graph_def_cache_version = max(self._graph_def_cache_version,
+                                          self._version)
+      cache_key = (self._version, self._graph_def_mutation_count)
+      cached = self._graph_def_cache.get(add_shapes)
       graph = graph_pb2.GraphDef()
-      graph.ParseFromString(compat.as_bytes(data))
-      # Strip the experimental library field iff it's empty.
-      if not graph.library.function:
-        graph.ClearField("library")
-
-      if add_shapes:
-        for node in graph.node:
-          op = self._nodes_by_name[node.name]
-          if op.outputs:
-            node.attr["_output_shapes"].list.shape.extend(
-                [output.get_shape().as_proto() for output in op.outputs])
+      if cached is not None and cached[0] == cache_key:
+        graph.CopyFrom(cached[1])
+        return graph, self._version
+
+      cached_version = cached[0][0] if cached is not None else None
+      if (cached is not None and
+          cached[0][1] == self._graph_def_mutation_count and
+          self._version - cached_version <= max(len(cached[1].node) // 10,
+                                                _GRAPH_DEF_MIN_DELTA)):
+        # Only ops were added since the cached `GraphDef` was built: serialize
+        # the new NodeDefs instead of the whole graph.
+        cached_graph = cached[1]
+        del self._graph_def_cache[add_shapes]
+        for op_id in range(cached_version + 1, self._version + 1):
+          op = self._nodes_by_id.get(op_id)
+          if op is not None:
+            self._add_node_def(cached_graph, op, add_shapes)
+      else:
+        with c_api_util.tf_buffer() as buf:
+          c_api.TF_GraphToGraphDef(self._c_graph, buf)
+          data = c_api.TF_GetBuffer(buf)
+        cached_graph = graph_pb2.GraphDef()
+        cached_graph.ParseFromString(compat.as_bytes(data))
+        # Strip the experimental library field iff it's empty.
+        if not cached_graph.library.function:
+          cached_graph.ClearField("library")
+
+        if add_shapes:
+          for node in cached_graph.node:
+            op = self._get_operation_by_name_locked(node.name)
+            self._add_output_shapes(node, op)
+
+      self._graph_def_cache[add_shapes] = (cache_key, cached_graph)
+      # The cached `GraphDef` is never handed out since callers may modify it.
+      graph.CopyFrom(cached_graph)
+    return graph, self._version
+
+  def _graph_def_since_version(self, from_version, add_shapes):
+    """Returns a `GraphDef` with the nodes added since `from_version`.
+
+    The `GraphDef` also contains the versions and function library of this
+    graph, so that it can be imported on its own. Must be called with
+    `self._lock` held.
+
+    Args:
+      from_version: The value of the `version` property from which to include
+        nodes.
+      add_shapes: If true, adds an "_output_shapes" list attr to each node.
+
+    Returns:
+      A tuple containing the `GraphDef` and the current version of the graph.
+    """
+    graph = graph_pb2.GraphDef()
+    graph.versions.CopyFrom(self.graph_def_versions)
+    self._copy_functions_to_graph_def(graph, 0)
+    lazy_names = [name for name, (_, op_id) in self._lazy_tf_operations.items()
+                  if op_id > from_version]
+    for name in lazy_names:
+      self._get_operation_by_name_locked(name)
+    for op_id in sorted(self._nodes_by_id):
+      if op_id > from_version:
+        self._add_node_def(graph, self._nodes_by_id[op_id], add_shapes)
     return graph, self._version
 
+  def _add_node_def(self, graph_def, op, add_shapes):
+    """Appends the NodeDef of `op` to `graph_def`."""
+    node = graph_def.node.add()
+    node.CopyFrom(op.node_def)
+    if add_shapes:
+      self._add_output_shapes(node, op)
+
+  def _add_output_shapes(self, node, op):
+    """Adds the "_output_shapes" attr of `op` to its NodeDef `node`."""
+    if op.outputs:
+      node.attr["_output_shapes"].list.shape.extend(
+          [output.get_shape().as_proto() for output in op.outputs])
+
+  def _invalidate_graph_def_cache(self, op=None):
+    """Records a change to the graph that is not the addition of an op.
+
+    Args:
+      op: (Optional.) The `Operation` that was modified. Changes to ops that
+        were added after the cached `GraphDef`s were built are ignored since
+        their NodeDefs are serialized when they are appended. If None, all
+        cached `GraphDef`s are invalidated.
+    """
+    if op is None or op._id <= self._graph_def_cache_version:  # pylint: disable=protected-access
+      self._graph_def_mutation_count += 1
+
   def as_graph_def(self, from_version=None, add_shapes=False):
     # pylint: disable=line-too-long
     """Returns a serialized `GraphDef` representation of this graph.
@@ -3188,6 +3299,7 @@ class Graph(object):
                 else None)
     c_api.TF_GraphCopyFunction(self._c_graph, function._c_func.func, gradient)
     # pylint: enable=protected-access
+    self._invalidate_graph_def_cache()
 
     self._functions[compat.as_str(name)] = function
 
@@ -3465,6 +3577,90 @@ class Graph(object):
 
     return new_ops
 
+  def _can_add_lazy_tf_operations(self):
+    """Returns whether `Operation`s for new TF_Operations can be created lazily.
+
+    The `Operation`s of TF_Operations created by the C API pick up the device
+    functions, colocation and control dependencies scopes, control flow context
+    and other scopes that are active when they are created. They can only be
+    created on first use if none of these are active when the TF_Operations
+    are added.
+    """
+    return not (self._building_function or
+                self._device_function_stack.peek_objs() or
+                self._colocation_stack or
+                self._control_dependencies_stack or
+                self._get_control_flow_context() is not None or
+                self._attr_scope_map or self._op_to_kernel_label_map or
+                self._gradient_override_map or self._container)
+
+  def _add_lazy_tf_operations(self):
+    """Registers new TF_Operations whose `Operation`s are created on first use.
+
+    This is an alternative to `_add_new_tf_operations()` for TF_Operations
+    imported from a `GraphDef`, when `_can_add_lazy_tf_operations()` is True.
+    Each TF_Operation is assigned the id its `Operation` would have had if it
+    had been created immediately, and its name is marked as used.
+    """
+    self._check_not_finalized()
+    with self._lock:
+      for c_op in c_api_util.new_tf_operations(self):
+        name = c_api.TF_OperationName(c_op)
+        self._next_id_counter += 1
+        self._lazy_tf_operations[name] = (c_op, self._next_id_counter)
+        name_key = name.lower()
+        if name_key not in self._names_in_use:
+          self._names_in_use[name_key] = 1
+      self._version = max(self._version, self._next_id_counter)
+
+  def _get_operation_by_name_locked(self, name):
+    """Returns the `Operation` named `name`, or None if there is none.
+
+    Creates the `Operation` if `name` refers to a lazily imported TF_Operation.
+    Must be called with `self._lock` held.
+
+    Args:
+      name: The name of an operation.
+    """
+    op = self._nodes_by_name.get(name)
+    if op is not None or not self._lazy_tf_operations:
+      return op
+    entry = self._lazy_tf_operations.pop(name, None)
+    if entry is None:
+      return None
+    c_op, op_id = entry
+    # Create the Operation with the id that was reserved for it on import, so
+    # that ids (and the op-level random seeds derived from them) do not depend
+    # on the order in which the imported operations are first used.
+    next_id_counter = self._next_id_counter
+    self._next_id_counter = op_id - 1
+    try:
+      op = Operation(c_op, self)
+    finally:
+      self._next_id_counter = next_id_counter
+    # No scopes were active on import (see `_can_add_lazy_tf_operations()`),
+    # and the devices were already processed by `import_graph_def`, so the
+    # scopes active now must not be applied.
+    # pylint: disable=protected-access
+    op._control_flow_context = None
+    op._device_code_locations = []
+    op._colocation_code_locations = {}
+    # pylint: enable=protected-access
+    return op
+
+  def _materialize_lazy_operations(self):
+    """Creates the `Operation`s of all lazily imported TF_Operations."""
+    with self._lock:
+      if not self._lazy_tf_operations:
+        return
+      names = sorted(self._lazy_tf_operations,
+                     key=lambda name: self._lazy_tf_operations[name][1])
+      for name in names:
+        self._get_operation_by_name_locked(name)
+      # Restore the creation order of `get_operations()`, since some of the
+      # operations may have been used before the others.
+      self._nodes_by_id = dict(sorted(self._nodes_by_id.items()))
+
   def as_graph_element(self, obj, allow_tensor=True, allow_operation=True):
     """Returns the object referred to by `obj`, as an `Operation` or `Tensor`.
 
@@ -3535,9 +3731,8 @@ class Graph(object):
           raise ValueError("The name %s looks a like a Tensor name, but is "
                            "not a valid one. Tensor names must be of the "
                            "form \"<op_name>:<output_index>\"." % repr(name))
-        if op_name in self._nodes_by_name:
-          op = self._nodes_by_name[op_name]
-        else:
+        op = self._get_operation_by_name_locked(op_name)
+        if op is None:
           raise KeyError("The name %s refers to a Tensor which does not "
                          "exist. The operation, %s, does not exist in the "
                          "graph." % (repr(name), repr(op_name)))
@@ -3556,14 +3751,15 @@ class Graph(object):
 
       elif ":" not in name and allow_operation:
         # Looks like an Operation name and can be an Operation.
-        if name not in self._nodes_by_name:
+        op = self._get_operation_by_name_locked(name)
+        if op is None:
           raise KeyError("The name %s refers to an Operation not in the "
                          "graph." % repr(name))
-        return self._nodes_by_name[name]
+        return op
 
       elif ":" not in name and not allow_operation:
         # Looks like an Operation name but can't be an Operation.
-        if name in self._nodes_by_name:
+        if name in self._nodes_by_name or name in self._lazy_tf_operations:
           # Yep, it's an Operation name
           err_msg = ("The name %s refers to an Operation, not a %s." %
                      (repr(name), types_str))
@@ -3605,6 +3801,7 @@ class Graph(object):
       return list(self._nodes_by_id.values())
 
     with self._lock:
+      self._materialize_lazy_operations()
       return list(self._nodes_by_id.values())
 
   def get_operation_by_name(self, name):
@@ -3649,7 +3846,10 @@ class Graph(object):
       return self._nodes_by_name[name]
 
     with self._lock:
-      return self._nodes_by_name[name]
+      op = self._get_operation_by_name_locked(name)
+      if op is None:
+        raise KeyError(name)
+      return op
 
   def _get_operation_by_tf_operation(self, tf_oper):
     op_name = c_api.TF_OperationName(tf_oper)
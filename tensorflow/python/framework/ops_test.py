@@ -2546,6 +2546,60 @@ class AsGraphDefTest(test_util.TensorFlowTestCase):
          float_val: 1.0  } } } }
       """, gd)
 
+  def _assertGraphDefMatchesUncached(self, g, gd):
+    g._invalidate_graph_def_cache()
+    expected = g.as_graph_def()
+    self.assertEqual(
+        {node.name: node for node in expected.node},
+        {node.name: node for node in gd.node})
+
+  def testCachedGraphDef(self):
+    with ops.Graph().as_default() as g:
+      a = constant_op.constant(1.0, name="a")
+      b = array_ops.identity(a, name="b")
+      gd = g.as_graph_def()
+      self.assertEqual(["a", "b"], [node.name for node in gd.node])
+
+      # The returned `GraphDef`s can be modified by the caller.
+      gd.node[0].device = "/cpu:0"
+      self.assertEqual("", g.as_graph_def().node[0].device)
+
+      # New ops are appended to the cached `GraphDef`.
+      c = math_ops.add(a, b, name="c")
+      gd = g.as_graph_def()
+      self.assertEqual(["a", "b", "c"], [node.name for node in gd.node])
+      self._assertGraphDefMatchesUncached(g, gd)
+
+      # Changes to existing ops invalidate the cached `GraphDef`.
+      b.op._set_device("/cpu:0")
+      b.op._set_attr("_foo", attr_value_pb2.AttrValue(s=b"foo"))
+      c.op._update_input(1, a)
+      c.op._add_control_input(b.op)
+      gd = g.as_graph_def()
+      self.assertEqual("/cpu:0", gd.node[1].device)
+      self.assertEqual(b"foo", gd.node[1].attr["_foo"].s)
+      self.assertEqual(["a", "a", "^b"], list(gd.node[2].input))
+      self._assertGraphDefMatchesUncached(g, gd)
+
+      b.set_shape([])
+      gd = g.as_graph_def(add_shapes=True)
+      self.assertEqual(
+          tensor_shape.scalar().as_proto(),
+          gd.node[1].attr["_output_shapes"].list.shape[0])
+
+  def testGraphDefFromVersion(self):
+    with ops.Graph().as_default() as g:
+      a = constant_op.constant(1.0, name="a")
+      version = g.version
+      array_ops.identity(a, name="b")
+
+      gd = g.as_graph_def(from_version=version)
+      self.assertEqual(["b"], [node.name for node in gd.node])
+      self.assertEqual(g.graph_def_versions, gd.versions)
+      self.assertEqual(
+          ["a", "b"], [node.name for node in g.as_graph_def().node])
+      self.assertEqual([], list(g.as_graph_def(from_version=g.version).node))
+
 
 @ops.RegisterStatistics("a", "flops")
 def _calc_a_forward_flops(unused_graph, unused_node):
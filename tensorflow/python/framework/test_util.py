@@ -2185,8 +2185,10 @@ def dismantle_polymorphic_function(func):
   """
   # TODO(b/115366440): Delete this method when a custom OrderedDict is added
   cache = func._function_cache  # pylint: disable=protected-access
-  for concrete_func in cache.values():
-    dismantle_func_graph(concrete_func.graph)
+  # A function traced with relaxed shapes may be cached under several keys.
+  graphs = {id(f.graph): f.graph for f in cache.values()}
+  for graph in graphs.values():
+    dismantle_func_graph(graph)
   while cache:
     cache.popitem()
   memory.dismantle_ordered_dict(cache)
@@ -2967,6 +2967,10 @@ class Function(object):
     self._symbol_vals = None
     self._fetches = None
     self._session = None
+    # The dtypes to feed the inputs with when calling `_callable_fn` directly,
+    # or `None` if the last call does not allow it (see `_fast_call`).
+    self._fast_path_dtypes = None
+    self._graph_version = None
 
   def _make_callable(self, feed_arrays, feed_symbols, symbol_vals, session):
     """Generates a callable that runs the graph.
@@ -3022,10 +3026,48 @@ class Function(object):
       if fetch in self.fetch_callbacks:
         self.fetch_callbacks[fetch](output)
 
+  def _fast_call(self, inputs):
+    """Runs the cached callable if `inputs` can be fed as in the last call.
+
+    This skips the validation of the inputs and the initialization of new
+    variables when all the inputs are fed Numpy values again, in the session
+    of the last call, and no op was added to its graph since.
+
+    Arguments:
+      inputs: List of input values.
+
+    Returns:
+      The fetched values, or `None` if the fast path does not apply.
+    """
+    feed_dtypes = self._fast_path_dtypes
+    if feed_dtypes is None or len(inputs) != len(feed_dtypes):
+      return None
+    session = ops.get_default_session()
+    if session is None:
+      session = _SESSION
+    if (session is not self._session or self.fetches != self._fetches or
+        (not _MANUAL_VAR_INIT and
+         session.graph.version != self._graph_version)):
+      return None
+    array_vals = []
+    for value, dtype in zip(inputs, feed_dtypes):
+      if value is None or tensor_util.is_tensor(value):
+        return None
+      array_vals.append(np.asarray(value, dtype=dtype))
+    return self._callable_fn(*array_vals, run_metadata=self.run_metadata)
+
   def __call__(self, inputs):
     if not isinstance(inputs, (list, tuple)):
       raise TypeError('`inputs` should be a list or tuple.')
 
+    fetched = self._fast_call(inputs)
+    if fetched is None:
+      fetched = self._call(inputs)
+    self._call_fetch_callbacks(fetched[-len(self._fetches):])
+    return fetched[:len(self.outputs)]
+
+  def _call(self, inputs):
+    """Runs the graph, refreshing the callable if the feeds changed."""
     session = get_session()
     feed_arrays = []
     array_vals = []
@@ -3064,10 +3106,19 @@ class Function(object):
         session != self._session):
       self._make_callable(feed_arrays, feed_symbols, symbol_vals, session)
 
-    fetched = self._callable_fn(*array_vals,
-                                run_metadata=self.run_metadata)
-    self._call_fetch_callbacks(fetched[-len(self._fetches):])
-    return fetched[:len(self.outputs)]
+    # The next calls can feed the callable directly if all the inputs are
+    # dense and fed Numpy values.
+    if (len(inputs) == len(feed_arrays) == len(self.inputs) and
+        not self.feed_dict and
+        not any(is_sparse(tensor) for tensor in self.inputs)):
+      self._fast_path_dtypes = [
+          dtypes_module.as_dtype(tensor.dtype).as_numpy_dtype
+          for tensor in self.inputs]
+      self._graph_version = session.graph.version
+    else:
+      self._fast_path_dtypes = None
+
+    return self._callable_fn(*array_vals, run_metadata=self.run_metadata)
 
 
 @tf_export('keras.backend.function')
@@ -17,12 +17,15 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import time
+
 from absl.testing import parameterized
 import numpy as np
 import scipy.sparse
 
 from tensorflow.core.protobuf import config_pb2
 from tensorflow.python import keras
+from tensorflow.python.client import session as session_lib
 from tensorflow.python.eager import context
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import errors_impl
@@ -1541,6 +1544,37 @@ class BackendGraphTests(test.TestCase):
       self.assertEqual(callback.times_called, 1)
       self.assertEqual(callback.callback_result, 200)
 
+  def test_function_fast_path(self):
+    with self.cached_session():
+      x = keras.backend.placeholder(shape=(2,))
+      v = keras.backend.variable(np.ones(2))
+      f = keras.backend.function([x], [x * v])
+      with test.mock.patch.object(
+          keras.backend, '_initialize_variables',
+          wraps=keras.backend._initialize_variables) as initialize_variables:
+        for _ in range(3):
+          self.assertAllClose([[1., 2.]], f([np.array([1., 2.])]))
+        callable_fn = f._callable_fn
+        # Only the first call looks for uninitialized variables.
+        self.assertEqual(1, initialize_variables.call_count)
+
+        # Inputs are still converted to the placeholder's dtype.
+        self.assertAllClose([[3., 4.]], f([[3, 4]]))
+        self.assertEqual(1, initialize_variables.call_count)
+        self.assertIs(callable_fn, f._callable_fn)
+
+        # New variables are initialized before running the function.
+        w = keras.backend.variable(np.ones(2) * 2.)
+        g = keras.backend.function([x], [x * w])
+        self.assertAllClose([[2., 4.]], g([np.array([1., 2.])]))
+        self.assertAllClose([[1., 2.]], f([np.array([1., 2.])]))
+        self.assertEqual(3, initialize_variables.call_count)
+
+        # Feeding a symbolic tensor leaves the fast path.
+        self.assertAllClose([[5., 5.]], f([keras.backend.constant([5., 5.])]))
+        self.assertIsNot(callable_fn, f._callable_fn)
+        self.assertIsNone(f._fast_path_dtypes)
+
   def test_placeholder(self):
     x = keras.backend.placeholder(shape=(3, 4))
     self.assertEqual(x.get_shape().as_list(), [3, 4])
@@ -1579,5 +1613,33 @@ class BackendGraphTests(test.TestCase):
     self.assertEqual(normed.shape.as_list(), [10, 3, 5, 5])
 
 
+class FunctionBenchmark(test.Benchmark):
+
+  def _run_benchmark(self, name, call, iters=2000):
+    for _ in range(10):
+      call()
+    start = time.time()
+    for _ in range(iters):
+      call()
+    self.report_benchmark(
+        iters=iters, wall_time=(time.time() - start) / iters, name=name)
+
+  def benchmark_function_call_overhead(self):
+    # A tiny computation, so that the wall time is mostly per call overhead.
+    with ops.Graph().as_default(), session_lib.Session() as sess:
+      with sess.as_default():
+        x = keras.backend.placeholder(shape=(1, 4))
+        v = keras.backend.variable(np.ones((4, 1)))
+        y = keras.backend.dot(x, v)
+        for _ in range(100):
+          keras.backend.variable(0.)
+        value = np.ones((1, 4), dtype=np.float32)
+
+        f = keras.backend.function([x], [y])
+        self._run_benchmark('keras_function_call', lambda: f([value]))
+        self._run_benchmark('session_run_call',
+                            lambda: sess.run(y, feed_dict={x: value}))
+
+
 if __name__ == '__main__':
   test.main()
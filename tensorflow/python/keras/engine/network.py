@@ -1510,7 +1510,7 @@ class Network(base_layer.Layer):
           model_checkpoint_path=filepath,
           all_model_checkpoint_paths=[filepath])
 
-  def load_weights(self, filepath, by_name=False):
+  def load_weights(self, filepath, by_name=False, experimental_mmap=False):
     """Loads all layer weights, either from a TensorFlow or an HDF5 weight file.
 
     If `by_name` is False weights are loaded based on the network's
@@ -1537,6 +1537,10 @@ class Network(base_layer.Layer):
         by_name: Boolean, whether to load weights by name or by topological
             order. Only topological loading is supported for weight files in
             TensorFlow format.
+        experimental_mmap: Boolean. Used for weight files in HDF5 format only.
+            If `True`, weights stored contiguously and uncompressed are
+            memory-mapped from the file instead of being read in memory
+            before being assigned.
 
     Returns:
         When loading a weight file in TensorFlow format, returns the same status
@@ -1586,9 +1590,11 @@ class Network(base_layer.Layer):
       if 'layer_names' not in f.attrs and 'model_weights' in f:
         f = f['model_weights']
       if by_name:
-        saving.load_weights_from_hdf5_group_by_name(f, self.layers)
+        saving.load_weights_from_hdf5_group_by_name(
+            f, self.layers, mmap=experimental_mmap)
       else:
-        saving.load_weights_from_hdf5_group(f, self.layers)
+        saving.load_weights_from_hdf5_group(
+            f, self.layers, mmap=experimental_mmap)
 
   def _updated_config(self):
     """Util shared between different serialization methods.
@@ -20,15 +20,19 @@ from __future__ import division
 from __future__ import print_function
 
 import json
+from multiprocessing.pool import ThreadPool
 import os
 
 import numpy as np
 from six.moves import zip  # pylint: disable=redefined-builtin
 
+from tensorflow.python.eager import context
+from tensorflow.python.framework import dtypes
 from tensorflow.python.keras import backend as K
 from tensorflow.python.keras import optimizers
 from tensorflow.python.keras.utils import conv_utils
 from tensorflow.python.keras.utils.io_utils import ask_to_proceed_with_overwrite
+from tensorflow.python.ops import array_ops
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.util import serialization
 from tensorflow.python.util.tf_export import tf_export
@@ -46,6 +50,13 @@ except ImportError:
   yaml = None
 # pylint: enable=g-import-not-at-top
 
+# Weights larger than this many bytes are transferred between HDF5 and the
+# backend in slices along their first dimension, so that no full copy of
+# them is made on the way.
+_WEIGHT_CHUNK_BYTES = 16 * 1024 * 1024
+# Maximum number of threads transferring weights when graph building.
+_WEIGHT_TRANSFER_THREADS = 8
+
 
 @tf_export('keras.models.save_model')
 def save_model(model, filepath, overwrite=True, include_optimizer=True):
@@ -718,9 +729,275 @@ def _convert_rnn_weights(layer, weights):
   return weights
 
 
+def _weight_slices(shape, dtype):
+  """Returns the slices to transfer a weight of `shape` and `dtype` by.
+
+  Arguments:
+      shape: The shape of the weight.
+      dtype: The Numpy dtype of the weight.
+
+  Returns:
+      A list of slices along the first dimension of the weight, or `[None]`
+      if the weight is transferred at once.
+  """
+  if not shape:
+    return [None]
+  nbytes = np.dtype(dtype).itemsize * int(np.prod(shape))
+  if nbytes <= _WEIGHT_CHUNK_BYTES or shape[0] < 2:
+    return [None]
+  rows = max(1, _WEIGHT_CHUNK_BYTES * shape[0] // nbytes)
+  return [slice(start, min(start + rows, shape[0]))
+          for start in range(0, shape[0], rows)]
+
+
+def _run_transfers(transfers):
+  """Calls each of `transfers`, on several threads when graph building."""
+  if context.executing_eagerly() or len(transfers) < 2:
+    for transfer in transfers:
+      transfer()
+    return
+  pool = ThreadPool(min(_WEIGHT_TRANSFER_THREADS, len(transfers)))
+  try:
+    pool.map(lambda transfer: transfer(), transfers)
+  finally:
+    pool.close()
+    pool.join()
+
+
+def _group_transfers(entries, run):
+  """Groups the transfers of weight slices into calls of `run`.
+
+  Arguments:
+      entries: List of `(weight, row_slice, nbytes)` tuples.
+      run: Function transferring a list of `(weight, row_slice)` tuples
+          within a single backend call.
+
+  Returns:
+      A list of functions, each transferring at most about
+      `_WEIGHT_CHUNK_BYTES`, or a single weight slice.
+  """
+  transfers = []
+  group = []
+  group_bytes = 0
+  for weight, row_slice, nbytes in entries:
+    if group and group_bytes + nbytes > _WEIGHT_CHUNK_BYTES:
+      transfers.append(lambda group=group: run(group))
+      group = []
+      group_bytes = 0
+    group.append((weight, row_slice))
+    group_bytes += nbytes
+  if group:
+    transfers.append(lambda group=group: run(group))
+  return transfers
+
+
+def _slice_placeholders():
+  """Returns int32 placeholders for the bounds of a slice of a weight."""
+  return (array_ops.placeholder(dtypes.int32, shape=()),
+          array_ops.placeholder(dtypes.int32, shape=()))
+
+
+def _write_weights_to_datasets(weight_dataset_tuples):
+  """Writes the values of weights to HDF5 datasets of the same shape.
+
+  Like `K.batch_get_value`, but weights larger than `_WEIGHT_CHUNK_BYTES` are
+  read and written by slices, and the reads run on several threads when
+  graph building.
+
+  Arguments:
+      weight_dataset_tuples: List of `(weight, dataset)` tuples.
+  """
+  datasets = {}
+  entries = []
+  for x, dset in weight_dataset_tuples:
+    datasets[x] = dset
+    for row_slice in _weight_slices(dset.shape, dset.dtype):
+      nbytes = dset.dtype.itemsize * int(np.prod(dset.shape))
+      if row_slice is not None:
+        nbytes = nbytes * (row_slice.stop - row_slice.start) // dset.shape[0]
+      entries.append((x, row_slice, nbytes))
+
+  def write(x, row_slice, value):
+    dset = datasets[x]
+    if row_slice is not None:
+      dset[row_slice] = value
+    elif not dset.shape:
+      # scalar
+      dset[()] = value
+    else:
+      dset[:] = value
+
+  if context.executing_eagerly():
+    for x, row_slice, _ in entries:
+      value = x if row_slice is None else x[row_slice]
+      write(x, row_slice, value.numpy())
+    return
+
+  with K.get_graph().as_default():
+    for x, row_slice, _ in entries:
+      if row_slice is not None and not hasattr(x, '_read_slice_op'):
+        x._read_slice_placeholders = _slice_placeholders()
+        begin, end = x._read_slice_placeholders
+        x._read_slice_op = x[begin:end]
+  session = K.get_session()
+
+  def run(group):
+    feed_dict = {}
+    ops = []
+    for x, row_slice in group:
+      if row_slice is None:
+        ops.append(x)
+      else:
+        begin, end = x._read_slice_placeholders
+        feed_dict[begin] = row_slice.start
+        feed_dict[end] = row_slice.stop
+        ops.append(x._read_slice_op)
+    values = session.run(ops, feed_dict=feed_dict)
+    for (x, row_slice), value in zip(group, values):
+      write(x, row_slice, value)
+
+  _run_transfers(_group_transfers(entries, run))
+
+
+def _assign_weights(weight_value_tuples):
+  """Sets the values of weights, like `K.batch_set_value`.
+
+  Values larger than `_WEIGHT_CHUNK_BYTES` are converted and assigned by
+  slices, so that no full copy of them is made, and the assignments run on
+  several threads when graph building.
+
+  Arguments:
+      weight_value_tuples: List of `(weight, value)` tuples. Each value
+          should be a Numpy array, which may be memory-mapped, or an HDF5
+          dataset, which is read by slices.
+  """
+  values = {}
+  entries = []
+  for x, value in weight_value_tuples:
+    if h5py is None or not isinstance(value, h5py.Dataset):
+      # Does not copy memory-mapped arrays.
+      value = np.asarray(value)
+    values[x] = value
+    dtype = K.dtype(x)
+    for row_slice in _weight_slices(value.shape, dtype):
+      nbytes = np.dtype(value.dtype).itemsize * int(np.prod(value.shape))
+      if row_slice is not None:
+        nbytes = nbytes * (row_slice.stop - row_slice.start) // value.shape[0]
+      entries.append((x, row_slice, nbytes))
+
+  def get_value(x, row_slice):
+    value = values[x] if row_slice is None else values[x][row_slice]
+    return np.asarray(value, dtype=K.dtype(x))
+
+  if context.executing_eagerly():
+    for x, row_slice, _ in entries:
+      if row_slice is None:
+        x.assign(get_value(x, row_slice))
+      else:
+        x[row_slice].assign(get_value(x, row_slice))
+    return
+
+  with K.get_graph().as_default():
+    for x, row_slice, _ in entries:
+      tf_dtype = dtypes.as_dtype(x.dtype.name.split('_')[0])
+      if row_slice is None:
+        if not hasattr(x, '_assign_placeholder'):
+          # Shared with `K.batch_set_value`.
+          x._assign_placeholder = array_ops.placeholder(
+              tf_dtype, shape=values[x].shape)
+          x._assign_op = x.assign(x._assign_placeholder)
+      elif not hasattr(x, '_assign_slice_op'):
+        begin, end = _slice_placeholders()
+        value_placeholder = array_ops.placeholder(
+            tf_dtype, shape=(None,) + values[x].shape[1:])
+        x._assign_slice_placeholders = (begin, end, value_placeholder)
+        x._assign_slice_op = x[begin:end].assign(value_placeholder)
+  session = K.get_session()
+
+  def run(group):
+    feed_dict = {}
+    ops = []
+    for x, row_slice in group:
+      if row_slice is None:
+        feed_dict[x._assign_placeholder] = get_value(x, row_slice)
+        ops.append(x._assign_op)
+      else:
+        begin, end, value_placeholder = x._assign_slice_placeholders
+        feed_dict[begin] = row_slice.start
+        feed_dict[end] = row_slice.stop
+        feed_dict[value_placeholder] = get_value(x, row_slice)
+        ops.append(x._assign_slice_op)
+    session.run(ops, feed_dict=feed_dict)
+
+  _run_transfers(_group_transfers(entries, run))
+
+
+def _load_dataset(dataset, mmap=False):
+  """Returns the value of an HDF5 dataset, without reading it in memory.
+
+  Arguments:
+      dataset: HDF5 dataset.
+      mmap: Whether to return a read-only memory map of the file, if the data
+          of the dataset is stored contiguously and uncompressed in a file on
+          disk.
+
+  Returns:
+      A `np.memmap`, or `dataset` itself, which is read when sliced.
+  """
+  if (mmap and dataset.shape and dataset.chunks is None and
+      not dataset.dtype.hasobject and dataset.file.driver in ('sec2', 'stdio')):
+    offset = dataset.id.get_offset()
+    if offset is not None:
+      return np.memmap(dataset.file.filename, mode='r', dtype=dataset.dtype,
+                       shape=dataset.shape, offset=offset)
+  return dataset
+
+
+def _requires_preprocessing(layer, original_keras_version, original_backend):
+  """Returns whether `preprocess_weights_for_loading` may convert weights.
+
+  The weights of the other layers are assigned as stored, so that they can be
+  read by slices.
+  """
+  if original_keras_version == '1' or original_backend == 'theano':
+    return True
+  return layer.__class__.__name__ in [
+      'Bidirectional', 'TimeDistributed', 'Model', 'Sequential', 'Conv1D',
+      'Conv2D', 'Conv3D', 'Conv2DTranspose', 'ConvLSTM2D', 'LSTM',
+      'CuDNNLSTM', 'GRU', 'CuDNNGRU'
+  ]
+
+
+def _load_weight_values(layer, datasets, mmap, original_keras_version,
+                        original_backend):
+  """Returns the values of HDF5 datasets to assign to the weights of `layer`.
+
+  Arguments:
+      layer: Layer instance.
+      datasets: List of HDF5 datasets of the saved weights of the layer.
+      mmap: Whether to memory-map the datasets when possible.
+      original_keras_version: Keras version for the weights, as a string.
+      original_backend: Keras backend the weights were trained with,
+          as a string.
+
+  Returns:
+      A list of Numpy arrays, memory maps or HDF5 datasets.
+  """
+  weight_values = [_load_dataset(dataset, mmap=mmap) for dataset in datasets]
+  if not _requires_preprocessing(layer, original_keras_version,
+                                 original_backend):
+    return weight_values
+  return preprocess_weights_for_loading(
+      layer, [np.asarray(value) for value in weight_values],
+      original_keras_version, original_backend)
+
+
 def save_weights_to_hdf5_group(f, layers):
   """Saves the weights of a list of layers to a HDF5 group.
 
+  Large weights are read and written by slices, in parallel across layers
+  when graph building.
+
   Arguments:
       f: HDF5 group.
       layers: List of layer instances.
@@ -732,33 +1009,42 @@ def save_weights_to_hdf5_group(f, layers):
   f.attrs['backend'] = K.backend().encode('utf8')
   f.attrs['keras_version'] = str(keras_version).encode('utf8')
 
+  weight_dataset_tuples = []
   for layer in layers:
     g = f.create_group(layer.name)
     symbolic_weights = layer.weights
-    weight_values = K.batch_get_value(symbolic_weights)
     weight_names = []
-    for i, (w, val) in enumerate(zip(symbolic_weights, weight_values)):
+    for i, w in enumerate(symbolic_weights):
       if hasattr(w, 'name') and w.name:
         name = str(w.name)
       else:
         name = 'param_' + str(i)
       weight_names.append(name.encode('utf8'))
     save_attributes_to_hdf5_group(g, 'weight_names', weight_names)
-    for name, val in zip(weight_names, weight_values):
-      param_dset = g.create_dataset(name, val.shape, dtype=val.dtype)
-      if not val.shape:
-        # scalar
+    for name, w in zip(weight_names, symbolic_weights):
+      shape = K.int_shape(w)
+      dtype = dtypes.as_dtype(w.dtype).base_dtype.as_numpy_dtype
+      if shape is None or None in shape:
+        val = K.get_value(w)
+        param_dset = g.create_dataset(name, val.shape, dtype=val.dtype)
         param_dset[()] = val
       else:
-        param_dset[:] = val
+        param_dset = g.create_dataset(name, shape, dtype=dtype)
+        weight_dataset_tuples.append((w, param_dset))
+  _write_weights_to_datasets(weight_dataset_tuples)
 
 
-def load_weights_from_hdf5_group(f, layers):
+def load_weights_from_hdf5_group(f, layers, mmap=False):
   """Implements topological (order-based) weight loading.
 
+  Large weights are assigned by slices, in parallel across layers when graph
+  building.
+
   Arguments:
       f: A pointer to a HDF5 group.
       layers: a list of target layers.
+      mmap: Whether to memory-map the weights from the file when possible,
+          instead of reading them in memory.
 
   Raises:
       ValueError: in case of mismatch between provided layers
@@ -799,11 +1085,11 @@ def load_weights_from_hdf5_group(f, layers):
   for k, name in enumerate(layer_names):
     g = f[name]
     weight_names = load_attributes_from_hdf5_group(g, 'weight_names')
-    weight_values = [np.asarray(g[weight_name]) for weight_name in weight_names]
     layer = filtered_layers[k]
     symbolic_weights = layer.weights
-    weight_values = preprocess_weights_for_loading(
-        layer, weight_values, original_keras_version, original_backend)
+    weight_values = _load_weight_values(
+        layer, [g[weight_name] for weight_name in weight_names], mmap,
+        original_keras_version, original_backend)
     if len(weight_values) != len(symbolic_weights):
       raise ValueError('Layer #' + str(k) + ' (named "' + layer.name +
                        '" in the current model) was found to '
@@ -813,10 +1099,10 @@ def load_weights_from_hdf5_group(f, layers):
                        ' weights, but the saved weights have ' +
                        str(len(weight_values)) + ' elements.')
     weight_value_tuples += zip(symbolic_weights, weight_values)
-  K.batch_set_value(weight_value_tuples)
+  _assign_weights(weight_value_tuples)
 
 
-def load_weights_from_hdf5_group_by_name(f, layers):
+def load_weights_from_hdf5_group_by_name(f, layers, mmap=False):
   """Implements name-based weight loading.
 
   (instead of topological weight loading).
@@ -826,6 +1112,8 @@ def load_weights_from_hdf5_group_by_name(f, layers):
   Arguments:
       f: A pointer to a HDF5 group.
       layers: a list of target layers.
+      mmap: Whether to memory-map the weights from the file when possible,
+          instead of reading them in memory.
 
   Raises:
       ValueError: in case of mismatch between provided layers
@@ -855,12 +1143,12 @@ def load_weights_from_hdf5_group_by_name(f, layers):
   for k, name in enumerate(layer_names):
     g = f[name]
     weight_names = load_attributes_from_hdf5_group(g, 'weight_names')
-    weight_values = [np.asarray(g[weight_name]) for weight_name in weight_names]
 
     for layer in index.get(name, []):
       symbolic_weights = layer.weights
-      weight_values = preprocess_weights_for_loading(
-          layer, weight_values, original_keras_version, original_backend)
+      weight_values = _load_weight_values(
+          layer, [g[weight_name] for weight_name in weight_names], mmap,
+          original_keras_version, original_backend)
       if len(weight_values) != len(symbolic_weights):
         raise ValueError('Layer #' + str(k) + ' (named "' + layer.name +
                          '") expects ' + str(len(symbolic_weights)) +
@@ -878,7 +1166,7 @@ def load_weights_from_hdf5_group_by_name(f, layers):
 
         else:
           weight_value_tuples.append((symbolic_weights[i], weight_values[i]))
-  K.batch_set_value(weight_value_tuples)
+  _assign_weights(weight_value_tuples)
 
 
 def save_attributes_to_hdf5_group(group, name, data):
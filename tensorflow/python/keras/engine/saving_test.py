@@ -220,6 +220,42 @@ class TestWeightSavingAndLoading(test.TestCase, parameterized.TestCase):
           for (x, y) in zip(weights1, weights2)
       ]
 
+  @test_util.run_in_graph_and_eager_modes
+  def test_chunked_weight_saving_and_loading(self):
+    if h5py is None:
+      return
+
+    temp_dir = self.get_temp_dir()
+    self.addCleanup(shutil.rmtree, temp_dir)
+    h5_path = os.path.join(temp_dir, 'test.h5')
+
+    def make_model():
+      model = keras.models.Sequential()
+      model.add(keras.layers.Dense(7, input_dim=5))
+      model.add(keras.layers.BatchNormalization())
+      model.add(keras.layers.Dense(2))
+      return model
+
+    x = np.random.random((4, 5))
+    model = make_model()
+    ref_y = model.predict(x)
+    layer_name = model.layers[0].name
+    kernel_name = model.layers[0].kernel.name
+    # Transfers weights larger than 32 bytes in slices of a few rows.
+    with test.mock.patch.object(saving, '_WEIGHT_CHUNK_BYTES', 32):
+      model.save_weights(h5_path)
+      for mmap in [False, True]:
+        model = make_model()
+        model.load_weights(h5_path, experimental_mmap=mmap)
+        self.assertAllClose(ref_y, model.predict(x))
+
+    with h5py.File(h5_path, 'r') as f:
+      dataset = f[layer_name][kernel_name]
+      self.assertIs(dataset, saving._load_dataset(dataset))
+      kernel = saving._load_dataset(dataset, mmap=True)
+      self.assertIsInstance(kernel, np.memmap)
+      self.assertAllEqual(np.asarray(dataset), kernel)
+
   def test_sequential_weight_loading(self):
     if h5py is None:
       return
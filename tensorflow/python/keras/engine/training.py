@@ -1308,6 +1308,7 @@ class Model(Network):
           max_queue_size=10,
           workers=1,
           use_multiprocessing=False,
+          experimental_prefetch=False,
           **kwargs):
     """Trains the model for a fixed number of epochs (iterations on a dataset).
 
@@ -1423,6 +1424,9 @@ class Model(Network):
             `False`. Note that because this implementation relies on
             multiprocessing, you should not pass non-picklable arguments to
             the generator as they can't be passed easily to children processes.
+        experimental_prefetch: Boolean. Used for Numpy array input only, when
+            graph building. If `True`, the next batch is gathered on a
+            background thread while the model trains on the current one.
         **kwargs: Used for backwards compatibility.
 
     Returns:
@@ -1592,7 +1596,8 @@ class Model(Network):
           shuffle=shuffle,
           initial_epoch=initial_epoch,
           steps_per_epoch=steps_per_epoch,
-          validation_steps=validation_steps)
+          validation_steps=validation_steps,
+          prefetch=experimental_prefetch)
 
   def evaluate(self,
                x=None,
@@ -1738,7 +1743,8 @@ class Model(Network):
               steps=None,
               max_queue_size=10,
               workers=1,
-              use_multiprocessing=False):
+              use_multiprocessing=False,
+              experimental_prefetch=False):
     """Generates output predictions for the input samples.
 
     Computation is done in batches.
@@ -1775,6 +1781,9 @@ class Model(Network):
             `False`. Note that because this implementation relies on
             multiprocessing, you should not pass non-picklable arguments to
             the generator as they can't be passed easily to children processes.
+        experimental_prefetch: Boolean. Used for Numpy array input only, when
+            graph building. If `True`, the next batch is gathered on a
+            background thread while the model predicts the current one.
 
 
     Returns:
@@ -1831,7 +1840,8 @@ class Model(Network):
       return results
     else:
       return training_arrays.predict_loop(
-          self, x, batch_size=batch_size, verbose=verbose, steps=steps)
+          self, x, batch_size=batch_size, verbose=verbose, steps=steps,
+          prefetch=experimental_prefetch)
 
   def train_on_batch(self, x, y=None, sample_weight=None, class_weight=None):
     """Runs a single gradient update on a single batch of data.
@@ -2253,6 +2263,96 @@ class Model(Network):
         use_multiprocessing=use_multiprocessing,
         verbose=verbose)
 
+  def experimental_predict_batches(self,
+                                   x,
+                                   batch_size=None,
+                                   verbose=0,
+                                   steps=None,
+                                   max_queue_size=10,
+                                   workers=1,
+                                   use_multiprocessing=False,
+                                   sink=None):
+    """Generates output predictions for the input samples batch by batch.
+
+    Unlike `predict`, the predictions are not accumulated in memory: each
+    batch is handed over as soon as it is computed, so that predicting on
+    more samples than fit in memory is possible.
+
+    Arguments:
+        x: Input samples, as accepted by `predict`.
+        batch_size: Integer or `None`.
+            Number of samples per batch.
+            If unspecified, `batch_size` will default to 32.
+            Do not specify the `batch_size` is your data is in the
+            form of symbolic tensors, dataset, dataset iterators,
+            generators, or `keras.utils.Sequence` instances (since they generate
+            batches).
+        verbose: Verbosity mode, 0 or 1.
+        steps: Total number of steps (batches of samples)
+            before declaring the prediction round finished.
+            Ignored with the default value of `None`.
+        max_queue_size: Integer. Used for generator or `keras.utils.Sequence`
+            input only. Maximum size for the generator queue.
+        workers: Integer. Used for generator or `keras.utils.Sequence` input
+            only. Maximum number of processes to spin up when using
+            process-based threading.
+        use_multiprocessing: Boolean. Used for generator or
+            `keras.utils.Sequence` input only. If `True`, use process-based
+            threading.
+        sink: Where to write the predictions, or `None`. It could be:
+          - A Numpy array (e.g. a `np.memmap`), or a list of arrays
+            (in case the model has multiple outputs), which is filled
+            from its first row onwards.
+          - A `tf.python_io.TFRecordWriter`, to which each sample is
+            written as a `tf.train.Example` with one feature per output,
+            named after the output.
+          - A callable, called with each batch of predictions.
+
+    Returns:
+        If `sink` is `None`, a generator yielding the Numpy array(s) of
+        predictions of each batch. Otherwise, the number of samples
+        written to `sink`.
+
+    Raises:
+        NotImplementedError: If the model was compiled with a
+            DistributionStrategy.
+        ValueError: In case of mismatch between the provided
+            input data and the model's expectations.
+    """
+    if self._distribution_strategy:
+      raise NotImplementedError('`experimental_predict_batches` is not '
+                                'supported for models compiled with '
+                                'DistributionStrategy.')
+
+    if data_utils.is_generator_or_sequence(x):
+      batches = training_generator.iterate_generator_predictions(
+          self,
+          x,
+          steps=steps,
+          max_queue_size=max_queue_size,
+          workers=workers,
+          use_multiprocessing=use_multiprocessing,
+          verbose=verbose)
+    else:
+      # Backwards compatibility.
+      if batch_size is None and steps is None:
+        batch_size = 32
+
+      x, _, _ = self._standardize_user_data(
+          x, check_steps=True, steps_name='steps', steps=steps)
+
+      if context.executing_eagerly():
+        batches = training_eager.iterate_predictions(
+            self, x, batch_size=batch_size, verbose=verbose, steps=steps)
+      else:
+        batches = training_arrays.iterate_predictions(
+            self, x, batch_size=batch_size, verbose=verbose, steps=steps,
+            prefetch=True)
+
+    if sink is not None:
+      return training_utils.write_predictions(batches, sink, self.output_names)
+    return (outs[0] if len(outs) == 1 else outs for outs in batches)
+
   def _get_callback_model(self):
     """Returns the Callback Model for this Model."""
 
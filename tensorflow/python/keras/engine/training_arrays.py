@@ -50,7 +50,8 @@ def fit_loop(model,
              shuffle=True,
              initial_epoch=0,
              steps_per_epoch=None,
-             validation_steps=None):
+             validation_steps=None,
+             prefetch=False):
   """Abstract fit function for arrays of data.
 
   Arguments:
@@ -76,6 +77,8 @@ def fit_loop(model,
       validation_steps: Number of steps to run validation for
           (only if doing validation from data tensors).
           Ignored with the default value of `None`.
+      prefetch: Whether to gather the next batch of the arrays on a
+          background thread during each training step.
 
   Returns:
       `History` object.
@@ -192,25 +195,16 @@ def fit_loop(model,
         np.random.shuffle(index_array)
 
       batches = make_batches(num_train_samples, batch_size)
+      batch_iterator = training_utils.iterate_batches(
+          ins, index_array, batches, indices_for_conversion_to_dense,
+          prefetch=prefetch)
 
-      for batch_index, (batch_start, batch_end) in enumerate(batches):
-        batch_ids = index_array[batch_start:batch_end]
-        try:
-          if isinstance(ins[-1], int):
-            # Do not slice the training phase flag.
-            ins_batch = slice_arrays(ins[:-1], batch_ids) + [ins[-1]]
-          else:
-            ins_batch = slice_arrays(ins, batch_ids)
-        except TypeError:
-          raise TypeError('TypeError while preparing batch. '
-                          'If using HDF5 input data, '
-                          'pass shuffle="batch".')
+      for batch_index, ins_batch in enumerate(batch_iterator):
+        batch_start, batch_end = batches[batch_index]
         batch_logs = {}
         batch_logs['batch'] = batch_index
-        batch_logs['size'] = len(batch_ids)
+        batch_logs['size'] = batch_end - batch_start
         callbacks.on_batch_begin(batch_index, batch_logs)
-        for i in indices_for_conversion_to_dense:
-          ins_batch[i] = ins_batch[i].toarray()
 
         outs = f(ins_batch)
         if not isinstance(outs, list):
@@ -236,6 +230,7 @@ def fit_loop(model,
             # Same labels assumed.
             for l, o in zip(model.metrics_names, val_outs):
               epoch_logs['val_' + l] = o
+      batch_iterator.close()
     callbacks.on_epoch_end(epoch, epoch_logs)
     if callbacks.model.stop_training:
       break
@@ -243,8 +238,9 @@ def fit_loop(model,
   return model.history
 
 
-def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None):
-  """Abstract method to loop over some data in batches.
+def iterate_predictions(model, inputs, batch_size=32, verbose=0, steps=None,
+                        prefetch=False):
+  """Yields the predictions of a model for each batch of some data.
 
   Arguments:
       model: Keras Model instance.
@@ -254,11 +250,11 @@ def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None):
       steps: Total number of steps (batches of samples)
           before declaring `_predict_loop` finished.
           Ignored with the default value of `None`.
+      prefetch: Whether to gather the next batch of the arrays on a
+          background thread during each prediction step.
 
-  Returns:
-      Array of predictions (if the model has a single output)
-      or list of arrays of predictions
-      (if the model has multiple outputs).
+  Yields:
+      Lists with the batch of predictions of each output of the model.
   """
   model._make_predict_function()
   f = model.predict_function
@@ -283,6 +279,66 @@ def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None):
         not K.is_sparse(model._feed_inputs[i])):
       indices_for_conversion_to_dense.append(i)
 
+  if steps is not None:
+    # Step-based predictions.
+    for step in range(steps):
+      batch_outs = f(ins)
+      if not isinstance(batch_outs, list):
+        batch_outs = [batch_outs]
+      if verbose == 1:
+        progbar.update(step + 1)
+      yield batch_outs
+  else:
+    # Sample-based predictions.
+    batches = make_batches(num_samples, batch_size)
+    index_array = np.arange(num_samples)
+    batch_iterator = training_utils.iterate_batches(
+        ins, index_array, batches, indices_for_conversion_to_dense,
+        prefetch=prefetch)
+    try:
+      for batch_index, ins_batch in enumerate(batch_iterator):
+        batch_outs = f(ins_batch)
+        if not isinstance(batch_outs, list):
+          batch_outs = [batch_outs]
+        if prefetch:
+          # The buffers of the batch are reused for the next batches, and an
+          # output may alias its input.
+          batch_outs = [
+              np.copy(batch_out) if any(
+                  isinstance(x, np.ndarray) and
+                  np.may_share_memory(batch_out, x) for x in ins_batch)
+              else batch_out
+              for batch_out in batch_outs]
+        if verbose == 1:
+          progbar.update(batches[batch_index][1])
+        yield batch_outs
+    finally:
+      batch_iterator.close()
+
+
+def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None,
+                 prefetch=False):
+  """Abstract method to loop over some data in batches.
+
+  Arguments:
+      model: Keras Model instance.
+      inputs: list of tensors to be fed to `f`.
+      batch_size: integer batch size.
+      verbose: verbosity mode.
+      steps: Total number of steps (batches of samples)
+          before declaring `_predict_loop` finished.
+          Ignored with the default value of `None`.
+      prefetch: Whether to gather the next batch of the arrays on a
+          background thread during each prediction step.
+
+  Returns:
+      Array of predictions (if the model has a single output)
+      or list of arrays of predictions
+      (if the model has multiple outputs).
+  """
+  all_batch_outs = iterate_predictions(
+      model, inputs, batch_size=batch_size, verbose=verbose, steps=steps,
+      prefetch=prefetch)
   if steps is not None:
     # Step-based predictions.
     # Since we do not know how many samples
@@ -291,17 +347,12 @@ def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None):
     # Instead, we store one array per batch seen
     # and concatenate them upon returning.
     unconcatenated_outs = []
-    for step in range(steps):
-      batch_outs = f(ins)
-      if not isinstance(batch_outs, list):
-        batch_outs = [batch_outs]
+    for step, batch_outs in enumerate(all_batch_outs):
       if step == 0:
         for batch_out in batch_outs:
           unconcatenated_outs.append([])
       for i, batch_out in enumerate(batch_outs):
         unconcatenated_outs[i].append(batch_out)
-      if verbose == 1:
-        progbar.update(step + 1)
     if len(unconcatenated_outs) == 1:
       return np.concatenate(unconcatenated_outs[0], axis=0)
     return [
@@ -310,31 +361,21 @@ def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None):
     ]
   else:
     # Sample-based predictions.
+    num_samples = training_utils.check_num_samples(
+        training_utils.ModelInputs(inputs).as_list(), batch_size, steps,
+        'steps')
     outs = []
-    batches = make_batches(num_samples, batch_size)
-    index_array = np.arange(num_samples)
-    for batch_index, (batch_start, batch_end) in enumerate(batches):
-      batch_ids = index_array[batch_start:batch_end]
-      if ins and isinstance(ins[-1], int):
-        # Do not slice the training phase flag.
-        ins_batch = slice_arrays(ins[:-1], batch_ids) + [ins[-1]]
-      else:
-        ins_batch = slice_arrays(ins, batch_ids)
-      for i in indices_for_conversion_to_dense:
-        ins_batch[i] = ins_batch[i].toarray()
-
-      batch_outs = f(ins_batch)
-      if not isinstance(batch_outs, list):
-        batch_outs = [batch_outs]
+    batch_start = 0
+    for batch_index, batch_outs in enumerate(all_batch_outs):
       if batch_index == 0:
         # Pre-allocate the results arrays.
         for batch_out in batch_outs:
           shape = (num_samples,) + batch_out.shape[1:]
           outs.append(np.zeros(shape, dtype=batch_out.dtype))
+      batch_end = batch_start + len(batch_outs[0])
       for i, batch_out in enumerate(batch_outs):
         outs[i][batch_start:batch_end] = batch_out
-      if verbose == 1:
-        progbar.update(batch_end)
+      batch_start = batch_end
     if len(outs) == 1:
       return outs[0]
     return outs
@@ -447,8 +447,8 @@ def iterator_test_loop(model, inputs, steps, verbose=0):
   return outs
 
 
-def iterator_predict_loop(model, inputs, steps, verbose=0):
-  """Predict function for eager execution when input is dataset iterator.
+def iterate_iterator_predictions(model, inputs, steps, verbose=0):
+  """Yields the predictions of a model for each batch of a dataset iterator.
 
   Arguments:
       model: Instance of `Model`.
@@ -457,9 +457,8 @@ def iterator_predict_loop(model, inputs, steps, verbose=0):
           `_predict_loop` finished.
       verbose: Verbosity mode.
 
-  Returns:
-      Array of predictions (if the model has a single output)
-      or list of arrays of predictions (if the model has multiple outputs).
+  Yields:
+      Lists with the batch of predictions of each output of the model.
 
   Raises:
       ValueError: In case of mismatch between given number of inputs and
@@ -473,7 +472,6 @@ def iterator_predict_loop(model, inputs, steps, verbose=0):
         ' - `(input)`, or `(input, target)`, or `(input, target,'
         'sample_weights)`. Received %s. We do not use the `target` or'
         '`sample_weights` value here.' % inputs.output_shapes)
-  outs = []
   if verbose == 1:
     progbar = generic_utils.Progbar(target=steps)
 
@@ -506,6 +504,32 @@ def iterator_predict_loop(model, inputs, steps, verbose=0):
     if not isinstance(batch_outs, list):
       batch_outs = [batch_outs]
 
+    if verbose == 1:
+      progbar.update(step_index + 1)
+    yield [backend.get_value(batch_out) for batch_out in batch_outs]
+
+
+def iterator_predict_loop(model, inputs, steps, verbose=0):
+  """Predict function for eager execution when input is dataset iterator.
+
+  Arguments:
+      model: Instance of `Model`.
+      inputs: Input dataset iterator.
+      steps: Total number of steps (batches of samples) before declaring
+          `_predict_loop` finished.
+      verbose: Verbosity mode.
+
+  Returns:
+      Array of predictions (if the model has a single output)
+      or list of arrays of predictions (if the model has multiple outputs).
+
+  Raises:
+      ValueError: In case of mismatch between given number of inputs and
+        expectations of the model.
+  """
+  outs = []
+  for step_index, batch_outs in enumerate(
+      iterate_iterator_predictions(model, inputs, steps, verbose=verbose)):
     # We collect the results from every step and then concatenate them once
     # in the end. This is an expensive process. We are doing this because we
     # do not know the number of samples beforehand.
@@ -513,10 +537,7 @@ def iterator_predict_loop(model, inputs, steps, verbose=0):
       for _ in batch_outs:
         outs.append([])
     for i, batch_out in enumerate(batch_outs):
-      outs[i].append(backend.get_value(batch_out))
-
-    if verbose == 1:
-      progbar.update(step_index + 1)
+      outs[i].append(batch_out)
   for i, out in enumerate(outs):
     outs[i] = np.concatenate(tuple(out), axis=0)
   if len(outs) == 1:
@@ -832,3 +853,32 @@ def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None):
     inputs, steps = training_utils.convert_to_iterator(
         x=inputs, batch_size=batch_size, steps_per_epoch=steps)
     return iterator_predict_loop(model, inputs, steps, verbose=verbose)
+
+
+def iterate_predictions(model, inputs, batch_size=32, verbose=0, steps=None):
+  """Yields the predictions of a model for each batch when executing eagerly.
+
+  Arguments:
+      model: Instance of `Model`.
+      inputs: List of input arrays.
+      batch_size: integer batch size.
+      verbose: verbosity mode.
+      steps: Total number of steps (batches of samples)
+          before declaring `_predict_loop` finished.
+          Ignored with the default value of `None`.
+
+  Yields:
+      Lists with the batch of predictions of each output of the model.
+  """
+  inputs, steps = training_utils.convert_to_iterator(
+      x=inputs, batch_size=batch_size, steps_per_epoch=steps)
+  batch_iterator = iterate_iterator_predictions(
+      model, inputs, steps, verbose=verbose)
+  while True:
+    # The learning phase is only set while predicting, not while the caller
+    # handles the predictions.
+    with backend.learning_phase_scope(0):
+      batch_outs = next(batch_iterator, None)
+    if batch_outs is None:
+      return
+    yield batch_outs
@@ -339,19 +339,24 @@ def evaluate_generator(model,
     return averages
 
 
-def predict_generator(model,
-                      generator,
-                      steps=None,
-                      max_queue_size=10,
-                      workers=1,
-                      use_multiprocessing=False,
-                      verbose=0):
-  """See docstring for `Model.predict_generator`."""
+def iterate_generator_predictions(model,
+                                  generator,
+                                  steps=None,
+                                  max_queue_size=10,
+                                  workers=1,
+                                  use_multiprocessing=False,
+                                  verbose=0):
+  """Yields the predictions of a model for each batch of a generator.
+
+  See `Model.predict_generator` for the arguments.
+
+  Yields:
+      Lists with the batch of predictions of each output of the model.
+  """
   if not context.executing_eagerly():
     model._make_test_function()
 
   steps_done = 0
-  all_outs = []
   is_sequence = isinstance(generator, Sequence)
   if not is_sequence and use_multiprocessing and workers > 1:
     logging.warning(
@@ -410,21 +415,42 @@ def predict_generator(model,
       outs = model.predict_on_batch(x)
       if not isinstance(outs, list):
         outs = [outs]
-
-      if not all_outs:
-        for out in outs:
-          all_outs.append([])
-
-      for i, out in enumerate(outs):
-        all_outs[i].append(out)
       steps_done += 1
       if verbose == 1:
         progbar.update(steps_done)
+      yield outs
 
   finally:
     if enqueuer is not None:
       enqueuer.stop()
 
+
+def predict_generator(model,
+                      generator,
+                      steps=None,
+                      max_queue_size=10,
+                      workers=1,
+                      use_multiprocessing=False,
+                      verbose=0):
+  """See docstring for `Model.predict_generator`."""
+  steps_done = 0
+  all_outs = []
+  for outs in iterate_generator_predictions(
+      model,
+      generator,
+      steps=steps,
+      max_queue_size=max_queue_size,
+      workers=workers,
+      use_multiprocessing=use_multiprocessing,
+      verbose=verbose):
+    if not all_outs:
+      for out in outs:
+        all_outs.append([])
+
+    for i, out in enumerate(outs):
+      all_outs[i].append(out)
+    steps_done += 1
+
   if len(all_outs) == 1:
     if steps_done == 1:
       return all_outs[0][0]
@@ -19,9 +19,11 @@ from __future__ import division
 from __future__ import print_function
 
 import logging
+import os
 
 import numpy as np
 
+from tensorflow.core.example import example_pb2
 from tensorflow.python import keras
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.eager import context
@@ -33,6 +35,7 @@ from tensorflow.python.keras import metrics as metrics_module
 from tensorflow.python.keras import testing_utils
 from tensorflow.python.keras.engine.training_utils import weighted_masked_objective
 from tensorflow.python.keras.utils.generic_utils import slice_arrays
+from tensorflow.python.lib.io import tf_record
 from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import sparse_ops
 from tensorflow.python.ops import variables as variables_lib
@@ -332,6 +335,97 @@ class TrainingTest(test.TestCase):
     })
     self.assertEqual(len(out), 2)
 
+  def test_fit_predict_with_prefetch(self):
+    with self.test_session():
+      model = keras.models.Sequential()
+      model.add(keras.layers.Dense(2, input_shape=(3,)))
+      model.compile(RMSPropOptimizer(learning_rate=0.001), 'mse')
+
+      x = np.random.random((25, 3))
+      y = np.random.random((25, 2))
+      model.fit(x, y, batch_size=4, epochs=2, verbose=0,
+                experimental_prefetch=True)
+      model.fit(x, y, batch_size=4, epochs=1, verbose=0, shuffle='batch',
+                experimental_prefetch=True)
+
+      # Stopping during an epoch interrupts the prefetching.
+      batches_seen = []
+      def on_batch_end(batch, logs):
+        batches_seen.append(batch)
+        model.stop_training = batch == 2
+      model.fit(x, y, batch_size=4, epochs=3, verbose=0,
+                experimental_prefetch=True,
+                callbacks=[keras.callbacks.LambdaCallback(
+                    on_batch_end=on_batch_end)])
+      self.assertEqual([0, 1, 2], batches_seen)
+
+      self.assertAllClose(
+          model.predict(x, batch_size=4),
+          model.predict(x, batch_size=4, experimental_prefetch=True))
+
+  @tf_test_util.run_in_graph_and_eager_modes
+  def test_predict_batches(self):
+    inputs = keras.layers.Input(shape=(3,))
+    outputs = [keras.layers.Dense(2)(inputs), keras.layers.Dense(1)(inputs)]
+    model = keras.models.Model(inputs, outputs)
+    model.compile(RMSPropOptimizer(learning_rate=0.001), 'mse')
+    x = np.random.random((10, 3)).astype(np.float32)
+    expected = model.predict(x, batch_size=4)
+
+    batches = list(model.experimental_predict_batches(x, batch_size=4))
+    self.assertEqual(3, len(batches))
+    for i in range(2):
+      self.assertAllClose(expected[i],
+                          np.concatenate([batch[i] for batch in batches]))
+
+    sink = [np.memmap(os.path.join(self.get_temp_dir(), 'out_%d' % i),
+                      dtype=np.float32, mode='w+', shape=out.shape)
+            for i, out in enumerate(expected)]
+    self.assertEqual(10, model.experimental_predict_batches(
+        x, batch_size=4, sink=sink))
+    self.assertAllClose(expected[0], sink[0])
+    self.assertAllClose(expected[1], sink[1])
+    with self.assertRaisesRegexp(ValueError, 'do not fit'):
+      model.experimental_predict_batches(
+          x, batch_size=4, sink=[np.zeros((5, 2)), np.zeros((5, 1))])
+    with self.assertRaisesRegexp(ValueError, 'Got 1 sink arrays'):
+      model.experimental_predict_batches(
+          x, batch_size=4, sink=np.zeros((10, 2)))
+
+    seen = []
+    self.assertEqual(10, model.experimental_predict_batches(
+        x, batch_size=4, sink=seen.append))
+    self.assertEqual([4, 4, 2], [len(batch[0]) for batch in seen])
+
+    path = os.path.join(self.get_temp_dir(), 'predictions.tfrecord')
+    with tf_record.TFRecordWriter(path) as writer:
+      model.experimental_predict_batches(x, batch_size=4, sink=writer)
+    records = list(tf_record.tf_record_iterator(path))
+    self.assertEqual(10, len(records))
+    example = example_pb2.Example.FromString(records[3])
+    self.assertAllClose(
+        expected[0][3],
+        example.features.feature[model.output_names[0]].float_list.value)
+
+    with self.assertRaisesRegexp(TypeError, 'Unsupported prediction sink'):
+      model.experimental_predict_batches(x, batch_size=4, sink='sink')
+
+  @tf_test_util.run_in_graph_and_eager_modes
+  def test_predict_batches_with_generator(self):
+    model = testing_utils.get_small_sequential_mlp(
+        num_hidden=4, num_classes=2, input_dim=3)
+    model.compile(RMSPropOptimizer(learning_rate=0.001), 'mse')
+    x = np.random.random((8, 3)).astype(np.float32)
+
+    def generator():
+      while True:
+        yield x[:4]
+
+    batches = list(model.experimental_predict_batches(
+        generator(), steps=2, workers=0))
+    self.assertEqual(2, len(batches))
+    self.assertAllClose(model.predict(x[:4]), batches[1])
+
   @tf_test_util.run_in_graph_and_eager_modes
   def test_invalid_loss(self):
     num_classes = 5
@@ -21,10 +21,13 @@ from __future__ import print_function
 from collections import OrderedDict
 import copy
 import math
+import sys
+import threading
 
 import numpy as np
 import six
 
+from tensorflow.core.example import example_pb2
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.data.ops import iterator_ops
 from tensorflow.python.eager import context
@@ -34,11 +37,18 @@ from tensorflow.python.framework import tensor_util
 from tensorflow.python.keras import backend as K
 from tensorflow.python.keras import losses
 from tensorflow.python.keras import metrics as metrics_module
+from tensorflow.python.keras.utils.generic_utils import slice_arrays
+from tensorflow.python.lib.io import tf_record
 from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import weights_broadcast_ops
 from tensorflow.python.util import nest
 
+try:
+  import queue  # pylint: disable=g-import-not-at-top
+except ImportError:
+  import Queue as queue  # pylint: disable=g-import-not-at-top
+
 
 def _map_nested(data, func):
   """Maps each nested element using func."""
@@ -571,6 +581,237 @@ def batch_shuffle(index_array, batch_size):
   return np.append(index_array, last_batch)
 
 
+def _gather_batch(ins, batch_ids, indices_for_conversion_to_dense,
+                  buffers=None):
+  """Gathers the samples `batch_ids` of each array in `ins`.
+
+  Arguments:
+      ins: List of arrays, possibly ending with the integer learning phase
+          flag, which is not sliced.
+      batch_ids: Array of the indices of the samples in the batch.
+      indices_for_conversion_to_dense: Indices in `ins` of sparse arrays to
+          convert to dense arrays.
+      buffers: Optional list with, for each array in `ins`, either a Numpy
+          array with at least `len(batch_ids)` rows to gather it into, or
+          `None`.
+
+  Returns:
+      The list of batches of the arrays.
+
+  Raises:
+      TypeError: If the arrays cannot be indexed with `batch_ids`.
+  """
+  if ins and isinstance(ins[-1], int):
+    # Do not slice the training phase flag.
+    arrays, learning_phase = ins[:-1], ins[-1:]
+  else:
+    arrays, learning_phase = ins, []
+  try:
+    if buffers is None:
+      ins_batch = slice_arrays(arrays, batch_ids)
+    else:
+      ins_batch = []
+      for array, buf in zip(arrays, buffers):
+        if buf is None:
+          ins_batch.append(slice_arrays([array], batch_ids)[0])
+        else:
+          ins_batch.append(np.take(array, batch_ids, axis=0,
+                                   out=buf[:len(batch_ids)], mode='clip'))
+  except TypeError:
+    raise TypeError('TypeError while preparing batch. '
+                    'If using HDF5 input data, '
+                    'pass shuffle="batch".')
+  for i in indices_for_conversion_to_dense:
+    ins_batch[i] = ins_batch[i].toarray()
+  return ins_batch + learning_phase
+
+
+class _BatchPrefetcher(object):
+  """Gathers batches of arrays on a background thread.
+
+  Numpy arrays are gathered into two sets of buffers allocated once: the next
+  batch is gathered into one of them while the current batch, held by the
+  other, is used. Other arrays (e.g. HDF5 datasets or sparse matrices) are
+  sliced as usual, but on the background thread as well.
+  """
+
+  _NUM_BUFFERS = 2
+
+  def __init__(self, ins, index_array, batches,
+               indices_for_conversion_to_dense):
+    self._ins = ins
+    self._index_array = index_array
+    self._batches = batches
+    self._indices_for_conversion_to_dense = indices_for_conversion_to_dense
+    batch_size = max([end - start for start, end in batches] + [0])
+    self._free_buffers = queue.Queue()
+    for _ in range(self._NUM_BUFFERS):
+      self._free_buffers.put([
+          np.empty((batch_size,) + x.shape[1:], dtype=x.dtype)
+          if isinstance(x, np.ndarray) else None
+          for x in ins if not isinstance(x, int)])
+    self._ready_batches = queue.Queue()
+    self._stopped = threading.Event()
+    self._thread = threading.Thread(target=self._gather_batches)
+    self._thread.daemon = True
+    self._thread.start()
+
+  def _gather_batches(self):
+    try:
+      for batch_start, batch_end in self._batches:
+        buffers = self._free_buffers.get()
+        if self._stopped.is_set():
+          return
+        ins_batch = _gather_batch(
+            self._ins, self._index_array[batch_start:batch_end],
+            self._indices_for_conversion_to_dense, buffers=buffers)
+        self._ready_batches.put((buffers, ins_batch, None))
+    except Exception:  # pylint: disable=broad-except
+      self._ready_batches.put((None, None, sys.exc_info()))
+
+  def __iter__(self):
+    try:
+      for _ in self._batches:
+        buffers, ins_batch, exc_info = self._ready_batches.get()
+        if exc_info is not None:
+          six.reraise(*exc_info)
+        yield ins_batch
+        # The batch was used, its buffers can be gathered into again.
+        self._free_buffers.put(buffers)
+    finally:
+      self._stopped.set()
+      # Wakes up the background thread if it waits for buffers.
+      self._free_buffers.put(None)
+
+
+def iterate_batches(ins, index_array, batches,
+                    indices_for_conversion_to_dense=(), prefetch=False):
+  """Yields batches of arrays.
+
+  Arguments:
+      ins: List of arrays, possibly ending with the integer learning phase
+          flag, which is passed along with each batch.
+      index_array: Array of the indices of the samples, in the order in which
+          they are batched.
+      batches: List of `(batch_start, batch_end)` positions of the batches in
+          `index_array`, as returned by `make_batches`.
+      indices_for_conversion_to_dense: Indices in `ins` of sparse arrays to
+          convert to dense arrays.
+      prefetch: Whether to gather the next batch on a background thread while
+          the current one is used. Prefetched batches of Numpy arrays are
+          gathered into reused buffers: each yielded batch is only valid until
+          the next one is requested.
+
+  Yields:
+      Lists of the batches of the arrays in `ins`.
+  """
+  if prefetch:
+    prefetched_batches = iter(_BatchPrefetcher(
+        ins, index_array, batches, indices_for_conversion_to_dense))
+    try:
+      for ins_batch in prefetched_batches:
+        yield ins_batch
+    finally:
+      # Stops the background thread if the iteration was interrupted.
+      prefetched_batches.close()
+  else:
+    for batch_start, batch_end in batches:
+      yield _gather_batch(ins, index_array[batch_start:batch_end],
+                          indices_for_conversion_to_dense)
+
+
+def _array_sink(arrays):
+  """Returns a function writing batches of outputs to consecutive rows."""
+  position = [0]
+
+  def write(outs):
+    batch_size = len(outs[0])
+    start = position[0]
+    for array, out in zip(arrays, outs):
+      if start + batch_size > len(array):
+        raise ValueError(
+            'The predictions do not fit in the sink arrays: got at least %d '
+            'samples, but the sink arrays have %d rows.' %
+            (start + batch_size, len(array)))
+      array[start:start + batch_size] = out
+    position[0] += batch_size
+
+  return write
+
+
+def _tf_record_sink(writer, output_names):
+  """Returns a function writing each sample's outputs as a `tf.Example`."""
+
+  def write(outs):
+    for i in range(len(outs[0])):
+      example = example_pb2.Example()
+      for name, out in zip(output_names, outs):
+        values = np.asarray(out[i]).ravel()
+        feature = example.features.feature[name]
+        if values.dtype.kind in 'biu':
+          feature.int64_list.value.extend(values.tolist())
+        elif values.dtype.kind == 'f':
+          feature.float_list.value.extend(values.tolist())
+        else:
+          feature.bytes_list.value.extend(values.tolist())
+      writer.write(example.SerializeToString())
+
+  return write
+
+
+def write_predictions(batches, sink, output_names):
+  """Writes batches of predictions to `sink` as they are produced.
+
+  Arguments:
+      batches: Iterable of lists with the batch of predictions of each output.
+      sink: Where to write the predictions. Either:
+          - A Numpy array (e.g. a `np.memmap`), or a list of arrays if the
+            model has multiple outputs, filled from the first row onwards.
+          - A `tf.python_io.TFRecordWriter`, to which each sample is written
+            as a `tf.train.Example` with a feature per output, named after it.
+          - A callable, called with each batch of predictions: an array if
+            the model has a single output, else a list of arrays.
+      output_names: The names of the outputs of the model.
+
+  Returns:
+      The number of samples written.
+
+  Raises:
+      TypeError: If `sink` is not a supported sink.
+      ValueError: If the number of sink arrays does not match the number of
+          outputs, or the predictions do not fit in the sink arrays.
+  """
+  if isinstance(sink, tf_record.TFRecordWriter):
+    write = _tf_record_sink(sink, output_names)
+  elif isinstance(sink, np.ndarray) or (
+      isinstance(sink, (list, tuple)) and sink and
+      all(isinstance(array, np.ndarray) for array in sink)):
+    arrays = [sink] if isinstance(sink, np.ndarray) else sink
+    if len(arrays) != len(output_names):
+      raise ValueError('Got %d sink arrays for a model with %d outputs.' %
+                       (len(arrays), len(output_names)))
+    write = _array_sink(arrays)
+  elif callable(sink):
+    write = lambda outs: sink(outs[0] if len(outs) == 1 else outs)
+  else:
+    raise TypeError('Unsupported prediction sink: %s. Expected a Numpy array, '
+                    'a list of Numpy arrays, a TFRecordWriter or a callable.' %
+                    (sink,))
+  num_samples = 0
+  try:
+    for outs in batches:
+      write(outs)
+      num_samples += len(outs[0])
+  finally:
+    if hasattr(batches, 'close'):
+      # Stops the prefetching threads or the generator enqueuer on errors.
+      batches.close()
+  for array in nest.flatten(sink):
+    if isinstance(array, np.memmap):
+      array.flush()
+  return num_samples
+
+
 def weighted_masked_objective(fn):
   """Adds support for masking and sample-weighting to an objective function.
 
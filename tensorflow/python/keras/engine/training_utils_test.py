@@ -25,6 +25,7 @@ from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor_util
 from tensorflow.python.framework import test_util
 from tensorflow.python.keras.engine import training_utils
+from tensorflow.python.keras.utils import generic_utils
 from tensorflow.python.keras.utils import tf_utils
 from tensorflow.python.platform import test
 
@@ -235,5 +236,40 @@ class ModelInputsTest(test.TestCase):
       self.assertTrue(tf_utils.is_symbolic_tensor(vals['b']))
 
 
+class IterateBatchesTest(test.TestCase):
+
+  def test_prefetch(self):
+    x = np.arange(20).reshape((10, 2))
+    y = np.arange(10, dtype=np.float32)
+    index_array = np.random.permutation(10)
+    batches = generic_utils.make_batches(10, 3)
+    expected = [(x[index_array[start:end]], y[index_array[start:end]], 1)
+                for start, end in batches]
+    for prefetch in [False, True]:
+      batch_index = 0
+      for ins_batch in training_utils.iterate_batches(
+          [x, y, 1], index_array, batches, prefetch=prefetch):
+        expected_x, expected_y, _ = expected[batch_index]
+        self.assertAllEqual(expected_x, ins_batch[0])
+        self.assertAllEqual(expected_y, ins_batch[1])
+        self.assertEqual(1, ins_batch[2])
+        batch_index += 1
+      self.assertEqual(len(batches), batch_index)
+
+  def test_prefetch_interrupted(self):
+    x = np.ones((10, 2))
+    batch_iterator = training_utils.iterate_batches(
+        [x], np.arange(10), generic_utils.make_batches(10, 2), prefetch=True)
+    next(batch_iterator)
+    batch_iterator.close()
+
+  def test_prefetch_error(self):
+    batch_iterator = training_utils.iterate_batches(
+        [np.ones((10, 2)), 'not an array'], np.arange(10),
+        generic_utils.make_batches(10, 2), prefetch=True)
+    with self.assertRaisesRegexp(TypeError, 'while preparing batch'):
+      next(batch_iterator)
+
+
 if __name__ == '__main__':
   test.main()
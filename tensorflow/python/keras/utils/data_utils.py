@@ -20,6 +20,7 @@ from __future__ import print_function
 
 from abc import abstractmethod
 from contextlib import closing
+import ctypes
 import hashlib
 import multiprocessing
 from multiprocessing.pool import ThreadPool
@@ -39,6 +40,7 @@ from six.moves.urllib.error import URLError
 from six.moves.urllib.request import urlopen
 
 from tensorflow.python.keras.utils.generic_utils import Progbar
+from tensorflow.python.util import nest
 from tensorflow.python.util import tf_inspect
 from tensorflow.python.util.tf_export import tf_export
 
@@ -419,13 +421,104 @@ def iter_sequence_infinite(seq):
 
 # Global variables to be shared across processes
 _SHARED_SEQUENCES = {}
+# Shared-memory rings used to hand off batches, by enqueuer `uid`.
+_SHARED_RINGS = {}
 # We use a Value to provide unique id to different processes.
 _SEQUENCE_COUNTER = None
 
+# Offsets of the arrays written into a shared-memory slot are rounded up to a
+# multiple of this value, so that the NumPy views over them are aligned.
+_SLOT_ALIGNMENT = 64
 
-def init_pool(seqs):
+
+class _ArrayRef(object):
+  """The location of a NumPy array within a shared-memory slot."""
+
+  def __init__(self, offset, dtype, shape):
+    self.offset = offset
+    self.dtype = dtype
+    self.shape = shape
+
+
+class _SlotDescriptor(object):
+  """A batch written to a shared-memory slot, as sent back by a worker.
+
+  `structure` is the structure of the batch, where the arrays that were
+  written to the slot are replaced by `_ArrayRef`s, and any other value (e.g.
+  an array that did not fit in the slot) is sent as is.
+  """
+
+  def __init__(self, slot, structure):
+    self.slot = slot
+    self.structure = structure
+
+
+class _SharedMemoryRing(object):
+  """A fixed number of fixed-size slots in memory shared with the workers.
+
+  Slots are owned by the enqueuer, which hands a free slot to each task it
+  submits. The worker that runs the task writes the batch into the slot and
+  returns a `_SlotDescriptor`, so only the layout of the batch is pickled.
+  """
+
+  def __init__(self, num_slots, slot_bytes):
+    self.num_slots = num_slots
+    self.slot_bytes = slot_bytes
+    self.buffer = multiprocessing.RawArray(ctypes.c_char,
+                                           num_slots * slot_bytes)
+
+  def _view(self, slot, ref):
+    count = int(np.prod(ref.shape)) if ref.shape else 1
+    return np.frombuffer(
+        self.buffer,
+        dtype=ref.dtype,
+        count=count,
+        offset=slot * self.slot_bytes + ref.offset).reshape(ref.shape)
+
+  def write(self, slot, batch):
+    """Copies the arrays of `batch` into `slot`.
+
+    Arrays are written in order while they fit in the slot; the remaining
+    arrays, and values that are not arrays of a fixed-size dtype, are kept in
+    the returned descriptor.
+
+    Arguments:
+        slot: The index of the slot to write to.
+        batch: A nested structure of values.
+
+    Returns:
+        A `_SlotDescriptor`.
+    """
+    offset = 0
+    flat = []
+    for value in nest.flatten(batch):
+      if isinstance(value, np.ndarray) and not value.dtype.hasobject:
+        end = offset + value.nbytes
+        if end <= self.slot_bytes:
+          ref = _ArrayRef(offset, value.dtype.str, value.shape)
+          self._view(slot, ref)[...] = value
+          value = ref
+          offset = (end + _SLOT_ALIGNMENT - 1) // _SLOT_ALIGNMENT
+          offset *= _SLOT_ALIGNMENT
+      flat.append(value)
+    return _SlotDescriptor(slot, nest.pack_sequence_as(batch, flat))
+
+  def read(self, descriptor):
+    """Returns the batch in `descriptor`, with views over the slot."""
+    flat = [
+        self._view(descriptor.slot, value)
+        if isinstance(value, _ArrayRef) else value
+        for value in nest.flatten(descriptor.structure)
+    ]
+    return nest.pack_sequence_as(descriptor.structure, flat)
+
+
+def init_pool(seqs, rings=None):
   global _SHARED_SEQUENCES
+  global _SHARED_RINGS
   _SHARED_SEQUENCES = seqs
+  if rings is not None:
+    _SHARED_RINGS = rings
 
 
 def get_index(uid, i):
@@ -445,6 +538,20 @@ def get_index(uid, i):
   return _SHARED_SEQUENCES[uid][i]
 
 
+def get_index_in_slot(uid, i, slot):
+  """Writes the value from the Sequence `uid` at index `i` to `slot`.
+
+  Arguments:
+      uid: int, Sequence identifier
+      i: index
+      slot: index of a slot in the shared-memory ring of enqueuer `uid`
+
+  Returns:
+      A descriptor of the value, to be read by the enqueuer.
+  """
+  return _SHARED_RINGS[uid].write(slot, _SHARED_SEQUENCES[uid][i])
+
+
 @tf_export('keras.utils.SequenceEnqueuer')
 class SequenceEnqueuer(object):
   """Base class to enqueue inputs.
@@ -465,12 +572,34 @@ class SequenceEnqueuer(object):
   ```
 
   The `enqueuer.get()` should be an infinite stream of datas.
+
+  With `use_multiprocessing=True`, the batches produced by the worker processes
+  are pickled to be sent to the main process. If `shared_memory_slot_bytes` is
+  set, the NumPy arrays of each batch are instead written to one of
+  `max_queue_size + 1` slots of memory shared with the workers, and only the
+  layout of the batch is pickled. The arrays yielded by `get()` are then views
+  over the slot, which are only valid until the next batch is requested. Each
+  slot is reserved before the batch is requested from a worker, so at most
+  `max_queue_size` batches are pending at any time. Arrays that do not fit in
+  the remaining space of a slot are pickled as usual.
+
+  Arguments:
+      sequence: A `tf.keras.utils.data_utils.Sequence` object, or a generator.
+      use_multiprocessing: use multiprocessing if True, otherwise threading
+      shared_memory_slot_bytes: (Optional.) The size in bytes of each slot of
+          shared memory, which should be large enough to hold the arrays of
+          one batch. Ignored unless `use_multiprocessing=True`.
   """
 
   def __init__(self, sequence,
-               use_multiprocessing=False):
+               use_multiprocessing=False,
+               shared_memory_slot_bytes=None):
     self.sequence = sequence
     self.use_multiprocessing = use_multiprocessing
+    if shared_memory_slot_bytes is not None and shared_memory_slot_bytes <= 0:
+      raise ValueError('`shared_memory_slot_bytes` must be positive, got: %s' %
+                       shared_memory_slot_bytes)
+    self.shared_memory_slot_bytes = shared_memory_slot_bytes
 
     global _SEQUENCE_COUNTER
     if _SEQUENCE_COUNTER is None:
@@ -496,6 +625,9 @@ class SequenceEnqueuer(object):
     self.queue = None
     self.run_thread = None
     self.stop_signal = None
+    self._free_slots = None
+    self._held_slot = None
+    self._task_slots = {}
 
   def is_running(self):
     return self.stop_signal is not None and not self.stop_signal.is_set()
@@ -509,6 +641,14 @@ class SequenceEnqueuer(object):
             (when full, workers could block on `put()`)
     """
     if self.use_multiprocessing:
+      if self.shared_memory_slot_bytes is not None:
+        # One slot for each queued batch, and one for the batch being used.
+        num_slots = max_queue_size + 1
+        _SHARED_RINGS[self.uid] = _SharedMemoryRing(
+            num_slots, self.shared_memory_slot_bytes)
+        self._free_slots = queue.Queue()
+        for slot in range(num_slots):
+          self._free_slots.put(slot)
       self.executor_fn = self._get_executor_init(workers)
     else:
       # We do not need the init since it's threads.
@@ -540,6 +680,82 @@ class SequenceEnqueuer(object):
       self.queue.not_full.notify()
     self.run_thread.join(timeout)
     _SHARED_SEQUENCES[self.uid] = None
+    _SHARED_RINGS.pop(self.uid, None)
+    self._free_slots = None
+    self._held_slot = None
+    self._task_slots = {}
+
+  def _uses_shared_memory(self):
+    return self._free_slots is not None
+
+  def _acquire_slot(self):
+    """Waits for a free shared-memory slot.
+
+    Returns:
+        The index of the slot, or `None` if the enqueuer was stopped.
+    """
+    while not self.stop_signal.is_set():
+      try:
+        return self._free_slots.get(timeout=0.1)
+      except queue.Empty:
+        pass
+    return None
+
+  def _submit_in_slot(self, executor, func, args):
+    """Submits `func(*args, slot)` for a free shared-memory slot.
+
+    Returns:
+        The `Future` of the task, or `None` if the enqueuer was stopped.
+    """
+    slot = self._acquire_slot()
+    if slot is None:
+      return None
+    future = executor.apply_async(func, args + (slot,))
+    self._task_slots[future] = slot
+    return future
+
+  def _get_result(self, future):
+    """Waits for the result of a task.
+
+    If the task raised, or did not write its batch to a slot, the slot
+    reserved for it is released.
+
+    Arguments:
+        future: The `Future` of the task.
+
+    Returns:
+        A batch, or a `_SlotDescriptor`.
+    """
+    slot = self._task_slots.pop(future, None)
+    result = None
+    try:
+      result = future.get()
+    finally:
+      free_slots = self._free_slots
+      if (slot is not None and free_slots is not None and
+          not isinstance(result, _SlotDescriptor)):
+        free_slots.put(slot)
+    return result
+
+  def _unpack(self, result):
+    """Returns the batch in the result of a task.
+
+    Once a new batch is requested, the consumer is done with the previous one,
+    so its shared-memory slot is released for reuse.
+
+    Arguments:
+        result: A batch, or a `_SlotDescriptor`.
+
+    Returns:
+        The batch.
+    """
+    if self._held_slot is not None:
+      self._free_slots.put(self._held_slot)
+      self._held_slot = None
+    if isinstance(result, _SlotDescriptor):
+      self._held_slot = result.slot
+      return _SHARED_RINGS[self.uid].read(result)
+    return result
 
   @abstractmethod
   def _run(self):
@@ -580,10 +796,15 @@ class OrderedEnqueuer(SequenceEnqueuer):
       sequence: A `tf.keras.utils.data_utils.Sequence` object.
       use_multiprocessing: use multiprocessing if True, otherwise threading
       shuffle: whether to shuffle the data at the beginning of each epoch
+      shared_memory_slot_bytes: (Optional.) If set with
+          `use_multiprocessing=True`, batches are handed off through slots of
+          shared memory of this size. See `SequenceEnqueuer`.
   """
 
-  def __init__(self, sequence, use_multiprocessing=False, shuffle=False):
-    super(OrderedEnqueuer, self).__init__(sequence, use_multiprocessing)
+  def __init__(self, sequence, use_multiprocessing=False, shuffle=False,
+               shared_memory_slot_bytes=None):
+    super(OrderedEnqueuer, self).__init__(sequence, use_multiprocessing,
+                                          shared_memory_slot_bytes)
     self.shuffle = shuffle
 
   def _get_executor_init(self, workers):
@@ -597,8 +818,8 @@ class OrderedEnqueuer(SequenceEnqueuer):
     """
     def pool_fn(seqs):
       return multiprocessing.Pool(workers,
-                                  initializer=init_pool_generator,
-                                  initargs=(seqs, self.random_seed))
+                                  initializer=init_pool,
+                                  initargs=(seqs, _SHARED_RINGS))
     return pool_fn
 
   def _wait_queue(self):
@@ -620,8 +841,14 @@ class OrderedEnqueuer(SequenceEnqueuer):
         for i in sequence:
           if self.stop_signal.is_set():
             return
-          self.queue.put(
-              executor.apply_async(get_index, (self.uid, i)), block=True)
+          if self._uses_shared_memory():
+            future = self._submit_in_slot(executor, get_index_in_slot,
+                                          (self.uid, i))
+            if future is None:
+              return
+          else:
+            future = executor.apply_async(get_index, (self.uid, i))
+          self.queue.put(future, block=True)
 
         # Done with the current epoch, waiting for the final batches
         self._wait_queue()
@@ -646,7 +873,7 @@ class OrderedEnqueuer(SequenceEnqueuer):
     """
     try:
       while self.is_running():
-        inputs = self.queue.get(block=True).get()
+        inputs = self._unpack(self._get_result(self.queue.get(block=True)))
         self.queue.task_done()
         if inputs is not None:
           yield inputs
@@ -655,9 +882,8 @@ class OrderedEnqueuer(SequenceEnqueuer):
       six.reraise(*sys.exc_info())
 
 
-def init_pool_generator(gens, random_seed=None):
-  global _SHARED_SEQUENCES
-  _SHARED_SEQUENCES = gens
+def init_pool_generator(gens, random_seed=None, rings=None):
+  init_pool(gens, rings)
 
   if random_seed is not None:
     ident = multiprocessing.current_process().ident
@@ -680,6 +906,19 @@ def next_sample(uid):
   return six.next(_SHARED_SEQUENCES[uid])
 
 
+def next_sample_in_slot(uid, slot):
+  """Writes the next value from the generator `uid` to `slot`.
+
+  Arguments:
+      uid: int, generator identifier
+      slot: index of a slot in the shared-memory ring of enqueuer `uid`
+
+  Returns:
+      A descriptor of the value, to be read by the enqueuer.
+  """
+  return _SHARED_RINGS[uid].write(slot, six.next(_SHARED_SEQUENCES[uid]))
+
+
 @tf_export('keras.utils.GeneratorEnqueuer')
 class GeneratorEnqueuer(SequenceEnqueuer):
   """Builds a queue out of a data generator.
@@ -695,12 +934,17 @@ class GeneratorEnqueuer(SequenceEnqueuer):
       wait_time: time to sleep in-between calls to `put()`
       random_seed: Initial seed for workers,
           will be incremented by one for each worker.
+      shared_memory_slot_bytes: (Optional.) If set with
+          `use_multiprocessing=True`, batches are handed off through slots of
+          shared memory of this size. See `SequenceEnqueuer`.
   """
 
   def __init__(self, sequence,
                use_multiprocessing=False,
-               random_seed=None):
-    super(GeneratorEnqueuer, self).__init__(sequence, use_multiprocessing)
+               random_seed=None,
+               shared_memory_slot_bytes=None):
+    super(GeneratorEnqueuer, self).__init__(sequence, use_multiprocessing,
+                                            shared_memory_slot_bytes)
     self.random_seed = random_seed
 
   def _get_executor_init(self, workers):
@@ -715,7 +959,8 @@ class GeneratorEnqueuer(SequenceEnqueuer):
     def pool_fn(seqs):
       return multiprocessing.Pool(workers,
                                   initializer=init_pool_generator,
-                                  initargs=(seqs, self.random_seed))
+                                  initargs=(seqs, self.random_seed,
+                                            _SHARED_RINGS))
     return pool_fn
 
   def _run(self):
@@ -725,8 +970,14 @@ class GeneratorEnqueuer(SequenceEnqueuer):
       while True:
         if self.stop_signal.is_set():
           return
-        self.queue.put(
-            executor.apply_async(next_sample, (self.uid,)), block=True)
+        if self._uses_shared_memory():
+          future = self._submit_in_slot(executor, next_sample_in_slot,
+                                        (self.uid,))
+          if future is None:
+            return
+        else:
+          future = executor.apply_async(next_sample, (self.uid,))
+        self.queue.put(future, block=True)
 
   def get(self):
     """Creates a generator to extract data from the queue.
@@ -740,7 +991,7 @@ class GeneratorEnqueuer(SequenceEnqueuer):
     """
     try:
       while self.is_running():
-        inputs = self.queue.get(block=True).get()
+        inputs = self._unpack(self._get_result(self.queue.get(block=True)))
         self.queue.task_done()
         if inputs is not None:
           yield inputs
@@ -753,8 +1004,14 @@ class GeneratorEnqueuer(SequenceEnqueuer):
       for f in last_ones:
         f.wait()
       # Keep the good ones
-      last_ones = [future.get() for future in last_ones if future.successful()]
-      for inputs in last_ones:
+      results = []
+      for future in last_ones:
+        try:
+          results.append(self._get_result(future))
+        except Exception:  # pylint: disable=broad-except
+          pass
+      for inputs in results:
+        inputs = self._unpack(inputs)
         if inputs is not None:
           yield inputs
     except Exception as e:  # pylint: disable=broad-except
@@ -282,6 +282,87 @@ class TestEnqueuers(test.TestCase):
     enqueuer.stop()
     enqueuer2.stop()
 
+  def assert_in_shared_memory(self, enqueuer, batch):
+    ring = keras.utils.data_utils._SHARED_RINGS[enqueuer.uid]
+    self.assertTrue(
+        np.may_share_memory(batch, np.frombuffer(ring.buffer, dtype=np.uint8)))
+
+  @unittest.skipIf(
+      os.name == 'nt',
+      'use_multiprocessing=True does not work on windows properly.')
+  def test_ordered_enqueuer_shared_memory(self):
+    # Each float64 batch is 720KB.
+    enqueuer = keras.utils.data_utils.OrderedEnqueuer(
+        TestSequence([3, 100, 100, 3]), use_multiprocessing=True,
+        shared_memory_slot_bytes=2 ** 20)
+    enqueuer.start(3, 4)
+    gen_output = enqueuer.get()
+    acc = []
+    for _ in range(200):
+      batch = next(gen_output)
+      self.assertEqual((3, 100, 100, 3), batch.shape)
+      self.assert_in_shared_memory(enqueuer, batch)
+      acc.append(batch[2, 99, 99, 2])
+    self.assertEqual(acc[:100], list(range(100)))
+    self.assertEqual(acc[100:], list([k * 5 for k in range(100)]))
+    enqueuer.stop()
+
+  @unittest.skipIf(
+      os.name == 'nt',
+      'use_multiprocessing=True does not work on windows properly.')
+  def test_ordered_enqueuer_shared_memory_batch_too_large(self):
+    enqueuer = keras.utils.data_utils.OrderedEnqueuer(
+        TestSequence([3, 200, 200, 3]), use_multiprocessing=True,
+        shared_memory_slot_bytes=16)
+    enqueuer.start(3, 4)
+    gen_output = enqueuer.get()
+    acc = []
+    for _ in range(100):
+      acc.append(next(gen_output)[0, 0, 0, 0])
+    self.assertEqual(acc, list(range(100)))
+    enqueuer.stop()
+
+  @unittest.skipIf(
+      os.name == 'nt',
+      'use_multiprocessing=True does not work on windows properly.')
+  def test_generator_enqueuer_shared_memory(self):
+    enqueuer = keras.utils.data_utils.GeneratorEnqueuer(
+        create_generator_from_sequence_pcs(TestSequence([3, 100, 100, 3])),
+        use_multiprocessing=True, shared_memory_slot_bytes=2 ** 20)
+    enqueuer.start(3, 4)
+    gen_output = enqueuer.get()
+    acc = []
+    for _ in range(100):
+      batch = next(gen_output)
+      self.assert_in_shared_memory(enqueuer, batch)
+      self.assertAllEqual(np.full([3, 100, 100, 3], batch[0, 0, 0, 0]), batch)
+      acc.append(int(batch[0, 0, 0, 0]))
+    self.assertEqual(len(set(acc) - set(range(100))), 0)
+    enqueuer.stop()
+
+  def test_shared_memory_ring(self):
+    ring = keras.utils.data_utils._SharedMemoryRing(2, 1024)
+    batch = ({'a': np.arange(10), 'b': np.ones([2, 3], dtype=np.float32)},
+             np.zeros([1000], dtype=np.int8), None, np.array(['x', 'y']))
+    descriptor = ring.write(1, batch)
+    # The int8 array does not fit in the slot after the others.
+    self.assertIsInstance(descriptor.structure[0]['a'],
+                          keras.utils.data_utils._ArrayRef)
+    self.assertIsInstance(descriptor.structure[1], np.ndarray)
+    result = ring.read(descriptor)
+    self.assertAllEqual(np.arange(10), result[0]['a'])
+    self.assertAllEqual(np.ones([2, 3]), result[0]['b'])
+    self.assertEqual(np.float32, result[0]['b'].dtype)
+    self.assertAllEqual(np.zeros([1000]), result[1])
+    self.assertIsNone(result[2])
+    self.assertAllEqual(['x', 'y'], result[3])
+
+  def test_shared_memory_invalid_slot_bytes(self):
+    with self.assertRaises(ValueError):
+      keras.utils.data_utils.OrderedEnqueuer(
+          TestSequence([3]), use_multiprocessing=True,
+          shared_memory_slot_bytes=0)
+
   def test_on_epoch_end_threads(self):
     enqueuer = keras.utils.data_utils.OrderedEnqueuer(
         TestSequence([3, 200, 200, 3]), use_multiprocessing=False)
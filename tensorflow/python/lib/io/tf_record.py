@@ -19,13 +19,29 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import struct
+
 from tensorflow.python import pywrap_tensorflow
 from tensorflow.python.framework import errors
+from tensorflow.python.lib.io import file_io
 from tensorflow.python.util import compat
 from tensorflow.python.util import deprecation
 from tensorflow.python.util.tf_export import tf_export
 
 
+# Each record is framed by a little-endian uint64 length and a uint32 masked
+# CRC of the length before the data, and a uint32 masked CRC of the data after
+# it.
+_RECORD_HEADER_BYTES = 12
+_RECORD_FOOTER_BYTES = 4
+
+# A TFRecord index file contains this magic string, a little-endian uint64
+# record count `n`, and `n + 1` little-endian uint64 offsets: the offset of
+# each record in the TFRecord file, followed by the size of the file.
+_INDEX_MAGIC = b"TFRIDX01"
+_INDEX_SUFFIX = ".idx"
+
+
 @tf_export(
     "io.TFRecordCompressionType",
     v1=["io.TFRecordCompressionType", "python_io.TFRecordCompressionType"])
@@ -196,20 +212,32 @@ class TFRecordWriter(object):
   """
 
   # TODO(josh11b): Support appending?
-  def __init__(self, path, options=None):
+  def __init__(self, path, options=None, index_path=None):
     """Opens file `path` and creates a `TFRecordWriter` writing to it.
 
     Args:
       path: The path to the TFRecords file.
       options: (optional) String specifying compression type,
           `TFRecordCompressionType`, or `TFRecordOptions` object.
+      index_path: (optional) If not `None`, the path of a TFRecord index file
+          that will be written when the writer is closed, which can be used to
+          read records from `path` in random order. Use `True` to write the
+          index to the default path, `tf_record_index_path(path)`. Only
+          uncompressed files can be indexed.
 
     Raises:
       IOError: If `path` cannot be opened for writing.
-      ValueError: If valid compression_type can't be determined from `options`.
+      ValueError: If valid compression_type can't be determined from `options`,
+          or if `index_path` is given for a compressed file.
     """
     if not isinstance(options, TFRecordOptions):
       options = TFRecordOptions(compression_type=options)
+    if index_path is True:
+      index_path = tf_record_index_path(path)
+    if index_path and TFRecordOptions.get_compression_type_string(options):
+      raise ValueError("Compressed TFRecord files cannot be indexed.")
+    self._index_path = index_path
+    self._offsets = [0]
 
     with errors.raise_exception_on_not_ok_status() as status:
       # pylint: disable=protected-access
@@ -233,6 +261,9 @@ class TFRecordWriter(object):
     """
     with errors.raise_exception_on_not_ok_status() as status:
       self._writer.WriteRecord(record, status)
+    if self._index_path:
+      self._offsets.append(self._offsets[-1] + _RECORD_HEADER_BYTES +
+                           len(record) + _RECORD_FOOTER_BYTES)
 
   def flush(self):
     """Flush the file."""
@@ -240,6 +271,128 @@ class TFRecordWriter(object):
       self._writer.Flush(status)
 
   def close(self):
-    """Close the file."""
+    """Close the file, and write its index if one was requested."""
     with errors.raise_exception_on_not_ok_status() as status:
       self._writer.Close(status)
+    if self._index_path:
+      _write_index(self._index_path, self._offsets)
+      self._index_path = None
+
+
+def tf_record_index_path(path):
+  """Returns the default path of the index file for the TFRecord file `path`."""
+  return path + _INDEX_SUFFIX
+
+
+def _write_index(index_path, offsets):
+  file_io.atomic_write_string_to_file(
+      index_path,
+      _INDEX_MAGIC + struct.pack("<Q", len(offsets) - 1) +
+      struct.pack("<%dQ" % len(offsets), *offsets))
+
+
+def read_tf_record_index(index_path):
+  """Reads a TFRecord index file.
+
+  Args:
+    index_path: The path of an index file written by `TFRecordWriter` or
+      `build_tf_record_index()`.
+
+  Returns:
+    A list of `n + 1` integers for a file of `n` records, where element `i`
+    is the offset of record `i` in the TFRecord file and the last element is
+    the size of the file.
+
+  Raises:
+    errors.DataLossError: If `index_path` is not a valid index file.
+  """
+  contents = file_io.read_file_to_string(index_path, binary_mode=True)
+  header_bytes = len(_INDEX_MAGIC) + 8
+  if contents[:len(_INDEX_MAGIC)] != _INDEX_MAGIC:
+    raise errors.DataLossError(
+        None, None, "%s is not a TFRecord index file." % index_path)
+  num_records, = struct.unpack("<Q", contents[len(_INDEX_MAGIC):header_bytes])
+  if len(contents) != header_bytes + 8 * (num_records + 1):
+    raise errors.DataLossError(
+        None, None, "TFRecord index file %s is truncated." % index_path)
+  return list(struct.unpack("<%dQ" % (num_records + 1),
+                            contents[header_bytes:]))
+
+
+@tf_export("io.build_tf_record_index")
+def build_tf_record_index(path, index_path=None):
+  """Writes an index for an existing, uncompressed TFRecord file.
+
+  The index records the offset of each record, so that individual records can
+  be read without scanning the file (e.g. by
+  `tf.data.experimental.IndexedTFRecordDataset`). Building it only reads the
+  header of each record.
+
+  Args:
+    path: The path to the TFRecords file.
+    index_path: (optional) The path of the index file to write. Defaults to
+      `tf_record_index_path(path)`.
+
+  Returns:
+    The number of records in `path`.
+
+  Raises:
+    errors.DataLossError: If `path` is truncated.
+  """
+  if index_path is None:
+    index_path = tf_record_index_path(path)
+  file_size = file_io.stat(path).length
+  offsets = [0]
+  with file_io.FileIO(path, "rb") as f:
+    while offsets[-1] < file_size:
+      f.seek(offsets[-1])
+      header = f.read(_RECORD_HEADER_BYTES)
+      if len(header) != _RECORD_HEADER_BYTES:
+        raise errors.DataLossError(
+            None, None, "Truncated record header at offset %d in %s." %
+            (offsets[-1], path))
+      length, = struct.unpack("<Q", header[:8])
+      offsets.append(offsets[-1] + _RECORD_HEADER_BYTES + length +
+                     _RECORD_FOOTER_BYTES)
+  if offsets[-1] != file_size:
+    raise errors.DataLossError(
+        None, None, "Truncated record at offset %d in %s." %
+        (offsets[-2], path))
+  _write_index(index_path, offsets)
+  return len(offsets) - 1
+
+
+def read_tf_record(path, offsets, index):
+  """Reads record `index` from a TFRecord file using its index.
+
+  Args:
+    path: The path of an uncompressed TFRecord file.
+    offsets: The contents of the file's index, as returned by
+      `read_tf_record_index()`.
+    index: The index of the record to read.
+
+  Returns:
+    The record, as a bytes object.
+
+  Raises:
+    errors.DataLossError: If the record does not match the index, or its
+      length or data is corrupted.
+  """
+  start, end = int(offsets[index]), int(offsets[index + 1])
+  with errors.raise_exception_on_not_ok_status() as status:
+    reader = pywrap_tensorflow.PyRecordReader_New(
+        compat.as_bytes(path), start, b"", status)
+  try:
+    # The reader checks the CRCs of the length and the data of the record.
+    try:
+      reader.GetNext()
+      matches_index = reader.offset() == end
+    except errors.OutOfRangeError:
+      matches_index = False
+    if not matches_index:
+      raise errors.DataLossError(
+          None, None, "Record %d at offset %d of %s does not match the index." %
+          (index, start, path))
+    return reader.record()
+  finally:
+    reader.Close()
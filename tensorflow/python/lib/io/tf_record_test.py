@@ -419,6 +419,92 @@ class TFRecordIteratorTest(TFCompressionTestCase):
         pass
 
 
+class TFRecordIndexTest(TFCompressionTestCase):
+
+  def _Records(self):
+    return [self._Record(0, j) * j for j in range(self._num_records)]
+
+  def testWriterIndex(self):
+    fn = os.path.join(self.get_temp_dir(), "indexed.tfrecord")
+    records = self._Records()
+    with tf_record.TFRecordWriter(fn, index_path=True) as writer:
+      for r in records:
+        writer.write(r)
+
+    offsets = tf_record.read_tf_record_index(
+        tf_record.tf_record_index_path(fn))
+    self.assertEqual(len(records) + 1, len(offsets))
+    self.assertEqual(os.path.getsize(fn), offsets[-1])
+    with open(fn, "rb") as f:
+      contents = f.read()
+    for i, r in enumerate(records):
+      self.assertEqual(len(r) + 16, offsets[i + 1] - offsets[i])
+      self.assertEqual(r, contents[offsets[i] + 12:offsets[i + 1] - 4])
+
+  def testBuildIndexMatchesWriterIndex(self):
+    fn = os.path.join(self.get_temp_dir(), "indexed.tfrecord")
+    index_fn = os.path.join(self.get_temp_dir(), "built.idx")
+    with tf_record.TFRecordWriter(fn, index_path=True) as writer:
+      for r in self._Records():
+        writer.write(r)
+    self.assertEqual(self._num_records,
+                     tf_record.build_tf_record_index(fn, index_fn))
+    self.assertEqual(
+        tf_record.read_tf_record_index(tf_record.tf_record_index_path(fn)),
+        tf_record.read_tf_record_index(index_fn))
+
+  def testReadRecord(self):
+    records = self._Records()
+    fn = self._WriteRecordsToFile(records, "unindexed.tfrecord")
+    tf_record.build_tf_record_index(fn)
+    offsets = tf_record.read_tf_record_index(
+        tf_record.tf_record_index_path(fn))
+    for i in reversed(range(len(records))):
+      self.assertEqual(records[i], tf_record.read_tf_record(fn, offsets, i))
+
+  def testReadCorruptedRecord(self):
+    records = self._Records()
+    fn = self._WriteRecordsToFile(records, "corrupted.tfrecord")
+    tf_record.build_tf_record_index(fn)
+    offsets = tf_record.read_tf_record_index(
+        tf_record.tf_record_index_path(fn))
+    with open(fn, "rb") as f:
+      contents = bytearray(f.read())
+    # Flips a bit of the length CRC of record 1 and of the data of record 2.
+    contents[offsets[1] + 8] ^= 1
+    contents[offsets[2] + 12] ^= 1
+    with open(fn, "wb") as f:
+      f.write(contents)
+    self.assertEqual(records[0], tf_record.read_tf_record(fn, offsets, 0))
+    with self.assertRaises(errors_impl.DataLossError):
+      tf_record.read_tf_record(fn, offsets, 1)
+    with self.assertRaises(errors_impl.DataLossError):
+      tf_record.read_tf_record(fn, offsets, 2)
+
+  def testBuildIndexOfTruncatedFile(self):
+    fn = self._WriteRecordsToFile(self._Records(), "truncated.tfrecord")
+    with open(fn, "rb") as f:
+      contents = f.read()
+    with open(fn, "wb") as f:
+      f.write(contents[:-1])
+    with self.assertRaises(errors_impl.DataLossError):
+      tf_record.build_tf_record_index(fn)
+
+  def testBadIndexFile(self):
+    fn = os.path.join(self.get_temp_dir(), "bad.idx")
+    with open(fn, "wb") as f:
+      f.write(b"not an index")
+    with self.assertRaises(errors_impl.DataLossError):
+      tf_record.read_tf_record_index(fn)
+
+  def testCompressedFilesCannotBeIndexed(self):
+    fn = os.path.join(self.get_temp_dir(), "compressed.tfrecord")
+    with self.assertRaises(ValueError):
+      tf_record.TFRecordWriter(
+          fn, tf_record.TFRecordOptions(TFRecordCompressionType.GZIP),
+          index_path=True)
+
+
 class TFRecordWriterCloseAndFlushTests(test.TestCase):
 
   def setUp(self, compression_type=TFRecordCompressionType.NONE):
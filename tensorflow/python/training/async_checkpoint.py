@@ -0,0 +1,297 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Writes checkpoints in the background from snapshots in host memory."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import threading
+import uuid
+
+from tensorflow.core.protobuf import config_pb2
+from tensorflow.python.client import session
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import gen_io_ops
+from tensorflow.python.ops import io_ops
+from tensorflow.python.ops import string_ops
+
+
+# The values of the tensors written to one shard of a V2 checkpoint: lists of
+# the names, slice specs, dtypes and NumPy values of the tensors.
+CheckpointShard = collections.namedtuple(
+    "CheckpointShard", ["names", "slices", "dtypes", "values"])
+
+
+class CheckpointSaveHandle(object):
+  """A handle to a checkpoint being written in the background.
+
+  Returned by `tf.train.Saver.save` and `tf.train.Checkpoint.save` when called
+  with `experimental_async=True`.
+  """
+
+  def __init__(self, save_path):
+    self._save_path = save_path
+    self._lock = threading.Lock()
+    self._done = threading.Event()
+    self._exception = None
+    self._finalizers = []
+
+  @property
+  def save_path(self):
+    """The path prefix of the checkpoint being written."""
+    return self._save_path
+
+  def done(self):
+    """Returns True if the checkpoint was written or the save failed."""
+    return self._done.is_set()
+
+  def exception(self, timeout=None):
+    """Waits for the save to finish and returns its exception, if any.
+
+    Args:
+      timeout: Optional number of seconds to wait for.
+
+    Returns:
+      The exception raised while writing the checkpoint, or None.
+
+    Raises:
+      RuntimeError: If the save did not finish within `timeout` seconds.
+    """
+    if not self._done.wait(timeout):
+      raise RuntimeError("Timed out waiting for checkpoint %s to be written." %
+                         self._save_path)
+    return self._exception
+
+  def result(self, timeout=None):
+    """Waits for the save to finish and returns the checkpoint path.
+
+    Args:
+      timeout: Optional number of seconds to wait for.
+
+    Returns:
+      The path prefix of the checkpoint, as returned by a synchronous save.
+
+    Raises:
+      RuntimeError: If the save did not finish within `timeout` seconds.
+      Any exception raised while writing the checkpoint.
+    """
+    exception = self.exception(timeout)
+    if exception is not None:
+      raise exception  # pylint: disable=raising-bad-type
+    return self._save_path
+
+  def _add_finalizer(self, finalizer):
+    """Calls `finalizer()` once the checkpoint is written.
+
+    Finalizers run in order, before the handle is done, and their exceptions
+    are reported by the handle. If the checkpoint was already written,
+    `finalizer` is called immediately and its exceptions are raised.
+
+    Args:
+      finalizer: A callable taking no arguments.
+    """
+    with self._lock:
+      if not self._done.is_set():
+        self._finalizers.append(finalizer)
+        return
+    if self._exception is None:
+      finalizer()
+
+  def _complete(self, exception=None):
+    """Runs the finalizers and marks the save as done."""
+    while True:
+      with self._lock:
+        if exception is not None or not self._finalizers:
+          self._exception = exception
+          self._finalizers = []
+          self._done.set()
+          return
+        finalizer = self._finalizers.pop(0)
+      try:
+        finalizer()
+      except Exception as e:  # pylint: disable=broad-except
+        exception = e
+
+
+class AsyncCheckpointWriter(object):
+  """Writes V2 checkpoints from snapshots of tensor values on a background thread.
+
+  Saves are written one at a time, in the order they are requested, so that
+  checkpoint management done after each write (e.g. updating the `checkpoint`
+  file) stays ordered. The shards of a checkpoint are written in parallel.
+  """
+
+  def __init__(self, max_pending_saves=1, num_threads=None):
+    """Creates an `AsyncCheckpointWriter`.
+
+    Args:
+      max_pending_saves: The maximum number of snapshots held in host memory
+        that have not been written yet. `save()` blocks until a pending save
+        is written when this many are outstanding.
+      num_threads: The number of threads used to write the shards of a
+        checkpoint. Defaults to the number of cores.
+    """
+    if max_pending_saves < 1:
+      raise ValueError("max_pending_saves must be at least 1, got %d" %
+                       max_pending_saves)
+    self._max_pending_saves = max_pending_saves
+    self._num_threads = num_threads or 0
+    self._cond = threading.Condition()
+    self._queue = collections.deque()
+    self._num_pending = 0
+    self._thread = None
+    # The signature of the shards written by `_write_graph`, and the graph and
+    # session used to write them.
+    self._write_signature = None
+    self._write_graph = None
+    self._write_session = None
+
+  def save(self, save_path, snapshot_fn):
+    """Snapshots tensor values and writes them to a checkpoint asynchronously.
+
+    Args:
+      save_path: The prefix of the V2 checkpoint to write.
+      snapshot_fn: A callable returning a list of `CheckpointShard`s. It is
+        called synchronously once the number of pending saves is below
+        `max_pending_saves`.
+
+    Returns:
+      A `CheckpointSaveHandle`.
+    """
+    with self._cond:
+      while self._num_pending >= self._max_pending_saves:
+        self._cond.wait()
+      self._num_pending += 1
+    try:
+      shards = snapshot_fn()
+    except:
+      self._release()
+      raise
+    handle = CheckpointSaveHandle(save_path)
+    with self._cond:
+      self._queue.append((handle, shards))
+      if self._thread is None:
+        # The thread exits once the queue is empty. It is not a daemon so that
+        # pending checkpoints are written before the program exits.
+        self._thread = threading.Thread(target=self._run)
+        self._thread.start()
+    return handle
+
+  def wait(self):
+    """Blocks until all pending saves are written."""
+    with self._cond:
+      while self._num_pending:
+        self._cond.wait()
+
+  def close(self):
+    """Waits for all pending saves, then closes the session writing them.
+
+    The writer can still be used afterwards: the next save creates a new
+    session.
+    """
+    self.wait()
+    with self._cond:
+      thread = self._thread
+    if thread is not None:
+      thread.join()
+    if self._write_session is not None:
+      self._write_session.close()
+    self._write_signature = None
+    self._write_graph = None
+    self._write_session = None
+
+  def _release(self):
+    with self._cond:
+      self._num_pending -= 1
+      self._cond.notify_all()
+
+  def _run(self):
+    while True:
+      with self._cond:
+        if not self._queue:
+          self._thread = None
+          return
+        handle, shards = self._queue.popleft()
+      try:
+        self._write(handle.save_path, shards)
+        exception = None
+      except Exception as e:  # pylint: disable=broad-except
+        exception = e
+      # Release the snapshot before running finalizers.
+      del shards
+      handle._complete(exception)  # pylint: disable=protected-access
+      self._release()
+
+  def _write(self, save_path, shards):
+    """Writes `shards` to the checkpoint `save_path`."""
+    signature = [(tuple(shard.names), tuple(shard.slices), tuple(shard.dtypes))
+                 for shard in shards]
+    if signature != self._write_signature:
+      self._build_write_graph(signature)
+    prefix, placeholders, write_op = self._write_graph
+    feed_dict = {prefix: save_path}
+    for shard_placeholders, shard in zip(placeholders, shards):
+      feed_dict.update(zip(shard_placeholders, shard.values))
+    self._write_session.run(write_op, feed_dict=feed_dict)
+
+  def _build_write_graph(self, signature):
+    """Builds a graph writing shards with the given names, slices and dtypes.
+
+    The graph mirrors the save ops built by `tf.train.Saver`: a single shard is
+    written directly to the checkpoint prefix, and multiple shards are written
+    to temporary prefixes and merged.
+
+    Args:
+      signature: A list of `(names, slices, dtypes)` tuples, one per shard.
+    """
+    if self._write_session is not None:
+      self._write_session.close()
+    graph = ops.Graph()
+    with graph.as_default(), ops.device("/cpu:0"):
+      prefix = array_ops.placeholder(dtypes.string, shape=[])
+      placeholders = [
+          [array_ops.placeholder(dtype) for dtype in shard_dtypes]
+          for _, _, shard_dtypes in signature]
+      if len(signature) == 1:
+        names, slices, _ = signature[0]
+        write_op = io_ops.save_v2(prefix, list(names), list(slices),
+                                  placeholders[0])
+      else:
+        tmp_prefix = string_ops.string_join(
+            [prefix, "_temp_%s/part" % uuid.uuid4().hex])
+        num_shards = constant_op.constant(len(signature))
+        sharded_prefixes = []
+        save_ops = []
+        for shard, ((names, slices, _), shard_placeholders) in enumerate(
+            zip(signature, placeholders)):
+          sharded_prefix = gen_io_ops.sharded_filename(tmp_prefix, shard,
+                                                       num_shards)
+          sharded_prefixes.append(sharded_prefix)
+          save_ops.append(io_ops.save_v2(sharded_prefix, list(names),
+                                         list(slices), shard_placeholders))
+        with ops.control_dependencies(save_ops):
+          write_op = gen_io_ops.merge_v2_checkpoints(
+              sharded_prefixes, prefix, delete_old_dirs=True)
+    graph.finalize()
+    config = config_pb2.ConfigProto(
+        device_count={"GPU": 0},
+        inter_op_parallelism_threads=self._num_threads)
+    self._write_session = session.Session(graph=graph, config=config)
+    self._write_graph = (prefix, placeholders, write_op)
+    self._write_signature = signature
@@ -588,6 +588,11 @@ class CheckpointSaverHook(session_run_hook.SessionRunHook):
       self._save(session, last_step)
     for l in self._listeners:
       l.end(session, last_step)
+    # Closes the background session of asynchronous saves once they are
+    # written.
+    async_writer = getattr(self._get_saver(), "_async_writer", None)
+    if async_writer is not None:
+      async_writer.close()
 
   def _save(self, session, step):
     """Saves the latest checkpoint, returns should_stop."""
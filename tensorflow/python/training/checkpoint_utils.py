@@ -30,6 +30,7 @@ from tensorflow.python.platform import gfile
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.training import checkpoint_management
 from tensorflow.python.training import distribution_strategy_context
+from tensorflow.python.training import mmap_checkpoint_reader
 from tensorflow.python.training import saver
 from tensorflow.python.util.tf_export import tf_export
 
@@ -40,15 +41,22 @@ __all__ = [
 
 
 @tf_export("train.load_checkpoint")
-def load_checkpoint(ckpt_dir_or_file):
+def load_checkpoint(ckpt_dir_or_file, experimental_mmap=False):
   """Returns `CheckpointReader` for checkpoint found in `ckpt_dir_or_file`.
 
   If `ckpt_dir_or_file` resolves to a directory with multiple checkpoints,
   reader for the latest checkpoint is returned.
 
+  With `experimental_mmap=True`, the data files of the checkpoint are memory
+  mapped and the reader returns read-only NumPy arrays backed by the mappings
+  rather than copies, so that processes loading the same checkpoint share its
+  pages. This requires a V2 checkpoint on a local file system.
+
   Args:
     ckpt_dir_or_file: Directory with checkpoints file or path to checkpoint
       file.
+    experimental_mmap: If `True`, returns a reader memory mapping the
+      checkpoint.
 
   Returns:
     `CheckpointReader` object.
@@ -61,24 +69,30 @@ def load_checkpoint(ckpt_dir_or_file):
   if filename is None:
     raise ValueError("Couldn't find 'checkpoint' file or checkpoints in "
                      "given directory %s" % ckpt_dir_or_file)
+  if experimental_mmap:
+    return mmap_checkpoint_reader.MmapCheckpointReader(filename)
   return pywrap_tensorflow.NewCheckpointReader(filename)
 
 
 @tf_export("train.load_variable")
-def load_variable(ckpt_dir_or_file, name):
+def load_variable(ckpt_dir_or_file, name, experimental_mmap=False):
   """Returns the tensor value of the given variable in the checkpoint.
 
   Args:
     ckpt_dir_or_file: Directory with checkpoints file or path to checkpoint.
     name: Name of the variable to return.
+    experimental_mmap: If `True`, returns a read-only view of a memory mapping
+      of the checkpoint when possible. See `tf.train.load_checkpoint`.
 
   Returns:
-    A numpy `ndarray` with a copy of the value of this variable.
+    A numpy `ndarray` with a copy of the value of this variable, or a read-only
+    view of the checkpoint if `experimental_mmap` is `True`.
   """
   # TODO(b/29227106): Fix this in the right place and remove this.
   if name.endswith(":0"):
     name = name[:-2]
-  reader = load_checkpoint(ckpt_dir_or_file)
+  reader = load_checkpoint(ckpt_dir_or_file,
+                           experimental_mmap=experimental_mmap)
   return reader.get_tensor(name)
 
 
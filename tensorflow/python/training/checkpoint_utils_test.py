@@ -112,6 +112,42 @@ class CheckpointsTest(test.TestCase):
         [("useful_scope/var4", [9, 9]), ("var1", [1, 10]), ("var2", [10, 10]),
          ("var3", [100, 100])])
 
+  def testGetTensorMmap(self):
+    checkpoint_dir = self.get_temp_dir()
+    with self.cached_session() as session:
+      v1, v2, v3, v4 = _create_checkpoints(session, checkpoint_dir)
+    reader = checkpoint_utils.load_checkpoint(
+        checkpoint_dir, experimental_mmap=True)
+    for name, value in [("var1", v1), ("var2", v2), ("var3", v3),
+                        ("useful_scope/var4", v4)]:
+      mapped = reader.get_tensor(name)
+      self.assertAllEqual(value, mapped)
+      self.assertFalse(mapped.flags.writeable)
+    self.assertAllEqual(
+        v1, checkpoint_utils.load_variable(
+            checkpoint_dir, "var1:0", experimental_mmap=True))
+    reference = checkpoint_utils.load_checkpoint(checkpoint_dir)
+    self.assertEqual(reference.get_variable_to_shape_map(),
+                     reader.get_variable_to_shape_map())
+    self.assertEqual(reference.get_variable_to_dtype_map(),
+                     reader.get_variable_to_dtype_map())
+    self.assertTrue(reader.has_tensor("var2"))
+    self.assertFalse(reader.has_tensor("var5"))
+    with self.assertRaises(errors_impl.OpError):
+      reader.get_tensor("var5")
+
+  def testGetTensorMmapFallback(self):
+    checkpoint_dir = self.get_temp_dir()
+    with self.cached_session() as session:
+      v1 = _create_partition_checkpoints(session, checkpoint_dir)
+    reader = checkpoint_utils.load_checkpoint(
+        checkpoint_dir, experimental_mmap=True)
+    # Partitioned tensors are read by a CheckpointReader.
+    self.assertAllEqual(np.concatenate(v1, axis=0),
+                        reader.get_tensor("scope/var1"))
+    self.assertEqual([("scope/var1", [100, 100])],
+                     sorted(reader.get_variable_to_shape_map().items()))
+
   def testInitFromCheckpoint(self):
     checkpoint_dir = self.get_temp_dir()
     with self.cached_session() as session:
@@ -51,6 +51,27 @@ OBJECT_GRAPH_PROTO_KEY = "_CHECKPOINTABLE_OBJECT_GRAPH"
 VARIABLE_VALUE_KEY = "VARIABLE_VALUE"
 OBJECT_CONFIG_JSON_KEY = "OBJECT_CONFIG_JSON"
 
+# Incremented whenever a dependency is added to or replaced in a
+# `Checkpointable` object. Savers reuse their serialized object graphs until it
+# changes.
+_dependency_generation = 0
+
+
+def dependency_generation():
+  """Returns a counter incremented when `Checkpointable` dependencies change."""
+  return _dependency_generation
+
+
+def mark_dependencies_changed():
+  """Invalidates serialized object graphs after changing dependencies.
+
+  Called by `Checkpointable._track_checkpointable`. Objects which add
+  dependencies without it must call this function themselves.
+  """
+  global _dependency_generation
+  _dependency_generation += 1
+
+
 CheckpointableReference = collections.namedtuple(
     "CheckpointableReference",
     [
@@ -733,8 +754,10 @@ class CheckpointableBase(object):
           self._unconditional_checkpoint_dependencies):
         if name == old_name:
           self._unconditional_checkpoint_dependencies[index] = new_reference
+      mark_dependencies_changed()
     elif current_object is None:
       self._unconditional_checkpoint_dependencies.append(new_reference)
+      mark_dependencies_changed()
       self._handle_deferred_dependencies(
           name=name, checkpointable=checkpointable)
     self._unconditional_dependency_names[name] = checkpointable
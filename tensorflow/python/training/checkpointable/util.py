@@ -20,6 +20,7 @@ from __future__ import print_function
 import abc
 import collections
 import os
+import time
 import weakref
 
 from tensorflow.core.protobuf import checkpointable_object_graph_pb2
@@ -36,6 +37,7 @@ from tensorflow.python.ops import gen_io_ops as io_ops
 from tensorflow.python.ops import init_ops
 from tensorflow.python.ops import variable_scope
 from tensorflow.python.ops import variables
+from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.training import checkpoint_management
 from tensorflow.python.training import optimizer as optimizer_lib
 from tensorflow.python.training import saveable_object as saveable_object_lib
@@ -63,6 +65,23 @@ _OPTIMIZER_SLOTS_NAME = _ESCAPE_CHAR + "OPTIMIZER_SLOT"
 #   <path to variable>/<_OBJECT_ATTRIBUTES_NAME>/<name of attribute>
 _OBJECT_ATTRIBUTES_NAME = _ESCAPE_CHAR + "ATTRIBUTES"
 
+# The result of gathering the saveables of an object graph for a save, which
+# `CheckpointableSaver` re-uses until the dependencies of the object graph
+# change.
+_CachedObjectGraph = collections.namedtuple(
+    "_CachedObjectGraph",
+    [
+        # The value of `base.dependency_generation()` when gathering.
+        "dependency_generation",
+        # (object, signature) pairs for objects whose dependencies may change
+        # without `base.dependency_generation()` changing.
+        "volatile_dependencies",
+        # The serialized CheckpointableObjectGraph proto.
+        "serialized_graph",
+        # The SaveableObjects to save, except the object graph proto.
+        "named_saveables",
+    ])
+
 
 class _CheckpointRestoreCoordinator(object):
   """Holds the status of an object-based checkpoint load."""
@@ -650,6 +669,27 @@ def _serialize_checkpointables(
   return named_saveables, object_graph_proto, feed_additions
 
 
+def _serialize_gathered_objects(
+    checkpointable_objects, path_to_root, saveables_cache):
+  """Create SaveableObjects and protos for gathered objects."""
+  object_names = _ObjectIdentityDictionary()
+  for obj, path in path_to_root.items():
+    object_names[obj] = _object_prefix_from_path(path)
+  node_ids = _ObjectIdentityDictionary()
+  for node_id, node in enumerate(checkpointable_objects):
+    node_ids[node] = node_id
+  slot_variables = _serialize_slot_variables(
+      checkpointable_objects=checkpointable_objects,
+      node_ids=node_ids,
+      object_names=object_names)
+  return _serialize_checkpointables(
+      checkpointable_objects=checkpointable_objects,
+      node_ids=node_ids,
+      object_names=object_names,
+      slot_variables=slot_variables,
+      saveables_cache=saveables_cache)
+
+
 def _serialize_object_graph(root_checkpointable, saveables_cache):
   """Determine checkpoint keys for variables and build a serialized graph.
 
@@ -680,24 +720,54 @@ def _serialize_object_graph(root_checkpointable, saveables_cache):
   """
   checkpointable_objects, path_to_root = (
       _breadth_first_checkpointable_traversal(root_checkpointable))
-  object_names = _ObjectIdentityDictionary()
-  for obj, path in path_to_root.items():
-    object_names[obj] = _object_prefix_from_path(path)
-  node_ids = _ObjectIdentityDictionary()
-  for node_id, node in enumerate(checkpointable_objects):
-    node_ids[node] = node_id
-  slot_variables = _serialize_slot_variables(
+  return _serialize_gathered_objects(
       checkpointable_objects=checkpointable_objects,
-      node_ids=node_ids,
-      object_names=object_names)
-  return _serialize_checkpointables(
-      checkpointable_objects=checkpointable_objects,
-      node_ids=node_ids,
-      object_names=object_names,
-      slot_variables=slot_variables,
+      path_to_root=path_to_root,
       saveables_cache=saveables_cache)
 
 
+def _dependency_signature(checkpointable):
+  """Summarizes dependencies which may change without being tracked.
+
+  Dependencies added with `Checkpointable._track_checkpointable` change
+  `base.dependency_generation()`. Objects which override
+  `_checkpoint_dependencies` (data structure wrappers noticing modifications of
+  the wrapped object, optimizers with dependencies for the current graph) and
+  optimizers creating slot variables may change the object graph without it.
+
+  Args:
+    checkpointable: A `Checkpointable` object.
+  Returns:
+    None if the dependencies of `checkpointable` only change through tracking,
+    otherwise a list which changes when they do.
+  """
+  # pylint: disable=protected-access
+  overrides_dependencies = (
+      type(checkpointable)._checkpoint_dependencies
+      is not base.CheckpointableBase._checkpoint_dependencies)
+  is_optimizer = isinstance(checkpointable, optimizer_lib.Optimizer)
+  if not (overrides_dependencies or is_optimizer):
+    return None
+  # Raises for data structure wrappers which can no longer be saved.
+  signature = [(child.name, id(child.ref))
+               for child in checkpointable._checkpoint_dependencies]
+  # pylint: enable=protected-access
+  if is_optimizer:
+    # Slot variables are only ever added.
+    signature.append(len(checkpointable.variables()))
+  return signature
+
+
+def _reusable_when_executing_eagerly(named_saveable_objects):
+  """Whether SaveableObjects read fresh values each time they are saved."""
+  for saveable in named_saveable_objects:
+    for spec in saveable.specs:
+      if not callable(spec._tensor):  # pylint: disable=protected-access
+        # The Tensor holds the value when the SaveableObject was created.
+        return False
+  return True
+
+
 def named_saveables(root_checkpointable):
   """Gather list of all SaveableObjects in the Checkpointable object."""
   return _serialize_object_graph(root_checkpointable, None)[0]
@@ -1200,6 +1270,10 @@ class _SessionWithFeedDictAdditions(session_lib.SessionInterface):
     self._wrapped_session = session
     self._feed_additions = feed_additions
 
+  @property
+  def graph(self):
+    return self._wrapped_session.graph
+
   def run(self, fetches, feed_dict=None, **kwargs):
     if feed_dict is None:
       feed_dict = {}
@@ -1218,6 +1292,7 @@ def _copy_saver_with_new_var_list(old_saver, new_var_list):
   new_saver._last_checkpoints = old_saver._last_checkpoints
   new_saver._checkpoints_to_be_deleted = old_saver._checkpoints_to_be_deleted
   new_saver._next_checkpoint_time = old_saver._next_checkpoint_time
+  new_saver._async_writer = old_saver._async_writer
   # pylint: enable=protected-access
   return new_saver
 
@@ -1261,6 +1336,9 @@ class CheckpointableSaver(object):
     self._object_graph_feed_tensor = None
     self._last_save_object_graph = None
     self._last_save_saver = None
+    # A _CachedObjectGraph if the last save's SaveableObjects may be re-used
+    # until dependencies change.
+    self._cached_object_graph = None
 
     # Op caching for restore, shared between _CheckpointRestoreCoordinators
     self._restore_op_cache = {}
@@ -1284,35 +1362,73 @@ class CheckpointableSaver(object):
 
   def _gather_saveables(
       self, object_graph_tensor=None, saveable_object_cache=None):
-    """Wraps _serialize_object_graph to include the object graph proto."""
+    """Wraps _serialize_object_graph to include the object graph proto.
+
+    Args:
+      object_graph_tensor: A `Tensor` to which the object graph will be fed, or
+        None to save it as a constant.
+      saveable_object_cache: A dictionary; if specified, used to cache
+        `SaveableObject`s.
+
+    Returns:
+      A tuple of (named_saveable_objects, graph_proto, feed_additions,
+      cached_object_graph), with a `_CachedObjectGraph` for re-using the
+      gathered saveables until dependencies change.
+    """
     assert ((object_graph_tensor is None and saveable_object_cache is None)
             or (object_graph_tensor is not None
                 and saveable_object_cache is not None))
+    dependency_generation = base.dependency_generation()
+    checkpointable_objects, path_to_root = (
+        _breadth_first_checkpointable_traversal(self._root_checkpointable))
+    volatile_dependencies = []
+    for checkpointable in checkpointable_objects:
+      signature = _dependency_signature(checkpointable)
+      if signature is not None:
+        volatile_dependencies.append((checkpointable, signature))
     (named_saveable_objects, graph_proto,
-     feed_additions) = _serialize_object_graph(
-         self._root_checkpointable,
+     feed_additions) = _serialize_gathered_objects(
+         checkpointable_objects=checkpointable_objects,
+         path_to_root=path_to_root,
          saveables_cache=saveable_object_cache)
+    cached_object_graph = _CachedObjectGraph(
+        dependency_generation=dependency_generation,
+        volatile_dependencies=volatile_dependencies,
+        serialized_graph=graph_proto.SerializeToString(),
+        named_saveables=list(named_saveable_objects))
     if object_graph_tensor is None:
       with ops.device("/cpu:0"):
         object_graph_tensor = constant_op.constant(
-            graph_proto.SerializeToString(), dtype=dtypes.string)
+            cached_object_graph.serialized_graph, dtype=dtypes.string)
     else:
       feed_additions.update(
-          {object_graph_tensor: graph_proto.SerializeToString()})
+          {object_graph_tensor: cached_object_graph.serialized_graph})
     assert base.OBJECT_GRAPH_PROTO_KEY not in named_saveable_objects
     named_saveable_objects.append(
         base.NoRestoreSaveable(
             tensor=object_graph_tensor,
             name=base.OBJECT_GRAPH_PROTO_KEY))
-    return named_saveable_objects, graph_proto, feed_additions
+    return (named_saveable_objects, graph_proto, feed_additions,
+            cached_object_graph)
 
   def freeze(self):
     """Creates a `tf.train.Saver` with the current object graph frozen."""
-    named_saveable_objects, _, _ = self._gather_saveables(
+    named_saveable_objects, _, _, _ = self._gather_saveables(
         object_graph_tensor=None, saveable_object_cache=None)
     return saver_lib.Saver(
         var_list=named_saveable_objects, max_to_keep=None)
 
+  def _object_graph_unchanged(self):
+    """Whether the object graph gathered for the last save is still current."""
+    cached = self._cached_object_graph
+    if (cached is None
+        or cached.dependency_generation != base.dependency_generation()):
+      return False
+    for checkpointable, signature in cached.volatile_dependencies:
+      if _dependency_signature(checkpointable) != signature:
+        return False
+    return True
+
   def _prepare_save(self,
                     object_graph_tensor=None,
                     saveable_object_cache=None):
@@ -1323,6 +1439,11 @@ class CheckpointableSaver(object):
     `_prepare_save` even if the object graph has grown. This avoids
     unnecessarily re-creating save ops.
 
+    The object graph is only traversed again if dependencies changed since the
+    last call. Otherwise the last `tf.train.Saver` is re-used, along with the
+    serialized object graph. When executing eagerly this requires that the
+    `SaveableObject`s read the values to save each time they are saved.
+
     Args:
       object_graph_tensor: A `Tensor` to which the current object graph will be
         fed.
@@ -1334,10 +1455,30 @@ class CheckpointableSaver(object):
       to feed when running save ops. The feed dict contains the current object
       graph and any Python state to be saved in the checkpoint.
     """
-    (named_saveable_objects, graph_proto,
-     feed_additions) = self._gather_saveables(
+    start_time = time.time()
+    if self._object_graph_unchanged():
+      cached = self._cached_object_graph
+      feed_additions = None
+      if object_graph_tensor is not None:
+        feed_additions = {object_graph_tensor: cached.serialized_graph}
+        for saveable in cached.named_saveables:
+          if isinstance(saveable, base.PythonStateSaveable):
+            feed_additions.update(saveable.feed_dict_additions())
+      logging.vlog(1, "Re-used the object graph of the last save (%d "
+                   "SaveableObjects) in %.3f seconds.",
+                   len(cached.named_saveables), time.time() - start_time)
+      return self._last_save_saver, feed_additions
+
+    (named_saveable_objects, graph_proto, feed_additions,
+     cached_object_graph) = self._gather_saveables(
          object_graph_tensor=object_graph_tensor,
          saveable_object_cache=saveable_object_cache)
+    if (not context.executing_eagerly()
+        or _reusable_when_executing_eagerly(
+            cached_object_graph.named_saveables)):
+      self._cached_object_graph = cached_object_graph
+    else:
+      self._cached_object_graph = None
     if (self._last_save_object_graph != graph_proto
         # When executing eagerly, we need to re-create SaveableObjects each time
         # save() is called so they pick up new Tensors passed to their
@@ -1352,9 +1493,13 @@ class CheckpointableSaver(object):
         self._last_save_saver = saver_lib.Saver(
             var_list=named_saveable_objects, max_to_keep=None)
       self._last_save_object_graph = graph_proto
+    logging.vlog(1, "Gathered %d SaveableObjects from %d objects in %.3f "
+                 "seconds.", len(named_saveable_objects),
+                 len(graph_proto.nodes), time.time() - start_time)
     return self._last_save_saver, feed_additions
 
-  def save(self, file_prefix, checkpoint_number=None, session=None):
+  def save(self, file_prefix, checkpoint_number=None, session=None,
+           experimental_async=False):
     """Save a training checkpoint.
 
     The saved checkpoint includes variables created by this object and any
@@ -1372,9 +1517,13 @@ class CheckpointableSaver(object):
       session: The session to evaluate variables in. Ignored when executing
         eagerly. If not provided when graph building, the default session is
         used.
+      experimental_async: If `True`, copies the values of the variables to host
+        memory and writes the checkpoint on a background thread. See
+        `tf.train.Saver.save`.
 
     Returns:
-      The full path to the checkpoint.
+      The full path to the checkpoint, or a handle to the save whose `result()`
+      method returns it if `experimental_async` is `True`.
     """
     feed_additions = {}
     graph_building = not context.executing_eagerly()
@@ -1397,6 +1546,7 @@ class CheckpointableSaver(object):
     elif session is None:
       session = ops.get_default_session()
 
+    start_time = time.time()
     with ops.device("/cpu:0"):
       save_path = saver.save(
           sess=_SessionWithFeedDictAdditions(
@@ -1404,7 +1554,11 @@ class CheckpointableSaver(object):
           save_path=file_prefix,
           write_meta_graph=False,
           write_state=False,
-          global_step=checkpoint_number)
+          global_step=checkpoint_number,
+          experimental_async=experimental_async)
+    logging.vlog(1, "Saving %s took %.3f seconds.",
+                 "asynchronously" if experimental_async else save_path,
+                 time.time() - start_time)
     return save_path
 
   def restore(self, save_path):
@@ -1670,7 +1824,7 @@ class Checkpoint(tracking.Checkpointable):
             add_variable(self, name="save_counter", initializer=0,
                          dtype=dtypes.int64))
 
-  def write(self, file_prefix, session=None):
+  def write(self, file_prefix, session=None, experimental_async=False):
     """Writes a training checkpoint.
 
     The checkpoint includes variables created by this object and any
@@ -1688,13 +1842,19 @@ class Checkpoint(tracking.Checkpointable):
       session: The session to evaluate variables in. Ignored when executing
         eagerly. If not provided when graph building, the default session is
         used.
+      experimental_async: If `True`, copies the values of the variables to host
+        memory, writes the checkpoint on a background thread and returns a
+        handle to the save. See `tf.train.Saver.save`.
 
     Returns:
-      The full path to the checkpoint (i.e. `file_prefix`).
+      The full path to the checkpoint (i.e. `file_prefix`), or a handle to the
+      save whose `result()` method returns it if `experimental_async` is
+      `True`.
     """
     return self._saver.save(
         file_prefix=file_prefix,
-        session=session)
+        session=session,
+        experimental_async=experimental_async)
 
   @property
   def save_counter(self):
@@ -1708,7 +1868,7 @@ class Checkpoint(tracking.Checkpointable):
     self._maybe_create_save_counter()
     return self._save_counter
 
-  def save(self, file_prefix, session=None):
+  def save(self, file_prefix, session=None, experimental_async=False):
     """Saves a training checkpoint and provides basic checkpoint management.
 
     The saved checkpoint includes variables created by this object and any
@@ -1729,9 +1889,14 @@ class Checkpoint(tracking.Checkpointable):
       session: The session to evaluate variables in. Ignored when executing
         eagerly. If not provided when graph building, the default session is
         used.
+      experimental_async: If `True`, copies the values of the variables to host
+        memory and writes the checkpoint on a background thread. The metadata
+        used by `tf.train.latest_checkpoint` is updated once the checkpoint is
+        written.
 
     Returns:
-      The full path to the checkpoint.
+      The full path to the checkpoint, or a handle to the save whose `result()`
+      method returns it if `experimental_async` is `True`.
     """
     graph_building = not context.executing_eagerly()
     if graph_building:
@@ -1751,12 +1916,18 @@ class Checkpoint(tracking.Checkpointable):
       checkpoint_number = session.run(self._save_assign_op)
     else:
       checkpoint_number = assign_op.numpy()
-    file_path = self.write("%s-%d" % (file_prefix, checkpoint_number),
-                           session=session)
-    checkpoint_management.update_checkpoint_state(
-        save_dir=os.path.dirname(file_prefix),
-        model_checkpoint_path=file_path,
-        all_model_checkpoint_paths=[file_path])
+    file_path = "%s-%d" % (file_prefix, checkpoint_number)
+    def _update_checkpoint_state():
+      checkpoint_management.update_checkpoint_state(
+          save_dir=os.path.dirname(file_prefix),
+          model_checkpoint_path=file_path,
+          all_model_checkpoint_paths=[file_path])
+    if experimental_async:
+      handle = self.write(file_path, session=session, experimental_async=True)
+      handle._add_finalizer(_update_checkpoint_state)  # pylint: disable=protected-access
+      return handle
+    file_path = self.write(file_path, session=session)
+    _update_checkpoint_state()
     return file_path
 
   def restore(self, save_path):
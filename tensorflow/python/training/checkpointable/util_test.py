@@ -614,6 +614,83 @@ class CheckpointingTests(test.TestCase):
         self.fail("%s should have suffix %s" % (path, expected_suffix))
       self.evaluate(step.assign_add(2))
 
+  @test_util.run_in_graph_and_eager_modes
+  def testAsyncSave(self):
+    directory = os.path.join(self.get_temp_dir(), "async")
+    prefix = os.path.join(directory, "ckpt")
+    v = resource_variable_ops.ResourceVariable(1., name="v")
+    checkpoint = checkpointable_utils.Checkpoint(v=v)
+    self.evaluate(v.initializer)
+    handle = checkpoint.save(prefix, experimental_async=True)
+    # The value is snapshotted before save() returns.
+    self.evaluate(v.assign(2.))
+    save_path = handle.result()
+    self.assertEqual(prefix + "-1", save_path)
+    self.assertEqual(save_path,
+                     checkpoint_management.latest_checkpoint(directory))
+    self.evaluate(v.assign(3.))
+    checkpoint.restore(save_path).assert_consumed().run_restore_ops()
+    self.assertEqual(1., self.evaluate(v))
+    self.assertEqual(1, self.evaluate(checkpoint.save_counter))
+
+  @test_util.run_in_graph_and_eager_modes
+  def testObjectGraphReusedUntilDependenciesChange(self):
+    prefix = os.path.join(self.get_temp_dir(), "ckpt")
+    root = tracking.Checkpointable()
+    root.v = resource_variable_ops.ResourceVariable(1., name="v")
+    checkpoint = checkpointable_utils.Checkpoint(root=root)
+    self.evaluate(checkpointable_utils.gather_initializers(checkpoint))
+    with test.mock.patch.object(
+        checkpointable_utils, "_breadth_first_checkpointable_traversal",
+        wraps=checkpointable_utils._breadth_first_checkpointable_traversal
+    ) as traversal:
+      checkpoint.save(prefix)
+      self.assertEqual(1, traversal.call_count)
+      self.evaluate(root.v.assign(2.))
+      save_path = checkpoint.save(prefix)
+      self.assertEqual(1, traversal.call_count)
+      reader = pywrap_tensorflow.NewCheckpointReader(save_path)
+      self.assertEqual(
+          2., reader.get_tensor("root/v/.ATTRIBUTES/VARIABLE_VALUE"))
+
+      # Adding a dependency invalidates the cached object graph.
+      root.w = resource_variable_ops.ResourceVariable(3., name="w")
+      self.evaluate(root.w.initializer)
+      save_path = checkpoint.save(prefix)
+      self.assertEqual(2, traversal.call_count)
+    reader = pywrap_tensorflow.NewCheckpointReader(save_path)
+    self.assertEqual(
+        3., reader.get_tensor("root/w/.ATTRIBUTES/VARIABLE_VALUE"))
+    self.evaluate(root.w.assign(4.))
+    checkpoint.restore(save_path).run_restore_ops()
+    self.assertEqual(3., self.evaluate(root.w))
+
+  @test_util.run_in_graph_and_eager_modes
+  def testObjectGraphReuseNoticesUntrackedChanges(self):
+    prefix = os.path.join(self.get_temp_dir(), "ckpt")
+    v = resource_variable_ops.ResourceVariable([1.], name="v")
+    optimizer = adam.AdamOptimizer(0.1)
+    root = tracking.Checkpointable()
+    root.optimizer = optimizer
+    root.v = v
+    root.wrapped = []
+    checkpoint = checkpointable_utils.Checkpoint(root=root)
+    self.evaluate(checkpointable_utils.gather_initializers(checkpoint))
+    checkpoint.save(prefix)
+    train_op = optimizer.apply_gradients(
+        [(constant_op.constant([1.]), v)])
+    self.evaluate([var.initializer for var in optimizer.variables()])
+    self.evaluate(train_op)
+    save_path = checkpoint.save(prefix)
+    # The new slot variables were saved.
+    reader = pywrap_tensorflow.NewCheckpointReader(save_path)
+    self.assertTrue(reader.has_tensor(
+        "root/v/.OPTIMIZER_SLOT/root/optimizer/m/.ATTRIBUTES/VARIABLE_VALUE"))
+
+    root.wrapped.insert(0, resource_variable_ops.ResourceVariable(1.))
+    with self.assertRaisesRegexp(ValueError, "A list element was replaced"):
+      checkpoint.save(prefix)
+
   # pylint: disable=cell-var-from-loop
   @test_util.run_in_graph_and_eager_modes
   def testWithDefun(self):
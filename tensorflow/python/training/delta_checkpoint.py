@@ -0,0 +1,355 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Checkpoints saving only the rows of embeddings changed since the last save.
+
+A chain of delta checkpoints starts with a full checkpoint of all the
+variables. Each following checkpoint holds the full values of the untracked
+variables and, for each variable tracked with `track_sparse_updates`, only the
+rows changed since the previous checkpoint of the chain. Restoring replays the
+chain: the full checkpoint is restored, then the changed rows of each delta are
+scattered into the tracked variables.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import weakref
+
+from tensorflow.python.eager import context
+from tensorflow.python.framework import device as pydev
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import control_flow_ops
+from tensorflow.python.ops import resource_variable_ops
+from tensorflow.python.training import checkpoint_management
+from tensorflow.python.training import saver as saver_lib
+
+
+# Maps the variables whose changed rows are tracked to boolean row masks.
+_ROW_MASKS = weakref.WeakKeyDictionary()
+
+_DELTA_INDICES_SUFFIX = "/.DELTA_INDICES"
+_DELTA_VALUES_SUFFIX = "/.DELTA_VALUES"
+
+
+def _variable_name(variable):
+  if isinstance(variable, resource_variable_ops.ResourceVariable):
+    return variable._shared_name  # pylint: disable=protected-access
+  return variable.op.name
+
+
+def track_sparse_updates(variable):
+  """Starts tracking the rows of `variable` changed by optimizers.
+
+  Sparse updates applied by a `tf.train.Optimizer` to `variable` mark the
+  updated rows as changed, and dense updates mark all of them. Optimizers whose
+  sparse updates also change other rows (e.g. `tf.train.AdamOptimizer`, which
+  decays the moments of all the rows) mark all of them too. Other updates
+  (e.g. `assign`) can be recorded with `mark_updated_rows`.
+
+  The optimizer slots of `variable` created after this call (e.g. by
+  `minimize()`) share its mask, so that only their changed rows are saved too.
+
+  All the rows are initially considered changed. The mask of changed rows is a
+  local variable placed on the host of `variable`: it must be initialized, e.g.
+  with `tf.local_variables_initializer()`, before training when graph building.
+
+  Args:
+    variable: A `Variable` or `ResourceVariable` with a statically known number
+      of rows.
+
+  Returns:
+    The boolean row mask variable.
+
+  Raises:
+    ValueError: If the number of rows of `variable` is not known.
+  """
+  mask = _ROW_MASKS.get(variable)
+  if mask is not None:
+    return mask
+  shape = variable.get_shape()
+  if shape.ndims is None or shape.ndims < 1 or shape[0].value is None:
+    raise ValueError("Tracking the changed rows of %s requires a known number "
+                     "of rows, got shape %s." % (variable.name, shape))
+  device = pydev.DeviceSpec.from_string(variable.device)
+  device.device_type = "CPU"
+  device.device_index = 0
+  with ops.device(device.to_string()), ops.init_scope():
+    mask = resource_variable_ops.ResourceVariable(
+        array_ops.ones([shape[0].value], dtype=dtypes.bool),
+        trainable=False,
+        collections=[ops.GraphKeys.LOCAL_VARIABLES],
+        name=_variable_name(variable).replace(":", "_") + "/changed_rows")
+  _ROW_MASKS[variable] = mask
+  return mask
+
+
+def track_slot(variable, slot):
+  """Tracks the changed rows of an optimizer slot of `variable`, if tracked.
+
+  The slot shares the row mask of `variable`, so the rows of the slot updated
+  along with the rows of `variable` are saved in the same delta checkpoints.
+  Slots without the same number of rows are not tracked.
+
+  Args:
+    variable: The primary variable of the slot.
+    slot: The slot variable.
+  """
+  mask = _ROW_MASKS.get(variable)
+  if mask is None or slot in _ROW_MASKS:
+    return
+  shape = slot.get_shape()
+  if (shape.ndims is None or shape.ndims < 1 or
+      shape[0].value != mask.get_shape()[0].value):
+    return
+  _ROW_MASKS[slot] = mask
+
+
+def mark_updated_rows(variable, indices=None):
+  """Marks rows of `variable` as changed since the last delta checkpoint.
+
+  Args:
+    variable: A variable, which may not be tracked by `track_sparse_updates`.
+    indices: An integer `Tensor` of the changed rows, or None if all the rows
+      changed.
+
+  Returns:
+    An op marking the rows when graph building, or None if `variable` is not
+    tracked.
+  """
+  mask = _ROW_MASKS.get(variable)
+  if mask is None:
+    return None
+  # Optimizers create the update ops colocated with `variable`, which may be
+  # on an accelerator, while the mask stays on the host.
+  with ops.colocate_with(None, ignore_existing=True), ops.device(mask.device):
+    if indices is None:
+      return mask.assign(array_ops.ones_like(mask), read_value=False)
+    return mask.scatter_update(ops.IndexedSlices(
+        array_ops.ones_like(indices, dtype=dtypes.bool), indices))
+
+
+class _DeltaSaveable(saver_lib.BaseSaverBuilder.SaveableObject):
+  """Saves the changed rows of a variable and scatters them on restore."""
+
+  def __init__(self, variable, mask, name):
+    def _read_indices():
+      with ops.device(mask.device):
+        return array_ops.reshape(array_ops.where(mask.read_value()), [-1])
+
+    def _gather_rows(indices):
+      with ops.device(variable.device):
+        if isinstance(variable, resource_variable_ops.ResourceVariable):
+          return variable.sparse_read(indices)
+        return array_ops.gather(variable, indices)
+
+    if context.executing_eagerly():
+      # Read the changed rows each time the checkpoint is saved.
+      indices = _read_indices
+      values = lambda: _gather_rows(_read_indices())
+    else:
+      indices = _read_indices()
+      values = _gather_rows(indices)
+    specs = [
+        saver_lib.BaseSaverBuilder.SaveSpec(
+            indices, "", name + _DELTA_INDICES_SUFFIX, dtype=dtypes.int64),
+        saver_lib.BaseSaverBuilder.SaveSpec(
+            values, "", name + _DELTA_VALUES_SUFFIX,
+            dtype=variable.dtype.base_dtype)]
+    super(_DeltaSaveable, self).__init__(variable, specs, name)
+
+  def restore(self, restored_tensors, restored_shapes):
+    indices, values = restored_tensors
+    return self.op.scatter_update(ops.IndexedSlices(values, indices))
+
+
+class DeltaCheckpointSaver(object):
+  """Saves chains of delta checkpoints of embedding variables.
+
+  Example usage:
+  ```python
+  embeddings = tf.get_variable("embeddings", [num_ids, dim])
+  tf.contrib.checkpoint.track_sparse_updates(embeddings)
+  train_op = optimizer.minimize(loss)
+  saver = tf.contrib.checkpoint.DeltaCheckpointSaver(
+      tf.global_variables(), directory="/tmp/model", full_save_interval=10)
+  with tf.Session() as sess:
+    sess.run([tf.global_variables_initializer(),
+              tf.local_variables_initializer()])
+    if saver.latest_checkpoint:
+      saver.restore(sess)
+    while True:
+      sess.run(train_op)
+      saver.save(sess)
+  ```
+
+  Variables in `var_list` tracked with `track_sparse_updates` only have their
+  changed rows written to delta checkpoints. A full checkpoint is written every
+  `full_save_interval` deltas, after which the previous chain is deleted.
+
+  The changed rows are reset after each save, so saves must not run
+  concurrently with updates of the tracked variables. The chain is recorded in
+  a checkpoint state file of `directory` named "delta_checkpoint", which also
+  lets a new `DeltaCheckpointSaver` continue the chain. Only one should be
+  active in a directory at a time.
+  """
+
+  def __init__(self, var_list, directory, full_save_interval=10,
+               sharded=False):
+    """Creates a `DeltaCheckpointSaver`.
+
+    Args:
+      var_list: A list of the variables to save.
+      directory: The directory in which to write the checkpoints.
+      full_save_interval: The number of delta checkpoints written between two
+        full checkpoints.
+      sharded: If `True`, shards the checkpoints, one per device.
+
+    Raises:
+      ValueError: If `full_save_interval` is negative.
+    """
+    if full_save_interval < 0:
+      raise ValueError("full_save_interval must be non-negative, got %d" %
+                       full_save_interval)
+    self._var_list = list(var_list)
+    self._directory = directory
+    self._prefix = os.path.join(directory, "ckpt")
+    self._latest_filename = "delta_checkpoint"
+    self._full_save_interval = full_save_interval
+    self._tracked = [(var, _ROW_MASKS[var]) for var in self._var_list
+                     if var in _ROW_MASKS]
+    self._untracked = [var for var in self._var_list if var not in _ROW_MASKS]
+    self._full_saver = saver_lib.Saver(
+        self._var_list, sharded=sharded, max_to_keep=None)
+    delta_saveables = [_DeltaSaveable(var, mask, _variable_name(var))
+                       for var, mask in self._tracked]
+    self._delta_saver = saver_lib.Saver(
+        self._untracked + delta_saveables, sharded=sharded, max_to_keep=None)
+    if context.executing_eagerly():
+      self._reset_op = None
+    else:
+      self._reset_op = self._reset_changed_rows()
+
+    state = checkpoint_management.get_checkpoint_state(
+        directory, latest_filename=self._latest_filename)
+    if state is None:
+      self._chain = []
+    else:
+      self._chain = list(state.all_model_checkpoint_paths)
+    self._checkpoint_number = max(
+        [self._number(path) for path in self._chain] + [0])
+
+  @property
+  def latest_checkpoint(self):
+    """The prefix of the most recent checkpoint of the chain, or None."""
+    return self._chain[-1] if self._chain else None
+
+  @property
+  def checkpoints(self):
+    """The full checkpoint and the deltas of the current chain, in order."""
+    return list(self._chain)
+
+  @staticmethod
+  def _number(path):
+    return int(path.rsplit("-", 1)[-1])
+
+  def _reset_changed_rows(self):
+    reset_ops = []
+    # Slots share the mask of their primary variable.
+    masks = []
+    for _, mask in self._tracked:
+      if not any(mask is m for m in masks):
+        masks.append(mask)
+    for mask in masks:
+      with ops.device(mask.device):
+        reset_ops.append(mask.assign(array_ops.zeros_like(mask),
+                                     read_value=False))
+    return control_flow_ops.group(*reset_ops)
+
+  def _reset(self, sess):
+    """Marks all the rows of the tracked variables as unchanged."""
+    if context.executing_eagerly():
+      self._reset_changed_rows()
+    else:
+      sess.run(self._reset_op)
+
+  def save(self, sess=None):
+    """Writes a full or delta checkpoint and updates the chain.
+
+    Args:
+      sess: The session to evaluate the variables in. Ignored when executing
+        eagerly.
+
+    Returns:
+      The prefix of the written checkpoint.
+    """
+    full = len(self._chain) == 0 or (
+        len(self._chain) > self._full_save_interval)
+    saver = self._full_saver if full else self._delta_saver
+    self._checkpoint_number += 1
+    save_path = saver.save(
+        sess, "%s-%d" % (self._prefix, self._checkpoint_number),
+        write_meta_graph=False, write_state=False)
+    self._reset(sess)
+
+    if full:
+      old_chain = self._chain
+      self._chain = [save_path]
+    else:
+      old_chain = []
+      self._chain.append(save_path)
+    self._record_state()
+    for path in old_chain:
+      checkpoint_management.remove_checkpoint(path)
+    return save_path
+
+  def restore(self, sess=None, save_path=None):
+    """Restores a checkpoint of the chain by replaying its deltas.
+
+    Subsequent saves continue the chain from `save_path`.
+
+    Args:
+      sess: The session to restore the variables in. Ignored when executing
+        eagerly.
+      save_path: A checkpoint of the current chain. Defaults to the latest.
+
+    Raises:
+      ValueError: If there is no checkpoint to restore, or if `save_path` is
+        not part of the chain.
+    """
+    if save_path is None:
+      save_path = self.latest_checkpoint
+      if save_path is None:
+        raise ValueError("No checkpoint to restore in %s." % self._directory)
+    if save_path not in self._chain:
+      raise ValueError("%s is not part of the checkpoint chain %s." %
+                       (save_path, self._chain))
+    chain = self._chain[:self._chain.index(save_path) + 1]
+    self._full_saver.restore(sess, chain[0])
+    for path in chain[1:]:
+      self._delta_saver.restore(sess, path)
+    self._reset(sess)
+    self._chain = chain
+    self._record_state()
+
+  def _record_state(self):
+    checkpoint_management.update_checkpoint_state_internal(
+        self._directory,
+        model_checkpoint_path=self._chain[-1],
+        all_model_checkpoint_paths=self._chain,
+        latest_filename=self._latest_filename,
+        save_relative_paths=True)
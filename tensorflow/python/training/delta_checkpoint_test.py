@@ -0,0 +1,219 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for delta checkpoints."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+
+import numpy as np
+
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import ops
+from tensorflow.python.framework import test_util
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import embedding_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import resource_variable_ops
+from tensorflow.python.ops import variables
+from tensorflow.python.platform import test
+from tensorflow.python.training import adagrad
+from tensorflow.python.training import adam
+from tensorflow.python.training import checkpoint_utils
+from tensorflow.python.training import delta_checkpoint
+from tensorflow.python.training import gradient_descent
+from tensorflow.python.training import saver as saver_lib
+
+
+class DeltaCheckpointTest(test.TestCase):
+
+  def _model(self, optimizer=None):
+    embeddings = resource_variable_ops.ResourceVariable(
+        np.zeros([10, 2], dtype=np.float32), name="embeddings")
+    bias = resource_variable_ops.ResourceVariable(0., name="bias")
+    mask = delta_checkpoint.track_sparse_updates(embeddings)
+    ids = array_ops.placeholder_with_default(
+        constant_op.constant([0], dtype=np.int64), shape=[None])
+    loss = math_ops.reduce_sum(
+        embedding_ops.embedding_lookup(embeddings, ids)) + bias
+    if optimizer is None:
+      optimizer = gradient_descent.GradientDescentOptimizer(1.)
+    train_op = optimizer.minimize(loss)
+    return embeddings, bias, mask, ids, train_op
+
+  def _testDeltaRestoreMatchesFullRestore(self, optimizer):
+    directory = os.path.join(self.get_temp_dir(), optimizer.get_name())
+    with self.session(graph=ops.Graph()) as sess:
+      embeddings, _, _, ids, train_op = self._model(optimizer)
+      var_list = variables.global_variables()
+      slots = [optimizer.get_slot(embeddings, name)
+               for name in optimizer.get_slot_names()]
+      saver = delta_checkpoint.DeltaCheckpointSaver(
+          var_list, directory, full_save_interval=5)
+      full_saver = saver_lib.Saver(var_list)
+      self.evaluate([variables.global_variables_initializer(),
+                     variables.local_variables_initializer()])
+      saver.save(sess)
+      for step_ids in [[1], [3, 4], [1, 7]]:
+        sess.run(train_op, feed_dict={ids: step_ids})
+        delta_path = saver.save(sess)
+      full_path = full_saver.save(
+          sess, os.path.join(self.get_temp_dir(), "full"), write_state=False)
+
+      # The slots are saved by rows, along with the embeddings.
+      for slot in slots:
+        self.assertIsNotNone(checkpoint_utils.load_variable(
+            delta_path, slot.op.name + "/.DELTA_INDICES"))
+
+      def _scramble():
+        self.evaluate([v.assign(array_ops.ones_like(v)) for v in var_list])
+
+      _scramble()
+      full_saver.restore(sess, full_path)
+      expected = self.evaluate(var_list)
+      _scramble()
+      saver.restore(sess)
+      for expected_value, value in zip(expected, self.evaluate(var_list)):
+        self.assertAllClose(expected_value, value)
+      return delta_path
+
+  def testAdamDeltaRoundTrip(self):
+    delta_path = self._testDeltaRestoreMatchesFullRestore(
+        adam.AdamOptimizer(0.1))
+    # Adam decays the moments of all the rows.
+    self.assertAllEqual(
+        np.arange(10), checkpoint_utils.load_variable(
+            delta_path, "embeddings/.DELTA_INDICES"))
+
+  def testAdagradDeltaRoundTrip(self):
+    delta_path = self._testDeltaRestoreMatchesFullRestore(
+        adagrad.AdagradOptimizer(0.1))
+    self.assertAllEqual(
+        [1, 7], checkpoint_utils.load_variable(
+            delta_path, "embeddings/.DELTA_INDICES"))
+
+  def testTrackSparseUpdates(self):
+    with self.session(graph=ops.Graph()) as sess:
+      embeddings, _, mask, ids, train_op = self._model()
+      self.assertIs(mask, delta_checkpoint.track_sparse_updates(embeddings))
+      self.evaluate([variables.global_variables_initializer(),
+                     variables.local_variables_initializer()])
+      self.assertTrue(np.all(self.evaluate(mask)))
+      self.evaluate(mask.assign(np.zeros([10], dtype=np.bool)))
+      sess.run(train_op, feed_dict={ids: [2, 7, 2]})
+      self.assertAllEqual([2, 7], np.flatnonzero(self.evaluate(mask)))
+
+  def testUnknownNumberOfRows(self):
+    with ops.Graph().as_default():
+      v = variables.Variable(
+          array_ops.placeholder_with_default([[1.]], shape=[None, 1]),
+          validate_shape=False)
+      with self.assertRaisesRegexp(ValueError, "known number of rows"):
+        delta_checkpoint.track_sparse_updates(v)
+
+  def testSaveAndRestoreChain(self):
+    directory = os.path.join(self.get_temp_dir(), "delta")
+    with self.session(graph=ops.Graph()) as sess:
+      embeddings, bias, _, ids, train_op = self._model()
+      saver = delta_checkpoint.DeltaCheckpointSaver(
+          [embeddings, bias], directory, full_save_interval=2)
+      self.evaluate([variables.global_variables_initializer(),
+                     variables.local_variables_initializer()])
+      paths = [saver.save(sess)]
+      expected = []
+      for step_ids in [[1], [3, 4], [5]]:
+        sess.run(train_op, feed_dict={ids: step_ids})
+        paths.append(saver.save(sess))
+        expected.append(self.evaluate([embeddings, bias]))
+        if len(paths) == 3:
+          # Deltas only hold the changed rows.
+          self.assertAllEqual(
+              [3, 4], checkpoint_utils.load_variable(
+                  paths[2], "embeddings/.DELTA_INDICES"))
+
+      # The chain was compacted after two deltas.
+      self.assertEqual(paths[3:], saver.checkpoints)
+      self.assertFalse(os.path.exists(paths[0] + ".index"))
+
+      saver = delta_checkpoint.DeltaCheckpointSaver(
+          [embeddings, bias], directory, full_save_interval=2)
+      self.assertEqual(paths[3], saver.latest_checkpoint)
+      self.evaluate([embeddings.assign(np.ones([10, 2])), bias.assign(5.)])
+      saver.restore(sess)
+      expected_embeddings, expected_bias = expected[-1]
+      self.assertAllEqual(expected_embeddings, self.evaluate(embeddings))
+      self.assertEqual(expected_bias, self.evaluate(bias))
+
+  def testRestoreReplaysDeltas(self):
+    directory = os.path.join(self.get_temp_dir(), "replay")
+    with self.session(graph=ops.Graph()) as sess:
+      embeddings, bias, mask, ids, train_op = self._model()
+      saver = delta_checkpoint.DeltaCheckpointSaver(
+          [embeddings, bias], directory, full_save_interval=5)
+      self.evaluate([variables.global_variables_initializer(),
+                     variables.local_variables_initializer()])
+      saver.save(sess)
+      expected = []
+      for step_ids in [[1], [3, 4]]:
+        sess.run(train_op, feed_dict={ids: step_ids})
+        expected.append(self.evaluate(embeddings))
+        saver.save(sess)
+      self.assertEqual(3, len(saver.checkpoints))
+
+      self.evaluate(embeddings.assign(np.ones([10, 2])))
+      saver.restore(sess, saver.checkpoints[1])
+      self.assertAllEqual(expected[0], self.evaluate(embeddings))
+      self.assertFalse(np.any(self.evaluate(mask)))
+      # Saving continues the chain from the restored checkpoint.
+      self.assertEqual(2, len(saver.checkpoints))
+
+      with self.assertRaisesRegexp(ValueError, "not part of the checkpoint"):
+        saver.restore(sess, os.path.join(directory, "missing"))
+
+  @test_util.run_in_graph_and_eager_modes
+  def testDenseUpdatesMarkAllRows(self):
+    v = resource_variable_ops.ResourceVariable(
+        np.zeros([3, 2], dtype=np.float32), name="dense")
+    mask = delta_checkpoint.track_sparse_updates(v)
+    self.evaluate([v.initializer, mask.initializer])
+    self.evaluate(mask.assign(np.zeros([3], dtype=np.bool)))
+    grad = constant_op.constant(np.ones([3, 2], dtype=np.float32))
+    optimizer = gradient_descent.GradientDescentOptimizer(1.)
+    self.evaluate(optimizer.apply_gradients([(grad, v)]))
+    self.assertTrue(np.all(self.evaluate(mask)))
+
+  def testSparseUpdatesOfGpuVariable(self):
+    if not test.is_gpu_available():
+      return
+    with self.session(graph=ops.Graph(), force_gpu=True) as sess:
+      v = resource_variable_ops.ResourceVariable(
+          np.zeros([10, 2], dtype=np.float32), name="embeddings")
+      mask = delta_checkpoint.track_sparse_updates(v)
+      grad = ops.IndexedSlices(
+          constant_op.constant(np.ones([2, 2], dtype=np.float32)),
+          constant_op.constant([2, 7]))
+      optimizer = gradient_descent.GradientDescentOptimizer(1.)
+      train_op = optimizer.apply_gradients([(grad, v)])
+      self.evaluate([v.initializer, mask.initializer])
+      self.evaluate(mask.assign(np.zeros([10], dtype=np.bool)))
+      # Soft placement is disabled, so this fails if the mask update is
+      # colocated with the variable.
+      sess.run(train_op)
+      self.assertAllEqual([2, 7], np.flatnonzero(self.evaluate(mask)))
+
+
+if __name__ == "__main__":
+  test.main()
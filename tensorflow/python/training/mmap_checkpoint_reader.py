@@ -0,0 +1,222 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Reads V2 checkpoints through read-only memory mappings of their data files.
+
+The `.index` file of a V2 checkpoint is a table in the LevelDB format (see
+`tensorflow/core/lib/io/table_format.txt`) mapping tensor names to
+`BundleEntryProto`s, which locate the bytes of each tensor in the `.data-*`
+files. Tensors with a fixed size dtype are returned as read-only NumPy arrays
+viewing a memory mapping of their data file, so that processes reading the same
+checkpoint share the page cache instead of each holding a copy.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import mmap
+import struct
+import sys
+import threading
+
+import numpy as np
+
+from tensorflow.core.framework import types_pb2
+from tensorflow.core.protobuf import tensor_bundle_pb2
+from tensorflow.python import pywrap_tensorflow
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors_impl
+from tensorflow.python.framework import tensor_shape
+from tensorflow.python.lib.io import file_io
+
+# See tensorflow/core/lib/io/format.h.
+_TABLE_MAGIC_NUMBER = 0xdb4775248b80fb57
+_FOOTER_LENGTH = 48
+_NO_COMPRESSION = 0
+
+# The key of the BundleHeaderProto in the index.
+_HEADER_ENTRY_KEY = b""
+# The keys of the slices of partitioned tensors, encoded by
+# EncodeTensorNameSlice, start with a 0 byte.
+_SLICE_KEY_PREFIX = b"\x00"
+
+_NOT_MAPPABLE_DTYPES = frozenset(
+    [types_pb2.DT_STRING, types_pb2.DT_RESOURCE, types_pb2.DT_VARIANT])
+
+
+def _decode_varint(data, pos):
+  """Decodes a varint from `data` at `pos`, returning it and the next pos."""
+  result = 0
+  shift = 0
+  while True:
+    byte = bytearray(data[pos:pos + 1])[0]
+    pos += 1
+    result |= (byte & 0x7f) << shift
+    if not byte & 0x80:
+      return result, pos
+    shift += 7
+
+
+def _read_block(data, offset, size):
+  """Returns the contents of the table block at `offset`."""
+  compression = bytearray(data[offset + size:offset + size + 1])[0]
+  if compression != _NO_COMPRESSION:
+    raise ValueError("Unsupported compression type %d in checkpoint index." %
+                     compression)
+  return data[offset:offset + size]
+
+
+def _block_entries(block):
+  """Yields the (key, value) pairs of a table block."""
+  num_restarts, = struct.unpack("<I", block[-4:])
+  limit = len(block) - 4 * (num_restarts + 1)
+  pos = 0
+  key = b""
+  while pos < limit:
+    shared, pos = _decode_varint(block, pos)
+    non_shared, pos = _decode_varint(block, pos)
+    value_length, pos = _decode_varint(block, pos)
+    key = key[:shared] + block[pos:pos + non_shared]
+    pos += non_shared
+    yield key, block[pos:pos + value_length]
+    pos += value_length
+
+
+def _read_index(index_data):
+  """Returns a dict mapping the keys of a checkpoint index to their values."""
+  if len(index_data) < _FOOTER_LENGTH:
+    raise ValueError("Checkpoint index is too short.")
+  footer = index_data[-_FOOTER_LENGTH:]
+  magic, = struct.unpack("<Q", footer[-8:])
+  if magic != _TABLE_MAGIC_NUMBER:
+    raise ValueError("Checkpoint index is not a table (bad magic number).")
+  # The footer holds the metaindex and index block handles.
+  _, pos = _decode_varint(footer, 0)
+  _, pos = _decode_varint(footer, pos)
+  index_offset, pos = _decode_varint(footer, pos)
+  index_size, pos = _decode_varint(footer, pos)
+  entries = {}
+  index_block = _read_block(index_data, index_offset, index_size)
+  for _, handle in _block_entries(index_block):
+    block_offset, pos = _decode_varint(handle, 0)
+    block_size, _ = _decode_varint(handle, pos)
+    for key, value in _block_entries(
+        _read_block(index_data, block_offset, block_size)):
+      entries[key] = value
+  return entries
+
+
+class MmapCheckpointReader(object):
+  """Reads the tensors of a V2 checkpoint without copying them.
+
+  Offers the same methods as the `CheckpointReader` returned by
+  `tf.train.load_checkpoint`. `get_tensor` returns read-only NumPy arrays
+  backed by memory mappings of the data files, which stay valid as long as the
+  arrays are referenced. Tensors which cannot be mapped (strings, and tensors
+  saved as slices of a partitioned variable) are read and copied by a
+  `CheckpointReader`.
+
+  The checkpoint files must be on a local file system. Checksums are not
+  verified.
+  """
+
+  def __init__(self, checkpoint_prefix):
+    """Opens the checkpoint with prefix `checkpoint_prefix`.
+
+    Args:
+      checkpoint_prefix: The prefix of a V2 checkpoint.
+
+    Raises:
+      NotFoundError: If the checkpoint index does not exist.
+      ValueError: If the index cannot be parsed, or if the checkpoint was
+        written on a platform with another endianness.
+    """
+    self._prefix = checkpoint_prefix
+    index_filename = checkpoint_prefix + ".index"
+    if not file_io.file_exists(index_filename):
+      raise errors_impl.NotFoundError(
+          None, None, "Unsuccessful TensorSliceReader constructor: Failed to "
+          "find any matching files for %s" % checkpoint_prefix)
+    with open(index_filename, "rb") as f:
+      index = _read_index(f.read())
+    header = tensor_bundle_pb2.BundleHeaderProto()
+    header.ParseFromString(index.pop(_HEADER_ENTRY_KEY))
+    little_endian = header.endianness == header.LITTLE
+    if little_endian != (sys.byteorder == "little"):
+      raise ValueError("Checkpoint %s was written with another endianness." %
+                       checkpoint_prefix)
+    self._num_shards = header.num_shards
+    self._entries = {}
+    for key, value in index.items():
+      if key.startswith(_SLICE_KEY_PREFIX):
+        # Slices are read through the entry of their partitioned tensor.
+        continue
+      entry = tensor_bundle_pb2.BundleEntryProto()
+      entry.ParseFromString(value)
+      self._entries[key.decode("utf-8")] = entry
+    self._lock = threading.Lock()
+    # Memory mappings of the data files, by shard id, created on first use.
+    self._mappings = {}
+    self._fallback_reader = None
+
+  def has_tensor(self, name):
+    return name in self._entries
+
+  def get_variable_to_shape_map(self):
+    return {key: [dim.size for dim in entry.shape.dim]
+            for key, entry in self._entries.items()}
+
+  def get_variable_to_dtype_map(self):
+    return {key: dtypes.as_dtype(entry.dtype)
+            for key, entry in self._entries.items()}
+
+  def _mapping(self, shard_id):
+    with self._lock:
+      mapping = self._mappings.get(shard_id)
+      if mapping is None:
+        filename = "%s.data-%05d-of-%05d" % (self._prefix, shard_id,
+                                             self._num_shards)
+        with open(filename, "rb") as f:
+          mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mappings[shard_id] = mapping
+      return mapping
+
+  def get_tensor(self, name):
+    """Returns the value of the tensor `name`.
+
+    Args:
+      name: The name of a tensor in the checkpoint.
+
+    Returns:
+      A NumPy array, read-only and backed by the checkpoint file if possible.
+
+    Raises:
+      NotFoundError: If the checkpoint has no tensor `name`.
+    """
+    entry = self._entries.get(name)
+    if entry is None:
+      raise errors_impl.NotFoundError(
+          None, None, "Key %s not found in checkpoint" % name)
+    if entry.slices or entry.dtype in _NOT_MAPPABLE_DTYPES:
+      if self._fallback_reader is None:
+        self._fallback_reader = pywrap_tensorflow.NewCheckpointReader(
+            self._prefix)
+      return self._fallback_reader.get_tensor(name)
+    shape = tensor_shape.TensorShape(entry.shape).as_list()
+    dtype = dtypes.as_dtype(entry.dtype).as_numpy_dtype
+    if entry.size == 0:
+      return np.zeros(shape, dtype=dtype)
+    value = np.frombuffer(self._mapping(entry.shard_id), dtype=dtype,
+                          count=int(np.prod(shape)), offset=entry.offset)
+    return value.reshape(shape)
@@ -34,6 +34,7 @@ from tensorflow.python.ops import resource_variable_ops
 from tensorflow.python.ops import state_ops
 from tensorflow.python.ops import variable_scope
 from tensorflow.python.ops import variables
+from tensorflow.python.training import delta_checkpoint
 from tensorflow.python.training import distribute as distribute_lib
 from tensorflow.python.training import distribution_strategy_context as distribute_ctx
 from tensorflow.python.training import slot_creator
@@ -98,6 +99,23 @@ class _OptimizableVariable(object):
     raise NotImplementedError("Calling an abstract method.")
 
 
+def _mark_updated_rows(v, update_op, indices=None):
+  """Groups `update_op` with marking the rows it changes for delta checkpoints.
+
+  Args:
+    v: The updated variable.
+    update_op: The op updating `v`.
+    indices: The updated rows, or None if all the rows are updated.
+
+  Returns:
+    `update_op`, or a grouped op if the changed rows of `v` are tracked.
+  """
+  mark_op = delta_checkpoint.mark_updated_rows(v, indices)
+  if mark_op is None:
+    return update_op
+  return control_flow_ops.group(update_op, mark_op)
+
+
 class _RefVariableProcessor(_OptimizableVariable):
   """Processor for Variable."""
 
@@ -115,9 +133,8 @@ class _RefVariableProcessor(_OptimizableVariable):
       update_op = optimizer._apply_dense(g, self._v)  # pylint: disable=protected-access
       if self._v.constraint is not None:
         with ops.control_dependencies([update_op]):
-          return self._v.assign(self._v.constraint(self._v))
-      else:
-        return update_op
+          update_op = self._v.assign(self._v.constraint(self._v))
+      return _mark_updated_rows(self._v, update_op)
     else:
       assert isinstance(g, ops.IndexedSlices), ("Gradient ", g, " is neither a "
                                                 "tensor nor IndexedSlices.")
@@ -125,7 +142,9 @@ class _RefVariableProcessor(_OptimizableVariable):
         raise RuntimeError(
             "Cannot use a constraint function on a sparse variable.")
       # pylint: disable=protected-access
-      return optimizer._apply_sparse_duplicate_indices(g, self._v)
+      return _mark_updated_rows(
+          self._v, optimizer._apply_sparse_duplicate_indices(g, self._v),
+          None if optimizer._sparse_apply_updates_all_rows else g.indices)
 
 
 class _DenseReadResourceVariableProcessor(_OptimizableVariable):
@@ -162,14 +181,16 @@ class _DenseResourceVariableProcessor(_OptimizableVariable):
       if self._v.constraint is not None:
         raise RuntimeError(
             "Cannot use a constraint function on a sparse variable.")
-      return optimizer._resource_apply_sparse_duplicate_indices(
-          g.values, self._v, g.indices)
+      return _mark_updated_rows(
+          self._v,
+          optimizer._resource_apply_sparse_duplicate_indices(
+              g.values, self._v, g.indices),
+          None if optimizer._sparse_apply_updates_all_rows else g.indices)
     update_op = optimizer._resource_apply_dense(g, self._v)
     if self._v.constraint is not None:
       with ops.control_dependencies([update_op]):
-        return self._v.assign(self._v.constraint(self._v))
-    else:
-      return update_op
+        update_op = self._v.assign(self._v.constraint(self._v))
+    return _mark_updated_rows(self._v, update_op)
 
 
 class _TensorProcessor(_OptimizableVariable):
@@ -307,6 +328,11 @@ class Optimizer(
   GATE_OP = 1
   GATE_GRAPH = 2
 
+  # Whether `_apply_sparse` and `_resource_apply_sparse` may update rows of the
+  # variable (or of its slots) outside the indices of the gradient, in which
+  # case all the rows are marked as changed for delta checkpoints.
+  _sparse_apply_updates_all_rows = False
+
   def __init__(self, use_locking, name):
     """Create a new Optimizer.
 
@@ -1090,6 +1116,7 @@ class Optimizer(
       self._restore_slot_variable(
           slot_name=slot_name, variable=var,
           slot_variable=new_slot_variable)
+      delta_checkpoint.track_slot(var, new_slot_variable)
       named_slots[_var_key(var)] = new_slot_variable
     return named_slots[_var_key(var)]
 
@@ -1116,6 +1143,7 @@ class Optimizer(
       self._restore_slot_variable(
           slot_name=slot_name, variable=var,
           slot_variable=new_slot_variable)
+      delta_checkpoint.track_slot(var, new_slot_variable)
       named_slots[_var_key(var)] = new_slot_variable
     return named_slots[_var_key(var)]
 
@@ -1137,6 +1165,7 @@ class Optimizer(
       self._restore_slot_variable(
           slot_name=slot_name, variable=var,
           slot_variable=new_slot_variable)
+      delta_checkpoint.track_slot(var, new_slot_variable)
       named_slots[_var_key(var)] = new_slot_variable
     return named_slots[_var_key(var)]
 
@@ -48,6 +48,7 @@ from tensorflow.python.ops import string_ops
 from tensorflow.python.ops import variables
 from tensorflow.python.platform import gfile
 from tensorflow.python.platform import tf_logging as logging
+from tensorflow.python.training import async_checkpoint
 from tensorflow.python.training import checkpoint_management
 from tensorflow.python.training import saveable_object
 from tensorflow.python.training import training_util
@@ -404,7 +405,23 @@ class BaseSaverBuilder(object):
     """
     all_tensors = self.bulk_restore(filename_tensor, saveables, preferred_shard,
                                     restore_sequentially)
+    assign_ops = self._AddAssignOps(saveables, all_tensors, reshape)
 
+    # Create a Noop that has control dependencies from all the updates.
+    return control_flow_ops.group(*assign_ops, name=name)
+
+  def _AddAssignOps(self, saveables, all_tensors, reshape):
+    """Add operations assigning restored tensors to saveables.
+
+    Args:
+      saveables: A list of SaveableObject objects.
+      all_tensors: The restored tensors, one per spec of `saveables`.
+      reshape: True if we want to reshape loaded tensors to the shape of
+        the corresponding variable.
+
+    Returns:
+      A list of the Operations restoring each saveable.
+    """
     assign_ops = []
     idx = 0
     # Load and optionally reshape on the CPU, as string tensors are not
@@ -426,9 +443,7 @@ class BaseSaverBuilder(object):
       saveable_tensors = all_tensors[idx:idx + len(saveable.specs)]
       idx += len(saveable.specs)
       assign_ops.append(saveable.restore(saveable_tensors, shapes))
-
-    # Create a Noop that has control dependencies from all the updates.
-    return control_flow_ops.group(*assign_ops, name=name)
+    return assign_ops
 
   def _AddShardedRestoreOps(self, filename_tensor, per_device,
                             restore_sequentially, reshape):
@@ -867,6 +882,140 @@ class BulkSaverBuilder(BaseSaverBuilder):
       return io_ops.restore_v2(filename_tensor, names, slices, dtypes)
 
 
+class ParallelRestoreSaverBuilder(BulkSaverBuilder):
+  """SaverBuilder restoring tensors in parallel, memory-bounded groups.
+
+  `BulkSaverBuilder` reads all the tensors of a shard with a single restore op,
+  so that every restored value is held in host memory before any of them is
+  assigned. This builder splits the saveables into groups of at most
+  `max_bytes_in_flight / num_parallel_reads` bytes, each read by its own
+  restore op, and runs at most `num_parallel_reads` groups at a time: a group
+  is only read once the values of an earlier group have been assigned. The
+  groups of different shards are interleaved so that the devices of a sharded
+  checkpoint are restored in parallel, under the same bound.
+
+  Slices of partitioned variables are restored independently, reading only
+  the slice from the checkpoint. Saveables whose size is not known statically
+  (e.g. string tensors) are not counted against the bound.
+  """
+
+  def __init__(self,
+               write_version=saver_pb2.SaverDef.V2,
+               num_parallel_reads=4,
+               max_bytes_in_flight=1 << 30):
+    """Creates a `ParallelRestoreSaverBuilder`.
+
+    Args:
+      write_version: The checkpoint format to write.
+      num_parallel_reads: The maximum number of restore ops running at once.
+      max_bytes_in_flight: The approximate maximum number of bytes read from
+        the checkpoint and not assigned yet. A saveable larger than
+        `max_bytes_in_flight / num_parallel_reads` is restored on its own.
+
+    Raises:
+      ValueError: If `num_parallel_reads` or `max_bytes_in_flight` is not
+        positive.
+    """
+    super(ParallelRestoreSaverBuilder, self).__init__(write_version)
+    if num_parallel_reads < 1:
+      raise ValueError("num_parallel_reads must be positive, got %d" %
+                       num_parallel_reads)
+    if max_bytes_in_flight < 1:
+      raise ValueError("max_bytes_in_flight must be positive, got %d" %
+                       max_bytes_in_flight)
+    self._num_parallel_reads = num_parallel_reads
+    self._max_group_bytes = max(max_bytes_in_flight // num_parallel_reads, 1)
+
+  @staticmethod
+  def _RestoredBytes(saveable):
+    """Returns the number of bytes restored for `saveable`, or 0 if unknown."""
+    if isinstance(saveable, (BaseSaverBuilder.VariableSaveable,
+                             BaseSaverBuilder.ResourceVariableSaveable)):
+      # Avoid building the read ops of the variable.
+      shapes = [saveable.op.get_shape()]
+    else:
+      shapes = [spec.tensor.get_shape() for spec in saveable.specs]
+    num_bytes = 0
+    for shape, spec in zip(shapes, saveable.specs):
+      dtype = spec.dtype.base_dtype
+      if shape.is_fully_defined() and (dtype.is_bool or dtype.is_integer or
+                                       dtype.is_floating or dtype.is_complex):
+        num_bytes += shape.num_elements() * dtype.size
+    return num_bytes
+
+  def _GroupSaveables(self, saveables):
+    """Splits `saveables` into groups of at most `_max_group_bytes` bytes."""
+    groups = []
+    group = []
+    group_bytes = 0
+    for saveable in saveables:
+      num_bytes = self._RestoredBytes(saveable)
+      if group and group_bytes + num_bytes > self._max_group_bytes:
+        groups.append(group)
+        group = []
+        group_bytes = 0
+      group.append(saveable)
+      group_bytes += num_bytes
+    if group:
+      groups.append(group)
+    return groups
+
+  def _AddBoundedRestoreOps(self, filename_tensor, per_device, reshape, name):
+    """Add operations restoring the saveables of each device in groups.
+
+    Args:
+      filename_tensor: Tensor for the path of the file to load.
+      per_device: A list of (device, SaveableObject) pairs. The device is None
+        when the checkpoint is not sharded.
+      reshape: True if we want to reshape loaded tensors to the shape of
+        the corresponding variable.
+      name: Name for the returned op.
+
+    Returns:
+      An Operation that restores the variables.
+    """
+    per_device_groups = [
+        [(device, group) for group in self._GroupSaveables(saveables)]
+        for device, saveables in per_device]
+    # Interleave the groups of the devices to read the shards in parallel.
+    groups = [device_group
+              for device_groups in six.moves.zip_longest(*per_device_groups)
+              for device_group in device_groups
+              if device_group is not None]
+    group_restores = []
+    for i, (device, group) in enumerate(groups):
+      # Wait for an earlier group to be assigned before reading this one.
+      if i >= self._num_parallel_reads:
+        dependencies = [group_restores[i - self._num_parallel_reads]]
+      else:
+        dependencies = []
+      with ops.device(device) if device else ops.NullContextmanager():
+        with ops.control_dependencies(dependencies):
+          tensors = self.bulk_restore(filename_tensor, group, -1, False)
+        group_restores.append(control_flow_ops.group(
+            *self._AddAssignOps(group, tensors, reshape),
+            name="restore_group"))
+    return control_flow_ops.group(*group_restores, name=name)
+
+  def _AddRestoreOps(self,
+                     filename_tensor,
+                     saveables,
+                     restore_sequentially,
+                     reshape,
+                     preferred_shard=-1,
+                     name="restore_all"):
+    # Ignored: groups are ordered by the bound on parallel reads.
+    del restore_sequentially, preferred_shard
+    return self._AddBoundedRestoreOps(filename_tensor, [(None, saveables)],
+                                      reshape, name)
+
+  def _AddShardedRestoreOps(self, filename_tensor, per_device,
+                            restore_sequentially, reshape):
+    del restore_sequentially
+    return self._AddBoundedRestoreOps(filename_tensor, per_device, reshape,
+                                      "restore_all")
+
+
 def _get_saver_or_default():
   """Returns the saver from SAVERS collection, or creates a default one.
 
@@ -1112,6 +1261,10 @@ class Saver(object):
     # For compatibility with object-based checkpoints, we may build a second
     # Saver to read the renamed keys.
     self._object_restore_saver = None
+    # Created on the first call to `save(experimental_async=True)`.
+    self._async_writer = None
+    # The SaveV2 ops run by the save tensor, when graph building.
+    self._save_v2_ops = None
 
   def build(self):
     if context.executing_eagerly():
@@ -1353,7 +1506,8 @@ class Saver(object):
            meta_graph_suffix="meta",
            write_meta_graph=True,
            write_state=True,
-           strip_default_attrs=False):
+           strip_default_attrs=False,
+           experimental_async=False):
     # pylint: disable=line-too-long
     """Saves variables.
 
@@ -1364,6 +1518,19 @@ class Saver(object):
     The method returns the path prefix of the newly created checkpoint files.
     This string can be passed directly to a call to `restore()`.
 
+    With `experimental_async=True`, the values of the variables are copied to
+    host memory and the checkpoint files are written on a background thread,
+    so that `save()` returns as soon as the copy is made. A handle to the save
+    is returned instead of the path prefix: its `result()` method waits for the
+    checkpoint to be written and returns the path prefix, and its `done()`
+    method returns whether it was written. The `checkpoint` file and the
+    deletion of old checkpoints are only updated once the checkpoint is written.
+    At most one checkpoint is written at a time: a new asynchronous save first
+    waits for the previous one to be written, and synchronous saves wait for
+    all pending asynchronous saves. Asynchronous saving requires the V2
+    checkpoint format, and all the values are written from the host calling
+    `save()`.
+
     Args:
       sess: A Session to use to save the variables.
       save_path: String.  Prefix of filenames created for the checkpoint.
@@ -1383,23 +1550,33 @@ class Saver(object):
       strip_default_attrs: Boolean. If `True`, default-valued attributes will be
         removed from the NodeDefs. For a detailed guide, see
         [Stripping Default-Valued Attributes](https://github.com/tensorflow/tensorflow/blob/master/tensorflow/python/saved_model/README.md#stripping-default-valued-attributes).
+      experimental_async: If `True`, writes the checkpoint on a background
+        thread and returns a handle to the save.
 
     Returns:
       A string: path prefix used for the checkpoint files.  If the saver is
         sharded, this string ends with: '-?????-of-nnnnn' where 'nnnnn'
         is the number of shards created.
       If the saver is empty, returns None.
+      If `experimental_async` is `True`, a handle whose `result()` method
+        returns the above.
 
     Raises:
       TypeError: If `sess` is not a `Session`.
       ValueError: If `latest_filename` contains path components, or if it
-        collides with `save_path`.
+        collides with `save_path`, or if `experimental_async` is `True` and the
+        saver does not use the V2 checkpoint format.
       RuntimeError: If save and restore ops weren't built.
     """
     # pylint: enable=line-too-long
     if not self._is_built and not context.executing_eagerly():
       raise RuntimeError(
           "`build()` should be called before save if defer_build==True")
+    if experimental_async and self._write_version != saver_pb2.SaverDef.V2:
+      raise ValueError("Asynchronous saving requires the V2 checkpoint format.")
+    if not experimental_async and self._async_writer is not None:
+      # Keep the checkpoint state consistent with the order of the saves.
+      self._async_writer.wait()
     if latest_filename is None:
       latest_filename = "checkpoint"
     if self._write_version != saver_pb2.SaverDef.V2:
@@ -1434,7 +1611,10 @@ class Saver(object):
       raise TypeError("'sess' must be a Session; %s" % sess)
 
     save_path_parent = os.path.dirname(save_path)
-    if not self._is_empty:
+    if experimental_async:
+      handle = self._save_async(sess, checkpoint_file, latest_filename,
+                                meta_graph_suffix, write_state)
+    elif not self._is_empty:
       try:
         if context.executing_eagerly():
           self._build_eager(
@@ -1470,11 +1650,115 @@ class Saver(object):
           self.export_meta_graph(
               meta_graph_filename, strip_default_attrs=strip_default_attrs)
 
-    if self._is_empty:
+    if experimental_async:
+      return handle
+    elif self._is_empty:
       return None
     else:
       return model_checkpoint_path
 
+  def _save_async(self, sess, checkpoint_file, latest_filename,
+                  meta_graph_suffix, write_state):
+    """Snapshots the saved tensors and writes them on a background thread.
+
+    Args:
+      sess: The Session to evaluate the saved tensors in, or None when
+        executing eagerly.
+      checkpoint_file: The prefix of the checkpoint to write.
+      latest_filename: The name of the checkpoint state file.
+      meta_graph_suffix: Suffix for `MetaGraphDef` files.
+      write_state: Whether to update the checkpoint state once written.
+
+    Returns:
+      A `CheckpointSaveHandle`.
+    """
+    if context.executing_eagerly():
+      if self._builder is None:
+        self._builder = BulkSaverBuilder(self._write_version)
+      self._is_empty = not self._var_list
+      if self.saver_def is None:
+        # Used by the checkpoint management in `_update_checkpoint_state`.
+        self.saver_def = saver_pb2.SaverDef(
+            max_to_keep=self._max_to_keep or 0,
+            sharded=self._sharded,
+            keep_checkpoint_every_n_hours=self._keep_checkpoint_every_n_hours,
+            version=self._write_version)
+      snapshot_fn = self._snapshot_eager
+    else:
+      snapshot_fn = lambda: self._snapshot(sess)
+    if self._is_empty:
+      if not self._allow_empty:
+        raise ValueError("No variables to save")
+      handle = async_checkpoint.CheckpointSaveHandle(None)
+      handle._complete()  # pylint: disable=protected-access
+      return handle
+
+    if self._async_writer is None:
+      self._async_writer = async_checkpoint.AsyncCheckpointWriter()
+    handle = self._async_writer.save(checkpoint_file, snapshot_fn)
+    if write_state:
+      def _update_checkpoint_state():
+        self._RecordLastCheckpoint(checkpoint_file)
+        checkpoint_management.update_checkpoint_state_internal(
+            save_dir=os.path.dirname(checkpoint_file),
+            model_checkpoint_path=checkpoint_file,
+            all_model_checkpoint_paths=self.last_checkpoints,
+            latest_filename=latest_filename,
+            save_relative_paths=self._save_relative_paths)
+        self._MaybeDeleteOldCheckpoints(meta_graph_suffix=meta_graph_suffix)
+      handle._add_finalizer(_update_checkpoint_state)  # pylint: disable=protected-access
+    return handle
+
+  def _snapshot(self, sess):
+    """Fetches the tensors written by the save tensor's SaveV2 ops."""
+    if self._save_v2_ops is None:
+      save_tensor = sess.graph.as_graph_element(self.saver_def.save_tensor_name)
+      save_v2_ops = []
+      seen = set()
+      to_visit = [save_tensor.op]
+      while to_visit:
+        op = to_visit.pop()
+        if op in seen:
+          continue
+        seen.add(op)
+        if op.type == "SaveV2":
+          save_v2_ops.append(op)
+        else:
+          to_visit.extend(t.op for t in op.inputs)
+          to_visit.extend(op.control_inputs)
+      self._save_v2_ops = sorted(save_v2_ops, key=lambda op: op.name)
+
+    # SaveV2 takes the prefix, the tensor names, the slice specs and the
+    # tensors to save.
+    fetches = [list(op.inputs)[1:] for op in self._save_v2_ops]
+    shards = []
+    for op, values in zip(self._save_v2_ops, sess.run(fetches)):
+      shards.append(async_checkpoint.CheckpointShard(
+          names=[compat.as_str(name) for name in values[0]],
+          slices=[compat.as_str(s) for s in values[1]],
+          dtypes=[t.dtype.base_dtype for t in list(op.inputs)[3:]],
+          values=values[2:]))
+    return shards
+
+  def _snapshot_eager(self):
+    """Copies the values of the saved tensors to host memory."""
+    # pylint: disable=protected-access
+    saveables = self._builder._ValidateAndSliceInputs(self._var_list)
+    if self._sharded:
+      groups = [group for _, group in self._builder._GroupByDevices(saveables)]
+    else:
+      groups = [saveables]
+    # pylint: enable=protected-access
+    shards = []
+    for group in groups:
+      specs = [spec for saveable in group for spec in saveable.specs]
+      shards.append(async_checkpoint.CheckpointShard(
+          names=[spec.name for spec in specs],
+          slices=[spec.slice_spec for spec in specs],
+          dtypes=[spec.dtype for spec in specs],
+          values=[spec.tensor.numpy() for spec in specs]))
+    return shards
+
   def export_meta_graph(self,
                         filename=None,
                         collection_list=None,
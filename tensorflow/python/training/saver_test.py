@@ -54,6 +54,7 @@ from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import control_flow_ops
 from tensorflow.python.ops import data_flow_ops
 from tensorflow.python.ops import gradients_impl
+from tensorflow.python.ops import init_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import nn_ops
 from tensorflow.python.ops import partitioned_variables
@@ -719,6 +720,109 @@ class SaverTest(test.TestCase):
   def testSaveWithGlobalStepWithPadding(self):
     self.testSaveWithGlobalStep(pad_step_number=True)
 
+  @test_util.run_in_graph_and_eager_modes
+  def testAsyncSave(self):
+    save_dir = os.path.join(self.get_temp_dir(), "async_save")
+    save_path = os.path.join(save_dir, "async_ckpt")
+    with self.session(graph=ops_lib.Graph()):
+      v0 = resource_variable_ops.ResourceVariable(10.0, name="v0")
+      v1 = resource_variable_ops.ResourceVariable([1, 2], name="v1")
+      if context.executing_eagerly():
+        sess = None
+      else:
+        self.evaluate([v0.initializer, v1.initializer])
+        sess = ops_lib.get_default_session()
+      save = saver_module.Saver({"v0": v0, "v1": v1}, max_to_keep=2)
+      handles = []
+      for step in range(3):
+        handles.append(save.save(sess, save_path, global_step=step,
+                                 experimental_async=True))
+        # The snapshot is taken before save() returns.
+        self.evaluate(v0.assign_add(1.0))
+      paths = [handle.result() for handle in handles]
+      self.assertTrue(all(handle.done() for handle in handles))
+      self.assertEqual(["%s-%d" % (save_path, step) for step in range(3)],
+                       paths)
+      self.assertEqual(paths[1:], save.last_checkpoints)
+      self.assertEqual(paths[-1], checkpoint_management.latest_checkpoint(
+          save_dir))
+      self.assertFalse(checkpoint_management.checkpoint_exists(paths[0]))
+      # pylint: disable=protected-access
+      save._async_writer.close()
+      self.assertIsNone(save._async_writer._write_session)
+      # pylint: enable=protected-access
+
+      self.evaluate([v0.assign(-1.0), v1.assign([0, 0])])
+      save.restore(sess, paths[1])
+      self.assertEqual(11.0, self.evaluate(v0))
+      self.assertAllEqual([1, 2], self.evaluate(v1))
+
+  def testParallelRestoreBuilder(self):
+    save_path = os.path.join(self.get_temp_dir(), "parallel_restore")
+    values = {"v%d" % i: np.full([4], i, dtype=np.float32) for i in range(5)}
+    with self.session(graph=ops_lib.Graph()) as sess:
+      var_list = {name: variables.Variable(value, name=name)
+                  for name, value in values.items()}
+      self.evaluate(variables.global_variables_initializer())
+      saver_module.Saver(var_list).save(sess, save_path)
+
+    with self.session(graph=ops_lib.Graph()) as sess:
+      var_list = {name: resource_variable_ops.ResourceVariable(
+          array_ops.zeros([4]), name=name) for name in values}
+      # Each 16-byte variable fills a group, and two groups are in flight.
+      builder = saver_module.ParallelRestoreSaverBuilder(
+          num_parallel_reads=2, max_bytes_in_flight=32)
+      save = saver_module.Saver(var_list, builder=builder)
+      restore_ops = [op for op in sess.graph.get_operations()
+                     if op.type == "RestoreV2"]
+      self.assertEqual(5, len(restore_ops))
+      self.assertEqual(
+          [0, 0, 1, 1, 1],
+          [len(op.control_inputs) for op in sorted(restore_ops,
+                                                   key=lambda op: op.name)])
+      self.evaluate(variables.global_variables_initializer())
+      save.restore(sess, save_path)
+      for name, value in values.items():
+        self.assertAllEqual(value, self.evaluate(var_list[name]))
+
+  def testParallelRestoreBuilderPartitioned(self):
+    save_path = os.path.join(self.get_temp_dir(), "parallel_restore_part")
+    value = np.arange(40, dtype=np.float32).reshape([10, 4])
+    with self.session(graph=ops_lib.Graph()) as sess:
+      v = variables.Variable(value, name="v")
+      self.evaluate(variables.global_variables_initializer())
+      saver_module.Saver([v]).save(sess, save_path)
+
+    with self.session(graph=ops_lib.Graph()) as sess:
+      v = variable_scope.get_variable(
+          "v", shape=[10, 4],
+          initializer=init_ops.zeros_initializer(),
+          partitioner=partitioned_variables.fixed_size_partitioner(
+              num_shards=5))
+      builder = saver_module.ParallelRestoreSaverBuilder(
+          num_parallel_reads=1, max_bytes_in_flight=1)
+      save = saver_module.Saver([v], builder=builder)
+      self.assertEqual(5, len([op for op in sess.graph.get_operations()
+                               if op.type == "RestoreV2"]))
+      self.evaluate(variables.global_variables_initializer())
+      save.restore(sess, save_path)
+      self.assertAllEqual(value, self.evaluate(v.as_tensor()))
+
+  def testParallelRestoreBuilderInvalidArguments(self):
+    with self.assertRaisesRegexp(ValueError, "num_parallel_reads"):
+      saver_module.ParallelRestoreSaverBuilder(num_parallel_reads=0)
+    with self.assertRaisesRegexp(ValueError, "max_bytes_in_flight"):
+      saver_module.ParallelRestoreSaverBuilder(max_bytes_in_flight=0)
+
+  def testAsyncSaveRequiresV2(self):
+    with self.cached_session() as sess:
+      v = variables.Variable(1.0, name="v")
+      save = saver_module.Saver(
+          {"v": v}, write_version=saver_pb2.SaverDef.V1)
+      with self.assertRaisesRegexp(ValueError, "V2 checkpoint format"):
+        save.save(sess, os.path.join(self.get_temp_dir(), "ckpt"),
+                  experimental_async=True)
+
   def testSaveToNonexistingPath(self):
     file_io.write_string_to_file(
         os.path.join(self.get_temp_dir(), "actually_a_file"), "")
@@ -1119,6 +1223,27 @@ class SaveRestoreShardedTest(test.TestCase):
 class SaveRestoreShardedTestV2(SaveRestoreShardedTest):
   _WRITE_VERSION = saver_pb2.SaverDef.V2
 
+  def testAsyncSave(self):
+    save_path = os.path.join(self.get_temp_dir(), "sharded_async")
+    with session.Session(
+        target="",
+        config=config_pb2.ConfigProto(device_count={"CPU": 2})) as sess:
+      with sess.graph.device("/cpu:0"):
+        v0 = variables.Variable(10, name="v0")
+      with sess.graph.device("/cpu:1"):
+        v1 = variables.Variable(20, name="v1")
+      save = saver_module.Saver(
+          {"v0": v0, "v1": v1}, sharded=True, write_version=self._WRITE_VERSION)
+      self.evaluate(variables.global_variables_initializer())
+      handle = save.save(sess, save_path, experimental_async=True)
+      self.assertEqual(save_path, handle.result())
+      self.assertEqual(2, len(gfile.Glob(save_path + ".data-*")))
+
+      self.evaluate([v0.assign(0), v1.assign(0)])
+      save.restore(sess, save_path)
+      self.assertEqual(10, self.evaluate(v0))
+      self.assertEqual(20, self.evaluate(v1))
+
 
 class MaxToKeepTest(test.TestCase):
 